@@ -20,10 +20,20 @@ ROOT_PACKAGE_PATH = path_join(PROJECT_ROOT, ROOT_PACKAGE_NAME)
 
 sys_path.insert(0, PROJECT_ROOT)
 
+from PySpeedIT.fixtures import Fixture
 from PySpeedIT.speed_it import speed_it
 
 
-data = dict(zip(range(1000), range(1000)))
+def make_data(rng, size):
+   """ fixture factory: a dict of `size` items with shuffled values: the same for each run
+   """
+   values = list(range(size))
+   rng.shuffle(values)
+   return dict(zip(range(size), values))
+
+
+# built once per run: each function gets its own copy: the functions shuffle it in place
+data = Fixture(make_data, seed=1, args=(1000,))
 
 
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
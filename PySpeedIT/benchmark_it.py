@@ -21,6 +21,133 @@ Can be used *instead of python's timeit*.
       - multiple modules can be run at once just ranking is restricted to functions within one module
 
 
+.. index:: Benchmark-IT; engines
+
+Engines
+-------
+
+*Benchmark-IT* has two engines: see option ``benchmarkit__engine`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   - ``code``: generates a new function which executes only the code body of the function
+
+      - needs the source code of the function: supports the START/END TAG
+      - the code body is transformed with python's `ast`: `return` statements end the timed code body and the original
+        line numbers are kept for tracebacks
+
+   - ``call``: a generated tight loop calls the prebound callable with its bound arguments
+
+      - does not need any source code: builtins, C extension functions, Cython compiled functions, bound methods,
+        `functools.partial` objects, lambdas and anything build dynamically
+      - the calibrated call overhead is reported separately in the column: `call_overhead`
+
+   - ``auto`` (default): ``code`` if the source code of a normal python function is available else ``call``
+
+
+.. index:: Benchmark-IT; system noise
+
+System noise
+------------
+
+The system state is sampled before and after each benchmark: results are marked in the column `suspect` if the
+system noise was above the limits: see :mod:`PySpeedIT.system_state` and option ``benchmarkit__stable_mode``
+of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+
+.. index:: Benchmark-IT; outliers
+
+Outliers
+--------
+
+The time of each loop is captured: outliers are classified and the statistics are computed with and without them:
+see :mod:`PySpeedIT.sample_stats` and the options ``benchmarkit__outlier_method`` and ``benchmarkit__reject_outliers``
+of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: the column `rank value` shows the value used for the ranking
+
+
+.. index:: Benchmark-IT; time limit
+
+Time limit
+----------
+
+With the option ``job_timeout_sec`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` each benchmark is supervised by
+a wall-clock watchdog: see :py:func:`PySpeedIT.utils.watchdog`: a timed-out benchmark is reported with the status
+`TIMEOUT` and the statistics of its partial samples: the remaining benchmarks continue
+
+
+.. index:: Benchmark-IT; memory budgets
+
+Memory budgets
+--------------
+
+With the option ``benchmarkit__memory_budgets_mb`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` each function is
+additionally benchmarked in a child process per memory budget: see :mod:`PySpeedIT.memory_budget`: an extra table
+reports the time per budget and the smallest budget where the function still completes
+
+
+.. index:: Benchmark-IT; interpreters
+
+Interpreters
+------------
+
+With the option ``benchmarkit__interpreters`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` the functions are
+benchmarked in each listed Python interpreter as a subprocess and ranked across the interpreters in one table:
+see :mod:`PySpeedIT.multi_interpreter`
+
+
+.. index:: Benchmark-IT; incremental
+
+Incremental
+-----------
+
+With the option ``benchmarkit__incremental`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` only functions whose
+code, referenced module-level helpers, arguments or settings changed since the last run on the same host are
+benchmarked: the results of unchanged functions are reused: see :mod:`PySpeedIT.result_cache`: the column `fresh` shows
+`fresh` for measured rows and `cached` with the time of the reused measurement
+
+
+.. index:: Benchmark-IT; throughput
+
+Throughput
+----------
+
+With the module option ``benchmarkit__work_units`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` a function can
+declare its work units per loop: ``ops`` (e.g. items or requests) and ``bytes``: as numbers or as callables applied to
+the function arguments. The columns `ops/sec` and `bytes/sec` show the throughput with its 95 % confidence interval:
+see :py:func:`PySpeedIT.sample_stats.get_throughput_stats`: ``benchmarkit__rank_by`` ``ops_per_sec`` or
+``bytes_per_sec`` ranks by throughput: so functions with different batch sizes can be compared fairly
+
+
+.. index:: Benchmark-IT; SLO
+
+Latency SLOs
+------------
+
+With the module option ``benchmarkit__slos`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` a function can
+declare latency service level objectives: a percentile of the loop samples and a threshold. A function with too few
+samples for a valid tail percentile is measured again with a longer `run_sec`. The column `SLOs` shows the status, the
+percentile with its 95 % confidence interval and the margin: see :mod:`PySpeedIT.slo`
+
+
+.. index:: Benchmark-IT; isolated jobs
+
+Isolated Jobs
+-------------
+
+With the option ``benchmarkit__isolate_jobs`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` each job runs in a
+clean child process forked from a server which has the module, its variants and the fixtures already loaded: a job can
+not change the state seen by the following jobs: see :mod:`PySpeedIT.fork_server`: a job which raises or crashes is
+reported with the status `ERROR` or `CRASHED` and without samples: it ranks last: the remaining jobs continue
+
+
+.. index:: Benchmark-IT; plots
+
+Plots
+-----
+
+Each table is followed by inline SVG plots of the loop samples: a box plot comparing all functions and a histogram per
+function: see :mod:`PySpeedIT.svg_plots` and the option ``benchmarkit__plots``
+of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+
 For usage see :mod:`PySpeedIT.speed_it`
 
 **OUTPUT HTML**
@@ -34,6 +161,12 @@ Functions
 
 .. autofunction:: _helper_get_perf_counter_reference_time
 
+.. autofunction:: measure_functions_in_module
+
+.. autofunction:: benchmark_callable
+
+.. autofunction:: benchmark_functions
+
 .. autofunction:: benchmark_functions_in_module
 """
 # noinspection PyUnresolvedReferences
@@ -42,21 +175,100 @@ from gc import (
    enable as gc_enable,
    isenabled as gc_isenabled,
 )
+from array import array
+from ast import (
+   AsyncFunctionDef as ast_AsyncFunctionDef,
+   Assign as ast_Assign,
+   Break as ast_Break,
+   ClassDef as ast_ClassDef,
+   Constant as ast_Constant,
+   Expr as ast_Expr,
+   FunctionDef as ast_FunctionDef,
+   If as ast_If,
+   Load as ast_Load,
+   Name as ast_Name,
+   NodeTransformer,
+   Pass as ast_Pass,
+   Store as ast_Store,
+   copy_location,
+   fix_missing_locations,
+   parse as ast_parse,
+   stmt as ast_stmt,
+   unparse as ast_unparse,
+   walk as ast_walk,
+)
+from copy import deepcopy as copy_deepcopy
+from functools import partial
+from html import escape as html_escape
 from inspect import (
+   CO_ASYNC_GENERATOR,
+   CO_COROUTINE,
+   CO_GENERATOR,
    getsourcelines as inspect_getsourcelines,
+   isfunction as inspect_isfunction,
    signature as inspect_signature,
 )
+from json import dump as json_dump
+from keyword import iskeyword as keyword_iskeyword
+from linecache import getlines as linecache_getlines
 from operator import itemgetter
 from os.path import join as path_join
-from time import perf_counter
+from time import (
+   localtime as time_localtime,
+   perf_counter,
+   strftime as time_strftime,
+   time as time_time,
+)
+from tokenize import (
+   COMMENT as tokenize_COMMENT,
+   generate_tokens as tokenize_generate_tokens,
+)
 
+from PySpeedIT.fixtures import (
+   preload_fixtures,
+   resolve_fixtures,
+)
+from PySpeedIT.results import BenchmarkRow
+from PySpeedIT.sample_stats import (
+   get_sample_stats,
+   get_throughput_stats,
+)
+from PySpeedIT.slo import (
+   SLO_MAX_EXTENSIONS,
+   check_slos,
+   evaluate_slos,
+   get_extended_run_sec,
+   get_required_samples,
+)
+from PySpeedIT.svg_plots import (
+   get_svg_box_plot,
+   get_svg_histogram,
+)
+from PySpeedIT.system_state import (
+   enter_stable_mode,
+   exit_stable_mode,
+   get_resource_usage,
+   get_resource_usage_delta,
+   get_system_noise,
+   get_system_state,
+   wait_for_quiet_system,
+)
 from PySpeedIT.utils import (
    Err,
+   JobTimeout,
+   format_throughput,
    format_time,
    get_html_template_css,
+   watchdog,
 )
 
 
+# kinds of declared work units per loop: unit symbol: see: option `benchmarkit__work_units`
+WORK_UNIT_KINDS = {'ops': 'ops', 'bytes': 'B'}
+# throughput ranking: benchmarkit__rank_by: work unit kind
+THROUGHPUT_COMPARE_KEYS = {'ops_per_sec': 'ops', 'bytes_per_sec': 'bytes'}
+
+
 def get_html_table_template():
    """ Returns a html_table_template
 
@@ -68,16 +280,16 @@ def get_html_table_template():
    <table>
       <thead>
       <tr>
-         <th class="head_title" colspan="10"><b>Benchmark-IT module_name: `{head_title_func}`</b>
+         <th class="head_title" colspan="30"><b>Benchmark-IT module_name: `{head_title_func}`</b>
          </th>
       </tr>
       <tr>
-         <th class="head_module_path" colspan="10">
+         <th class="head_module_path" colspan="30">
             <strong>module_path:</strong> {head_module_path}
          </th>
       </tr>
       <tr>
-         <th class="head_module_info" colspan="10">
+         <th class="head_module_info" colspan="30">
             <strong>Number of functions:</strong> {head_module_num_functions}
          </th>
       </tr>
@@ -85,13 +297,13 @@ def get_html_table_template():
          <th class="head_parameter" rowspan="2">
             <strong>Parameters:</strong>
          </th>
-         <th class="head_parameter" colspan="9">
+         <th class="head_parameter" colspan="29">
             <strong>output_max_slashes_fileinfo:</strong> {head_parameter_output_max_slashes_fileinfo} &nbsp;
             <strong>use_func_name:</strong> {head_parameter_use_func_name}
          </th>
       </tr>
       <tr>
-         <th class="head_parameter" colspan="9">
+         <th class="head_parameter" colspan="29">
             <strong>output_in_sec:</strong> {head_parameter_output_in_sec} &nbsp;
             <strong>benchmarkit__output_source:</strong> {head_parameter_benchmarkit__output_source} &nbsp;
             <strong>benchmarkit__with_gc:</strong> {head_parameter_benchmarkit__with_gc} &nbsp;
@@ -99,15 +311,28 @@ def get_html_table_template():
             <strong>benchmarkit__rank_by:</strong> {head_parameter_benchmarkit__rank_by} &nbsp;
             <strong>benchmarkit__run_sec:</strong> {head_parameter_benchmarkit__run_sec} &nbsp;
             <strong>benchmarkit__repeat:</strong> {head_parameter_benchmarkit__repeat} &nbsp;
+            <strong>benchmarkit__engine:</strong> {head_parameter_benchmarkit__engine} &nbsp;
+            <strong>benchmarkit__stable_mode:</strong> {head_parameter_benchmarkit__stable_mode} &nbsp;
+            <strong>benchmarkit__outlier_method:</strong> {head_parameter_benchmarkit__outlier_method} &nbsp;
+            <strong>benchmarkit__reject_outliers:</strong> {head_parameter_benchmarkit__reject_outliers} &nbsp;
+            <strong>job_timeout_sec:</strong> {head_parameter_job_timeout_sec} &nbsp;
+            <strong>benchmarkit__incremental:</strong> {head_parameter_benchmarkit__incremental} &nbsp;
+            <strong>benchmarkit__isolate_jobs:</strong> {head_parameter_benchmarkit__isolate_jobs} &nbsp;
+            <strong>benchmarkit__shared_buffers:</strong> {head_parameter_benchmarkit__shared_buffers} &nbsp;
+            <strong>benchmarkit__work_units:</strong> {head_parameter_benchmarkit__work_units} &nbsp;
+            <strong>benchmarkit__slos:</strong> {head_parameter_benchmarkit__slos} &nbsp;
+            <strong>interpreters:</strong> {head_parameter_benchmarkit__interpreters} &nbsp;
          </th>
       </tr>
       <tr>
-         <th colspan="10">
+         <th colspan="30">
             <br />
          </th>
       </tr>
       <tr class="head">
          <th>name</th>
+         <th>status</th>
+         <th>fresh</th>
          <th>{head_thead_benchmarkit__rank_by}</th>
          <th>compare %</th>
          <th>num. loops</th>
@@ -116,13 +341,33 @@ def get_html_table_template():
          <th>second_best_loop</th>
          <th>worst_loop</th>
          <th>second_worst_loop</th>
+         <th>median_loop</th>
+         <th>outliers</th>
+         <th>avg_loop without outliers</th>
+         <th>worst_loop without outliers</th>
+         <th>rank value</th>
+         <th>ops/sec (95% CI)</th>
+         <th>bytes/sec (95% CI)</th>
+         <th>SLOs</th>
          <th>all_loops time</th>
+         <th>engine</th>
+         <th>call_overhead</th>
+         <th>suspect</th>
+         <th>minor_faults / loop</th>
+         <th>major_faults / loop</th>
+         <th>vol. ctx_switches / loop</th>
+         <th>invol. ctx_switches / loop</th>
+         <th>max_rss</th>
+         <th>io_read bytes / loop</th>
+         <th>io_write bytes / loop</th>
       </tr>
       </thead>
 
       <tfoot>
       <tr class="head">
          <th>name</th>
+         <th>status</th>
+         <th>fresh</th>
          <th>{head_tfoot_benchmarkit__rank_by}</th>
          <th>compare %</th>
          <th>num. loops</th>
@@ -131,7 +376,25 @@ def get_html_table_template():
          <th>second_best_loop</th>
          <th>worst_loop</th>
          <th>second_worst_loop</th>
+         <th>median_loop</th>
+         <th>outliers</th>
+         <th>avg_loop without outliers</th>
+         <th>worst_loop without outliers</th>
+         <th>rank value</th>
+         <th>ops/sec (95% CI)</th>
+         <th>bytes/sec (95% CI)</th>
+         <th>SLOs</th>
          <th>all_loops time</th>
+         <th>engine</th>
+         <th>call_overhead</th>
+         <th>suspect</th>
+         <th>minor_faults / loop</th>
+         <th>major_faults / loop</th>
+         <th>vol. ctx_switches / loop</th>
+         <th>invol. ctx_switches / loop</th>
+         <th>max_rss</th>
+         <th>io_read bytes / loop</th>
+         <th>io_write bytes / loop</th>
       </tr>
       </tfoot>
 
@@ -150,6 +413,8 @@ def get_html_table_row_template():
    return '''
          <tr class="{td_class}">
             <td>{td_name}</td>
+            <td>{td_status}</td>
+            <td>{td_fresh}</td>
             <td>{td_rank}</td>
             <td>{td_compare}</td>
             <td>{td_num_loops}</td>
@@ -158,11 +423,86 @@ def get_html_table_row_template():
             <td>{td_second_best_loop}</td>
             <td>{td_worst_loop}</td>
             <td>{td_second_worst_loop}</td>
+            <td>{td_median_loop}</td>
+            <td>{td_outliers}</td>
+            <td>{td_clean_avg_loop}</td>
+            <td>{td_clean_worst_loop}</td>
+            <td>{td_rank_value}</td>
+            <td>{td_ops_per_sec}</td>
+            <td>{td_bytes_per_sec}</td>
+            <td>{td_slos}</td>
             <td>{td_all_loops_time}</td>
+            <td>{td_engine}</td>
+            <td>{td_call_overhead}</td>
+            <td>{td_suspect}</td>
+            <td>{td_minor_faults}</td>
+            <td>{td_major_faults}</td>
+            <td>{td_voluntary_ctx_switches}</td>
+            <td>{td_involuntary_ctx_switches}</td>
+            <td>{td_max_rss}</td>
+            <td>{td_io_read_bytes}</td>
+            <td>{td_io_write_bytes}</td>
          </tr>
    '''
 
 
+def get_html_memory_budget_table_template():
+   """ Returns a html_memory_budget_table_template: the budget columns are passed in as: head_budget_columns
+
+   :return: (str) html_memory_budget_table_template
+   """
+   return '''
+   <table>
+      <thead>
+      <tr>
+         <th class="head_title" colspan="{head_colspan}"><b>Memory budgets: `{head_title_func}`</b>
+         </th>
+      </tr>
+      <tr>
+         <th class="head_parameter" colspan="{head_colspan}">
+            <strong>benchmarkit__memory_budgets_mb:</strong> {head_parameter_benchmarkit__memory_budgets_mb} &nbsp;
+            <strong>value:</strong> {head_parameter_rank_value} &nbsp;
+            <strong>limits:</strong> RLIMIT_AS, RLIMIT_DATA: of the whole child process address space
+         </th>
+      </tr>
+      <tr class="head">
+         <th>name</th>
+         <th>baseline address space</th>
+         {head_budget_columns}
+         <th>smallest completing budget</th>
+      </tr>
+      </thead>
+
+      <tbody>
+      {body_final_result_rows}
+      </tbody>
+   </table>
+'''
+
+
+def get_html_plots_template():
+   """ Returns a html_plots_template: for the inline SVG plots
+
+   :return: (str) html_plots_template
+   """
+   return '''
+   <table>
+      <tr>
+         <th class="head_parameter">Loop time box plot: all functions</th>
+      </tr>
+      <tr>
+         <td>{body_box_plot}</td>
+      </tr>
+      <tr>
+         <th class="head_parameter">Loop time histograms</th>
+      </tr>
+      <tr>
+         <td>{body_histograms}</td>
+      </tr>
+   </table>
+'''
+
+
 def _helper_get_perf_counter_reference_time():
    """ Returns 2 times the smallest difference of calling perf_counter() immediately after each other a couple of times.
 
@@ -178,6 +518,117 @@ def _helper_get_perf_counter_reference_time():
    return _result_time * 2
 
 
+class _ReturnToBreakTransformer(NodeTransformer):
+   """ Transforms all `return` statements of a function code body into a `break` out of the timed code body.
+
+   The timed code body is wrapped in a `while True: ... break` block:
+
+      - ``return value`` becomes: ``_speedit_prefix__return_value = value`` followed by a `break`: so the return value
+        is still evaluated
+      - a `return` inside a loop sets additionally: ``_speedit_prefix__returned = True`` and every loop which contains such
+        a `return` is followed by: ``if _speedit_prefix__returned: break``
+
+   Nested functions, lambdas and classes are not transformed.
+   """
+
+   def __init__(self):
+      """ Constructor.
+      """
+      NodeTransformer.__init__(self)
+      self.loop_depth = 0
+      self.num_loop_returns = 0
+
+   def visit_stmts(self, stmts):
+      """ Returns the transformed list of statements
+
+      :param stmts: (list) of ast statement nodes
+      :return: (list) of ast statement nodes
+      """
+      new_stmts = []
+      for stmt in stmts:
+         result = self.visit(stmt)
+         if isinstance(result, list):
+            new_stmts.extend(result)
+         else:
+            new_stmts.append(result)
+      return new_stmts
+
+   def visit_FunctionDef(self, node):
+      """ Do not transform nested functions """
+      return node
+
+   visit_AsyncFunctionDef = visit_FunctionDef
+   visit_ClassDef = visit_FunctionDef
+   visit_Lambda = visit_FunctionDef
+
+   def visit_Return(self, node):
+      """ Returns the replacement statements for a `return` """
+      new_stmts = []
+      if node.value is not None:
+         new_stmts.append(copy_location(
+            ast_Assign(targets=[ast_Name(id='_speedit_prefix__return_value', ctx=ast_Store())], value=node.value),
+            node
+         ))
+      if self.loop_depth:
+         self.num_loop_returns += 1
+         new_stmts.append(copy_location(
+            ast_Assign(targets=[ast_Name(id='_speedit_prefix__returned', ctx=ast_Store())], value=ast_Constant(value=True)),
+            node
+         ))
+      new_stmts.append(copy_location(ast_Break(), node))
+      return new_stmts
+
+   def visit_loop(self, node):
+      """ Transforms a `for`, `async for` or `while` loop """
+      num_loop_returns_before = self.num_loop_returns
+      self.loop_depth += 1
+      node.body = self.visit_stmts(node.body)
+      self.loop_depth -= 1
+      # a break in the `else` block breaks out of the enclosing loop
+      node.orelse = self.visit_stmts(node.orelse)
+      if self.num_loop_returns == num_loop_returns_before:
+         return node
+      check_returned = copy_location(
+         ast_If(test=ast_Name(id='_speedit_prefix__returned', ctx=ast_Load()), body=[ast_Break()], orelse=[]),
+         node
+      )
+      return [node, check_returned]
+
+   visit_For = visit_loop
+   visit_AsyncFor = visit_loop
+   visit_While = visit_loop
+
+   def generic_visit(self, node):
+      """ Visits all statement lists of compound statements (if, with, try, match ...) """
+      for field in ('body', 'orelse', 'finalbody', 'handlers', 'cases'):
+         value = getattr(node, field, None)
+         if not value:
+            continue
+         if field in ('handlers', 'cases'):
+            for sub_node in value:
+               sub_node.body = self.visit_stmts(sub_node.body)
+         else:
+            setattr(node, field, self.visit_stmts(value))
+      return node
+
+
+def _helper_set_location(nodes, lineno):
+   """ Sets for all nodes (inclusive all child nodes) the location to: `lineno`
+
+   :param nodes: (list) of ast nodes
+   :param lineno: (int) line number
+   :return: (list) nodes
+   """
+   for node in nodes:
+      for sub_node in ast_walk(node):
+         if 'lineno' in sub_node._attributes:
+            sub_node.lineno = lineno
+            sub_node.end_lineno = lineno
+            sub_node.col_offset = 0
+            sub_node.end_col_offset = 0
+   return nodes
+
+
 class _TimeIT(object):
    """ Class for timing execution speed of function code.
 
@@ -188,22 +639,12 @@ class _TimeIT(object):
 
    This avoids calling into the function itself
 
-   :param func: (function)
-
-      .. warning:: the `func` function may not have any return statements: but any inner function can have one
-
-      OK
+   The `func code block` is taken from the parsed module source code (python's `ast`): therefore any formatting is
+   supported: e.g. decorators, docstrings, single-line bodies, any indentation.
 
-      .. code-block:: python3
-
-         def example_formal_func_inner(data_):
-            shuffle(data_)
-            def fn_inner(x):
-               return x[1]
-            result = sorted(data_.items(), key=fn_inner)
-            del result
-
-      NOT OK
+      - the original line numbers are kept: tracebacks point to the original source lines
+      - `return` statements are transformed into a `break` out of the timed `func code block`:
+         see: _ReturnToBreakTransformer
 
       .. code-block:: python3
 
@@ -212,10 +653,17 @@ class _TimeIT(object):
             result = sorted(data_.items(), key=itemgetter(1))
             return result
 
+   :param func: (function) a python function with available source code
    :param orig_func_name: (str)
    :param module_globals: globals of the module where the function is defined in (e.g.: loaded_module.__dict__)
    :param args_list: (list) positional arguments for the function
    :param kwargs_dict: (dict) any keyword arguments for the function
+
+      - arguments are bound like in a normal call: default arguments do not need to be passed on
+      - each loop gets a fresh deep copy of the mutable arguments: copied outside the timed code: a function which
+        mutates its input is not timed on the input of the previous loop: immutable arguments and arguments which can
+        not be deep copied (e.g. `memoryview`) are passed on by reference
+
    :param check_too_fast: (bool) if True and a code block is timed faster than a `Reference-Time` an Exception is raised.
 
       - Reference-Time: the smallest difference of calling perf_counter() immediately after each other a couple of times
@@ -243,15 +691,21 @@ class _TimeIT(object):
       self.perf_counter_reference_time = perf_counter_reference_time
       if callable(self.func):
          _ns = {}
-         self.src = self.__get_final_inner_function()
          if self.run_sec != -1 and self.run_sec < 0.1:
             raise Err('_TimeIT.__init__', [
                '''run_sec: <{:.1f}> must be at least <0.1 second> or <-1 to run it once> or <None prints `func code block`>
                '''.format(self.run_sec)
             ])
+         self.arguments = self.__get_bound_arguments()
+         self.copied_params = self.__get_copied_params()
+         final_inner_module = self.__get_final_inner_module()
+         self.src = '# orig function name: {}  file: {}\n\n{}\n'.format(
+            self.orig_func_name,
+            self.func.__code__.co_filename,
+            ast_unparse(final_inner_module)
+         )
 
-         _code = compile(self.src, 'benchmarkit-src', "exec")
-         # exec(_code, globals(), _ns)
+         _code = compile(final_inner_module, self.func.__code__.co_filename, "exec")
          exec(_code, module_globals, _ns)
 
          self.inner = _ns["inner"]
@@ -284,12 +738,21 @@ class _TimeIT(object):
             if there where only a very low number of loops - one might want to increase the `run_sec` and rerun it
          - two_best_loop_sec: time in seconds for the two fastest of all loops
          - two_worst_loop_sec: time in seconds for the two slowest of all loops
+         - samples: (array of doubles) time in seconds of each loop: also kept in: `self.samples`
+           see: get_partial_result()
+         - resource counters per loop: see: :py:func:`PySpeedIT.system_state.get_resource_usage_delta`
+           sampled once before/after all loops
       """
+      self.samples = array('d')
       if with_gc:
          gc_old = gc_isenabled()
          gc_enable()
          try:
-            benchmark_result = self.inner()
+            usage_before = get_resource_usage()
+            benchmark_result = self.inner(self.arguments, self.samples)
+            benchmark_result.update(
+               get_resource_usage_delta(usage_before, get_resource_usage(), benchmark_result['loops'])
+            )
             benchmark_result['name'] = self.name
          finally:
             if not gc_old:
@@ -298,211 +761,545 @@ class _TimeIT(object):
          gc_old = gc_isenabled()
          gc_disable()
          try:
-            benchmark_result = self.inner()
+            usage_before = get_resource_usage()
+            benchmark_result = self.inner(self.arguments, self.samples)
+            benchmark_result.update(
+               get_resource_usage_delta(usage_before, get_resource_usage(), benchmark_result['loops'])
+            )
             benchmark_result['name'] = self.name
          finally:
             if gc_old:
                gc_enable()
       return benchmark_result
 
-   # noinspection PyPep8
-   def __get_final_inner_function(self):
-      """ Returns a string of an generated inner function with the code body from: func
+   def get_partial_result(self, elapsed_sec):
+      """ Returns the result of an interrupted benchmark_it(): e.g. by the `job_timeout_sec` watchdog
+
+      :param elapsed_sec: (float) wall-clock time in seconds until the interruption
+      :return: (dict) see: _helper_get_partial_benchmark_result()
+      """
+      return _helper_get_partial_benchmark_result(self.samples, 1, elapsed_sec, 'code', self.name)
 
-      Tries to generate a new function with the 'code-body' from the `self.func`
-      as well as the `self.args_list` and `self.kwargs_dict`
+   def __get_bound_arguments(self):
+      """ Returns the arguments bound to the function parameters: inclusive any default arguments
 
-      :return: (str) generated inner function)
-      :raise Err: example if an indentation is encountered which is not a multiple of the first found indentation
+      :return: (OrderedDict) parameter name: argument
+      :raise Err: if the arguments can not be bound to the function parameters
       """
-      has_block_speedit = False
-      _start_block_stripped_line = ''
-      start_tag_block_speedit = 0
-      end_tag_block_speedit = 0
-
-      func_line, l_num = inspect_getsourcelines(self.func)
-      sig = inspect_signature(self.func)
-      indent_ = None
-      func_def_indent = len(func_line[0]) - len(func_line[0].lstrip())
-      func_body = func_line[1:]
-      search_docstring = False
-
-      # PREPARE: remove docstring and get final indentation
-      first_none_docstring_idx = 0
-      for idx, line_orig in enumerate(func_body):
-         rstripped_line = line_orig.rstrip()
-         if rstripped_line:
-            stripped_codeline = rstripped_line.lstrip()
-            if stripped_codeline[0] == '#':  # remove comment lines
-               if not ('::SPEEDIT::' in stripped_codeline or '**SPEEDIT**' in stripped_codeline):
-                  continue
-            if search_docstring:
-               if stripped_codeline[0:3] == '"""' or stripped_codeline[0:3] == "'''":
-                  search_docstring = False
-               continue
-            else:
-               codebody_indent = len(rstripped_line) - len(stripped_codeline)
-               indent_ = codebody_indent - func_def_indent
-               # Check if we have a docstring
-               if stripped_codeline[0:3] == '"""' or stripped_codeline[0:3] == "'''":
-                  search_docstring = True
-                  continue
-            first_none_docstring_idx = idx
+      try:
+         bound_arguments = inspect_signature(self.func).bind(*self.args_list, **self.kwargs_dict)
+      except TypeError as err:
+         raise Err('_TimeIT.__get_bound_arguments', [
+            'orig_func_name: <{}>'.format(self.orig_func_name),
+            '  ARGUMENTS ERROR: the arguments can not be bound to the function parameters',
+            '    list_of_positional_arguments: <{}>'.format(self.args_list),
+            '     dictionary_of_keyword_arguments: <{}>'.format(self.kwargs_dict),
+            '       TypeError: <{}>'.format(err),
+         ])
+      bound_arguments.apply_defaults()
+      return bound_arguments.arguments
+
+   def __get_copied_params(self):
+      """ Returns the names of the parameters whose argument is deep copied per loop
+
+      Immutable arguments: deepcopy() returns the argument itself: and arguments which can not be deep copied are passed
+      on by reference
+
+      :return: (set) parameter names
+      """
+      copied_params = set()
+      for param, argument in self.arguments.items():
+         try:
+            if copy_deepcopy(argument) is not argument:
+               copied_params.add(param)
+         except Exception:
+            continue
+      return copied_params
+
+   def __get_func_node(self):
+      """ Returns the ast node of `self.func` and the module source lines
+
+      :return: (tuple) func_node, source_lines
+      :raise Err: if the function can not be found in the module source code
+      """
+      code = self.func.__code__
+      if code.co_flags & (CO_GENERATOR | CO_COROUTINE | CO_ASYNC_GENERATOR):
+         raise Err('_TimeIT.__get_func_node', [
+            '<{}>: ERROR: generator or coroutine functions are not supported by the Benchmark-IT `code` engine'.format(
+               self.orig_func_name),
+            '  use: benchmarkit__engine: <call>',
+         ])
+      source_lines = linecache_getlines(code.co_filename)
+      if not source_lines:
+         raise Err('_TimeIT.__get_func_node', [
+            '<{}>: ERROR: could not get the source code: <{}>'.format(self.orig_func_name, code.co_filename),
+            '  use: benchmarkit__engine: <call>',
+         ])
+      for node in ast_walk(ast_parse(''.join(source_lines), code.co_filename)):
+         if isinstance(node, ast_FunctionDef) and node.name == code.co_name:
+            if node.lineno == code.co_firstlineno or (
+                     node.decorator_list and node.decorator_list[0].lineno == code.co_firstlineno):
+               return node, source_lines
+      raise Err('_TimeIT.__get_func_node', [
+         '<{}>: ERROR: could not find the function definition in: <{}>'.format(self.orig_func_name, code.co_filename),
+         '  co_firstlineno: <{}>'.format(code.co_firstlineno),
+         '  use: benchmarkit__engine: <call>',
+      ])
+
+   def __get_check_too_fast_nodes(self, tag_lineno, lineno):
+      """ Returns the `check_too_fast` ast nodes
+
+      :param tag_lineno: (int or None) line number of the START-TAG
+      :param lineno: (int) line number used for the nodes
+      :return: (list) of ast nodes
+      """
+      if not self.check_too_fast:
+         return []
+      if tag_lineno is None:
+         block_info = ''
+      else:
+         block_info = '\n    START-TAG line: <{}>'.format(tag_lineno)
+      message = (
+         'in function: <{}> code block: too fast to measure:\n   code part: _speedit_prefix__result_time: <{{:.11f}}>  '
+         '2 times _smallest_perf_counter_time: <{{:.11f}}>{}'.format(self.orig_func_name, block_info)
+      )
+      return _helper_set_location(ast_parse(
+         'if _speedit_prefix__result_time < _speedit_prefix__check_reference_time: raise Exception({!r}.format('
+         '_speedit_prefix__result_time, _speedit_prefix__check_reference_time))'.format(message)
+      ).body, lineno)
+
+   def __insert_speedit_tags(self, func_node, func_body, source_lines):
+      """ Inserts the timing statements for any START/END TAG comment lines: in place
+
+      The code block of a TAG is found by the indentation of the TAG comment line.
+
+      :param func_node: (obj) ast node of the function
+      :param func_body: (list) ast statement nodes of the function code body (without docstring)
+      :param source_lines: (list) module source lines
+      :return: (bool) True if any TAG was found
+      :raise Err: for wrong TAG order or a TAG not matching the indentation of any code block
+      """
+      tags = []
+      for token in tokenize_generate_tokens(iter(source_lines).__next__):
+         if token.start[0] < func_node.lineno:
+            continue
+         if token.start[0] > func_node.end_lineno:
             break
+         if token.type == tokenize_COMMENT and ('::SPEEDIT::' in token.string or '**SPEEDIT**' in token.string):
+            tags.append((token.start[0], token.start[1], '::SPEEDIT::' in token.string))
+      if not tags:
+         return False
+
+      # all statements (without nested functions/classes) with its statement list and all block boundary lines
+      all_stmts = []
+      boundaries = {}
+
+      def collect_stmts(stmts):
+         """ collect statements and boundaries """
+         for stmt_ in stmts:
+            all_stmts.append((stmt_, stmts))
+            boundaries[stmt_.lineno] = stmt_.col_offset
+            if isinstance(stmt_, (ast_FunctionDef, ast_AsyncFunctionDef, ast_ClassDef)):
+               continue
+            for field in ('body', 'orelse', 'finalbody'):
+               sub_stmts = getattr(stmt_, field, None)
+               if sub_stmts and isinstance(sub_stmts[0], ast_stmt):
+                  collect_stmts(sub_stmts)
+            for sub_node in getattr(stmt_, 'handlers', []) + getattr(stmt_, 'cases', []):
+               boundary_node = getattr(sub_node, 'pattern', sub_node)
+               boundaries[boundary_node.lineno] = boundary_node.col_offset
+               collect_stmts(sub_node.body)
+
+      collect_stmts(func_body)
+      for lineno in range(func_node.lineno, func_node.end_lineno + 1):
+         stripped_line = source_lines[lineno - 1].lstrip()
+         if stripped_line.startswith(('else', 'finally')) and stripped_line.split(':')[0].strip() in ('else', 'finally'):
+            boundaries[lineno] = len(source_lines[lineno - 1]) - len(stripped_line)
+
+      def has_dedent(start_lineno, end_lineno, col):
+         """ True if any block boundary between start_lineno and end_lineno has a smaller indentation """
+         return any(
+            start_lineno < lineno_ < end_lineno and col_ < col for lineno_, col_ in boundaries.items()
+         )
+
+      block_open = False
+      start_tag_lineno = None
+      for tag_lineno, tag_col, is_start_tag in tags:
+         if is_start_tag and block_open:
+            raise Err('_TimeIT.__insert_speedit_tags', [
+               '<{}>: FUNCTION INNER TAG ERROR:'.format(self.orig_func_name),
+               '  Expected an END-TAG <**SPEEDIT**>: line: <{}>'.format(tag_lineno),
+               ' {}'.format(source_lines[tag_lineno - 1])
+            ])
+         if not is_start_tag and not block_open:
+            raise Err('_TimeIT.__insert_speedit_tags', [
+               '<{}>: FUNCTION INNER TAG ERROR:'.format(self.orig_func_name),
+               '  Expected an START-TAG <::SPEEDIT::>: line: <{}>'.format(tag_lineno),
+               ' {}'.format(source_lines[tag_lineno - 1])
+            ])
+
+         if is_start_tag:
+            tag_nodes = _helper_set_location(ast_parse(
+               '_speedit_prefix__block_open = True\n'
+               '_speedit_prefix__stmt_inner_start = _speedit_prefix__perf_counter()'
+            ).body, tag_lineno)
+            start_tag_lineno = tag_lineno
+         else:
+            tag_nodes = _helper_set_location(ast_parse(
+               '_speedit_prefix__result_time += _speedit_prefix__perf_counter() - _speedit_prefix__stmt_inner_start\n'
+               '_speedit_prefix__block_open = False'
+            ).body, tag_lineno)
+            tag_nodes.extend(self.__get_check_too_fast_nodes(start_tag_lineno, tag_lineno))
+         block_open = is_start_tag
+
+         before_stmt = None
+         after_stmt = None
+         for stmt_, stmts in all_stmts:
+            if stmt_.col_offset != tag_col:
+               continue
+            if stmt_.end_lineno < tag_lineno and (before_stmt is None or stmt_.end_lineno > before_stmt[0].end_lineno):
+               before_stmt = (stmt_, stmts)
+            elif stmt_.lineno > tag_lineno and (after_stmt is None or stmt_.lineno < after_stmt[0].lineno):
+               after_stmt = (stmt_, stmts)
+
+         if before_stmt and not has_dedent(before_stmt[0].end_lineno, tag_lineno, tag_col):
+            stmts = before_stmt[1]
+            idx = stmts.index(before_stmt[0]) + 1
+         elif after_stmt and not has_dedent(tag_lineno, after_stmt[0].lineno, tag_col):
+            stmts = after_stmt[1]
+            idx = stmts.index(after_stmt[0])
+         else:
+            raise Err('_TimeIT.__insert_speedit_tags', [
+               '<{}>: FUNCTION INNER TAG ERROR: the TAG indentation does not match any code block'.format(
+                  self.orig_func_name),
+               '  line: <{}>'.format(tag_lineno),
+               ' {}'.format(source_lines[tag_lineno - 1])
+            ])
+         stmts[idx:idx] = tag_nodes
+      return True
+
+   def __get_final_inner_module(self):
+      """ Returns an ast module of an generated inner function with the code body from: func
+
+      Generates a new function with the 'code-body' from the `self.func` as well as the bound `self.arguments`
+
+      :return: (obj) ast module with the generated inner function
+      :raise Err: example for wrong START/END TAGs
+      """
+      func_node, source_lines = self.__get_func_node()
+      lineno = func_node.lineno
+
+      func_body = func_node.body
+      first_stmt = func_body[0]
+      if isinstance(first_stmt, ast_Expr) and isinstance(first_stmt.value, ast_Constant) and isinstance(
+            first_stmt.value.value, str):
+         # remove docstring
+         func_body = func_body[1:] or [copy_location(ast_Pass(), first_stmt)]
+
+      has_block_speedit = self.__insert_speedit_tags(func_node, func_body, source_lines)
+
+      return_transformer = _ReturnToBreakTransformer()
+      func_body = return_transformer.visit_stmts(func_body)
+      has_loop_returns = return_transformer.num_loop_returns > 0
+
+      # the arguments: bound once before the loop: assigned per loop: mutable ones as a fresh copy before the timing
+      prebind_arguments_lines = []
+      arguments_lines = []
+      for param in self.arguments:
+         prebind_arguments_lines.append('   _speedit_prefix__arg__{0} = _speedit_prefix__arguments[{0!r}]'.format(param))
+         if param in self.copied_params:
+            arguments_lines.append('      {0} = _speedit_prefix__deepcopy(_speedit_prefix__arg__{0})'.format(param))
+         else:
+            arguments_lines.append('      {0} = _speedit_prefix__arg__{0}'.format(param))
 
-      # do the func code body
-      adjusted_func_code_line = []
-      for line_orig in func_body[first_none_docstring_idx:]:
-         # remove empty
-         if line_orig:
-            # get indentation check it is a multiple of indent_
-            rstrip_line = line_orig.rstrip()
-            if rstrip_line:
-               stripped_line = rstrip_line.lstrip()
-               if stripped_line[0] == '#':  # remove comment lines: keep any with  ::SPEEDIT::
-                  if '::SPEEDIT::' in stripped_line or '**SPEEDIT**' in stripped_line:
-                     has_block_speedit = True
-                  else:
-                     continue
-               line_indentation = len(rstrip_line) - len(stripped_line)
-               if line_indentation % indent_ != 0:
-                  raise Err('_TimeIT.get_final_inner_function', [
-                     '<{}>: ERROR: indentation must be a multiple of the second function line: <{}>'.format(
-                        self.orig_func_name,
-                        indent_
-                     ),
-                     '  seems we encountered a wrong indented line: line_indentation: <{}>'.format(line_indentation),
-                     '    {}'.format(line_orig)
-                  ])
-               line_indentation_level = int((line_indentation - func_def_indent) / indent_) + 1  # need one extra level
-
-               if has_block_speedit:
-                  if '::SPEEDIT::' in stripped_line:
-                     if start_tag_block_speedit != end_tag_block_speedit:
-                        # expected END Tag
-                        raise Err('_TimeIT.get_final_inner_function', [
-                           '<{}>: FUNCTION INNER TAG ERROR: has_block_speedit: <{}>'.format(
-                              self.orig_func_name,
-                              has_block_speedit
-                           ),
-                           '  Expected an END-TAG <**SPEEDIT**>: '
-                           ' {}'.format(line_orig)
-                        ])
-                     adjusted_func_code_line.append(
-                        ('   ' * line_indentation_level) + '_speedit_prefix__stmt_inner_start = _speedit_prefix__perf_counter()  # ::SPEEDIT::START internally added'
-                     )
-                     start_tag_block_speedit += 1
-                     _start_block_stripped_line = stripped_line
-                  elif '**SPEEDIT**' in stripped_line:
-                     if end_tag_block_speedit != start_tag_block_speedit - 1:
-                        # expected START TAG
-                        raise Err('_TimeIT.get_final_inner_function', [
-                           '<{}>: FUNCTION INNER TAG ERROR: has_block_speedit: <{}>'.format(
-                              self.orig_func_name,
-                              has_block_speedit),
-                           '  Expected an START-TAG <::SPEEDIT::>:',
-                           ' {}'.format(line_orig)
-                        ])
-                     # Do this inner result
-                     adjusted_func_code_line.append((
-                                                    '   ' * line_indentation_level) + '_speedit_prefix__result_time += _speedit_prefix__perf_counter() - _speedit_prefix__stmt_inner_start  # **SPEEDIT**END internally added')
-                     if self.check_too_fast:
-                        adjusted_func_code_line.append(
-                           ('   ' * line_indentation_level) + 'if _speedit_prefix__result_time < _speedit_prefix__check_reference_time: raise Exception("in function: <{}>'.format(
-                           self.orig_func_name) + ' code block: too fast to measure:\\n   code part: _speedit_prefix__result_time: <{:.11f}>  2 times _smallest_perf_counter_time: <{:.11f}>\\n  ' + '  _start_block_stripped_line: <{}>'.format(
-                           _start_block_stripped_line) + '".format(_speedit_prefix__result_time, _speedit_prefix__check_reference_time))  # SPEEDIT: internally added')
-                     end_tag_block_speedit += 1
-                  else:
-                     adjusted_func_code_line.append(('   ' * line_indentation_level) + stripped_line)
-               else:
-                  adjusted_func_code_line.append(('   ' * line_indentation_level) + stripped_line)
-
-      # CHECK: LAST END TAG
-      # e.g. if a function body ends with an END-TAG this is not returned by: inspect.getsourcelines(self.func)
+      final_inner_function_lines = [
+         'def inner(_speedit_prefix__arguments, _speedit_prefix__samples):',
+         '   from copy import deepcopy as _speedit_prefix__deepcopy',
+         '   from time import perf_counter as _speedit_prefix__perf_counter',
+         '   _speedit_prefix__run_sec = {}'.format(self.run_sec),
+         '   _speedit_prefix__check_reference_time = {}'.format(self.perf_counter_reference_time),
+      ]
+      final_inner_function_lines.extend(prebind_arguments_lines)
+      final_inner_function_lines.extend([
+         '   _speedit_prefix__loops = 0',
+         '   _speedit_prefix__all_loops_time_sec = 0.0',
+         '   _speedit_prefix__avg_loop_sec = 0.0',
+         '   _speedit_prefix__best_loop_sec = 99999999999.0',
+         '   _speedit_prefix__second_best_loop_sec = 99999999999.0',
+         '   _speedit_prefix__worst_loop_sec = 0.0',
+         '   _speedit_prefix__second_worst_loop_sec = 0.0',
+         '   _speedit_prefix__samples_append = _speedit_prefix__samples.append',
+         '   if _speedit_prefix__run_sec == -1:',
+         '      _speedit_prefix__run_once = True',
+         '   else:',
+         '      _speedit_prefix__run_once = False',
+         '   _speedit_prefix__main_start_time = _speedit_prefix__perf_counter()',
+         '   while True:',
+         '      _speedit_prefix__loops += 1',
+         '      _speedit_prefix__result_time = 0',
+      ])
+      final_inner_function_lines.extend(arguments_lines)
+      if has_loop_returns:
+         final_inner_function_lines.append('      _speedit_prefix__returned = False')
       if has_block_speedit:
-         if start_tag_block_speedit != end_tag_block_speedit:
-            # Do the last inner result: ADDING an END-TAG
-            adjusted_func_code_line.append(
-               '      _speedit_prefix__result_time += _speedit_prefix__perf_counter() - _speedit_prefix__stmt_inner_start  # **SPEEDIT**END internally added')
-            if self.check_too_fast:
-               adjusted_func_code_line.append(
-                  '      if _speedit_prefix__result_time < _speedit_prefix__check_reference_time: raise Exception("in function: <{}>'.format(
-                     self.orig_func_name) + ' code block: too fast to measure:\\n   code part: _speedit_prefix__result_time: <{:.11f}>  2 times _smallest_perf_counter_time: <{:.11f}>\\n  ' + '  _start_block_stripped_line: <{}>'.format(
-                     _start_block_stripped_line) + '".format(_speedit_prefix__result_time, _speedit_prefix__check_reference_time))  # SPEEDIT: internally added')
-
-      # add the normal perf_counter time lines
+         final_inner_function_lines.append('      _speedit_prefix__block_open = False')
       else:
-         adjusted_func_code_line.insert(
-            0,
-            '      _speedit_prefix__stmt_inner_start = _speedit_prefix__perf_counter()  # ::SPEEDIT::START internally added'
-         )
-         adjusted_func_code_line.append(
-            '      _speedit_prefix__result_time += _speedit_prefix__perf_counter() - _speedit_prefix__stmt_inner_start  # **SPEEDIT**END internally added')
-
-         if self.check_too_fast:
-            adjusted_func_code_line.append(
-               '      if _speedit_prefix__result_time < _speedit_prefix__check_reference_time: raise Exception("in function: <{}>'.format(
-                  self.orig_func_name) + ' code block: too fast to measure:\\n   code part: _speedit_prefix__result_time: <{:.11f}>  2 times _smallest_perf_counter_time: <{:.11f}>".format(_speedit_prefix__result_time, _speedit_prefix__check_reference_time))  # SPEEDIT: internally added')
-
-      # Do the arguments
-      final_param_line = []
-      for param, value in sig.parameters.items():
-         if value.kind == value.POSITIONAL_OR_KEYWORD:
-            # check if we have a keyword
-            if param in self.kwargs_dict:
-               value_to_set = self.kwargs_dict.pop(param)
-            else:  # use any positional
-               if not self.args_list:
-                  raise Err('_TimeIT.__get_final_inner_function', [
-                     'orig_func_name: <{}>'.format(self.orig_func_name),
-                     '  POSITIONAL_OR_KEYWORD ERROR: seems no such keyword nor enough positional arguments are supplied',
-                     '   param: <{}>'.format(param),
-                     '    list_of_positional_arguments: <{}>'.format(self.args_list),
-                     '     dictionary_of_keyword_arguments: <{}>'.format(self.kwargs_dict),
-                  ])
-               value_to_set = self.args_list.pop(0)
-            if isinstance(value_to_set, str):
-               parameter_line = '{} = "{}"'.format(param, value_to_set)
-            else:
-               parameter_line = '{} = {}'.format(param, value_to_set)
-            final_param_line.append(('   ' * 2) + parameter_line)
-         elif value.kind == value.POSITIONAL_ONLY:
-            value_to_set = self.args_list.pop(0)
-            if isinstance(value_to_set, str):
-               parameter_line = '{} = "{}"'.format(param, value_to_set)
-            else:
-               parameter_line = '{} = {}'.format(param, value_to_set)
-            final_param_line.append(('   ' * 2) + parameter_line)
-            # TODO: From docs: 3.4 Python has no explicit syntax for defining positional-only parameters, but many built-in and extension module functions (especially those that accept only one or two parameters) accept them.
-            raise Err('_TimeIT.get_final_inner_function()', [
-               'orig_func_name: <{}>'.format(self.orig_func_name),
-               '  POSITIONAL_ONLY !! not sure what to do .. check in future if needed:',
-               '   param: <{}> value.kind: <{}>'.format(param, value.kind)
+         final_inner_function_lines.append('      _speedit_prefix__stmt_inner_start = _speedit_prefix__perf_counter()')
+      final_inner_function_lines.extend([
+         '      while True:',
+         '         _speedit_prefix__FUNC_CODE_BLOCK',
+         '         break',
+      ])
+      if has_block_speedit:
+         # a missing last END-TAG or a `return` within a TAG block
+         final_inner_function_lines.extend([
+            '      if _speedit_prefix__block_open:',
+            '         _speedit_prefix__result_time += _speedit_prefix__perf_counter() - _speedit_prefix__stmt_inner_start',
+            '         _speedit_prefix__CHECK_TOO_FAST',
+         ])
+      else:
+         final_inner_function_lines.extend([
+            '      _speedit_prefix__result_time += _speedit_prefix__perf_counter() - _speedit_prefix__stmt_inner_start',
+            '      _speedit_prefix__CHECK_TOO_FAST',
+         ])
+      final_inner_function_lines.extend([
+         '      _speedit_prefix__all_loops_time_sec += _speedit_prefix__result_time',
+         '      _speedit_prefix__samples_append(_speedit_prefix__result_time)',
+         '      if _speedit_prefix__result_time <= _speedit_prefix__best_loop_sec:',
+         '         _speedit_prefix__second_best_loop_sec = _speedit_prefix__best_loop_sec',
+         '         _speedit_prefix__best_loop_sec = _speedit_prefix__result_time',
+         '      if _speedit_prefix__result_time >= _speedit_prefix__worst_loop_sec:',
+         '         _speedit_prefix__second_worst_loop_sec = _speedit_prefix__worst_loop_sec',
+         '         _speedit_prefix__worst_loop_sec = _speedit_prefix__result_time',
+         '      if _speedit_prefix__run_once:',
+         '         break',
+         '      # check if we have to get out',
+         '      if _speedit_prefix__perf_counter() - _speedit_prefix__main_start_time >= _speedit_prefix__run_sec:',
+         '         break',
+         '   _speedit_prefix__avg_loop_sec = _speedit_prefix__all_loops_time_sec / _speedit_prefix__loops',
+         '   if _speedit_prefix__second_best_loop_sec == 99999999999.0:',
+         '      _speedit_prefix__second_best_loop_sec = -1.0',
+         '   if _speedit_prefix__second_worst_loop_sec == 0.0:',
+         '      _speedit_prefix__second_worst_loop_sec = -1.0',
+         '   return {',
+         '      "loops": _speedit_prefix__loops,',
+         '      "all_loops_time_sec": _speedit_prefix__all_loops_time_sec,',
+         '      "avg_loop_sec": _speedit_prefix__avg_loop_sec,',
+         '      "best_loop_sec": _speedit_prefix__best_loop_sec,',
+         '      "second_best_loop_sec": _speedit_prefix__second_best_loop_sec,',
+         '      "worst_loop_sec": _speedit_prefix__worst_loop_sec,',
+         '      "second_worst_loop_sec": _speedit_prefix__second_worst_loop_sec,',
+         '      "engine": "code",',
+         '      "call_overhead_sec": -1.0,',
+         '      "samples": _speedit_prefix__samples',
+         '   }',
+      ])
+      final_inner_module = ast_parse('\n'.join(final_inner_function_lines))
+      # the generated code gets the line number of the original function definition
+      _helper_set_location(final_inner_module.body, lineno)
+
+      # replace the placeholders
+      for node in ast_walk(final_inner_module):
+         for field in ('body', 'orelse'):
+            stmts = getattr(node, field, None)
+            if not stmts or not isinstance(stmts, list):
+               continue
+            for idx, stmt_ in enumerate(stmts):
+               if isinstance(stmt_, ast_Expr) and isinstance(stmt_.value, ast_Name):
+                  if stmt_.value.id == '_speedit_prefix__FUNC_CODE_BLOCK':
+                     stmts[idx:idx + 1] = func_body
+                     break
+                  elif stmt_.value.id == '_speedit_prefix__CHECK_TOO_FAST':
+                     stmts[idx:idx + 1] = self.__get_check_too_fast_nodes(None, lineno) or [ast_Pass()]
+                     break
+      return fix_missing_locations(final_inner_module)
+
+
+class _CallTimeIT(object):
+   """ Class for timing execution speed of a callable by calling it.
+
+   This is the Benchmark-IT `call` engine: it does not need any source code and can therefore be used for: builtins,
+   C extension functions, Cython compiled functions, bound methods, `functools.partial` objects, lambdas and anything
+   build dynamically.
+
+   A generated tight loop calls the prebound callable with its bound arguments `number` times per loop:
+   the `number` is calibrated once so that one loop takes at least: `_CALL_MIN_LOOP_TIME_FACTOR` times the
+   `Reference-Time`. All reported loop times are per call.
+
+   The call overhead (the generated loop calling an empty python function with the same call signature) is measured
+   separately with its own calibrated `number` and reported as: `call_overhead_sec`: it is NOT subtracted from the
+   loop times. The `check_too_fast` check is only applied to the measured loops of the callable.
+
+   :param func: (callable)
+   :param orig_func_name: (str)
+   :param args_list: (list) positional arguments for the callable
+   :param kwargs_dict: (dict) any keyword arguments for the callable
+   :param check_too_fast: (bool) if True and a loop is timed faster than a `Reference-Time` an Exception is raised.
+
+      .. seealso:: _helper_get_perf_counter_reference_time()
+
+   :param run_sec: (float or -1) seconds the callable will be called (looped over)
+
+         - if run_sec is -1: then the callable is only called once
+
+   :param name: (str) the name used for the output `name` part
+   :param perf_counter_reference_time: (float) passed on see: _helper_get_perf_counter_reference_time()
+   :param per_call_samples: (bool) if True: the `number` is not calibrated: each loop is a single call: e.g. for the
+      SLO percentiles: an average over many calls hides the slow calls of the tail
+   """
+   _CALL_MIN_LOOP_TIME_FACTOR = 1000
+
+   def __init__(self, func, orig_func_name, args_list, kwargs_dict, check_too_fast, run_sec, name,
+                perf_counter_reference_time, per_call_samples=False):
+      """ Constructor.
+      """
+      self.func = func
+      self.orig_func_name = orig_func_name
+      self.args_list = list(args_list)
+      self.kwargs_dict = kwargs_dict.copy()
+      self.check_too_fast = check_too_fast
+      self.run_sec = run_sec
+      self.name = name
+      self.perf_counter_reference_time = perf_counter_reference_time
+      self.per_call_samples = per_call_samples
+      self.samples = array('d')
+      self.number = 0
+      if callable(self.func):
+         if self.run_sec != -1 and self.run_sec < 0.1:
+            raise Err('_CallTimeIT.__init__', [
+               '''run_sec: <{:.1f}> must be at least <0.1 second> or <-1 to run it once>
+               '''.format(self.run_sec)
             ])
-         elif value.kind == value.VAR_POSITIONAL:  # do the remaining POSITIONAL arguments
-            parameter_line = '{} = {}'.format(param, self.args_list)
-            final_param_line.append(('   ' * 2) + parameter_line)
-         elif value.kind == value.KEYWORD_ONLY:
-            if param in self.kwargs_dict:
-               value_to_set = self.kwargs_dict.pop(param)
-            else:  # use the default
-               value_to_set = value.default
-            if isinstance(value_to_set, str):
-               parameter_line = '{} = "{}"'.format(param, value_to_set)
-            else:
-               parameter_line = '{} = {}'.format(param, value_to_set)
-            final_param_line.append(('   ' * 2) + parameter_line)
-         elif value.kind == value.VAR_KEYWORD:  # do the remaining KEYWORD arguments
-            parameter_line = '{} = {}'.format(param, self.kwargs_dict)
-            final_param_line.append(('   ' * 2) + parameter_line)
+         self.src = self.__get_final_inner_function()
+         self._code = compile(self.src, 'benchmarkit-call-src', "exec")
+         self.inner = self.__get_inner(self.func)
+         self.inner_call_overhead = self.__get_inner(None)
+      else:
+         raise ValueError('<func>: is not a `callable` type: <{}>'.format(self.func))
+
+   def get_source(self):
+      """ Returns the actual used source code """
+      return self.src
+
+   def benchmark_it(self, with_gc):
+      """ Returns timing result for calling the callable
+
+      :param with_gc: (bool) see: _TimeIT.benchmark_it()
+      :return: dict benchmark result dict keys: see: _TimeIT.benchmark_it(): all loop times are per call
+
+         - loops: how many times the callable was called
+         - call_overhead_sec: best time in seconds of the generated loop calling an empty python function
+      """
+      gc_old = gc_isenabled()
+      if with_gc:
+         gc_enable()
+      else:
+         gc_disable()
+      self.samples = array('d')
+      self.number = 0
+      try:
+         if self.per_call_samples:
+            self.number = 1
          else:
-            continue
+            self.number = self.__get_calibrated_number(self.inner)
+         usage_before = get_resource_usage()
+         benchmark_result = self.inner(self.number, self.run_sec, self.check_too_fast, self.samples)
+         benchmark_result.update(
+            get_resource_usage_delta(usage_before, get_resource_usage(), benchmark_result['loops'])
+         )
+         call_overhead_number = self.__get_calibrated_number(self.inner_call_overhead)
+         if self.run_sec == -1:
+            call_overhead_result = self.inner_call_overhead(call_overhead_number, -1, False, array('d'))
+         else:
+            call_overhead_result = self.inner_call_overhead(call_overhead_number, 0.1, False, array('d'))
+         benchmark_result['call_overhead_sec'] = call_overhead_result['best_loop_sec']
+         benchmark_result['name'] = self.name
+      finally:
+         if gc_old:
+            gc_enable()
+         else:
+            gc_disable()
+      return benchmark_result
+
+   def get_partial_result(self, elapsed_sec):
+      """ Returns the result of an interrupted benchmark_it(): e.g. by the `job_timeout_sec` watchdog
+
+      :param elapsed_sec: (float) wall-clock time in seconds until the interruption
+      :return: (dict) see: _helper_get_partial_benchmark_result()
+      """
+      return _helper_get_partial_benchmark_result(self.samples, self.number, elapsed_sec, 'call', self.name)
+
+   def __get_calibrated_number(self, inner):
+      """ Returns the number of calls per loop: so that one loop takes at least the minimum loop time
+
+      similar to python's `timeit.Timer.autorange()`
+
+      :param inner: (function) generated inner function to calibrate
+      :return: (int) number of calls per loop
+      """
+      min_loop_time = self.perf_counter_reference_time * self._CALL_MIN_LOOP_TIME_FACTOR
+      number = 1
+      while True:
+         for factor in (1, 2, 5):
+            calibrate_number = number * factor
+            calibrate_result = inner(calibrate_number, -1, False, array('d'))
+            if calibrate_result['best_loop_sec'] * calibrate_number >= min_loop_time:
+               return calibrate_number
+         number *= 10
+
+   def __get_final_inner_function(self):
+      """ Returns a string of an generated inner function which calls the prebound callable in a tight loop
+
+      :return: (str) generated inner function
+      """
+      call_arguments = []
+      call_overhead_func_parameters = []
+      prebind_lines = []
+      for idx in range(len(self.args_list)):
+         prebind_lines.append('   _speedit_prefix__arg_{0} = _speedit_prefix__args[{0}]'.format(idx))
+         call_arguments.append('_speedit_prefix__arg_{}'.format(idx))
+         call_overhead_func_parameters.append('_speedit_prefix__arg_{}'.format(idx))
+
+      has_kwargs_rest = False
+      for idx, key in enumerate(self.kwargs_dict):
+         if isinstance(key, str) and key.isidentifier() and not keyword_iskeyword(key):
+            prebind_lines.append('   _speedit_prefix__kwarg_{} = _speedit_prefix__kwargs[{!r}]'.format(idx, key))
+            call_arguments.append('{}=_speedit_prefix__kwarg_{}'.format(key, idx))
+            call_overhead_func_parameters.append('{}=None'.format(key))
+         else:
+            has_kwargs_rest = True
+      if has_kwargs_rest:
+         prebind_lines.append(
+            '   _speedit_prefix__kwargs_rest = {key: value for key, value in _speedit_prefix__kwargs.items() if not '
+            '(isinstance(key, str) and key.isidentifier() and not _speedit_prefix__iskeyword(key))}'
+         )
+         call_arguments.append('**_speedit_prefix__kwargs_rest')
+         call_overhead_func_parameters.append('**_speedit_prefix__kwargs_rest')
+
+      if self.check_too_fast:
+         check_too_fast_lines = [
+            '      if _speedit_prefix__check_too_fast and _speedit_prefix__result_time < _speedit_prefix__check_reference_time: raise Exception("in function: <{}>'.format(
+               self.orig_func_name) + ' call loop: too fast to measure:\\n   _speedit_prefix__result_time: <{:.11f}>  2 times _smallest_perf_counter_time: <{:.11f}>".format(_speedit_prefix__result_time, _speedit_prefix__check_reference_time))  # SPEEDIT: internally added'
+         ]
+      else:
+         check_too_fast_lines = []
 
       final_inner_function_lines = [
-         'def inner():  # orig function name: {}'.format(self.orig_func_name),
+         '# empty function with the same call signature: used to calibrate the call overhead',
+         'def _speedit_prefix__call_overhead_func({}):'.format(', '.join(call_overhead_func_parameters)),
+         '   pass',
+         '',
+         '',
+         'def inner(_speedit_prefix__number, _speedit_prefix__run_sec, _speedit_prefix__check_too_fast, _speedit_prefix__samples):  # orig function name: {}'.format(self.orig_func_name),
          '   from time import perf_counter as _speedit_prefix__perf_counter',
+         '   from keyword import iskeyword as _speedit_prefix__iskeyword',
          '',
-         '   _speedit_prefix__run_sec = {}'.format(self.run_sec),
+         '   # prebound callable and arguments',
+         '   _speedit_prefix__call = _speedit_prefix__func',
+      ]
+      final_inner_function_lines.extend(prebind_lines)
+      final_inner_function_lines.extend([
+         '   _speedit_prefix__repeat_range = range(_speedit_prefix__number)',
          '',
          '   # The smallest difference of calling _speedit_prefix__perf_counter() ',
          '   #   immediately after each other a couple of times',
@@ -514,6 +1311,7 @@ class _TimeIT(object):
          '   _speedit_prefix__second_best_loop_sec = 99999999999.0',
          '   _speedit_prefix__worst_loop_sec = 0.0',
          '   _speedit_prefix__second_worst_loop_sec = 0.0',
+         '   _speedit_prefix__samples_append = _speedit_prefix__samples.append',
          '   if _speedit_prefix__run_sec == -1:',
          '      # only run it once',
          '      _speedit_prefix__run_once = True',
@@ -522,20 +1320,20 @@ class _TimeIT(object):
          '   _speedit_prefix__main_start_time = _speedit_prefix__perf_counter()',
          '   while True:',
          '      _speedit_prefix__loops += 1',
-         '      _speedit_prefix__result_time = 0',
          '',
-         '      # ==================== START CODE BLOCK ==================== #',
-         '',
-      ]
-
-      final_inner_function_lines.extend(final_param_line)
-      final_inner_function_lines.extend(adjusted_func_code_line)
-
-      inner_function_lines_rest = [
-         '',
-         '      # ==================== END CODE BLOCK ==================== #',
+         '      # ==================== START CALL LOOP ==================== #',
+         '      _speedit_prefix__stmt_inner_start = _speedit_prefix__perf_counter()',
+         '      for _speedit_prefix__ in _speedit_prefix__repeat_range:',
+         '         _speedit_prefix__call({})'.format(', '.join(call_arguments)),
+         '      _speedit_prefix__result_time = _speedit_prefix__perf_counter() - _speedit_prefix__stmt_inner_start',
+         '      # ==================== END CALL LOOP ==================== #',
          '',
+      ])
+      final_inner_function_lines.extend(check_too_fast_lines)
+      final_inner_function_lines.extend([
          '      _speedit_prefix__all_loops_time_sec += _speedit_prefix__result_time',
+         '      _speedit_prefix__result_time /= _speedit_prefix__number',
+         '      _speedit_prefix__samples_append(_speedit_prefix__result_time)',
          '      if _speedit_prefix__result_time <= _speedit_prefix__best_loop_sec:',
          '         _speedit_prefix__second_best_loop_sec = _speedit_prefix__best_loop_sec',
          '         _speedit_prefix__best_loop_sec = _speedit_prefix__result_time',
@@ -547,26 +1345,825 @@ class _TimeIT(object):
          '      # check if we have to get out',
          '      if _speedit_prefix__perf_counter() - _speedit_prefix__main_start_time >= _speedit_prefix__run_sec:',
          '         break',
-         '   _speedit_prefix__avg_loop_sec = _speedit_prefix__all_loops_time_sec / _speedit_prefix__loops',
+         '   _speedit_prefix__avg_loop_sec = _speedit_prefix__all_loops_time_sec / (_speedit_prefix__loops * _speedit_prefix__number)',
          '   if _speedit_prefix__second_best_loop_sec == 99999999999.0:',
          '      _speedit_prefix__second_best_loop_sec = -1.0',
          '   if _speedit_prefix__second_worst_loop_sec == 0.0:',
          '      _speedit_prefix__second_worst_loop_sec = -1.0',
          '   return {',
-         '      "loops": _speedit_prefix__loops,',
+         '      "loops": _speedit_prefix__loops * _speedit_prefix__number,',
          '      "all_loops_time_sec": _speedit_prefix__all_loops_time_sec,',
          '      "avg_loop_sec": _speedit_prefix__avg_loop_sec,',
          '      "best_loop_sec": _speedit_prefix__best_loop_sec,',
          '      "second_best_loop_sec": _speedit_prefix__second_best_loop_sec,',
          '      "worst_loop_sec": _speedit_prefix__worst_loop_sec,',
-         '      "second_worst_loop_sec": _speedit_prefix__second_worst_loop_sec',
+         '      "second_worst_loop_sec": _speedit_prefix__second_worst_loop_sec,',
+         '      "engine": "call",',
+         '      "samples": _speedit_prefix__samples',
          '   }',
          ''
-      ]
-      final_inner_function_lines.extend(inner_function_lines_rest)
+      ])
 
       return '\n'.join(final_inner_function_lines)
 
+   def __get_inner(self, func):
+      """ Returns the generated inner function bound to: func
+
+      :param func: (callable) if None: the generated empty `_speedit_prefix__call_overhead_func` is used
+      :return: (function) generated inner function
+      """
+      _ns = {
+         '_speedit_prefix__func': func,
+         '_speedit_prefix__args': self.args_list,
+         '_speedit_prefix__kwargs': self.kwargs_dict,
+      }
+      exec(self._code, _ns)
+      if func is None:
+         _ns['_speedit_prefix__func'] = _ns['_speedit_prefix__call_overhead_func']
+      return _ns['inner']
+
+
+def _helper_get_partial_benchmark_result(samples, calls_per_sample, elapsed_sec, engine, name):
+   """ Returns a benchmark result built from the samples captured until a benchmark was interrupted
+
+   - if not even one loop finished: the elapsed time is used as one sample: a lower bound of the loop time
+   - the resource counters per loop and the call overhead are not measured
+
+   :param samples: (array of doubles) time in seconds of each finished loop
+   :param calls_per_sample: (int) `call` engine: calibrated number of calls per loop: `code` engine: 1
+   :param elapsed_sec: (float) wall-clock time in seconds until the interruption
+   :param engine: (str) ``code`` or ``call``
+   :param name: (str) the name used for the output `name` part
+   :return: (dict) benchmark result dict: see: _TimeIT.benchmark_it(): with `status`: TIMEOUT
+   """
+   loops = len(samples) * calls_per_sample
+   if not samples:
+      samples = array('d', [elapsed_sec])
+   sorted_samples = sorted(samples)
+   benchmark_result = {
+      'loops': loops,
+      'all_loops_time_sec': sum(samples) * max(calls_per_sample, 1),
+      'avg_loop_sec': sum(samples) / len(samples),
+      'best_loop_sec': sorted_samples[0],
+      'second_best_loop_sec': sorted_samples[1] if len(samples) > 1 else -1.0,
+      'worst_loop_sec': sorted_samples[-1],
+      'second_worst_loop_sec': sorted_samples[-2] if len(samples) > 1 else -1.0,
+      'engine': engine,
+      'call_overhead_sec': -1.0,
+      'samples': samples,
+      'name': name,
+      'status': 'TIMEOUT',
+   }
+   # no loops: only the peak resident set size is measured
+   resource_usage = get_resource_usage()
+   benchmark_result.update(get_resource_usage_delta(resource_usage, resource_usage, 0))
+   return benchmark_result
+
+
+def _helper_get_failed_benchmark_result(status, error_text, engine, name):
+   """ Returns a benchmark result of a job which raised or crashed: no samples
+
+   :param status: (str) ``ERROR`` or ``CRASHED``: see: :py:meth:`PySpeedIT.fork_server.ForkServer.submit`
+   :param error_text: (str) the traceback or the exit status: the last line is reported as `suspect`
+   :param engine: (str) ``code`` or ``call``
+   :param name: (str) the name used for the output `name` part
+   :return: (dict) benchmark result dict: see: _TimeIT.benchmark_it(): the times are -1.0: not measured
+   """
+   benchmark_result = {
+      'loops': 0,
+      'all_loops_time_sec': -1.0,
+      'avg_loop_sec': -1.0,
+      'best_loop_sec': -1.0,
+      'second_best_loop_sec': -1.0,
+      'worst_loop_sec': -1.0,
+      'second_worst_loop_sec': -1.0,
+      'engine': engine,
+      'call_overhead_sec': -1.0,
+      'samples': array('d'),
+      'name': name,
+      'status': status,
+      'suspect': ['{}: {}'.format(status, (error_text.strip().splitlines() or [''])[-1])],
+   }
+   benchmark_result.update({key: None for key in get_resource_usage() if not key.startswith('_')})
+   benchmark_result.update(get_sample_stats(benchmark_result['samples']))
+   return benchmark_result
+
+
+def _helper_get_benchmark_engine(func, benchmarkit__engine):
+   """ Returns the Benchmark-IT engine to use for: func
+
+   :param func: (callable)
+   :param benchmarkit__engine: (str) ``code``, ``call`` or ``auto``
+
+      - ``auto``: ``code`` if the source code of a normal python function is available else ``call``
+
+   :return: (str) ``code`` or ``call``
+   """
+   if benchmarkit__engine != 'auto':
+      return benchmarkit__engine
+   if not inspect_isfunction(func) or func.__name__ == '<lambda>':
+      return 'call'
+   try:
+      inspect_getsourcelines(func)
+   except (OSError, TypeError):
+      return 'call'
+   return 'code'
+
+
+def _helper_format_benchmark_row(dict_, output_in_sec):
+   """ Formats all time and resource counter values of one benchmark result row: in place
+
+   :param dict_: (dict) benchmark result row
+   :param output_in_sec: (bool) see: speed_it()
+   """
+   for key in ('avg_loop_sec', 'best_loop_sec', 'second_best_loop_sec', 'worst_loop_sec', 'second_worst_loop_sec',
+               'all_loops_time_sec', 'call_overhead_sec', 'median_loop_sec', 'clean_avg_loop_sec',
+               'clean_best_loop_sec', 'clean_worst_loop_sec'):
+      if output_in_sec:
+         if dict_[key] == -1.0:
+            dict_[key] = 'NOT-MEASURED'
+         else:
+            dict_[key] = '{:.11f}'.format(dict_[key])
+      else:
+         dict_[key] = format_time(dict_[key])
+   for key in ('minor_faults', 'major_faults', 'voluntary_ctx_switches', 'involuntary_ctx_switches', 'io_read_bytes',
+               'io_write_bytes'):
+      if dict_[key] is None:
+         dict_[key] = 'NOT-MEASURED'
+      else:
+         dict_[key] = '{:.4g}'.format(dict_[key])
+   if dict_['outliers']:
+      dict_['outliers'] = '{:,}: {}'.format(dict_['outliers'], ', '.join(
+         '{:,} {}'.format(dict_['outliers_' + outlier_class], outlier_class) for outlier_class in
+         ('low_severe', 'low_mild', 'high_mild', 'high_severe') if dict_['outliers_' + outlier_class]
+      ))
+   if dict_['max_rss_kb'] is None:
+      dict_['max_rss_kb'] = 'NOT-MEASURED'
+   else:
+      dict_['max_rss_kb'] = '{:,} KiB'.format(dict_['max_rss_kb'])
+   for kind, unit in WORK_UNIT_KINDS.items():
+      if dict_[kind + '_per_sec'] is None:
+         dict_[kind + '_per_sec'] = 'NOT-DECLARED'
+      elif dict_[kind + '_per_sec'] == -1.0:
+         dict_[kind + '_per_sec'] = 'NOT-MEASURED'
+      else:
+         dict_[kind + '_per_sec'] = '{} ({} - {})'.format(
+            format_throughput(dict_[kind + '_per_sec'], unit),
+            format_throughput(dict_[kind + '_per_sec_ci_low'], unit),
+            format_throughput(dict_[kind + '_per_sec_ci_high'], unit),
+         )
+
+
+def _helper_format_slos(slo_results, output_in_sec):
+   """ Returns the formatted SLO results of one benchmark result row
+
+   :param slo_results: (list or None) see: :py:func:`PySpeedIT.slo.evaluate_slos`
+   :param output_in_sec: (bool) see: speed_it()
+   :return: (str) one block per SLO: `NOT-DECLARED` if None
+   """
+   if slo_results is None:
+      return 'NOT-DECLARED'
+
+   def format_sec(value):
+      if output_in_sec:
+         return 'NOT-MEASURED' if value == -1.0 else '{:.11f}'.format(value)
+      return format_time(value)
+
+   formatted_slos = []
+   for slo_result in slo_results:
+      formatted_slo = 'p{:g} &lt;= {}: <strong>{}</strong><br />p{:g}: {} ({} - {})'.format(
+         slo_result['percentile'],
+         format_sec(slo_result['threshold_sec']),
+         slo_result['status'],
+         slo_result['percentile'],
+         format_sec(slo_result['percentile_sec']),
+         format_sec(slo_result['ci_low_sec']),
+         format_sec(slo_result['ci_high_sec']),
+      )
+      if slo_result['percentile_sec'] != -1.0:
+         # a negative margin is shown with its sign
+         formatted_slo += '<br />margin: {}{} ({:.1f} %)'.format(
+            '-' if slo_result['margin_sec'] < 0 else '',
+            format_sec(abs(slo_result['margin_sec'])),
+            slo_result['margin_percent'],
+         )
+      formatted_slo += '<br />samples: {:,} of {:,} needed'.format(
+         slo_result['samples'], slo_result['required_samples'])
+      formatted_slos.append(formatted_slo)
+   return '<br /><br />'.join(formatted_slos)
+
+
+def _helper_format_rank_value(value, compare_key, output_in_sec):
+   """ Returns the formatted value used for the ranking: a time or a throughput
+
+   :param value: (float) the value of the compare_key: see: _helper_get_compare_key()
+   :param compare_key: (str) see: _helper_get_compare_key()
+   :param output_in_sec: (bool) see: speed_it()
+   :return: (str)
+   """
+   if compare_key in THROUGHPUT_COMPARE_KEYS:
+      return format_throughput(value, WORK_UNIT_KINDS[THROUGHPUT_COMPARE_KEYS[compare_key]])
+   if output_in_sec:
+      return 'NOT-MEASURED' if value == -1.0 else '{:.11f}'.format(value)
+   return format_time(value)
+
+
+def _helper_get_compare_key(benchmarkit__rank_by, benchmarkit__reject_outliers):
+   """ Returns the benchmark result key used for the ranking
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :return: (str) benchmark result key
+   """
+   if benchmarkit__rank_by == 'best':
+      compare_key = 'best_loop_sec'
+   elif benchmarkit__rank_by == 'average':
+      compare_key = 'avg_loop_sec'
+   elif benchmarkit__rank_by == 'worst':
+      compare_key = 'best_loop_sec'
+   elif benchmarkit__rank_by in THROUGHPUT_COMPARE_KEYS:
+      # the throughput is computed of all samples
+      return benchmarkit__rank_by
+   else:
+      raise Err('benchmark_functions_in_module', [
+         'WRONG PARAMETER ERROR',
+         '  <benchmarkit__rank_by> must be one of: <best, average, worst, ops_per_sec, bytes_per_sec> We got: <{}>'.format(
+            benchmarkit__rank_by)
+      ])
+   if benchmarkit__reject_outliers:
+      compare_key = 'clean_' + compare_key
+   return compare_key
+
+
+def _helper_get_memory_budget_table(memory_budget_rows, module_name, benchmarkit__memory_budgets_mb, compare_key,
+                                    output_in_sec):
+   """ Returns the html table of the memory budget runs
+
+   :param memory_budget_rows: (list) of dicts: name, baseline_address_space_mb, budget_results,
+      smallest_completing_budget_mb: budget_results see: :py:func:`PySpeedIT.memory_budget.run_with_memory_budget`
+   :param module_name: (str)
+   :param benchmarkit__memory_budgets_mb: (list) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param compare_key: (str) benchmark result key shown per budget: see: _helper_get_compare_key()
+   :param output_in_sec: (bool) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :return: (str) html table
+   """
+   final_result_rows = ''
+   for idx, row in enumerate(memory_budget_rows):
+      budget_cells = []
+      for budget_result in row['budget_results']:
+         if budget_result['benchmark_result'] is None:
+            cell = budget_result['status']
+         else:
+            cell = _helper_format_rank_value(budget_result['benchmark_result'][compare_key], compare_key, output_in_sec)
+            if budget_result['status'] != 'OK':
+               cell = '{}: partial: {}'.format(budget_result['status'], cell)
+         if budget_result['error']:
+            cell = '{}<br />{}'.format(cell, html_escape(budget_result['error']))
+         budget_cells.append('<td>{}</td>'.format(cell))
+      if row['smallest_completing_budget_mb'] is None:
+         smallest_completing_budget = 'NONE'
+      else:
+         smallest_completing_budget = '{:,} MiB'.format(row['smallest_completing_budget_mb'])
+
+      final_result_rows += '''
+         <tr class="{td_class}">
+            <td>{td_name}</td>
+            <td>{td_baseline_address_space}</td>
+            {td_budget_cells}
+            <td>{td_smallest_completing_budget}</td>
+         </tr>
+      '''.format(
+         td_class='row-even' if (idx % 2) == 0 else 'row-odd',
+         td_name=row['name'],
+         td_baseline_address_space='{:,.1f} MiB'.format(row['baseline_address_space_mb']),
+         td_budget_cells=''.join(budget_cells),
+         td_smallest_completing_budget=smallest_completing_budget,
+      )
+
+   budgets_mb = sorted(benchmarkit__memory_budgets_mb)
+   return get_html_memory_budget_table_template().format(
+      head_colspan=len(budgets_mb) + 3,
+      head_title_func=module_name,
+      head_parameter_benchmarkit__memory_budgets_mb='{}'.format(budgets_mb),
+      head_parameter_rank_value=compare_key,
+      head_budget_columns=''.join('<th>{:,} MiB</th>'.format(budget_mb) for budget_mb in budgets_mb),
+      body_final_result_rows=final_result_rows,
+   )
+
+
+def _helper_get_timeit_obj(
+      func,
+      orig_func_name,
+      loaded_module,
+      func_positional_arguments,
+      func_keyword_arguments,
+      benchmarkit__check_too_fast,
+      benchmarkit__run_sec,
+      name,
+      perf_counter_reference_time,
+      benchmarkit__engine,
+      forked=False,
+      per_call_samples=False):
+   """ Returns a `_TimeIT` or `_CallTimeIT` instance depending on the selected engine
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :param forked: (bool) True if the instance runs in forked child processes: see:
+      :py:func:`PySpeedIT.fixtures.get_fixture_view`
+   :param per_call_samples: (bool) `call` engine: see: `_CallTimeIT`: the `code` engine always samples single runs
+   :return: (obj) instance of `_TimeIT` or `_CallTimeIT`: each instance gets its own view of the fixture arguments
+   """
+   func_positional_arguments, func_keyword_arguments = resolve_fixtures(
+      func_positional_arguments, func_keyword_arguments, forked)
+   if _helper_get_benchmark_engine(func, benchmarkit__engine) == 'call':
+      return _CallTimeIT(
+         func,
+         orig_func_name,
+         func_positional_arguments,
+         func_keyword_arguments,
+         benchmarkit__check_too_fast,
+         benchmarkit__run_sec,
+         name,
+         perf_counter_reference_time,
+         per_call_samples
+      )
+   return _TimeIT(
+      func,
+      orig_func_name,
+      loaded_module.__dict__,
+      func_positional_arguments,
+      func_keyword_arguments,
+      benchmarkit__check_too_fast,
+      benchmarkit__run_sec,
+      name,
+      perf_counter_reference_time
+   )
+
+
+def _helper_iter_benchmark_jobs(loaded_module, variant_modules, module_tuple_of_func_tuples, use_func_name,
+                                benchmarkit__engine):
+   """ Yields all benchmark jobs of one loaded_module: inclusive any variant_modules
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`benchmark_functions_in_module`
+
+   :return: (generator) yields tuples: (name_str, func, orig_func_name, job_module, name, func_positional_arguments,
+      func_keyword_arguments, engine)
+   """
+   if variant_modules:
+      job_modules = [('python', loaded_module)] + list(variant_modules)
+      # compiled variants have no source code: compare all variants with the same engine
+      benchmarkit__engine = 'call'
+   else:
+      job_modules = [(None, loaded_module)]
+
+   for variant_name, job_module in job_modules:
+      for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
+         try:
+            func = getattr(job_module, function_name_str)
+         except Exception as err:
+            raise Err('_helper_iter_benchmark_jobs', [
+               'COULD NOT ACCESS FUNCTION ERROR: function_name_str: <{}>'.format(function_name_str),
+               '  loaded_module: <{}>'.format(job_module),
+               '    Exception: <{}>'.format(err)
+            ])
+
+         orig_func_name = getattr(func, "__name__", func)
+         if use_func_name:
+            name = orig_func_name
+         else:
+            name = name_str
+         if variant_name:
+            name = '{} [{}]'.format(name, variant_name)
+
+         yield (name_str, func, orig_func_name, job_module, name, func_positional_arguments, func_keyword_arguments,
+                _helper_get_benchmark_engine(func, benchmarkit__engine))
+
+
+def _helper_resolve_work_units(benchmarkit__work_units, module_tuple_of_func_tuples):
+   """ Returns the declared work units per loop of each function: callables are applied to the function arguments
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :return: (dict) name_str: dict: work unit kind: (float) work units per loop
+   :raise Err: for unknown functions or kinds and for work units which are not positive numbers
+   """
+   resolved_work_units = {}
+   if not benchmarkit__work_units:
+      return resolved_work_units
+
+   job_arguments = {
+      name_str: (func_positional_arguments, func_keyword_arguments)
+      for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples
+   }
+   for name_str, work_units in benchmarkit__work_units.items():
+      if name_str not in job_arguments or not isinstance(work_units, dict) or set(work_units) - set(WORK_UNIT_KINDS):
+         raise Err('benchmarkit__work_units', [
+            'name_str: <{}> work_units: <{}>'.format(name_str, work_units),
+            '  must be a name_str of the func_tuples: <{}>'.format(sorted(job_arguments)),
+            '  with a dict of the kinds: <{}>'.format(', '.join(WORK_UNIT_KINDS))
+         ])
+      func_positional_arguments, func_keyword_arguments = resolve_fixtures(*job_arguments[name_str])
+      resolved_work_units[name_str] = {}
+      for kind, work_units_per_loop in work_units.items():
+         if callable(work_units_per_loop):
+            work_units_per_loop = work_units_per_loop(*func_positional_arguments, **func_keyword_arguments)
+         if isinstance(work_units_per_loop, bool) or not isinstance(work_units_per_loop, (int, float)) or \
+               work_units_per_loop <= 0:
+            raise Err('benchmarkit__work_units', [
+               'name_str: <{}> kind: <{}>: work units per loop must be a positive number: we got: <{!r}>'.format(
+                  name_str, kind, work_units_per_loop)
+            ])
+         resolved_work_units[name_str][kind] = float(work_units_per_loop)
+   return resolved_work_units
+
+
+def _helper_add_throughput(benchmark_result, job_work_units):
+   """ Adds the throughput of all work unit kinds to a benchmark result dict: in place: None for undeclared kinds
+
+   - keys per kind: `{kind}_per_loop`, `{kind}_per_sec`, `{kind}_per_sec_ci_low`, `{kind}_per_sec_ci_high`
+
+   :param benchmark_result: (dict) see: `_TimeIT.benchmark_it()`
+   :param job_work_units: (dict) work unit kind: (float) work units per loop: see: _helper_resolve_work_units()
+   """
+   for kind in WORK_UNIT_KINDS:
+      if kind in job_work_units:
+         per_sec, ci_low_per_sec, ci_high_per_sec = get_throughput_stats(
+            benchmark_result['samples'], job_work_units[kind])
+         benchmark_result[kind + '_per_loop'] = job_work_units[kind]
+      else:
+         per_sec = ci_low_per_sec = ci_high_per_sec = None
+         benchmark_result[kind + '_per_loop'] = None
+      benchmark_result[kind + '_per_sec'] = per_sec
+      benchmark_result[kind + '_per_sec_ci_low'] = ci_low_per_sec
+      benchmark_result[kind + '_per_sec_ci_high'] = ci_high_per_sec
+
+
+def _helper_run_benchmark_job(timeit_obj, benchmarkit__with_gc, benchmarkit__noise_limits, benchmarkit__outlier_method,
+                              job_timeout_sec):
+   """ Returns the benchmark result of one job: supervised by the `job_timeout_sec` watchdog
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :param timeit_obj: (obj) instance of `_TimeIT` or `_CallTimeIT`
+   :return: (dict) benchmark result dict: see: `_TimeIT.benchmark_it()`: with the keys: status, suspect and the sample
+      statistics of :py:func:`PySpeedIT.sample_stats.get_sample_stats`
+   """
+   state_before = get_system_state()
+   start_time = perf_counter()
+   try:
+      with watchdog(job_timeout_sec):
+         benchmark_result = timeit_obj.benchmark_it(with_gc=benchmarkit__with_gc)
+      benchmark_result['status'] = 'OK'
+   except JobTimeout:
+      # keep the partial samples: continue with the next job
+      benchmark_result = timeit_obj.get_partial_result(perf_counter() - start_time)
+   benchmark_result['suspect'] = get_system_noise(state_before, get_system_state(), benchmarkit__noise_limits)
+   benchmark_result.update(get_sample_stats(benchmark_result['samples'], benchmarkit__outlier_method))
+   return benchmark_result
+
+
+def benchmark_callable(
+      func,
+      func_positional_arguments,
+      func_keyword_arguments,
+      name,
+      benchmarkit__with_gc=False,
+      benchmarkit__check_too_fast=True,
+      benchmarkit__run_sec=1,
+      benchmarkit__noise_limits=None,
+      benchmarkit__outlier_method='tukey',
+      job_timeout_sec=None,
+      perf_counter_reference_time=None):
+   """ Returns the unformatted benchmark result of any callable with the `call` engine: nothing is written
+
+   - used e.g. by :mod:`PySpeedIT.pytest_plugin` for callables which are not module-level functions
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :param func: (callable)
+   :param func_positional_arguments: (list) positional arguments
+   :param func_keyword_arguments: (dict) keyword arguments
+   :param name: (str) name of the result row
+   :param perf_counter_reference_time: (float or None) if None: see: _helper_get_perf_counter_reference_time()
+   :return: (dict) benchmark result dict: see: `_TimeIT.benchmark_it()`: with the keys: status, suspect and the sample
+      statistics of :py:func:`PySpeedIT.sample_stats.get_sample_stats`
+   """
+   if perf_counter_reference_time is None:
+      perf_counter_reference_time = _helper_get_perf_counter_reference_time()
+   timeit_obj = _CallTimeIT(
+      func,
+      getattr(func, '__name__', name),
+      func_positional_arguments,
+      func_keyword_arguments,
+      benchmarkit__check_too_fast,
+      benchmarkit__run_sec,
+      name,
+      perf_counter_reference_time
+   )
+   return _helper_run_benchmark_job(
+      timeit_obj, benchmarkit__with_gc, benchmarkit__noise_limits, benchmarkit__outlier_method, job_timeout_sec)
+
+
+def measure_functions_in_module(
+      loaded_module,
+      module_tuple_of_func_tuples,
+      use_func_name,
+      benchmarkit__with_gc,
+      benchmarkit__check_too_fast,
+      benchmarkit__run_sec,
+      benchmarkit__repeat,
+      benchmarkit__engine='auto',
+      variant_modules=None,
+      benchmarkit__stable_mode=False,
+      benchmarkit__noise_limits=None,
+      benchmarkit__outlier_method='tukey',
+      job_timeout_sec=None,
+      benchmarkit__memory_budgets_mb=None,
+      perf_counter_reference_time=None,
+      benchmarkit__incremental=False,
+      benchmarkit__work_units=None,
+      benchmarkit__slos=None,
+      benchmarkit__isolate_jobs=False):
+   """ Returns the unformatted benchmark results for one loaded_module for all defined functions: nothing is written
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`benchmark_functions_in_module` and
+      :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :param perf_counter_reference_time: (float or None) if None: see: _helper_get_perf_counter_reference_time()
+   :param benchmarkit__incremental: (bool) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: the results of
+      the measured jobs are stored: see: :mod:`PySpeedIT.result_cache`
+   :param benchmarkit__work_units: (dict or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: module option
+   :param benchmarkit__slos: (dict or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: module option:
+      a function with too few samples for its SLOs is measured again with a longer `run_sec`:
+      see: :py:func:`PySpeedIT.slo.get_extended_run_sec`
+   :param benchmarkit__isolate_jobs: (bool) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: each measured job
+      runs in a child of a :py:class:`PySpeedIT.fork_server.ForkServer`
+   :return: (tuple) format: (all_tables, memory_budget_rows)
+
+      - all_tables: (list) one table per repeat: list of benchmark result dicts: see: `_TimeIT.benchmark_it()`:
+        with the keys: status, suspect, fresh, measured_at, run_sec, the sample statistics of
+        :py:func:`PySpeedIT.sample_stats.get_sample_stats`, the throughput: see: _helper_add_throughput() and slos:
+        see: :py:func:`PySpeedIT.slo.evaluate_slos`: None if not declared:
+        fresh is False for results reused from the result cache
+      - memory_budget_rows: (list) of dicts: name, baseline_address_space_mb, budget_results,
+        smallest_completing_budget_mb: empty if no `benchmarkit__memory_budgets_mb`
+   """
+   if perf_counter_reference_time is None:
+      perf_counter_reference_time = _helper_get_perf_counter_reference_time()
+   resolved_work_units = _helper_resolve_work_units(benchmarkit__work_units, module_tuple_of_func_tuples)
+   checked_slos = check_slos(benchmarkit__slos, module_tuple_of_func_tuples)
+
+   jobs = list(_helper_iter_benchmark_jobs(loaded_module, variant_modules, module_tuple_of_func_tuples, use_func_name,
+                                           benchmarkit__engine))
+   # incremental: reuse the stored results of unchanged jobs
+   cached_job_results = [None] * len(jobs)
+   job_fingerprints = [None] * len(jobs)
+   job_keys = [None] * len(jobs)
+   if benchmarkit__incremental:
+      # lazy import: pickle is only needed for the result cache
+      from PySpeedIT.result_cache import (
+         get_job_fingerprint,
+         get_job_key,
+         get_results_cache_dir_path,
+         load_job_result,
+         store_job_result,
+      )
+      results_cache_dir_path = get_results_cache_dir_path()
+      module_file_path = getattr(loaded_module, '__file__', None) or loaded_module.__name__
+      for job_idx, (name_str, func, orig_func_name, job_module, name, func_positional_arguments,
+                    func_keyword_arguments, engine) in enumerate(jobs):
+         job_fingerprints[job_idx] = get_job_fingerprint(func, func_positional_arguments, func_keyword_arguments, {
+            'engine': engine,
+            'benchmarkit__with_gc': benchmarkit__with_gc,
+            'benchmarkit__check_too_fast': benchmarkit__check_too_fast,
+            'benchmarkit__run_sec': benchmarkit__run_sec,
+            'benchmarkit__repeat': benchmarkit__repeat,
+            'benchmarkit__stable_mode': benchmarkit__stable_mode,
+            'benchmarkit__noise_limits': benchmarkit__noise_limits,
+            'benchmarkit__outlier_method': benchmarkit__outlier_method,
+            'job_timeout_sec': job_timeout_sec,
+            'benchmarkit__memory_budgets_mb': benchmarkit__memory_budgets_mb,
+            'benchmarkit__isolate_jobs': benchmarkit__isolate_jobs,
+            # the SLO percentiles extend the run: the thresholds are evaluated of the stored samples
+            'slo_required_samples': max(
+               (get_required_samples(slo['percentile']) for slo in checked_slos.get(name_str, ())), default=0),
+         })
+         job_keys[job_idx] = get_job_key(module_file_path, name)
+         cached_job_results[job_idx] = load_job_result(
+            results_cache_dir_path, job_keys[job_idx], job_fingerprints[job_idx])
+
+   def measure_job(job_idx, forked=False):
+      """ Returns the fresh benchmark result of one job: a function with SLOs is measured again with a longer run_sec
+      until the tail percentiles have enough samples
+      """
+      name_str, func, orig_func_name, job_module, name, func_positional_arguments, func_keyword_arguments, \
+         engine = jobs[job_idx]
+      benchmark_result = None
+      run_sec = benchmarkit__run_sec
+      for extension_idx in range(SLO_MAX_EXTENSIONS + 1):
+         if benchmark_result is not None:
+            if name_str not in checked_slos or benchmark_result['status'] != 'OK':
+               break
+            extended_run_sec = get_extended_run_sec(
+               checked_slos[name_str], len(benchmark_result['samples']), run_sec,
+               benchmark_result['all_loops_time_sec'])
+            if extended_run_sec is None:
+               break
+            run_sec = extended_run_sec
+         timeit_obj = _helper_get_timeit_obj(
+            func,
+            orig_func_name,
+            job_module,
+            func_positional_arguments,
+            func_keyword_arguments,
+            benchmarkit__check_too_fast,
+            run_sec,
+            name,
+            perf_counter_reference_time,
+            engine,
+            forked,
+            # the SLO percentiles are of single calls
+            per_call_samples=name_str in checked_slos
+         )
+         if benchmarkit__stable_mode:
+            wait_for_quiet_system(benchmarkit__noise_limits)
+         benchmark_result = _helper_run_benchmark_job(
+            timeit_obj, benchmarkit__with_gc, benchmarkit__noise_limits, benchmarkit__outlier_method, job_timeout_sec)
+      benchmark_result['run_sec'] = run_sec
+      benchmark_result['fresh'] = True
+      benchmark_result['measured_at'] = time_time()
+      return benchmark_result
+
+   if benchmarkit__isolate_jobs and None in cached_job_results:
+      # the fixtures are built before the fork: inherited by all job children
+      for job in jobs:
+         preload_fixtures(job[5], job[6])
+      # lazy import: multiprocessing is only needed for the isolated jobs
+      from PySpeedIT.fork_server import ForkServer
+      fork_server = ForkServer(partial(measure_job, forked=True))
+   else:
+      fork_server = None
+   if benchmarkit__stable_mode and None in cached_job_results:
+      stable_mode_settings = enter_stable_mode()
+   else:
+      stable_mode_settings = None
+   try:
+      if fork_server is not None:
+         fork_server.start()
+      all_tables = []
+      for repeat_idx in range(benchmarkit__repeat):
+         table = []
+         for job_idx, (name_str, func, orig_func_name, job_module, name, func_positional_arguments,
+                       func_keyword_arguments, engine) in enumerate(jobs):
+            if cached_job_results[job_idx] is not None:
+               benchmark_result = cached_job_results[job_idx]['benchmark_results'][repeat_idx]
+               benchmark_result['fresh'] = False
+            elif fork_server is None:
+               benchmark_result = measure_job(job_idx)
+            else:
+               status, benchmark_result, error_text = fork_server.submit(job_idx)
+               if status != 'OK':
+                  # keep the row: continue with the next job
+                  benchmark_result = _helper_get_failed_benchmark_result(status, error_text, engine, name)
+                  benchmark_result['run_sec'] = benchmarkit__run_sec
+                  benchmark_result['fresh'] = True
+                  benchmark_result['measured_at'] = time_time()
+            table.append(benchmark_result)
+         all_tables.append(table)
+
+      # memory budgets: one child process per function and budget
+      memory_budget_rows = [None] * len(jobs)
+      if benchmarkit__memory_budgets_mb:
+         # lazy import: multiprocessing is only needed for the memory budgets
+         from PySpeedIT.memory_budget import (
+            get_smallest_completing_budget,
+            run_with_memory_budget,
+         )
+         for job_idx, (name_str, func, orig_func_name, job_module, name, func_positional_arguments,
+                       func_keyword_arguments, engine) in enumerate(jobs):
+            if cached_job_results[job_idx] is not None:
+               memory_budget_rows[job_idx] = cached_job_results[job_idx]['memory_budget_row']
+               continue
+
+            timeit_obj = _helper_get_timeit_obj(
+               func,
+               orig_func_name,
+               job_module,
+               func_positional_arguments,
+               func_keyword_arguments,
+               benchmarkit__check_too_fast,
+               benchmarkit__run_sec,
+               name,
+               perf_counter_reference_time,
+               engine,
+               forked=True
+            )
+            budget_results = []
+            for memory_budget_mb in sorted(benchmarkit__memory_budgets_mb):
+               if benchmarkit__stable_mode:
+                  wait_for_quiet_system(benchmarkit__noise_limits)
+               budget_result = run_with_memory_budget(
+                  timeit_obj, benchmarkit__with_gc, memory_budget_mb, job_timeout_sec)
+               if budget_result['benchmark_result'] is not None:
+                  budget_result['benchmark_result'].update(
+                     get_sample_stats(budget_result['benchmark_result']['samples'], benchmarkit__outlier_method))
+               budget_results.append(budget_result)
+            memory_budget_rows[job_idx] = {
+               'name': name,
+               'baseline_address_space_mb': budget_results[0]['baseline_address_space_mb'],
+               'budget_results': budget_results,
+               'smallest_completing_budget_mb': get_smallest_completing_budget(budget_results),
+            }
+   finally:
+      if fork_server is not None:
+         fork_server.close()
+      if stable_mode_settings:
+         exit_stable_mode(stable_mode_settings)
+
+   if benchmarkit__incremental:
+      for job_idx, cached_job_result in enumerate(cached_job_results):
+         if cached_job_result is None:
+            store_job_result(
+               results_cache_dir_path,
+               job_keys[job_idx],
+               job_fingerprints[job_idx],
+               [table[job_idx] for table in all_tables],
+               memory_budget_rows[job_idx]
+            )
+
+   # throughput and SLOs: derived of the samples: not stored in the result cache
+   for job_idx, (name_str, func, orig_func_name, job_module, name, func_positional_arguments,
+                 func_keyword_arguments, engine) in enumerate(jobs):
+      for table in all_tables:
+         _helper_add_throughput(table[job_idx], resolved_work_units.get(name_str, {}))
+         if name_str in checked_slos:
+            table[job_idx]['slos'] = evaluate_slos(
+               table[job_idx]['samples'], checked_slos[name_str], table[job_idx]['run_sec'])
+         else:
+            table[job_idx]['slos'] = None
+      if memory_budget_rows[job_idx] is not None:
+         for budget_result in memory_budget_rows[job_idx]['budget_results']:
+            if budget_result['benchmark_result'] is not None:
+               _helper_add_throughput(budget_result['benchmark_result'], resolved_work_units.get(name_str, {}))
+
+   memory_budget_rows = [row for row in memory_budget_rows if row is not None]
+   return all_tables, memory_budget_rows
+
+
+def benchmark_functions(
+      loaded_module,
+      module_tuple_of_func_tuples,
+      use_func_name=True,
+      benchmarkit__with_gc=False,
+      benchmarkit__check_too_fast=True,
+      benchmarkit__run_sec=1,
+      benchmarkit__repeat=3,
+      benchmarkit__engine='auto',
+      benchmarkit__outlier_method='tukey',
+      job_timeout_sec=None,
+      benchmarkit__work_units=None,
+      benchmarkit__slos=None,
+      benchmarkit__isolate_jobs=False):
+   """ Returns the Benchmark-IT results of all defined functions: the library API: nothing is written
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`:
+      :py:func:`measure_functions_in_module` supports all benchmark options
+
+   :return: (list) one table per repeat: list of :py:class:`PySpeedIT.results.BenchmarkRow`: unsorted
+   """
+   all_tables, memory_budget_rows = measure_functions_in_module(
+      loaded_module,
+      module_tuple_of_func_tuples,
+      use_func_name,
+      benchmarkit__with_gc,
+      benchmarkit__check_too_fast,
+      benchmarkit__run_sec,
+      benchmarkit__repeat,
+      benchmarkit__engine,
+      benchmarkit__outlier_method=benchmarkit__outlier_method,
+      job_timeout_sec=job_timeout_sec,
+      benchmarkit__work_units=benchmarkit__work_units,
+      benchmarkit__slos=benchmarkit__slos,
+      benchmarkit__isolate_jobs=benchmarkit__isolate_jobs
+   )
+   return [[BenchmarkRow.from_dict(benchmark_result) for benchmark_result in table] for table in all_tables]
+
 
 def benchmark_functions_in_module(
       loaded_module,
@@ -582,47 +2179,76 @@ def benchmark_functions_in_module(
       benchmarkit__check_too_fast,
       benchmarkit__rank_by,
       benchmarkit__run_sec,
-      benchmarkit__repeat):
+      benchmarkit__repeat,
+      benchmarkit__engine='auto',
+      variant_modules=None,
+      benchmarkit__stable_mode=False,
+      benchmarkit__noise_limits=None,
+      benchmarkit__output_json=False,
+      benchmarkit__outlier_method='tukey',
+      benchmarkit__reject_outliers=False,
+      benchmarkit__plots=True,
+      job_timeout_sec=None,
+      benchmarkit__memory_budgets_mb=None,
+      benchmarkit__interpreters=None,
+      benchmarkit__incremental=False,
+      benchmarkit__work_units=None,
+      benchmarkit__slos=None,
+      benchmarkit__isolate_jobs=False,
+      benchmarkit__shared_buffers=None):
    """ Writes the results for one loaded_module for all defined functions to a html files overwriting them if they existed.
 
    .. seealso::
 
       for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
 
+   :param variant_modules: (list or None) list of tuples: (variant_name, loaded_variant_module)
+
+      - e.g. Cython compiled variants of the `loaded_module`: all functions are benchmarked in all variants and
+        ranked in one table: the `call` engine is used for all variants
+
+   :param benchmarkit__stable_mode: (bool) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param benchmarkit__noise_limits: (dict or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param benchmarkit__output_json: (bool) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param benchmarkit__outlier_method: (str) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param benchmarkit__reject_outliers: (bool) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param benchmarkit__plots: (bool) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param job_timeout_sec: (float or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param benchmarkit__memory_budgets_mb: (list or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param benchmarkit__interpreters: (list or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`:
+      not supported together with: variant_modules
+   :param benchmarkit__incremental: (bool) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param benchmarkit__work_units: (dict or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: module option
+   :param benchmarkit__slos: (dict or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: module option
+   :param benchmarkit__isolate_jobs: (bool) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param benchmarkit__shared_buffers: (str or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :return: (list) the SLO results of all rows of all repeats: see: :py:func:`PySpeedIT.slo.evaluate_slos`: with the key
+      name: empty if no SLOs are declared
    """
    # get once the perf_counter_reference_time
    perf_counter_reference_time = _helper_get_perf_counter_reference_time()
+   # callables are applied once here: only numbers are passed on: e.g. to other interpreters
+   resolved_work_units = _helper_resolve_work_units(benchmarkit__work_units, module_tuple_of_func_tuples)
+   checked_slos = check_slos(benchmarkit__slos, module_tuple_of_func_tuples)
 
    # === DO THE SOURCE CODE
    if benchmarkit__output_source:
       all_final_lines = []
       # Run all only once and get the code
-      for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
-         try:
-            func = getattr(loaded_module, function_name_str)
-         except Exception as err:
-            raise Err('_profile_functions_in_module', [
-               'COULD NOT ACCESS FUNCTION ERROR: function_name_str: <{}>'.format(function_name_str),
-               '  loaded_module: <{}>'.format(loaded_module),
-               '    Exception: <{}>'.format(err)
-            ])
-
-         orig_func_name = getattr(func, "__name__", func)
-         if use_func_name:
-            name = orig_func_name
-         else:
-            name = name_str
-
-         source_result = _TimeIT(
+      for name_str, func, orig_func_name, job_module, name, func_positional_arguments, func_keyword_arguments, \
+            engine in _helper_iter_benchmark_jobs(loaded_module, variant_modules, module_tuple_of_func_tuples,
+                                                  use_func_name, benchmarkit__engine):
+         source_result = _helper_get_timeit_obj(
             func,
             orig_func_name,
-            loaded_module.__dict__,
+            job_module,
             func_positional_arguments,
             func_keyword_arguments,
             benchmarkit__check_too_fast,
             benchmarkit__run_sec,
             name,
-            perf_counter_reference_time
+            perf_counter_reference_time,
+            engine
          ).get_source()
 
          all_final_lines.extend([
@@ -652,125 +2278,136 @@ def benchmark_functions_in_module(
 
    '''.format(head_embedded_style_sheet=get_html_template_css(), head_module_name=module_name)
 
-   for repeat_all in range(benchmarkit__repeat):
-      table = []
-      for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
-         try:
-            func = getattr(loaded_module, function_name_str)
-         except Exception as err:
-            raise Err('_profile_functions_in_module', [
-               'COULD NOT ACCESS FUNCTION ERROR: function_name_str: <{}>'.format(function_name_str),
-               '  loaded_module: <{}>'.format(loaded_module),
-               '    Exception: <{}>'.format(err)
-            ])
-
-         orig_func_name = getattr(func, "__name__", func)
-         if use_func_name:
-            name = orig_func_name
-         else:
-            name = name_str
-
-         benchmark_result = _TimeIT(
-            func,
-            orig_func_name,
-            loaded_module.__dict__,
-            func_positional_arguments,
-            func_keyword_arguments,
-            benchmarkit__check_too_fast,
-            benchmarkit__run_sec,
-            name,
-            perf_counter_reference_time
-         ).benchmark_it(with_gc=benchmarkit__with_gc)
-
-         table.append(benchmark_result)
-
-      if benchmarkit__rank_by == 'best':
-         table = sorted(table, key=itemgetter('best_loop_sec'))
-         compare_reference = table[0]['best_loop_sec']
-         for idx, dict_ in enumerate(table):
-            dict_['compare'] = '{:,.3f}'.format((dict_['best_loop_sec'] / compare_reference) * 100.0)
-            dict_['rank'] = '{:,}'.format(idx + 1)
-            dict_['loops'] = '{:,}'.format(dict_['loops'])
-            if output_in_sec:
-               dict_['avg_loop_sec'] = '{:.11f}'.format(dict_['avg_loop_sec'])
-               dict_['best_loop_sec'] = '{:.11f}'.format(dict_['best_loop_sec'])
-               if dict_['second_best_loop_sec'] == -1.0:
-                  dict_['second_best_loop_sec'] = 'NOT-MEASURED'
-               else:
-                  dict_['second_best_loop_sec'] = '{:.11f}'.format(dict_['second_best_loop_sec'])
-               dict_['worst_loop_sec'] = '{:.11f}'.format(dict_['worst_loop_sec'])
-               if dict_['second_worst_loop_sec'] == -1.0:
-                  dict_['second_worst_loop_sec'] = 'NOT-MEASURED'
-               else:
-                  dict_['second_worst_loop_sec'] = '{:.11f}'.format(dict_['second_worst_loop_sec'])
-               dict_['all_loops_time_sec'] = '{:.11f}'.format(dict_['all_loops_time_sec'])
-            else:
-               dict_['avg_loop_sec'] = format_time(dict_['avg_loop_sec'])
-               dict_['best_loop_sec'] = format_time(dict_['best_loop_sec'])
-               dict_['second_best_loop_sec'] = format_time(dict_['second_best_loop_sec'])
-               dict_['worst_loop_sec'] = format_time(dict_['worst_loop_sec'])
-               dict_['second_worst_loop_sec'] = format_time(dict_['second_worst_loop_sec'])
-               dict_['all_loops_time_sec'] = format_time(dict_['all_loops_time_sec'])
-      elif benchmarkit__rank_by == 'average':
-         table = sorted(table, key=itemgetter('avg_loop_sec'))
-         compare_reference = table[0]['avg_loop_sec']
-         for idx, dict_ in enumerate(table):
-            dict_['compare'] = '{:,.3f}'.format((dict_['avg_loop_sec'] / compare_reference) * 100.0)
-            dict_['rank'] = '{:,}'.format(idx + 1)
-            dict_['loops'] = '{:,}'.format(dict_['loops'])
-            if output_in_sec:
-               dict_['avg_loop_sec'] = '{:.11f}'.format(dict_['avg_loop_sec'])
-               dict_['best_loop_sec'] = '{:.11f}'.format(dict_['best_loop_sec'])
-               if dict_['second_best_loop_sec'] == -1.0:
-                  dict_['second_best_loop_sec'] = 'NOT-MEASURED'
-               else:
-                  dict_['second_best_loop_sec'] = '{:.11f}'.format(dict_['second_best_loop_sec'])
-               dict_['worst_loop_sec'] = '{:.11f}'.format(dict_['worst_loop_sec'])
-               if dict_['second_worst_loop_sec'] == -1.0:
-                  dict_['second_worst_loop_sec'] = 'NOT-MEASURED'
-               else:
-                  dict_['second_worst_loop_sec'] = '{:.11f}'.format(dict_['second_worst_loop_sec'])
-               dict_['all_loops_time_sec'] = '{:.11f}'.format(dict_['all_loops_time_sec'])
-            else:
-               dict_['avg_loop_sec'] = format_time(dict_['avg_loop_sec'])
-               dict_['best_loop_sec'] = format_time(dict_['best_loop_sec'])
-               dict_['second_best_loop_sec'] = format_time(dict_['second_best_loop_sec'])
-               dict_['worst_loop_sec'] = format_time(dict_['worst_loop_sec'])
-               dict_['second_worst_loop_sec'] = format_time(dict_['second_worst_loop_sec'])
-               dict_['all_loops_time_sec'] = format_time(dict_['all_loops_time_sec'])
-      elif benchmarkit__rank_by == 'worst':
-         table = sorted(table, key=itemgetter('best_loop_sec'), reverse=True)
-         compare_reference = table[0]['best_loop_sec']
-         for idx, dict_ in enumerate(table):
-            dict_['compare'] = '{:,.3f}'.format((dict_['best_loop_sec'] / compare_reference) * 100.0)
-            dict_['rank'] = '{:,}'.format(idx + 1)
-            dict_['loops'] = '{:,}'.format(dict_['loops'])
-            if output_in_sec:
-               dict_['avg_loop_sec'] = '{:.11f}'.format(dict_['avg_loop_sec'])
-               dict_['best_loop_sec'] = '{:.11f}'.format(dict_['best_loop_sec'])
-               if dict_['second_best_loop_sec'] == -1.0:
-                  dict_['second_best_loop_sec'] = 'NOT-MEASURED'
-               else:
-                  dict_['second_best_loop_sec'] = '{:.11f}'.format(dict_['second_best_loop_sec'])
-               dict_['worst_loop_sec'] = '{:.11f}'.format(dict_['worst_loop_sec'])
-               if dict_['second_worst_loop_sec'] == -1.0:
-                  dict_['second_worst_loop_sec'] = 'NOT-MEASURED'
-               else:
-                  dict_['second_worst_loop_sec'] = '{:.11f}'.format(dict_['second_worst_loop_sec'])
-               dict_['all_loops_time_sec'] = '{:.11f}'.format(dict_['all_loops_time_sec'])
-            else:
-               dict_['avg_loop_sec'] = format_time(dict_['avg_loop_sec'])
-               dict_['best_loop_sec'] = format_time(dict_['best_loop_sec'])
-               dict_['second_best_loop_sec'] = format_time(dict_['second_best_loop_sec'])
-               dict_['worst_loop_sec'] = format_time(dict_['worst_loop_sec'])
-               dict_['second_worst_loop_sec'] = format_time(dict_['second_worst_loop_sec'])
-               dict_['all_loops_time_sec'] = format_time(dict_['all_loops_time_sec'])
-      else:
+   if benchmarkit__interpreters:
+      # lazy import: subprocess and pickle are only needed for the interpreter subprocesses
+      from PySpeedIT.multi_interpreter import measure_functions_in_interpreters
+      all_tables, memory_budget_rows, interpreters_info = measure_functions_in_interpreters(
+         benchmarkit__interpreters,
+         getattr(loaded_module, '__file__', module_path),
+         module_tuple_of_func_tuples,
+         {
+            'use_func_name': use_func_name,
+            'benchmarkit__with_gc': benchmarkit__with_gc,
+            'benchmarkit__check_too_fast': benchmarkit__check_too_fast,
+            'benchmarkit__run_sec': benchmarkit__run_sec,
+            'benchmarkit__repeat': benchmarkit__repeat,
+            'benchmarkit__engine': benchmarkit__engine,
+            'benchmarkit__stable_mode': benchmarkit__stable_mode,
+            'benchmarkit__noise_limits': benchmarkit__noise_limits,
+            'benchmarkit__outlier_method': benchmarkit__outlier_method,
+            'job_timeout_sec': job_timeout_sec,
+            'benchmarkit__memory_budgets_mb': benchmarkit__memory_budgets_mb,
+            'benchmarkit__incremental': benchmarkit__incremental,
+            'benchmarkit__work_units': resolved_work_units,
+            'benchmarkit__slos': checked_slos,
+            'benchmarkit__isolate_jobs': benchmarkit__isolate_jobs,
+         },
+         benchmarkit__shared_buffers
+      )
+   else:
+      all_tables, memory_budget_rows = measure_functions_in_module(
+         loaded_module,
+         module_tuple_of_func_tuples,
+         use_func_name,
+         benchmarkit__with_gc,
+         benchmarkit__check_too_fast,
+         benchmarkit__run_sec,
+         benchmarkit__repeat,
+         benchmarkit__engine,
+         variant_modules,
+         benchmarkit__stable_mode,
+         benchmarkit__noise_limits,
+         benchmarkit__outlier_method,
+         job_timeout_sec,
+         benchmarkit__memory_budgets_mb,
+         perf_counter_reference_time,
+         benchmarkit__incremental,
+         resolved_work_units,
+         checked_slos,
+         benchmarkit__isolate_jobs
+      )
+      interpreters_info = []
+   # the html and json writers are consumers of the result objects: each row is formatted in a new dict
+   all_tables = [[BenchmarkRow.from_dict(benchmark_result) for benchmark_result in table] for table in all_tables]
+
+   # structured output: unformatted values: times in seconds
+   json_result = {
+      'module_name': module_name,
+      'module_path': module_path,
+      'parameters': {
+         'use_func_name': use_func_name,
+         'benchmarkit__with_gc': benchmarkit__with_gc,
+         'benchmarkit__check_too_fast': benchmarkit__check_too_fast,
+         'benchmarkit__rank_by': benchmarkit__rank_by,
+         'benchmarkit__run_sec': benchmarkit__run_sec,
+         'benchmarkit__repeat': benchmarkit__repeat,
+         'benchmarkit__engine': benchmarkit__engine,
+         'benchmarkit__stable_mode': benchmarkit__stable_mode,
+         'benchmarkit__outlier_method': benchmarkit__outlier_method,
+         'benchmarkit__reject_outliers': benchmarkit__reject_outliers,
+         'job_timeout_sec': job_timeout_sec,
+         'benchmarkit__memory_budgets_mb': benchmarkit__memory_budgets_mb,
+         'benchmarkit__interpreters': benchmarkit__interpreters,
+         'benchmarkit__incremental': benchmarkit__incremental,
+         'benchmarkit__work_units': resolved_work_units,
+         'benchmarkit__slos': checked_slos,
+         'benchmarkit__isolate_jobs': benchmarkit__isolate_jobs,
+         'benchmarkit__shared_buffers': benchmarkit__shared_buffers,
+      },
+      'interpreters': interpreters_info,
+      'repeats': [],
+   }
+   all_slo_results = [
+      dict(slo_result, name=row.name) for table in all_tables for row in table for slo_result in row.slos or ()
+   ]
+   json_result['slo_status'] = None if not checked_slos else 'PASS' if all(
+      slo_result['status'] == 'PASS' for slo_result in all_slo_results) else 'FAIL'
+   compare_key = _helper_get_compare_key(benchmarkit__rank_by, benchmarkit__reject_outliers)
+   if compare_key in THROUGHPUT_COMPARE_KEYS:
+      undeclared_names = sorted({row.name for table in all_tables for row in table if getattr(row, compare_key) is None})
+      if undeclared_names:
          raise Err('benchmark_functions_in_module', [
-            'WRONG PARAMETER ERROR',
-            '  <benchmarkit__rank_by> must be one of: <best, average, worst> We got: <{}>'.format(benchmarkit__rank_by)
+            'benchmarkit__rank_by: <{}> needs the work units: <{}> of all functions: see: <benchmarkit__work_units>'.format(
+               benchmarkit__rank_by, THROUGHPUT_COMPARE_KEYS[compare_key]),
+            '  not declared for: <{}>'.format(', '.join(undeclared_names))
          ])
+   for table in all_tables:
+      # a higher throughput ranks first: rows which were not measured rank last: e.g. jobs which raised or crashed
+      table = [row.as_dict() for row in table]
+      table = sorted((dict_ for dict_ in table if dict_[compare_key] != -1.0), key=itemgetter(compare_key),
+                     reverse=benchmarkit__rank_by == 'worst' or compare_key in THROUGHPUT_COMPARE_KEYS) + \
+         [dict_ for dict_ in table if dict_[compare_key] == -1.0]
+      compare_reference = table[0][compare_key]
+
+      if benchmarkit__plots:
+         final_plots = get_html_plots_template().format(
+            body_box_plot=get_svg_box_plot([(dict_['name'], dict_) for dict_ in table]),
+            body_histograms=''.join(get_svg_histogram(dict_['samples'], dict_['name'], dict_) for dict_ in table),
+         )
+      else:
+         final_plots = ''
+
+      json_table = []
+      for idx, dict_ in enumerate(table):
+         dict_['rank_value_sec'] = dict_[compare_key]
+         json_row = {key: value for key, value in dict_.items() if key != 'samples'}
+         if dict_[compare_key] == -1.0 or compare_reference == -1.0:
+            json_row['compare_percent'] = -1.0
+         else:
+            json_row['compare_percent'] = (dict_[compare_key] / compare_reference) * 100.0
+         json_row['rank'] = idx + 1
+         json_table.append(json_row)
 
+         if json_row['compare_percent'] == -1.0:
+            dict_['compare'] = 'NOT-MEASURED'
+         else:
+            dict_['compare'] = '{:,.3f}'.format(json_row['compare_percent'])
+         dict_['rank'] = '{:,}'.format(idx + 1)
+         dict_['loops'] = '{:,}'.format(dict_['loops'])
+         dict_['suspect'] = '<br />'.join(dict_['suspect']) or 'no'
+         dict_['rank_value_sec'] = _helper_format_rank_value(dict_['rank_value_sec'], compare_key, output_in_sec)
+         dict_['slos'] = _helper_format_slos(dict_['slos'], output_in_sec)
+         _helper_format_benchmark_row(dict_, output_in_sec)
 
       final_result_rows = ''
       for row in table:
@@ -783,6 +2420,9 @@ def benchmark_functions_in_module(
          final_result_rows += get_html_table_row_template().format(
             td_class=final_td_class,
             td_name=row['name'],
+            td_status=row['status'],
+            td_fresh='fresh' if row['fresh'] else 'cached: {}'.format(
+               time_strftime('%Y-%m-%d %H:%M:%S', time_localtime(row['measured_at']))),
             td_rank=row['rank'],
             td_compare=row['compare'],
             td_num_loops=row['loops'],
@@ -791,13 +2431,31 @@ def benchmark_functions_in_module(
             td_second_best_loop=row['second_best_loop_sec'],
             td_worst_loop=row['worst_loop_sec'],
             td_second_worst_loop=row['second_worst_loop_sec'],
+            td_median_loop=row['median_loop_sec'],
+            td_outliers=row['outliers'],
+            td_clean_avg_loop=row['clean_avg_loop_sec'],
+            td_clean_worst_loop=row['clean_worst_loop_sec'],
+            td_rank_value=row['rank_value_sec'],
+            td_ops_per_sec=row['ops_per_sec'],
+            td_bytes_per_sec=row['bytes_per_sec'],
+            td_slos=row['slos'],
             td_all_loops_time=row['all_loops_time_sec'],
+            td_engine=row['engine'],
+            td_call_overhead=row['call_overhead_sec'],
+            td_suspect=row['suspect'],
+            td_minor_faults=row['minor_faults'],
+            td_major_faults=row['major_faults'],
+            td_voluntary_ctx_switches=row['voluntary_ctx_switches'],
+            td_involuntary_ctx_switches=row['involuntary_ctx_switches'],
+            td_max_rss=row['max_rss_kb'],
+            td_io_read_bytes=row['io_read_bytes'],
+            td_io_write_bytes=row['io_write_bytes'],
          )
 
       final_html_table_profile += get_html_table_template().format(
          head_title_func=module_name,
          head_module_path=module_path,
-         head_module_num_functions=len(module_tuple_of_func_tuples),
+         head_module_num_functions=len(table),
 
          head_parameter_output_max_slashes_fileinfo='{}'.format(output_max_slashes_fileinfo),
          head_parameter_use_func_name='{}'.format(use_func_name),
@@ -808,12 +2466,54 @@ def benchmark_functions_in_module(
          head_parameter_benchmarkit__rank_by='{}'.format(benchmarkit__rank_by),
          head_parameter_benchmarkit__run_sec='{}'.format(benchmarkit__run_sec),
          head_parameter_benchmarkit__repeat='{}'.format(benchmarkit__repeat),
-
-         head_thead_benchmarkit__rank_by='rank-{}'.format(benchmarkit__rank_by),
-         head_tfoot_benchmarkit__rank_by='rank-{}'.format(benchmarkit__rank_by),
+         head_parameter_benchmarkit__engine='{}'.format(benchmarkit__engine),
+         head_parameter_benchmarkit__stable_mode='{}'.format(benchmarkit__stable_mode),
+
+         head_parameter_benchmarkit__outlier_method='{}'.format(benchmarkit__outlier_method),
+         head_parameter_benchmarkit__reject_outliers='{}'.format(benchmarkit__reject_outliers),
+         head_parameter_job_timeout_sec='{}'.format(job_timeout_sec),
+         head_parameter_benchmarkit__incremental='{}'.format(benchmarkit__incremental),
+         head_parameter_benchmarkit__isolate_jobs='{}'.format(benchmarkit__isolate_jobs),
+         head_parameter_benchmarkit__shared_buffers='{}'.format(benchmarkit__shared_buffers),
+         head_parameter_benchmarkit__work_units=html_escape('{}'.format(resolved_work_units or None)),
+         head_parameter_benchmarkit__slos=html_escape('{}'.format(checked_slos or None)),
+         head_parameter_benchmarkit__interpreters=html_escape(', '.join(
+            '{}: {}: handoff: {:,.2f} MiB pickled: {:,.2f} MiB shared: {}'.format(
+               interpreter_info['label'],
+               interpreter_info['executable'],
+               interpreter_info['handoff_pickled_bytes'] / float(2 ** 20),
+               interpreter_info['handoff_shared_bytes'] / float(2 ** 20),
+               format_time(interpreter_info['handoff_sec']),
+            ) for interpreter_info in interpreters_info) or 'current'),
+
+         head_thead_benchmarkit__rank_by='rank-{}: {}'.format(benchmarkit__rank_by, compare_key),
+         head_tfoot_benchmarkit__rank_by='rank-{}: {}'.format(benchmarkit__rank_by, compare_key),
 
          body_final_result_rows=final_result_rows,
       )
+      final_html_table_profile += final_plots
+      json_result['repeats'].append(json_table)
+
+   if memory_budget_rows:
+      final_html_table_profile += _helper_get_memory_budget_table(
+         memory_budget_rows, module_name, benchmarkit__memory_budgets_mb, compare_key, output_in_sec)
+      json_result['memory_budgets'] = [
+         {
+            'name': row['name'],
+            'baseline_address_space_mb': row['baseline_address_space_mb'],
+            'smallest_completing_budget_mb': row['smallest_completing_budget_mb'],
+            'budget_results': [
+               {
+                  'memory_budget_mb': budget_result['memory_budget_mb'],
+                  'status': budget_result['status'],
+                  'error': budget_result['error'],
+                  'benchmark_result': None if budget_result['benchmark_result'] is None else {
+                     key: value for key, value in budget_result['benchmark_result'].items() if key != 'samples'
+                  },
+               } for budget_result in row['budget_results']
+            ],
+         } for row in memory_budget_rows
+      ]
 
    final_html_table_profile += '''
    </body>
@@ -821,3 +2521,7 @@ def benchmark_functions_in_module(
    '''
    with open(path_join(benchmarks_dir_path, 'benchmark_it__{}.html'.format(module_name)), 'w') as file_:
       file_.write(final_html_table_profile)
+   if benchmarkit__output_json:
+      with open(path_join(benchmarks_dir_path, 'benchmark_it__{}.json'.format(module_name)), 'w') as file_:
+         json_dump(json_result, file_, indent=3)
+   return all_slo_results
@@ -0,0 +1,154 @@
+"""
+=============
+PySpeedIT.cli
+=============
+
+Overview
+========
+Command line interface: ``python -m PySpeedIT.cli`` or the console script ``pyspeedit``.
+
+Commands
+--------
+
+   - ``run-suite SUITE_FILE RESULT_FILE``: runs a serialized Benchmark-IT suite in the running interpreter and writes
+     the serialized results: used by :mod:`PySpeedIT.multi_interpreter` for each interpreter
+
+   - ``slo-gate JSON_FILE [JSON_FILE ...]``: checks the Benchmark-IT SLOs of the structured output
+     (``benchmarkit__output_json``): prints each SLO which did not pass: exit code 1 if any: see :mod:`PySpeedIT.slo`
+
+.. code-block:: sh
+
+   python3.12 -m PySpeedIT.cli run-suite suite.pickle result.pickle
+
+   pyspeedit slo-gate BenchmarkIT_Results/benchmark_it__*.json
+
+.. note:: this module is not Cython compiled: ``python -m`` needs the python source
+
+
+Functions
+=========
+
+.. autofunction:: run_suite
+
+.. autofunction:: slo_gate
+
+.. autofunction:: main
+"""
+from argparse import ArgumentParser
+from json import load as json_load
+from importlib.util import (
+   module_from_spec as importlib_module_from_spec,
+   spec_from_file_location as importlib_spec_from_file_location,
+)
+from os.path import (
+   basename as path_basename,
+   splitext as path_splitext,
+)
+from sys import (
+   exit as sys_exit,
+   modules as sys_modules,
+)
+from time import perf_counter
+
+from PySpeedIT.benchmark_it import measure_functions_in_module
+from PySpeedIT.multi_interpreter import (
+   read_suite_file,
+   write_result_file,
+)
+from PySpeedIT.shared_buffers import (
+   attach_arguments,
+   release_segments,
+)
+from PySpeedIT.slo import get_slo_exit_code
+
+
+def run_suite(suite_file_path, result_file_path):
+   """ Runs a serialized Benchmark-IT suite in the running interpreter and writes the serialized results
+
+   - the module is loaded before any timing: its import cost is not part of the results
+   - shared buffer arguments are attached as zero-copy views: see: :mod:`PySpeedIT.shared_buffers`
+
+   :param suite_file_path: (str) see: :py:func:`PySpeedIT.multi_interpreter.write_suite_file`
+   :param result_file_path: (str) see: :py:func:`PySpeedIT.multi_interpreter.write_result_file`
+   """
+   handoff_start_time = perf_counter()
+   suite = read_suite_file(suite_file_path)
+   module_tuple_of_func_tuples, segments = attach_arguments(suite['module_tuple_of_func_tuples'])
+   handoff_sec = perf_counter() - handoff_start_time
+   module_file_path = suite['module_file_path']
+   module_name = path_splitext(path_basename(module_file_path))[0]
+   module_spec = importlib_spec_from_file_location(module_name, module_file_path)
+   loaded_module = importlib_module_from_spec(module_spec)
+   sys_modules[module_name] = loaded_module
+   module_spec.loader.exec_module(loaded_module)
+
+   all_tables, memory_budget_rows = measure_functions_in_module(
+      loaded_module,
+      module_tuple_of_func_tuples,
+      **suite['options']
+   )
+   # the views must be released before the segments are closed
+   del module_tuple_of_func_tuples
+   release_segments(segments, unlink=False)
+   write_result_file(result_file_path, all_tables, memory_budget_rows, handoff_sec)
+
+
+def slo_gate(json_file_paths):
+   """ Checks the Benchmark-IT SLOs of the structured output: prints each SLO which did not pass
+
+   :param json_file_paths: (list) Benchmark-IT json files: see: option `benchmarkit__output_json` of
+      :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :return: (int) exit code: see: :py:func:`PySpeedIT.slo.get_slo_exit_code`
+   """
+   all_slo_results = []
+   for json_file_path in json_file_paths:
+      with open(json_file_path, 'r') as file_:
+         json_result = json_load(file_)
+      for json_table in json_result['repeats']:
+         for json_row in json_table:
+            for slo_result in json_row.get('slos') or ():
+               all_slo_results.append(slo_result)
+               if slo_result['status'] != 'PASS':
+                  print('{}: {}: p{:g} <= {:.6g} sec: {}: p{:g}: {:.6g} sec: samples: {} of {} needed'.format(
+                     json_result['module_name'],
+                     json_row['name'],
+                     slo_result['percentile'],
+                     slo_result['threshold_sec'],
+                     slo_result['status'],
+                     slo_result['percentile'],
+                     slo_result['percentile_sec'],
+                     slo_result['samples'],
+                     slo_result['required_samples'],
+                  ))
+   print('SLO gate: {} of {} SLO results passed'.format(
+      sum(slo_result['status'] == 'PASS' for slo_result in all_slo_results), len(all_slo_results)))
+   return get_slo_exit_code(all_slo_results)
+
+
+def main(argv=None):
+   """ Command line entry point
+
+   :param argv: (list or None) command line arguments: if None: `sys.argv[1:]`
+   :return: (int) exit code
+   """
+   parser = ArgumentParser(prog='pyspeedit', description='PySpeedIT command line interface')
+   subparsers = parser.add_subparsers(dest='command', required=True)
+   run_suite_parser = subparsers.add_parser(
+      'run-suite', help='run a serialized Benchmark-IT suite in this interpreter'
+   )
+   run_suite_parser.add_argument('suite_file_path', help='serialized suite description')
+   run_suite_parser.add_argument('result_file_path', help='serialized results to write')
+   slo_gate_parser = subparsers.add_parser(
+      'slo-gate', help='exit code 1 if any Benchmark-IT SLO of the json results did not pass'
+   )
+   slo_gate_parser.add_argument('json_file_paths', nargs='+', help='Benchmark-IT json results')
+
+   args = parser.parse_args(argv)
+   if args.command == 'slo-gate':
+      return slo_gate(args.json_file_paths)
+   run_suite(args.suite_file_path, args.result_file_path)
+   return 0
+
+
+if __name__ == '__main__':
+   sys_exit(main())
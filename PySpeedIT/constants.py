@@ -0,0 +1,22 @@
+"""
+===================
+PySpeedIT.constants
+===================
+
+Overview
+========
+Option defaults and choices which :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` needs up front: no imports: the
+modules of the features which use them are only loaded when the feature is used.
+
+   - `SAMPLING_DEFAULT_INTERVAL_SEC`: see :mod:`PySpeedIT.sampling_profiler`
+   - `CONTEXT_PROFILER_DEFAULT_MAX_DEPTH`: see :mod:`PySpeedIT.context_profiler`
+   - `SHARED_BUFFER_BACKENDS`: see :mod:`PySpeedIT.shared_buffers`
+"""
+
+
+# the sampling Profile-IT engine: 1000 samples per second: about 10 - 20 microseconds per sample: about 1 - 2 % overhead
+SAMPLING_DEFAULT_INTERVAL_SEC = 0.001
+# the context Profile-IT engine: maximum depth of the calling-context tree
+CONTEXT_PROFILER_DEFAULT_MAX_DEPTH = 64
+# the zero-copy argument handoff to the interpreter subprocesses
+SHARED_BUFFER_BACKENDS = ('shm', 'mmap')
@@ -0,0 +1,273 @@
+"""
+==================
+PySpeedIT.fixtures
+==================
+
+Overview
+========
+
+Deterministic benchmark inputs: a :py:class:`Fixture` is a placeholder in the positional or keyword arguments of a
+function tuple. Its value is built once per run by a seeded factory: ``factory(rng, *args, **kwargs)``: `rng` is a
+`random.Random(seed)` instance: the same seed builds the same input in each run.
+
+   - the value is cached: fixtures of all modules with the same factory, seed and arguments share it: the factory is
+     identified by its module and qualified name
+   - each job gets an isolated view of the value: a function which changes its input in place does not change the input
+     of the next job or repeat: the view is made before any timing
+
+Isolation modes:
+
+   - ``copy``: a shallow copy: fast for flat containers: e.g. dict, list, bytearray, array
+   - ``deepcopy``: a deep copy: for nested containers
+   - ``readonly``: a read-only view where the type has one: a mapping proxy, a read-only memoryview, a not writeable
+     NumPy view: an immutable copy otherwise: tuple, frozenset: immutable values are shared
+   - ``cow``: copy-on-write after fork: jobs in forked child processes get the cached value itself: e.g. the memory
+     budget runs: jobs in the running process get a deep copy
+
+The cache lives until :py:func:`clear_fixtures`: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` clears it at the end
+of each run.
+
+The interpreter subprocesses of :mod:`PySpeedIT.multi_interpreter` get the values built by the running process: the
+factories do not need to be importable there: see :py:func:`build_func_tuples_fixtures`.
+
+.. code-block:: python3
+
+   def make_data(rng, size):
+      values = list(range(size))
+      rng.shuffle(values)
+      return dict(zip(range(size), values))
+
+   data = Fixture(make_data, seed=1, args=(1000,))
+
+   modules__func_tuples = (
+      [path_abspath('dict_sorting.py'), (
+         ('sorting: pep265', 'example_pep265', [data], {}),
+         ('sorting: lambda', 'example_lambda', [data], {}),
+      )],
+   )
+
+.. index:: Benchmark-IT; fixtures
+
+
+Classes
+=======
+
+.. autoclass:: Fixture
+   :members:
+
+
+Functions
+=========
+
+.. autofunction:: get_fixture_value
+
+.. autofunction:: get_fixture_view
+
+.. autofunction:: resolve_fixtures
+
+.. autofunction:: preload_fixtures
+
+.. autofunction:: build_func_tuples_fixtures
+
+.. autofunction:: clear_fixtures
+"""
+from array import array
+from copy import (
+   copy as copy_copy,
+   deepcopy as copy_deepcopy,
+)
+from random import Random
+from types import MappingProxyType
+
+from PySpeedIT.utils import Err
+
+
+FIXTURE_ISOLATION_MODES = ('copy', 'deepcopy', 'readonly', 'cow')
+# values which are shared by all views
+IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, tuple, frozenset, range)
+
+# fixture key: built value
+_FIXTURE_VALUES = {}
+
+
+class Fixture(object):
+   """ A benchmark input built once per run by a seeded factory: a placeholder in the function arguments
+
+   - factory: (callable) ``factory(rng, *args, **kwargs)``: returns the value
+   - seed: (int) seed of the `random.Random` instance passed as `rng`
+   - args, kwargs: (tuple, dict) further arguments of the factory: part of the key
+   - isolation: (str) ``copy``, ``deepcopy``, ``readonly`` or ``cow``
+   """
+   __slots__ = ('factory', 'seed', 'args', 'kwargs', 'isolation')
+
+   def __init__(self, factory, seed=0, args=(), kwargs=None, isolation='copy'):
+      """ Constructor.
+
+      :raise Err: for a factory which is not callable or an unknown isolation mode
+      """
+      if not callable(factory):
+         raise Err('Fixture', ['factory: <{!r}> must be callable'.format(factory)])
+      if isolation not in FIXTURE_ISOLATION_MODES:
+         raise Err('Fixture', [
+            'isolation: <{}> must be one of: <{}>'.format(isolation, ', '.join(FIXTURE_ISOLATION_MODES))
+         ])
+      self.factory = factory
+      self.seed = seed
+      self.args = tuple(args)
+      self.kwargs = dict(kwargs or {})
+      self.isolation = isolation
+
+   def get_key(self):
+      """ Returns the cache key: equal for the same factory, seed and arguments: the isolation is not part of it
+
+      :return: (tuple) format: (factory_module, factory_qualname, seed, args_repr, kwargs_repr)
+      """
+      return (
+         getattr(self.factory, '__module__', None),
+         getattr(self.factory, '__qualname__', repr(self.factory)),
+         self.seed,
+         repr(self.args),
+         repr(sorted(self.kwargs.items())),
+      )
+
+   def __repr__(self):
+      # no object ids: used for the fingerprints of the result cache
+      factory_module, factory_qualname, seed, args_repr, kwargs_repr = self.get_key()
+      return 'Fixture({}.{}, seed={!r}, args={}, kwargs={}, isolation={!r})'.format(
+         factory_module, factory_qualname, seed, args_repr, kwargs_repr, self.isolation)
+
+
+def get_fixture_value(fixture):
+   """ Returns the cached value of a fixture: built on first use
+
+   :param fixture: (obj) :py:class:`Fixture`
+   :return: the value: shared: use :py:func:`get_fixture_view` for an isolated view
+   :raise Err: if the factory raises an exception
+   """
+   key = fixture.get_key()
+   if key not in _FIXTURE_VALUES:
+      try:
+         _FIXTURE_VALUES[key] = fixture.factory(Random(fixture.seed), *fixture.args, **fixture.kwargs)
+      except Exception as err:
+         raise Err('get_fixture_value', [
+            'fixture: <{!r}>'.format(fixture),
+            '  Exception: <{}>'.format(err)
+         ])
+   return _FIXTURE_VALUES[key]
+
+
+def _helper_get_readonly_view(value):
+   """ Returns a read-only view of value or an immutable copy
+
+   :raise Err: for types without a read-only view or immutable copy
+   """
+   if isinstance(value, IMMUTABLE_TYPES):
+      return value
+   if isinstance(value, dict):
+      return MappingProxyType(value)
+   if isinstance(value, (bytearray, array, memoryview)):
+      return memoryview(value).toreadonly()
+   if isinstance(value, list):
+      return tuple(value)
+   if isinstance(value, set):
+      return frozenset(value)
+   # e.g. NumPy arrays: duck typed
+   if hasattr(value, 'view') and hasattr(value, 'setflags'):
+      view = value.view()
+      view.setflags(write=False)
+      return view
+   raise Err('get_fixture_view', [
+      'isolation: <readonly> not supported for type: <{}>'.format(type(value).__name__),
+      '  use isolation: <copy> or <deepcopy>'
+   ])
+
+
+def get_fixture_view(fixture, forked=False):
+   """ Returns an isolated view of the value of a fixture
+
+   :param fixture: (obj) :py:class:`Fixture`
+   :param forked: (bool) True if the view is used in a forked child process: isolation ``cow`` shares the value
+   :return: the view: see: the isolation modes
+   """
+   value = get_fixture_value(fixture)
+   if fixture.isolation == 'readonly':
+      return _helper_get_readonly_view(value)
+   if isinstance(value, IMMUTABLE_TYPES):
+      return value
+   if fixture.isolation == 'copy':
+      return copy_copy(value)
+   if fixture.isolation == 'cow' and forked:
+      return value
+   return copy_deepcopy(value)
+
+
+def resolve_fixtures(func_positional_arguments, func_keyword_arguments, forked=False):
+   """ Returns the function arguments with each :py:class:`Fixture` replaced by an isolated view
+
+   :param func_positional_arguments: (list) positional arguments of a function tuple
+   :param func_keyword_arguments: (dict) keyword arguments of a function tuple
+   :param forked: (bool) see: :py:func:`get_fixture_view`
+   :return: (tuple) format: (func_positional_arguments, func_keyword_arguments): new containers only if any fixtures
+   """
+   if not any(isinstance(argument, Fixture) for argument in func_positional_arguments) and \
+         not any(isinstance(argument, Fixture) for argument in func_keyword_arguments.values()):
+      return func_positional_arguments, func_keyword_arguments
+   return [
+      get_fixture_view(argument, forked) if isinstance(argument, Fixture) else argument
+      for argument in func_positional_arguments
+   ], {
+      key: get_fixture_view(argument, forked) if isinstance(argument, Fixture) else argument
+      for key, argument in func_keyword_arguments.items()
+   }
+
+
+def preload_fixtures(func_positional_arguments, func_keyword_arguments):
+   """ Builds the values of all fixtures in the function arguments: e.g. before forking job processes
+
+   :param func_positional_arguments: (list) positional arguments of a function tuple
+   :param func_keyword_arguments: (dict) keyword arguments of a function tuple
+   """
+   for argument in list(func_positional_arguments) + list(func_keyword_arguments.values()):
+      if isinstance(argument, Fixture):
+         get_fixture_value(argument)
+
+
+def build_func_tuples_fixtures(module_tuple_of_func_tuples):
+   """ Returns the function tuples with each :py:class:`Fixture` replaced by its value: e.g. to hand them off to other
+   processes
+
+   - isolation ``copy`` and ``deepcopy``: each function tuple gets its own copy
+   - isolation ``readonly`` and ``cow``: all function tuples share the value: the receiving process has its own copy
+
+   :param module_tuple_of_func_tuples: (tuple) see: `modules__func_tuples` of
+      :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :return: (tuple) of function tuples: the given tuples if no function tuple has a fixture
+   """
+   if not any(
+         isinstance(argument, Fixture)
+         for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples
+         for argument in list(func_positional_arguments) + list(func_keyword_arguments.values())):
+      return module_tuple_of_func_tuples
+
+   def build(argument):
+      if not isinstance(argument, Fixture):
+         return argument
+      if argument.isolation in ('readonly', 'cow'):
+         return get_fixture_value(argument)
+      return get_fixture_view(argument)
+
+   return tuple(
+      (
+         name_str,
+         function_name_str,
+         [build(argument) for argument in func_positional_arguments],
+         {key: build(argument) for key, argument in func_keyword_arguments.items()},
+      )
+      for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples
+   )
+
+
+def clear_fixtures():
+   """ Clears the cached fixture values: the next use builds them again
+   """
+   _FIXTURE_VALUES.clear()
@@ -0,0 +1,173 @@
+"""
+=====================
+PySpeedIT.fork_server
+=====================
+
+Overview
+========
+A fork server for isolated *Benchmark-IT* jobs: each job runs in a clean child process which costs a fork: not an
+interpreter start and imports.
+
+The server is forked once from the running process after PySpeedIT, the benchmarked module, its variants and the
+fixtures are loaded: see :mod:`PySpeedIT.fixtures`. For each job request it forks a child from its own unchanged state:
+the child runs the job and sends the result back over a pipe: the server relays it to the requesting process.
+
+   - a job can not change the state seen by the following jobs: e.g. module globals, caches, fixture values or the
+     heap layout
+   - the requests and results are pickled: the job functions are inherited by the fork: they do not need to be picklable
+   - status of a job: ``OK``, ``ERROR``: the job raised an exception, ``CRASHED``: the child ended without a result:
+     e.g. a C extension aborted
+
+Needs the `fork` start method: Linux and other POSIX systems.
+
+.. code-block:: python3
+
+   with ForkServer(run_job) as fork_server:
+      status, result, error_text = fork_server.submit(job_idx)
+
+.. index:: Benchmark-IT; fork server
+
+
+Classes
+=======
+
+.. autoclass:: ForkServer
+   :members:
+
+
+Functions
+=========
+
+.. autofunction:: is_fork_server_supported
+"""
+from multiprocessing import (
+   get_all_start_methods as multiprocessing_get_all_start_methods,
+   get_context as multiprocessing_get_context,
+)
+
+from PySpeedIT.utils import Err
+
+
+def is_fork_server_supported():
+   """ Returns True if a fork server can be started on this system
+
+   :return: (bool)
+   """
+   return 'fork' in multiprocessing_get_all_start_methods()
+
+
+def _helper_fork_server_child(connection, run_job, request):
+   """ Runs in the forked job child: sends the tuple: (status, result or None, error_text)
+   """
+   try:
+      result = run_job(request)
+      status = 'OK'
+      error_text = ''
+   except Exception as err:
+      result = None
+      status = 'ERROR'
+      error_text = repr(err)
+   connection.send((status, result, error_text))
+   connection.close()
+
+
+def _helper_fork_server_main(request_connection, response_connection, run_job):
+   """ Runs in the fork server: forks a child per request until the request None
+   """
+   context = multiprocessing_get_context('fork')
+   while True:
+      try:
+         request = request_connection.recv()
+      except EOFError:
+         break
+      if request is None:
+         break
+
+      parent_connection, child_connection = context.Pipe(duplex=False)
+      child_process = context.Process(target=_helper_fork_server_child, args=(child_connection, run_job, request))
+      child_process.start()
+      # close the server copy: recv() raises EOFError if the child ends without a result
+      child_connection.close()
+      try:
+         response = parent_connection.recv()
+      except EOFError:
+         response = None
+      finally:
+         parent_connection.close()
+         child_process.join()
+      if response is None:
+         response = ('CRASHED', None, 'exit code: <{}>'.format(child_process.exitcode))
+      response_connection.send(response)
+   response_connection.close()
+
+
+class ForkServer(object):
+   """ Runs each job in a child forked from a server process: see: the module documentation
+
+   - run_job: (callable) ``run_job(request)``: runs in the child: returns the picklable result
+   """
+
+   def __init__(self, run_job):
+      """ Constructor.
+
+      :param run_job: (callable) called in the job child with the request: inherited by the fork
+      :raise Err: if the `fork` start method is not supported
+      """
+      if not is_fork_server_supported():
+         raise Err('ForkServer', ['needs the `fork` start method: not supported on this system'])
+      self.run_job = run_job
+      self.server_process = None
+      self.request_connection = None
+      self.response_connection = None
+
+   def start(self):
+      """ Forks the server process: everything loaded until now is inherited by all job children
+      """
+      context = multiprocessing_get_context('fork')
+      server_request_connection, self.request_connection = context.Pipe(duplex=False)
+      self.response_connection, server_response_connection = context.Pipe(duplex=False)
+      self.server_process = context.Process(
+         target=_helper_fork_server_main,
+         args=(server_request_connection, server_response_connection, self.run_job),
+      )
+      self.server_process.start()
+      server_request_connection.close()
+      server_response_connection.close()
+
+   def submit(self, request):
+      """ Runs one job in a new child of the server: waits for its result
+
+      :param request: (picklable) passed to `run_job`
+      :return: (tuple) format: (status, result, error_text): status: ``OK``, ``ERROR`` or ``CRASHED``: result: None if
+         not ``OK``: error_text: the exception or the exit code of the child
+      :raise Err: if the server process ended
+      """
+      try:
+         self.request_connection.send(request)
+         return self.response_connection.recv()
+      except (EOFError, OSError) as err:
+         raise Err('ForkServer.submit', [
+            'the fork server ended: exit code: <{}>'.format(self.server_process.exitcode),
+            '  Exception: <{!r}>'.format(err)
+         ])
+
+   def close(self):
+      """ Stops the server process
+      """
+      if self.server_process is None:
+         return
+      try:
+         self.request_connection.send(None)
+      except OSError:
+         pass
+      self.request_connection.close()
+      self.response_connection.close()
+      self.server_process.join()
+      self.server_process = None
+
+   def __enter__(self):
+      self.start()
+      return self
+
+   def __exit__(self, exc_type, exc_value, traceback):
+      self.close()
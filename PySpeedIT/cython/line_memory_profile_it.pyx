@@ -13,6 +13,9 @@ A profiler that records the amount of memory for each line.
 
 This code is based on parts of: `memory_profiler <https://github.com/fabianp/memory_profiler>`_.
 
+A function which exceeds the option ``job_timeout_sec`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` is
+reported with the status `TIMEOUT` and the lines measured until then.
+
 For usage see :mod:`PySpeedIT.speed_it`
 
 **OUTPUT HTML**
@@ -24,8 +27,11 @@ For usage see :mod:`PySpeedIT.speed_it`
 Functions
 =========
 
+.. autofunction:: line_memory_profile_functions
+
 .. autofunction:: line_memory_profile_functions_in_module
 """
+from array import array
 from inspect import getblock
 from linecache import getlines as linecache_getlines
 from os import (
@@ -38,11 +44,13 @@ from sys import (
    gettrace
 )
 
-from psutil import Process
-
+from PySpeedIT.fixtures import resolve_fixtures
+from PySpeedIT.results import LineMemoryResult
 from PySpeedIT.utils import (
    Err,
+   JobTimeout,
    get_html_template_css,
+   watchdog,
 )
 
 
@@ -67,6 +75,7 @@ def get_html_table_template():
       <tr>
          <th class="head_module_info" colspan="4">
             <strong>max_mem:</strong> {head_module_info_max_mem} &nbsp;
+            <strong>status:</strong> {head_module_info_status} &nbsp;
          </th>
       </tr>
       <tr>
@@ -75,7 +84,8 @@ def get_html_table_template():
          </th>
          <th class="head_parameter" colspan="3">
             <strong>output_max_slashes_fileinfo:</strong> {head_parameter_output_max_slashes_fileinfo} &nbsp;
-            <strong>use_func_name:</strong> {head_parameter_use_func_name}
+            <strong>use_func_name:</strong> {head_parameter_use_func_name} &nbsp;
+            <strong>job_timeout_sec:</strong> {head_parameter_job_timeout_sec}
          </th>
       </tr>
       <tr>
@@ -137,6 +147,9 @@ class _LineMemoryProfiler(object):
       self.max_mem = None
       self.prevline = None
       self._original_trace_function = gettrace()
+      # lazy import: psutil is only needed when Line-Memory-Profile-IT runs
+      from psutil import Process
+      self.process = Process(getpid())
 
 
    def __call__(self, func):
@@ -196,8 +209,7 @@ class _LineMemoryProfiler(object):
       if event in ('call', 'line', 'return') and frame.f_code in self.code_map:
          if event != 'call':
             # "call" event just saves the lineno but not the memory
-            process = Process(getpid())
-            mem = process.memory_info()[0] / float(2 ** 20)
+            mem = self.process.memory_info()[0] / float(2 ** 20)
             # if there is already a measurement for that line get the max
             old_mem = self.code_map[frame.f_code].get(self.prevline, 0)
             self.code_map[frame.f_code][self.prevline] = max(mem, old_mem)
@@ -209,13 +221,18 @@ class _LineMemoryProfiler(object):
       return self.trace_memory_usage
 
 
-def _memory_profile_it(mem_profiler):
-   """ Returns a dictionary with the memory profile result
+def _memory_profile_it(mem_profiler, name, status):
+   """ Returns the memory profile result
 
    :param mem_profiler: (class) instance of `_LineMemoryProfiler`
-   :return: (tuple) format: (max_mem, table): table = list_of_dictionaries
+   :param name: (str) the name of the result
+   :param status: (str) ``OK`` or ``TIMEOUT``
+   :return: (obj) :py:class:`PySpeedIT.results.LineMemoryResult`: unformatted values
    """
-   table = []
+   line_nums = array('l')
+   memory_usage_mib = array('d')
+   increment_memory_usage_mib = array('d')
+   source_lines = []
    max_mem = 0
    for code in mem_profiler.code_map:
       lines = mem_profiler.code_map[code]
@@ -241,17 +258,53 @@ def _memory_profile_it(mem_profiler):
                max_mem = mem
             mem_increment = mem - mem_old
             mem_old = mem
-         dict_ = {
-            'line_num': '{}'.format(line),
+         line_nums.append(line)
+         memory_usage_mib.append(mem)
+         increment_memory_usage_mib.append(mem_increment)
+         source_lines.append(all_lines[line - 1].strip())
+
+   return LineMemoryResult(
+      name, status, max_mem, line_nums, memory_usage_mib, increment_memory_usage_mib, tuple(source_lines)
+   )
+
+
+def line_memory_profile_functions(loaded_module, module_tuple_of_func_tuples, use_func_name=True, job_timeout_sec=None):
+   """ Returns the Line-Memory-Profile-IT results of all defined functions: the library API: nothing is written
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
 
-            'memory_usage': '{:.3f} MiB'.format(mem),
-            'increment_memory_usage': '{:.3f} MiB'.format(mem_increment),
-            'line': all_lines[line - 1].strip()
-         }
-         table.append(dict_)
+   :return: (list) of :py:class:`PySpeedIT.results.LineMemoryResult`: one per function
+   :raise Err:
+   """
+   line_memory_results = []
+   for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
+      try:
+         func = getattr(loaded_module, function_name_str)
+      except Exception as err:
+         raise Err('line_memory_profile_functions', [
+            'COULD NOT ACCESS FUNCTION ERROR: function_name_str: <{}>'.format(function_name_str),
+            '  loaded_module: <{}>'.format(loaded_module),
+            '    Exception: <{}>'.format(err)
+         ])
+      if use_func_name:
+         name = getattr(func, "__name__", func)
+      else:
+         name = name_str
 
-   max_mem = '{:.3f} MiB'.format(max_mem)
-   return max_mem, table
+      profiler = _LineMemoryProfiler()
+      func_positional_arguments, func_keyword_arguments = resolve_fixtures(
+         func_positional_arguments, func_keyword_arguments)
+      status = 'OK'
+      try:
+         with watchdog(job_timeout_sec):
+            profiler(func)(*func_positional_arguments, **func_keyword_arguments)
+      except JobTimeout:
+         # keep the lines measured until the timeout
+         status = 'TIMEOUT'
+      line_memory_results.append(_memory_profile_it(profiler, name, status))
+   return line_memory_results
 
 
 def line_memory_profile_functions_in_module(
@@ -261,7 +314,8 @@ def line_memory_profile_functions_in_module(
       linememoryprofiles_dir_path,
       module_tuple_of_func_tuples,
       output_max_slashes_fileinfo,
-      use_func_name):
+      use_func_name,
+      job_timeout_sec=None):
    """ Writes the results for one loaded_module for all defined functions to a html files overwriting them if they existed.
 
    .. seealso::
@@ -283,26 +337,10 @@ def line_memory_profile_functions_in_module(
 
    '''.format(head_embedded_style_sheet=get_html_template_css(), head_module_name=module_name)
 
-   for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
-      try:
-         func = getattr(loaded_module, function_name_str)
-      except Exception as err:
-         raise Err('_line_memory_profile_functions_in_module', [
-            'COULD NOT ACCESS FUNCTION ERROR: function_name_str: <{}>'.format(function_name_str),
-            '  loaded_module: <{}>'.format(loaded_module),
-            '    Exception: <{}>'.format(err)
-         ])
-      if use_func_name:
-         name = getattr(func, "__name__", func)
-      else:
-         name = name_str
-
-      profiler = _LineMemoryProfiler()
-      profiler(func)(*func_positional_arguments, **func_keyword_arguments)
-      max_mem, table = _memory_profile_it(profiler)
-
+   for line_memory_result in line_memory_profile_functions(
+         loaded_module, module_tuple_of_func_tuples, use_func_name, job_timeout_sec):
       final_result_rows = ''
-      for idx, row in enumerate(table):
+      for idx, (line_num, memory_usage, increment_memory_usage, line) in enumerate(line_memory_result.iter_rows()):
          if (idx % 2) == 0:
             final_td_class = 'row-even'
          else:
@@ -310,19 +348,21 @@ def line_memory_profile_functions_in_module(
 
          final_result_rows += get_html_table_row_template().format(
             td_class=final_td_class,
-            td_line_num=row['line_num'],
-            td_memory_usage=row['memory_usage'],
-            td_increment_memory_usage=row['increment_memory_usage'],
-            td_line=row['line'],
+            td_line_num='{}'.format(line_num),
+            td_memory_usage='{:.3f} MiB'.format(memory_usage),
+            td_increment_memory_usage='{:.3f} MiB'.format(increment_memory_usage),
+            td_line=line,
          )
 
       final_html_table_profile += get_html_table_template().format(
-         head_title_func=name,
+         head_title_func=line_memory_result.name,
          head_module_path=module_path,
-         head_module_info_max_mem=max_mem,
+         head_module_info_max_mem='{:.3f} MiB'.format(line_memory_result.max_mem_mib),
+         head_module_info_status=line_memory_result.status,
 
          head_parameter_output_max_slashes_fileinfo='{}'.format(output_max_slashes_fileinfo),
          head_parameter_use_func_name='{}'.format(use_func_name),
+         head_parameter_job_timeout_sec='{}'.format(job_timeout_sec),
 
          body_final_result_rows=final_result_rows,
       )
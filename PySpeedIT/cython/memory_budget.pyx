@@ -0,0 +1,180 @@
+"""
+=======================
+PySpeedIT.memory_budget
+=======================
+
+Overview
+========
+Runs a *Benchmark-IT* benchmark in a child process with a limited address space: a time/memory tradeoff curve.
+
+For each memory budget a child process is forked: it lowers its soft limits of `RLIMIT_AS` and `RLIMIT_DATA` to the
+budget and runs the benchmark: allocations above the budget fail with a `MemoryError`.
+
+   - the budget is the limit of the whole address space of the child process: inclusive the interpreter and all modules
+     inherited from the parent: the address space at the fork is reported as: `baseline_address_space_mb`
+   - the soft limits are restored before the result is sent back to the parent: only the benchmark is limited
+
+Status of a budget run:
+
+   - ``OK``: the benchmark completed
+   - ``MEMORY-ERROR``: the benchmark raised a `MemoryError`
+   - ``TIMEOUT``: the benchmark exceeded the `job_timeout_sec`: see :py:func:`PySpeedIT.utils.watchdog`
+   - ``CRASHED``: the child process ended without a result: e.g. a C extension aborted on a failed allocation
+   - ``ERROR``: the benchmark raised any other exception
+
+Needs the `resource` module and the `fork` start method: Linux and other POSIX systems.
+
+.. index:: Benchmark-IT; memory budgets
+
+
+Functions
+=========
+
+.. autofunction:: is_memory_budget_supported
+
+.. autofunction:: run_with_memory_budget
+
+.. autofunction:: get_smallest_completing_budget
+"""
+from multiprocessing import (
+   get_all_start_methods as multiprocessing_get_all_start_methods,
+   get_context as multiprocessing_get_context,
+)
+
+from PySpeedIT.utils import (
+   JobTimeout,
+   watchdog,
+)
+
+try:
+   from resource import (
+      RLIMIT_AS as resource_RLIMIT_AS,
+      RLIMIT_DATA as resource_RLIMIT_DATA,
+      RLIM_INFINITY as resource_RLIM_INFINITY,
+      getrlimit as resource_getrlimit,
+      setrlimit as resource_setrlimit,
+   )
+except ImportError:
+   resource_RLIMIT_AS = None
+   resource_RLIMIT_DATA = None
+   resource_RLIM_INFINITY = None
+   resource_getrlimit = None
+   resource_setrlimit = None
+
+
+def is_memory_budget_supported():
+   """ Returns True if benchmarks can be run with a memory budget on this system
+
+   :return: (bool)
+   """
+   return resource_setrlimit is not None and 'fork' in multiprocessing_get_all_start_methods()
+
+
+def _helper_set_soft_limits(limit_bytes_by_resource):
+   """ Sets the soft limits: returns the previous soft limits
+
+   - a soft limit can not be raised above the hard limit
+
+   :param limit_bytes_by_resource: (dict) resource: soft limit in bytes or `RLIM_INFINITY`
+   :return: (dict) resource: previous soft limit
+   """
+   previous_soft_limits = {}
+   for resource_, limit_bytes in limit_bytes_by_resource.items():
+      soft_limit, hard_limit = resource_getrlimit(resource_)
+      previous_soft_limits[resource_] = soft_limit
+      if hard_limit != resource_RLIM_INFINITY and (limit_bytes == resource_RLIM_INFINITY or limit_bytes > hard_limit):
+         limit_bytes = hard_limit
+      resource_setrlimit(resource_, (limit_bytes, hard_limit))
+   return previous_soft_limits
+
+
+def _helper_memory_budget_child(connection, timeit_obj, with_gc, limit_bytes, job_timeout_sec):
+   """ Runs in the forked child process: sends the tuple: (status, benchmark_result or None, error_text)
+
+   .. seealso:: run_with_memory_budget()
+   """
+   benchmark_result = None
+   error_text = ''
+   previous_soft_limits = _helper_set_soft_limits({
+      resource_RLIMIT_AS: limit_bytes,
+      resource_RLIMIT_DATA: limit_bytes,
+   })
+   try:
+      with watchdog(job_timeout_sec):
+         benchmark_result = timeit_obj.benchmark_it(with_gc=with_gc)
+      status = 'OK'
+   except MemoryError:
+      status = 'MEMORY-ERROR'
+   except JobTimeout:
+      status = 'TIMEOUT'
+   except Exception as err:
+      status = 'ERROR'
+      error_text = repr(err)
+   finally:
+      _helper_set_soft_limits(previous_soft_limits)
+
+   if status == 'TIMEOUT':
+      benchmark_result = timeit_obj.get_partial_result(job_timeout_sec)
+   connection.send((status, benchmark_result, error_text))
+   connection.close()
+
+
+def run_with_memory_budget(timeit_obj, with_gc, memory_budget_mb, job_timeout_sec=None):
+   """ Returns the result of running the benchmark in a forked child process limited to: memory_budget_mb
+
+   :param timeit_obj: (obj) instance of `_TimeIT` or `_CallTimeIT`: see: :mod:`PySpeedIT.benchmark_it`
+   :param with_gc: (bool) see: `_TimeIT.benchmark_it()`
+   :param memory_budget_mb: (int or float) limit of the address space of the child process in MiB
+   :param job_timeout_sec: (float or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :return: (dict) budget result
+
+      - memory_budget_mb: (int or float)
+      - status: (str) ``OK``, ``MEMORY-ERROR``, ``TIMEOUT``, ``CRASHED`` or ``ERROR``
+      - benchmark_result: (dict or None) see: `_TimeIT.benchmark_it()`: partial result for ``TIMEOUT``: None for
+        ``MEMORY-ERROR``, ``CRASHED`` and ``ERROR``
+      - baseline_address_space_mb: (float) address space of the process at the fork in MiB
+      - error: (str) the exception for ``ERROR`` or the exit code for ``CRASHED`` else empty
+   """
+   # lazy import: psutil is only needed for memory budget runs
+   from psutil import Process
+
+   budget_result = {
+      'memory_budget_mb': memory_budget_mb,
+      'status': 'CRASHED',
+      'benchmark_result': None,
+      'baseline_address_space_mb': Process().memory_info().vms / float(2 ** 20),
+      'error': '',
+   }
+   context = multiprocessing_get_context('fork')
+   parent_connection, child_connection = context.Pipe(duplex=False)
+   child_process = context.Process(
+      target=_helper_memory_budget_child,
+      args=(child_connection, timeit_obj, with_gc, int(memory_budget_mb * 2 ** 20), job_timeout_sec),
+   )
+   child_process.start()
+   # close the parent copy: recv() raises EOFError if the child ends without a result
+   child_connection.close()
+   try:
+      budget_result['status'], budget_result['benchmark_result'], budget_result['error'] = parent_connection.recv()
+   except EOFError:
+      pass
+   finally:
+      parent_connection.close()
+      child_process.join()
+   if budget_result['status'] == 'CRASHED':
+      budget_result['error'] = 'exit code: <{}>'.format(child_process.exitcode)
+   return budget_result
+
+
+def get_smallest_completing_budget(budget_results):
+   """ Returns the smallest memory budget with the status ``OK``
+
+   :param budget_results: (list) of budget result dicts: see: run_with_memory_budget()
+   :return: (int or float or None) memory budget in MiB: None if the benchmark did not complete within any budget
+   """
+   completing_budgets = [
+      budget_result['memory_budget_mb'] for budget_result in budget_results if budget_result['status'] == 'OK'
+   ]
+   if completing_budgets:
+      return min(completing_budgets)
+   return None
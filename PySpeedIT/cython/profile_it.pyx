@@ -8,6 +8,24 @@ Overview
 
 Can be used *instead of python's profiler* and uses internally the `cProfiler`.
 
+A function which exceeds the option ``job_timeout_sec`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>` is
+reported with the status `TIMEOUT` and its partial profile.
+
+Call graph: each function of the report expands to its callers and callees: the calls and the time along each edge:
+who called a hot function and what it called. The callers are collected by the profiler: the callees are the
+inverted callers: :py:class:`PySpeedIT.results.ProfileCaller`, :py:class:`PySpeedIT.results.ProfileCallee`.
+
+Engines: option ``profileit__engine`` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   - ``cprofile``: the `cProfiler`: every call is recorded: exact call counts: but heavy call paths run 2 - 10 times
+     slower and the hot spots can shift
+   - ``sampling``: the stacks are sampled at a fixed interval: see: :mod:`PySpeedIT.sampling_profiler`: low overhead:
+     the report shows an interactive flamegraph per function: the collapsed stacks of all functions are written to:
+     `profile_it__<module_name>.collapsed`: e.g. for `flamegraph.pl` or speedscope
+   - ``context``: every call is recorded per call path: see: :mod:`PySpeedIT.context_profiler`: the report shows the
+     calling-context tree per function: collapsible: the self and total time of each node: the time a helper spends
+     when called from one path is kept apart from the time it spends when called from another path
+
 For usage see :mod:`PySpeedIT.speed_it`
 
 **OUTPUT HTML**
@@ -19,19 +37,51 @@ For usage see :mod:`PySpeedIT.speed_it`
 Functions
 =========
 
+.. autofunction:: profile_functions
+
+.. autofunction:: sample_functions
+
+.. autofunction:: context_profile_functions
+
 .. autofunction:: profile_functions_in_module
 """
+from html import escape as html_escape
 from operator import itemgetter
 from os.path import join as path_join
 from _lsprof import Profiler
 
+from PySpeedIT.context_profiler import (
+   CONTEXT_PROFILER_DEFAULT_MAX_DEPTH,
+   ContextProfiler,
+)
+from PySpeedIT.fixtures import resolve_fixtures
+from PySpeedIT.results import (
+   ContextProfileResult,
+   ProfileCallee,
+   ProfileCaller,
+   ProfileEntry,
+   ProfileResult,
+   SampledProfileResult,
+   get_profile_func_txt,
+)
+from PySpeedIT.sampling_profiler import (
+   SAMPLING_DEFAULT_INTERVAL_SEC,
+   SamplingProfiler,
+)
+from PySpeedIT.svg_plots import get_svg_flamegraph
 from PySpeedIT.utils import (
    Err,
+   JobTimeout,
    format_time,
    get_html_template_css,
+   watchdog,
 )
 
 
+# context tree: nodes with at least this share of the total time are expanded
+CONTEXT_TREE_OPEN_PERCENT = 5.0
+
+
 def get_html_table_template():
    """ Returns a html_table_template
 
@@ -55,6 +105,7 @@ def get_html_table_template():
             <strong>total_calls:</strong> {head_module_info_total_calls} &nbsp;
             <strong>primitive_calls:</strong> {head_module_info_primitive_calls} &nbsp;
             <strong>total_time:</strong>  {head_module_info_total_time} &nbsp;
+            <strong>status:</strong>  {head_module_info_status} &nbsp;
          </th>
       </tr>
       <tr>
@@ -69,7 +120,8 @@ def get_html_table_template():
       <tr>
          <th class="head_parameter" colspan="4">
             <strong>output_in_sec:</strong> {head_parameter_output_in_sec} &nbsp;
-            <strong>profileit__repeat:</strong> {head_parameter_profileit__repeat}
+            <strong>profileit__repeat:</strong> {head_parameter_profileit__repeat} &nbsp;
+            <strong>job_timeout_sec:</strong> {head_parameter_job_timeout_sec}
          </th>
       </tr>
       <tr>
@@ -119,6 +171,142 @@ def get_html_table_row_template():
    '''
 
 
+def get_html_sampling_table_template():
+   """ Returns a html_sampling_table_template: engine ``sampling``
+
+   :return: (str) html_sampling_table_template
+   """
+   return '''
+   <br>
+   <br>
+   <table>
+      <thead>
+      <tr>
+         <th class="head_title"><b>Profile-IT function_name: `{head_title_func}`</b>
+         </th>
+      </tr>
+      <tr>
+         <th class="head_module_path">{head_module_path}
+         </th>
+      </tr>
+      <tr>
+         <th class="head_module_info">
+            <strong>samples:</strong> {head_module_info_samples} &nbsp;
+            <strong>sampled_time:</strong> {head_module_info_sampled_time} &nbsp;
+            <strong>mode:</strong> {head_module_info_mode} &nbsp;
+            <strong>status:</strong>  {head_module_info_status} &nbsp;
+         </th>
+      </tr>
+      <tr>
+         <th class="head_parameter">
+            <strong>Parameters:</strong> &nbsp;
+            <strong>output_max_slashes_fileinfo:</strong> {head_parameter_output_max_slashes_fileinfo} &nbsp;
+            <strong>use_func_name:</strong> {head_parameter_use_func_name} &nbsp;
+            <strong>profileit__repeat:</strong> {head_parameter_profileit__repeat} &nbsp;
+            <strong>profileit__engine:</strong> sampling &nbsp;
+            <strong>profileit__sample_interval_sec:</strong> {head_parameter_profileit__sample_interval_sec} &nbsp;
+            <strong>job_timeout_sec:</strong> {head_parameter_job_timeout_sec}
+         </th>
+      </tr>
+      </thead>
+
+      <tbody>
+      <tr>
+         <td>{body_flamegraph}</td>
+      </tr>
+      </tbody>
+   </table>
+'''
+
+
+def get_html_context_table_template():
+   """ Returns a html_context_table_template: engine ``context``
+
+   :return: (str) html_context_table_template
+   """
+   return '''
+   <br>
+   <br>
+   <table>
+      <thead>
+      <tr>
+         <th class="head_title"><b>Profile-IT function_name: `{head_title_func}`</b>
+         </th>
+      </tr>
+      <tr>
+         <th class="head_module_path">{head_module_path}
+         </th>
+      </tr>
+      <tr>
+         <th class="head_module_info">
+            <strong>nodes:</strong> {head_module_info_nodes} &nbsp;
+            <strong>total_time:</strong>  {head_module_info_total_time} &nbsp;
+            <strong>status:</strong>  {head_module_info_status} &nbsp;
+         </th>
+      </tr>
+      <tr>
+         <th class="head_parameter">
+            <strong>Parameters:</strong> &nbsp;
+            <strong>output_max_slashes_fileinfo:</strong> {head_parameter_output_max_slashes_fileinfo} &nbsp;
+            <strong>use_func_name:</strong> {head_parameter_use_func_name} &nbsp;
+            <strong>output_in_sec:</strong> {head_parameter_output_in_sec} &nbsp;
+            <strong>profileit__repeat:</strong> {head_parameter_profileit__repeat} &nbsp;
+            <strong>profileit__engine:</strong> context &nbsp;
+            <strong>profileit__context_max_depth:</strong> {head_parameter_profileit__context_max_depth} &nbsp;
+            <strong>job_timeout_sec:</strong> {head_parameter_job_timeout_sec}
+         </th>
+      </tr>
+      </thead>
+
+      <tbody>
+      <tr>
+         <td>{body_context_tree}</td>
+      </tr>
+      </tbody>
+   </table>
+'''
+
+
+def get_html_call_graph_template():
+   """ Returns a html_call_graph_template: the expandable callers and callees of one function
+
+   :return: (str) html_call_graph_template
+   """
+   return '''<details>
+               <summary>{call_graph_func_txt}</summary>
+               <table>
+                  <tr class="head">
+                     <th>callers</th>
+                     <th>number_of_calls</th>
+                     <th>func_time</th>
+                     <th>func_cumulative_time</th>
+                  </tr>
+                  {call_graph_caller_rows}
+                  <tr class="head">
+                     <th>callees</th>
+                     <th>number_of_calls</th>
+                     <th>func_time</th>
+                     <th>func_cumulative_time</th>
+                  </tr>
+                  {call_graph_callee_rows}
+               </table>
+            </details>'''
+
+
+def get_html_call_graph_row_template():
+   """ Returns a html_call_graph_row_template: one caller or callee
+
+   :return: (str) html_call_graph_row_template
+   """
+   return '''
+                  <tr>
+                     <td>{td_func_txt}</td>
+                     <td>{td_number_of_calls}</td>
+                     <td>{td_func_time}</td>
+                     <td>{td_func_cumulative_time}</td>
+                  </tr>'''
+
+
 def create_stats(profiler_):
    """ Based on cProfile.py
 
@@ -187,8 +375,8 @@ def create_stats(profiler_):
    return stats
 
 
-def _profile_it(func, func_positional_arguments, func_keyword_arguments, output_max_slashes_fileinfo, profileit__repeat):
-   """ Returns a dictionary with the profile result: the function runs only once.
+def _profile_it(func, func_positional_arguments, func_keyword_arguments, name, profileit__repeat, job_timeout_sec=None):
+   """ Returns the profile result: the function runs `profileit__repeat` times.
 
    .. note:: excludes a couple of not relative functions/methods
 
@@ -199,7 +387,7 @@ def _profile_it(func, func_positional_arguments, func_keyword_arguments, output_
    :param func:
    :param func_positional_arguments: (list) positional arguments for the function
    :param func_keyword_arguments: (dict) any keyword arguments for the function
-   :param output_max_slashes_fileinfo: (int) to adjust max path levels in the profile info
+   :param name: (str) the name of the result
    :param profileit__repeat: (int) how often the function is repeated: the result will be the sum of all:
       similar to the code below
 
@@ -210,70 +398,356 @@ def _profile_it(func, func_positional_arguments, func_keyword_arguments, output_
             profiler.runcall(func, *func_positional_arguments, **func_keyword_arguments)
             profiler.disable()
 
-   :return: (tuple) format: (summary_dict, table): table = list_of_dictionaries (sorted profile result lines dict)
+   :param job_timeout_sec: (float or None) wall-clock time limit for all repeats: see: :py:func:`PySpeedIT.utils.watchdog`
+
+      - if exceeded: the partial profile until the timeout is returned: status: TIMEOUT
+
+   :return: (obj) :py:class:`PySpeedIT.results.ProfileResult`: unformatted values
    :raise Err:
    """
    profiler = Profiler()
 
-   for repeat in range(profileit__repeat):
-      profiler.enable()
-      func(*func_positional_arguments, **func_keyword_arguments)
-      profiler.disable()
+   status = 'OK'
+   try:
+      with watchdog(job_timeout_sec):
+         for repeat in range(profileit__repeat):
+            # fixtures: each repeat gets its own view
+            repeat_positional_arguments, repeat_keyword_arguments = resolve_fixtures(
+               func_positional_arguments, func_keyword_arguments)
+            profiler.enable()
+            try:
+               func(*repeat_positional_arguments, **repeat_keyword_arguments)
+            finally:
+               profiler.disable()
+   except JobTimeout:
+      status = 'TIMEOUT'
 
    total_calls = 0
    primitive_calls = 0
    total_time = 0
-   table = []
+   entries = []
 
    for func_tmp, (pcalls, ncalls, tottime, cumtime, callers) in create_stats(profiler).items():
+      # exclude the profiler.enable()/disable() functions
+      if func_tmp[0] == '~' and '_lsprof.Profiler' in func_tmp[2]:
+         continue
+      if ("jprofile", 0, "profiler") in callers:
+         raise Err('_profile_it', ['ERROR NOT SURE WHAT To DO HERE: SEE pstate.py: get_top_level_stats()', func])
 
-      temp_dict = {
-         'number_of_calls': '{:,}'.format(pcalls) if pcalls == ncalls else '{:,}/{:,}'.format(pcalls, ncalls),
-         'func_time': tottime, 'func_cumulative_time': cumtime
-      }
+      entries.append(ProfileEntry(
+         func_tmp[0], func_tmp[1], func_tmp[2], ncalls, pcalls, tottime, cumtime,
+         tuple(
+            ProfileCaller(get_profile_func_txt(*caller_func), caller_ncalls, caller_pcalls, caller_tottime, caller_cumtime)
+            for caller_func, (caller_ncalls, caller_pcalls, caller_tottime, caller_cumtime) in callers.items()
+            if not (caller_func[0] == '~' and '_lsprof.Profiler' in caller_func[2])
+         )
+      ))
 
-      if func_tmp[0] == '~':
-         # exclude the profiler.enable()/disable() functions
-         if '_lsprof.Profiler' in func_tmp[2]:
-            continue
-         else:
-            temp_func_txt = func_tmp[2]
+      total_calls += ncalls
+      primitive_calls += pcalls
+      total_time += tottime
+
+   # callees: the inverted callers: the edge values are the same: calls and time spent in the callee
+   callees = {}
+   for entry in entries:
+      func_txt = entry.get_func_txt()
+      for caller in entry.callers:
+         callees.setdefault(caller.func_txt, []).append(ProfileCallee(
+            func_txt, caller.calls, caller.primitive_calls, caller.func_time, caller.func_cumulative_time))
+   for entry in entries:
+      entry.callees = tuple(callees.get(entry.get_func_txt(), ()))
+
+   return ProfileResult(name, status, total_calls, primitive_calls, total_time, tuple(entries))
+
+
+def _sample_it(func, func_positional_arguments, func_keyword_arguments, name, profileit__repeat, job_timeout_sec=None,
+               profileit__sample_interval_sec=SAMPLING_DEFAULT_INTERVAL_SEC):
+   """ Returns the sampled profile: the function runs `profileit__repeat` times: the samples of all repeats are added
+
+   .. seealso:: :py:func:`_profile_it`: the parameters
+
+   :param profileit__sample_interval_sec: (float) time between two samples: see:
+      :py:class:`PySpeedIT.sampling_profiler.SamplingProfiler`
+   :return: (obj) :py:class:`PySpeedIT.results.SampledProfileResult`
+   """
+   sampling_profiler = SamplingProfiler(profileit__sample_interval_sec)
+
+   status = 'OK'
+   try:
+      with watchdog(job_timeout_sec):
+         for repeat in range(profileit__repeat):
+            # fixtures: each repeat gets its own view
+            repeat_positional_arguments, repeat_keyword_arguments = resolve_fixtures(
+               func_positional_arguments, func_keyword_arguments)
+            sampling_profiler.start()
+            try:
+               func(*repeat_positional_arguments, **repeat_keyword_arguments)
+            finally:
+               sampling_profiler.stop()
+   except JobTimeout:
+      status = 'TIMEOUT'
+
+   frames, stacks, counts = sampling_profiler.get_samples()
+   return SampledProfileResult(
+      name, status, sampling_profiler.mode, profileit__sample_interval_sec, frames, stacks, counts)
+
+
+def _context_it(func, func_positional_arguments, func_keyword_arguments, name, profileit__repeat, job_timeout_sec=None,
+                profileit__context_max_depth=CONTEXT_PROFILER_DEFAULT_MAX_DEPTH):
+   """ Returns the calling-context tree: the function runs `profileit__repeat` times: the calls of all repeats are added
+
+   .. seealso:: :py:func:`_profile_it`: the parameters
+
+   :param profileit__context_max_depth: (int) the depth cap: see:
+      :py:class:`PySpeedIT.context_profiler.ContextProfiler`
+   :return: (obj) :py:class:`PySpeedIT.results.ContextProfileResult`
+   """
+   context_profiler = ContextProfiler(profileit__context_max_depth)
+
+   status = 'OK'
+   try:
+      with watchdog(job_timeout_sec):
+         for repeat in range(profileit__repeat):
+            # fixtures: each repeat gets its own view
+            repeat_positional_arguments, repeat_keyword_arguments = resolve_fixtures(
+               func_positional_arguments, func_keyword_arguments)
+            context_profiler.start()
+            try:
+               func(*repeat_positional_arguments, **repeat_keyword_arguments)
+            finally:
+               context_profiler.stop()
+   except JobTimeout:
+      status = 'TIMEOUT'
+
+   return ContextProfileResult(name, status, profileit__context_max_depth, *context_profiler.get_tree())
+
+
+def _helper_format_profile_time(time_sec, output_in_sec):
+   """ Returns the formatted time: see: speed_it(): output_in_sec
+   """
+   if output_in_sec:
+      return '{:.11f}'.format(time_sec)
+   return format_time(time_sec)
+
+
+def _helper_format_number_of_calls(calls, primitive_calls):
+   """ Returns the formatted number of calls: `primitive_calls/calls` for recursive calls
+   """
+   if primitive_calls == calls:
+      return '{:,}'.format(calls)
+   return '{:,}/{:,}'.format(primitive_calls, calls)
+
+
+def _helper_get_call_graph_rows(edges, func_txts, output_in_sec):
+   """ Returns the html rows of callers or callees: sorted by the cumulative time
+
+   - func_txts: dict: full func_txt: func_txt with output_max_slashes_fileinfo
+   """
+   call_graph_rows = ''
+   for edge in sorted(edges, key=lambda edge_: edge_.func_cumulative_time, reverse=True):
+      call_graph_rows += get_html_call_graph_row_template().format(
+         td_func_txt=func_txts.get(edge.func_txt, edge.func_txt),
+         td_number_of_calls=_helper_format_number_of_calls(edge.calls, edge.primitive_calls),
+         td_func_time=_helper_format_profile_time(edge.func_time, output_in_sec),
+         td_func_cumulative_time=_helper_format_profile_time(edge.func_cumulative_time, output_in_sec),
+      )
+   return call_graph_rows
+
+
+def _helper_iter_profile_jobs(loaded_module, module_tuple_of_func_tuples, use_func_name, profile_it_func,
+                              *profile_it_args):
+   """ Yields the result of one Profile-IT engine for each defined function
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :param profile_it_func: (function) the engine: `_profile_it`, `_sample_it` or `_context_it`
+   :param profile_it_args: the arguments of the engine after: func, func_positional_arguments,
+      func_keyword_arguments, name
+   :return: (generator) yields the result of profile_it_func
+   :raise Err:
+   """
+   for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
+      try:
+         func = getattr(loaded_module, function_name_str)
+      except Exception as err:
+         raise Err('_helper_iter_profile_jobs', [
+            'COULD NOT ACCESS FUNCTION ERROR: function_name_str: <{}>'.format(function_name_str),
+            '  loaded_module: <{}>'.format(loaded_module),
+            '    Exception: <{}>'.format(err)
+         ])
+
+      if use_func_name:
+         name = getattr(func, "__name__", func)
       else:
-         # adjust path levels
-         temp_path_file_ect = func_tmp[0]
-         temp_slashes = temp_path_file_ect.count('/')
-         if temp_slashes > output_max_slashes_fileinfo:
-            temp_func_txt = '{}:{}({})'.format(
-               temp_path_file_ect.split('/', temp_slashes - output_max_slashes_fileinfo)[-1],
-               func_tmp[1], func_tmp[2]
-            )
-         else:
-            temp_func_txt = '{}:{}({})'.format(temp_path_file_ect, func_tmp[1], func_tmp[2])
-
-      if temp_func_txt[0] == '<' and temp_func_txt[-1] == '>':
-         temp_dict['func_txt'] = temp_func_txt[1:-1]
-      elif temp_func_txt[0] == '<':
-         temp_dict['func_txt'] = temp_func_txt[1:]
-      elif temp_func_txt[-1] == '>':
-         temp_dict['func_txt'] = temp_func_txt[:-1]
+         name = name_str
+      yield profile_it_func(func, func_positional_arguments, func_keyword_arguments, name, *profile_it_args)
+
+
+def profile_functions(loaded_module, module_tuple_of_func_tuples, use_func_name=True, profileit__repeat=1,
+                      job_timeout_sec=None):
+   """ Returns the Profile-IT results of all defined functions: the library API: nothing is written
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :return: (list) of :py:class:`PySpeedIT.results.ProfileResult`: one per function
+   :raise Err:
+   """
+   return list(_helper_iter_profile_jobs(
+      loaded_module, module_tuple_of_func_tuples, use_func_name, _profile_it, profileit__repeat, job_timeout_sec
+   ))
+
+
+def sample_functions(loaded_module, module_tuple_of_func_tuples, use_func_name=True, profileit__repeat=1,
+                     job_timeout_sec=None, profileit__sample_interval_sec=SAMPLING_DEFAULT_INTERVAL_SEC):
+   """ Returns the sampled Profile-IT results of all defined functions: engine ``sampling``: the library API: nothing is
+   written
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :return: (list) of :py:class:`PySpeedIT.results.SampledProfileResult`: one per function
+   :raise Err:
+   """
+   return list(_helper_iter_profile_jobs(
+      loaded_module, module_tuple_of_func_tuples, use_func_name, _sample_it, profileit__repeat, job_timeout_sec,
+      profileit__sample_interval_sec
+   ))
+
+
+def _helper_write_sampled_profiles(
+      loaded_module,
+      module_path,
+      module_name,
+      profiles_dir_path,
+      module_tuple_of_func_tuples,
+      output_max_slashes_fileinfo,
+      use_func_name,
+      output_in_sec,
+      profileit__repeat,
+      job_timeout_sec,
+      profileit__sample_interval_sec):
+   """ Returns the html tables of the engine ``sampling``: writes the collapsed stacks of all functions
+   """
+   html_tables = ''
+   collapsed_text = ''
+   for sampled_result in sample_functions(
+         loaded_module, module_tuple_of_func_tuples, use_func_name, profileit__repeat, job_timeout_sec,
+         profileit__sample_interval_sec):
+      num_samples = sampled_result.get_num_samples()
+      collapsed_text += sampled_result.get_collapsed_text('{}'.format(sampled_result.name), output_max_slashes_fileinfo)
+      html_tables += get_html_sampling_table_template().format(
+         head_title_func=sampled_result.name,
+         head_module_path=module_path,
+         head_module_info_samples='{:,}'.format(num_samples),
+         head_module_info_sampled_time=_helper_format_profile_time(
+            num_samples * sampled_result.interval_sec, output_in_sec),
+         head_module_info_mode=sampled_result.mode,
+         head_module_info_status=sampled_result.status,
+
+         head_parameter_output_max_slashes_fileinfo='{}'.format(output_max_slashes_fileinfo),
+         head_parameter_use_func_name='{}'.format(use_func_name),
+         head_parameter_profileit__repeat='{}'.format(profileit__repeat),
+         head_parameter_profileit__sample_interval_sec='{}'.format(profileit__sample_interval_sec),
+         head_parameter_job_timeout_sec='{}'.format(job_timeout_sec),
+
+         body_flamegraph=get_svg_flamegraph(
+            sampled_result.get_collapsed_stacks(output_max_slashes_fileinfo), '{}'.format(sampled_result.name)),
+      )
+   with open(path_join(profiles_dir_path, 'profile_it__{}.collapsed'.format(module_name)), 'w') as file_:
+      file_.write(collapsed_text)
+   return html_tables
+
+
+def context_profile_functions(loaded_module, module_tuple_of_func_tuples, use_func_name=True, profileit__repeat=1,
+                              job_timeout_sec=None, profileit__context_max_depth=CONTEXT_PROFILER_DEFAULT_MAX_DEPTH):
+   """ Returns the calling-context trees of all defined functions: engine ``context``: the library API: nothing is
+   written
+
+   .. seealso::
+
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+   :return: (list) of :py:class:`PySpeedIT.results.ContextProfileResult`: one per function
+   :raise Err:
+   """
+   return list(_helper_iter_profile_jobs(
+      loaded_module, module_tuple_of_func_tuples, use_func_name, _context_it, profileit__repeat, job_timeout_sec,
+      profileit__context_max_depth
+   ))
+
+
+def _helper_get_context_tree_html(context_result, output_max_slashes_fileinfo, output_in_sec):
+   """ Returns the calling-context tree as nested html `details` elements: the nodes with at least
+   `CONTEXT_TREE_OPEN_PERCENT` of the total time are expanded
+   """
+   children = context_result.get_children()
+   root_total_time = context_result.total_times[0]
+   html_parts = []
+   # node index or the closing tag of a node with children
+   pending = [0]
+   while pending:
+      node_idx = pending.pop()
+      if isinstance(node_idx, str):
+         html_parts.append(node_idx)
+         continue
+      total_time = context_result.total_times[node_idx]
+      percent = total_time * 100.0 / root_total_time if root_total_time else 100.0
+      node_txt = '<strong>{}</strong> &nbsp; total: {} ({:,.3f} %) &nbsp; self: {} &nbsp; calls: {:,}{}'.format(
+         html_escape(context_result.get_func_txt(node_idx, output_max_slashes_fileinfo)),
+         _helper_format_profile_time(total_time, output_in_sec),
+         percent,
+         _helper_format_profile_time(context_result.self_times[node_idx], output_in_sec),
+         context_result.calls[node_idx],
+         ' &nbsp; <em>truncated: depth cap</em>' if context_result.truncated[node_idx] else '',
+      )
+      if children[node_idx]:
+         html_parts.append('<details style="margin-left:1.2em"{}><summary>{}</summary>'.format(
+            ' open' if percent >= CONTEXT_TREE_OPEN_PERCENT else '', node_txt))
+         pending.append('</details>')
+         pending.extend(reversed(children[node_idx]))
       else:
-         temp_dict['func_txt'] = temp_func_txt
+         html_parts.append('<div style="margin-left:2.2em">{}</div>'.format(node_txt))
+   return '\n'.join(html_parts)
 
-      table.append(temp_dict)
 
-      total_calls += ncalls
-      primitive_calls += pcalls
-      total_time += tottime
-      if ("jprofile", 0, "profiler") in callers:
-         raise Err('_profile_it', ['ERROR NOT SURE WHAT To DO HERE: SEE pstate.py: get_top_level_stats()', func])
+def _helper_write_context_profiles(
+      loaded_module,
+      module_path,
+      module_tuple_of_func_tuples,
+      output_max_slashes_fileinfo,
+      use_func_name,
+      output_in_sec,
+      profileit__repeat,
+      job_timeout_sec,
+      profileit__context_max_depth):
+   """ Returns the html tables of the engine ``context``
+   """
+   html_tables = ''
+   for context_result in context_profile_functions(
+         loaded_module, module_tuple_of_func_tuples, use_func_name, profileit__repeat, job_timeout_sec,
+         profileit__context_max_depth):
+      html_tables += get_html_context_table_template().format(
+         head_title_func=context_result.name,
+         head_module_path=module_path,
+         head_module_info_nodes='{:,}'.format(len(context_result) - 1),
+         head_module_info_total_time=_helper_format_profile_time(context_result.total_times[0], output_in_sec),
+         head_module_info_status=context_result.status,
 
-   summary_dict = {
-      'total_calls': total_calls,
-      'primitive_calls': primitive_calls,
-      'total_time': total_time
-   }
+         head_parameter_output_max_slashes_fileinfo='{}'.format(output_max_slashes_fileinfo),
+         head_parameter_use_func_name='{}'.format(use_func_name),
+         head_parameter_output_in_sec='{}'.format(output_in_sec),
+         head_parameter_profileit__repeat='{}'.format(profileit__repeat),
+         head_parameter_profileit__context_max_depth='{}'.format(profileit__context_max_depth),
+         head_parameter_job_timeout_sec='{}'.format(job_timeout_sec),
 
-   return summary_dict, table
+         body_context_tree=_helper_get_context_tree_html(context_result, output_max_slashes_fileinfo, output_in_sec),
+      )
+   return html_tables
 
 
 def profile_functions_in_module(
@@ -285,7 +759,11 @@ def profile_functions_in_module(
       output_max_slashes_fileinfo,
       use_func_name,
       output_in_sec,
-      profileit__repeat):
+      profileit__repeat,
+      job_timeout_sec=None,
+      profileit__engine='cprofile',
+      profileit__sample_interval_sec=SAMPLING_DEFAULT_INTERVAL_SEC,
+      profileit__context_max_depth=CONTEXT_PROFILER_DEFAULT_MAX_DEPTH):
    """ Writes the results for one loaded_module for all defined functions to a html files overwriting them if they existed.
 
    .. seealso::
@@ -307,25 +785,56 @@ def profile_functions_in_module(
 
    '''.format(head_embedded_style_sheet=get_html_template_css(), head_module_name=module_name)
 
-   for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
-      try:
-         func = getattr(loaded_module, function_name_str)
-      except Exception as err:
-         raise Err('_profile_functions_in_module', [
-            'COULD NOT ACCESS FUNCTION ERROR: function_name_str: <{}>'.format(function_name_str),
-            '  loaded_module: <{}>'.format(loaded_module),
-            '    Exception: <{}>'.format(err)
-         ])
-
-      if use_func_name:
-         name = getattr(func, "__name__", func)
-      else:
-         name = name_str
-      summary_dict, table = _profile_it(func, func_positional_arguments, func_keyword_arguments, output_max_slashes_fileinfo,
-         profileit__repeat)
+   if profileit__engine == 'sampling':
+      final_html_table_profile += _helper_write_sampled_profiles(
+         loaded_module,
+         module_path,
+         module_name,
+         profiles_dir_path,
+         module_tuple_of_func_tuples,
+         output_max_slashes_fileinfo,
+         use_func_name,
+         output_in_sec,
+         profileit__repeat,
+         job_timeout_sec,
+         profileit__sample_interval_sec
+      )
+      profile_results = []
+   elif profileit__engine == 'context':
+      final_html_table_profile += _helper_write_context_profiles(
+         loaded_module,
+         module_path,
+         module_tuple_of_func_tuples,
+         output_max_slashes_fileinfo,
+         use_func_name,
+         output_in_sec,
+         profileit__repeat,
+         job_timeout_sec,
+         profileit__context_max_depth
+      )
+      profile_results = []
+   else:
+      profile_results = profile_functions(
+         loaded_module, module_tuple_of_func_tuples, use_func_name, profileit__repeat, job_timeout_sec)
+   for profile_result in profile_results:
+      func_txts = {
+         entry.get_func_txt(): entry.get_func_txt(output_max_slashes_fileinfo) for entry in profile_result.entries
+      }
+      table = [
+         {
+            'number_of_calls': _helper_format_number_of_calls(entry.calls, entry.primitive_calls),
+            'func_time': entry.func_time,
+            'func_txt': get_html_call_graph_template().format(
+               call_graph_func_txt=func_txts[entry.get_func_txt()],
+               call_graph_caller_rows=_helper_get_call_graph_rows(entry.callers, func_txts, output_in_sec),
+               call_graph_callee_rows=_helper_get_call_graph_rows(entry.callees, func_txts, output_in_sec),
+            ),
+         }
+         for entry in profile_result.entries
+      ]
 
       table = sorted(table, key=itemgetter('func_time'), reverse=True)
-      compare_reference = summary_dict['total_time']
+      compare_reference = profile_result.total_time
       if compare_reference == 0:
          # add ranking ect...
          for idx, dict_ in enumerate(table):
@@ -363,22 +872,24 @@ def profile_functions_in_module(
          )
 
       if output_in_sec:
-         total_time = '{:.11f}'.format(summary_dict['total_time'])
+         total_time = '{:.11f}'.format(profile_result.total_time)
       else:
-         total_time = format_time(summary_dict['total_time'])
+         total_time = format_time(profile_result.total_time)
 
       final_html_table_profile += get_html_table_template().format(
-         head_title_func=name,
+         head_title_func=profile_result.name,
          head_module_path=module_path,
-         head_module_info_total_calls=summary_dict['total_calls'],
-         head_module_info_primitive_calls=summary_dict['primitive_calls'],
+         head_module_info_total_calls=profile_result.total_calls,
+         head_module_info_primitive_calls=profile_result.primitive_calls,
          head_module_info_total_time=total_time,
+         head_module_info_status=profile_result.status,
 
          head_parameter_output_max_slashes_fileinfo='{}'.format(output_max_slashes_fileinfo),
          head_parameter_use_func_name='{}'.format(use_func_name),
 
          head_parameter_output_in_sec='{}'.format(output_in_sec),
          head_parameter_profileit__repeat='{}'.format(profileit__repeat),
+         head_parameter_job_timeout_sec='{}'.format(job_timeout_sec),
 
          body_final_result_rows=final_result_rows,
       )
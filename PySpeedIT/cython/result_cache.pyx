@@ -0,0 +1,280 @@
+"""
+======================
+PySpeedIT.result_cache
+======================
+
+Overview
+========
+Incremental re-benchmarking: *Benchmark-IT* results of unchanged functions are reused from the last run on the same host.
+
+Each benchmark job gets a fingerprint: a hash of
+
+   - the function: its source code: or for functions without source: the code object or the file of its module
+   - transitive: all module-level helpers it references: functions, classes, constants of the same module: and the
+     name and version of referenced modules
+   - the arguments: pickled: or their `repr` if they can not be pickled
+   - the tool settings: the Benchmark-IT options which have an influence on the result, the interpreter version,
+     the PySpeedIT version and the host name
+
+The results of each job are stored per host, module and job name: only the last run is kept. A stored result is reused
+if the fingerprint is unchanged: such rows are marked as `cached` in the column `fresh`.
+
+Cache directory: `$PYSPEEDIT_RESULTS_CACHE_DIR` or `$XDG_CACHE_HOME/PySpeedIT/results` or `~/.cache/PySpeedIT/results`
+
+.. note:: changes which are not visible in the source: e.g. of data files read by the function or of other modules
+   than the referenced module versions: are not detected: disable the option to re-run all functions
+
+.. index:: Benchmark-IT; incremental
+
+
+Functions
+=========
+
+.. autofunction:: get_function_fingerprint
+
+.. autofunction:: get_arguments_fingerprint
+
+.. autofunction:: get_job_fingerprint
+
+.. autofunction:: get_job_key
+
+.. autofunction:: get_results_cache_dir_path
+
+.. autofunction:: load_job_result
+
+.. autofunction:: store_job_result
+"""
+from functools import partial
+from hashlib import sha256 as hashlib_sha256
+from inspect import (
+   getsource as inspect_getsource,
+   isclass as inspect_isclass,
+   ismodule as inspect_ismodule,
+)
+from marshal import dumps as marshal_dumps
+from os import (
+   makedirs as os_makedirs,
+   replace as os_replace,
+)
+from os.path import join as path_join
+from pickle import (
+   dump as pickle_dump,
+   dumps as pickle_dumps,
+   load as pickle_load,
+)
+from platform import node as platform_node
+from sys import (
+   modules as sys_modules,
+   version as sys_version,
+)
+from types import CodeType
+
+from PySpeedIT import __version__ as pyspeedit_version
+from PySpeedIT.utils import get_cache_path
+
+
+# pickle protocol of the stored results
+RESULT_CACHE_PICKLE_PROTOCOL = 4
+# types of module-level constants which are fingerprinted by their `repr`
+_REPR_FINGERPRINT_TYPES = (bool, int, float, complex, str, bytes, type(None))
+
+
+def _helper_get_code_names(code):
+   """ Returns all global names referenced by a code object: inclusive nested code objects: e.g. comprehensions
+
+   :param code: (code object)
+   :return: (set) names
+   """
+   names = set(code.co_names)
+   for const in code.co_consts:
+      if isinstance(const, CodeType):
+         names.update(_helper_get_code_names(const))
+   return names
+
+
+def _helper_get_value_fingerprint(value, module_name, visited_ids):
+   """ Returns the fingerprint text of a module-level value referenced by a function
+
+   :param value: (any)
+   :param module_name: (str) name of the module of the referencing function: values of other modules are only
+      fingerprinted by their module name and version
+   :param visited_ids: (set) ids of already fingerprinted functions: against recursion
+   :return: (str) fingerprint text
+   """
+   if inspect_ismodule(value):
+      return 'module: {} {}'.format(value.__name__, getattr(value, '__version__', ''))
+   if getattr(value, '__module__', None) == module_name and (callable(value) or inspect_isclass(value)):
+      if inspect_isclass(value):
+         try:
+            return 'class: {}'.format(inspect_getsource(value))
+         except (OSError, TypeError):
+            return 'class: {}'.format(value.__qualname__)
+      return 'function: {}'.format(get_function_fingerprint(value, visited_ids))
+   if isinstance(value, _REPR_FINGERPRINT_TYPES):
+      return 'constant: {!r}'.format(value)
+   if callable(value) or inspect_isclass(value):
+      # helpers of other modules: only by name and module version
+      value_module = sys_modules.get(getattr(value, '__module__', None) or '')
+      return 'external: {}.{} {}'.format(
+         getattr(value, '__module__', ''), getattr(value, '__qualname__', ''), getattr(value_module, '__version__', ''))
+   try:
+      return 'pickle: {}'.format(hashlib_sha256(pickle_dumps(value, RESULT_CACHE_PICKLE_PROTOCOL)).hexdigest())
+   except Exception:
+      return 'type: {}'.format(type(value).__qualname__)
+
+
+def get_function_fingerprint(func, visited_ids=None):
+   """ Returns the fingerprint of a function: inclusive the transitive fingerprint of the module-level helpers it
+   references
+
+   - python functions: the source code or if not available the code object
+   - `functools.partial` objects and bound methods: the wrapped function and the bound arguments
+   - functions without code object: e.g. builtins, C extension, Cython compiled functions: the qualified name and
+     the content of the file of their module
+
+   :param func: (callable)
+   :param visited_ids: (set or None) used internally against recursion
+   :return: (str) hex digest
+   """
+   if visited_ids is None:
+      visited_ids = set()
+   fingerprint = hashlib_sha256()
+   if id(func) in visited_ids:
+      fingerprint.update('recursive: {}'.format(getattr(func, '__qualname__', '')).encode('utf-8'))
+      return fingerprint.hexdigest()
+   visited_ids.add(id(func))
+
+   if isinstance(func, partial):
+      fingerprint.update(get_function_fingerprint(func.func, visited_ids).encode('ascii'))
+      fingerprint.update(get_arguments_fingerprint(func.args, func.keywords).encode('ascii'))
+      return fingerprint.hexdigest()
+   if hasattr(func, '__func__') and hasattr(func, '__self__'):
+      fingerprint.update(get_function_fingerprint(func.__func__, visited_ids).encode('ascii'))
+      fingerprint.update(_helper_get_value_fingerprint(func.__self__, None, visited_ids).encode('utf-8'))
+      return fingerprint.hexdigest()
+
+   code = getattr(func, '__code__', None)
+   if code is None:
+      fingerprint.update('{}.{}'.format(
+         getattr(func, '__module__', ''), getattr(func, '__qualname__', repr(func))).encode('utf-8'))
+      module_file_path = getattr(sys_modules.get(getattr(func, '__module__', None) or ''), '__file__', None)
+      if module_file_path:
+         try:
+            with open(module_file_path, 'rb') as file_:
+               fingerprint.update(file_.read())
+         except OSError:
+            pass
+      return fingerprint.hexdigest()
+
+   try:
+      fingerprint.update(inspect_getsource(func).encode('utf-8'))
+   except (OSError, TypeError):
+      fingerprint.update(marshal_dumps(code))
+   fingerprint.update(repr(getattr(func, '__defaults__', None)).encode('utf-8'))
+   fingerprint.update(repr(getattr(func, '__kwdefaults__', None)).encode('utf-8'))
+
+   func_globals = getattr(func, '__globals__', {})
+   module_name = getattr(func, '__module__', None)
+   for name in sorted(_helper_get_code_names(code)):
+      if name in func_globals:
+         fingerprint.update('\n{}: {}'.format(
+            name, _helper_get_value_fingerprint(func_globals[name], module_name, visited_ids)).encode('utf-8'))
+   return fingerprint.hexdigest()
+
+
+def get_arguments_fingerprint(args_list, kwargs_dict):
+   """ Returns the fingerprint of the function arguments
+
+   :param args_list: (list or tuple) positional arguments
+   :param kwargs_dict: (dict) keyword arguments
+   :return: (str) hex digest: of the pickled arguments or of their `repr` if they can not be pickled
+   """
+   arguments = (tuple(args_list), sorted(kwargs_dict.items(), key=lambda item_: repr(item_[0])))
+   try:
+      arguments_bytes = pickle_dumps(arguments, RESULT_CACHE_PICKLE_PROTOCOL)
+   except Exception:
+      arguments_bytes = repr(arguments).encode('utf-8')
+   return hashlib_sha256(arguments_bytes).hexdigest()
+
+
+def get_job_fingerprint(func, args_list, kwargs_dict, settings):
+   """ Returns the fingerprint of a benchmark job
+
+   :param func: (callable)
+   :param args_list: (list) positional arguments
+   :param kwargs_dict: (dict) keyword arguments
+   :param settings: (dict) tool settings which have an influence on the result: e.g. the Benchmark-IT options
+   :return: (str) hex digest
+   """
+   fingerprint = hashlib_sha256()
+   for part in (
+         'function: {}'.format(get_function_fingerprint(func)),
+         'arguments: {}'.format(get_arguments_fingerprint(args_list, kwargs_dict)),
+         'settings: {!r}'.format(sorted((key, repr(value)) for key, value in settings.items())),
+         'python_version: {!r}'.format(sys_version),
+         'pyspeedit_version: {!r}'.format(pyspeedit_version),
+         'host: {!r}'.format(platform_node())):
+      fingerprint.update(part.encode('utf-8'))
+      fingerprint.update(b'\n')
+   return fingerprint.hexdigest()
+
+
+def get_job_key(module_file_path, name):
+   """ Returns the key under which the results of a job are stored: only the last run per key is kept
+
+   :param module_file_path: (str) path of the module
+   :param name: (str) the name of the job: see: `name` of the benchmark results
+   :return: (str) hex digest of: host, interpreter, module_file_path, name
+   """
+   return hashlib_sha256('{!r}'.format((platform_node(), sys_version, module_file_path, name)).encode('utf-8')).hexdigest()
+
+
+def get_results_cache_dir_path():
+   """ Returns the path of the result cache directory
+
+   - environment variable `PYSPEEDIT_RESULTS_CACHE_DIR` if set
+   - else: `$XDG_CACHE_HOME/PySpeedIT/results` or `~/.cache/PySpeedIT/results`
+
+   :return: (str) path of the result cache directory
+   """
+   return get_cache_path('results', 'PYSPEEDIT_RESULTS_CACHE_DIR')
+
+
+def load_job_result(cache_dir_path, job_key, job_fingerprint):
+   """ Returns the stored result of a job if its fingerprint is unchanged
+
+   :param cache_dir_path: (str) see: get_results_cache_dir_path()
+   :param job_key: (str) see: get_job_key()
+   :param job_fingerprint: (str) see: get_job_fingerprint()
+   :return: (dict or None) see: store_job_result(): None if there is no stored result or the fingerprint changed
+   """
+   try:
+      with open(path_join(cache_dir_path, '{}.pickle'.format(job_key)), 'rb') as file_:
+         job_result = pickle_load(file_)
+   except Exception:
+      return None
+   if job_result.get('fingerprint') != job_fingerprint:
+      return None
+   return job_result
+
+
+def store_job_result(cache_dir_path, job_key, job_fingerprint, benchmark_results, memory_budget_row):
+   """ Stores the result of a job: replaces any previous result of the same job_key
+
+   :param cache_dir_path: (str) see: get_results_cache_dir_path()
+   :param job_key: (str) see: get_job_key()
+   :param job_fingerprint: (str) see: get_job_fingerprint()
+   :param benchmark_results: (list) one benchmark result dict per repeat
+   :param memory_budget_row: (dict or None) see: :py:func:`PySpeedIT.benchmark_it.measure_functions_in_module`
+   """
+   os_makedirs(cache_dir_path, exist_ok=True)
+   job_result_file_path = path_join(cache_dir_path, '{}.pickle'.format(job_key))
+   tmp_file_path = '{}.tmp'.format(job_result_file_path)
+   with open(tmp_file_path, 'wb') as file_:
+      pickle_dump({
+         'fingerprint': job_fingerprint,
+         'benchmark_results': benchmark_results,
+         'memory_budget_row': memory_budget_row,
+      }, file_, protocol=RESULT_CACHE_PICKLE_PROTOCOL)
+   # atomic: a parallel run never reads a half written file
+   os_replace(tmp_file_path, job_result_file_path)
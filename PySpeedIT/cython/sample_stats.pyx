@@ -0,0 +1,259 @@
+"""
+======================
+PySpeedIT.sample_stats
+======================
+
+Overview
+========
+Robust statistics of the loop samples captured by *Benchmark-IT*.
+
+.. index:: Benchmark-IT; outliers
+
+Outliers
+--------
+
+Single loops can be dominated by an interrupt, a page fault or a context switch: such loops are classified as outliers
+and the statistics are computed with and without them.
+
+   - ``tukey``: Tukey fences on the interquartile range (IQR)
+
+      - mild: outside of: Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+      - severe: outside of: Q1 - 3.0 * IQR, Q3 + 3.0 * IQR
+
+   - ``mad``: modified z-scores based on the median absolute deviation (MAD)
+
+      - mild: absolute modified z-score above 3.5
+      - severe: absolute modified z-score above 7.0
+
+Outliers are classified as `low` (faster) or `high` (slower).
+
+.. index:: Benchmark-IT; throughput
+
+Throughput
+----------
+
+A job can declare its work units per loop: e.g. items or bytes: the throughput is: work units / average loop time.
+Its confidence interval is based on the normal approximation of the mean loop time: mean +/- z * stdev / sqrt(n): the
+bounds are converted to work units per second: the upper bound is limited by the best loop.
+
+.. index:: Benchmark-IT; percentiles
+
+Percentiles
+-----------
+
+The confidence interval of a percentile is distribution-free: the bounds are the samples at the ranks:
+n * q -/+ z * sqrt(n * q * (1 - q)) of the sorted samples: the binomial distribution of the number of samples below the
+true percentile in its normal approximation.
+
+
+Functions
+=========
+
+.. autofunction:: get_quantile
+
+.. autofunction:: classify_outliers
+
+.. autofunction:: get_sample_stats
+
+.. autofunction:: get_throughput_stats
+
+.. autofunction:: get_percentile_stats
+"""
+from math import (
+   ceil as math_ceil,
+   floor as math_floor,
+)
+
+from PySpeedIT.utils import Err
+
+
+# supported outlier classification methods
+OUTLIER_METHODS = ('tukey', 'mad')
+
+# Tukey fences: IQR factors for: mild, severe
+TUKEY_MILD_FACTOR = 1.5
+TUKEY_SEVERE_FACTOR = 3.0
+
+# modified z-score limits for: mild, severe
+MAD_MILD_Z_SCORE = 3.5
+MAD_SEVERE_Z_SCORE = 7.0
+
+# minimum number of samples to classify outliers
+OUTLIERS_MIN_SAMPLES = 4
+
+# z-score of the two-sided 95 % confidence intervals: throughput and percentiles
+CONFIDENCE_Z_SCORE = 1.96
+
+
+def get_quantile(sorted_samples, quantile):
+   """ Returns the linear interpolated quantile of already sorted samples
+
+   :param sorted_samples: (list or array) sorted samples: must not be empty
+   :param quantile: (float) 0.0 to 1.0
+   :return: (float) quantile value
+   """
+   position = (len(sorted_samples) - 1) * quantile
+   lower_idx = int(position)
+   upper_idx = min(lower_idx + 1, len(sorted_samples) - 1)
+   fraction = position - lower_idx
+   return sorted_samples[lower_idx] + (sorted_samples[upper_idx] - sorted_samples[lower_idx]) * fraction
+
+
+def classify_outliers(samples, outlier_method='tukey', sorted_samples=None):
+   """ Returns a classification of each sample
+
+   :param samples: (list or array) loop samples
+   :param outlier_method: (str) ``tukey`` or ``mad``
+   :param sorted_samples: (list or None) the already sorted samples: if None they are sorted
+   :return: (list) one classification per sample: `None` or one of: ``low_mild``, ``low_severe``, ``high_mild``,
+      ``high_severe``
+   """
+   if outlier_method not in OUTLIER_METHODS:
+      raise Err('sample_stats.classify_outliers', [
+         'outlier_method: <{}> must be one of: <{}>'.format(outlier_method, ', '.join(OUTLIER_METHODS))
+      ])
+   classification = [None] * len(samples)
+   if len(samples) < OUTLIERS_MIN_SAMPLES:
+      return classification
+
+   if sorted_samples is None:
+      sorted_samples = sorted(samples)
+   if outlier_method == 'tukey':
+      quartile_1 = get_quantile(sorted_samples, 0.25)
+      quartile_3 = get_quantile(sorted_samples, 0.75)
+      iqr = quartile_3 - quartile_1
+      low_mild = quartile_1 - TUKEY_MILD_FACTOR * iqr
+      low_severe = quartile_1 - TUKEY_SEVERE_FACTOR * iqr
+      high_mild = quartile_3 + TUKEY_MILD_FACTOR * iqr
+      high_severe = quartile_3 + TUKEY_SEVERE_FACTOR * iqr
+   else:
+      median = get_quantile(sorted_samples, 0.5)
+      mad = get_quantile(sorted(abs(sample - median) for sample in samples), 0.5)
+      if mad == 0.0:
+         # more than half of the samples are equal: fall back to the mean absolute deviation
+         mad = sum(abs(sample - median) for sample in samples) / len(samples) * 1.2533 * 0.6745
+      if mad == 0.0:
+         return classification
+      # modified z-score: 0.6745 * (sample - median) / mad
+      low_mild = median - MAD_MILD_Z_SCORE * mad / 0.6745
+      low_severe = median - MAD_SEVERE_Z_SCORE * mad / 0.6745
+      high_mild = median + MAD_MILD_Z_SCORE * mad / 0.6745
+      high_severe = median + MAD_SEVERE_Z_SCORE * mad / 0.6745
+
+   for idx, sample in enumerate(samples):
+      if sample > high_severe:
+         classification[idx] = 'high_severe'
+      elif sample > high_mild:
+         classification[idx] = 'high_mild'
+      elif sample < low_severe:
+         classification[idx] = 'low_severe'
+      elif sample < low_mild:
+         classification[idx] = 'low_mild'
+   return classification
+
+
+def get_sample_stats(samples, outlier_method='tukey'):
+   """ Returns robust statistics of the loop samples
+
+   :param samples: (list or array) loop samples in seconds
+   :param outlier_method: (str) see: classify_outliers()
+   :return: (dict) sample statistics: -1.0 if not measured
+
+      - median_loop_sec: (float)
+      - quartile_1_loop_sec, quartile_3_loop_sec: (float) first and third quartile
+      - whisker_low_loop_sec, whisker_high_loop_sec: (float) lowest/highest sample within the Tukey mild fences
+      - outliers: (int) number of all outliers
+      - outliers_low_mild, outliers_low_severe, outliers_high_mild, outliers_high_severe: (int)
+      - clean_loops: (int) number of loops without outliers
+      - clean_avg_loop_sec, clean_best_loop_sec, clean_worst_loop_sec: (float) statistics without outliers
+   """
+   sample_stats = {
+      'median_loop_sec': -1.0,
+      'quartile_1_loop_sec': -1.0,
+      'quartile_3_loop_sec': -1.0,
+      'whisker_low_loop_sec': -1.0,
+      'whisker_high_loop_sec': -1.0,
+      'outliers': 0,
+      'outliers_low_mild': 0,
+      'outliers_low_severe': 0,
+      'outliers_high_mild': 0,
+      'outliers_high_severe': 0,
+      'clean_loops': 0,
+      'clean_avg_loop_sec': -1.0,
+      'clean_best_loop_sec': -1.0,
+      'clean_worst_loop_sec': -1.0,
+   }
+   if not samples:
+      return sample_stats
+
+   sorted_samples = sorted(samples)
+   sample_stats['median_loop_sec'] = get_quantile(sorted_samples, 0.5)
+   quartile_1 = sample_stats['quartile_1_loop_sec'] = get_quantile(sorted_samples, 0.25)
+   quartile_3 = sample_stats['quartile_3_loop_sec'] = get_quantile(sorted_samples, 0.75)
+   whisker_low_fence = quartile_1 - TUKEY_MILD_FACTOR * (quartile_3 - quartile_1)
+   whisker_high_fence = quartile_3 + TUKEY_MILD_FACTOR * (quartile_3 - quartile_1)
+   sample_stats['whisker_low_loop_sec'] = next(
+      sample for sample in sorted_samples if sample >= whisker_low_fence)
+   sample_stats['whisker_high_loop_sec'] = next(
+      sample for sample in reversed(sorted_samples) if sample <= whisker_high_fence)
+
+   clean_samples = []
+   for sample, outlier_class in zip(samples, classify_outliers(samples, outlier_method, sorted_samples)):
+      if outlier_class is None:
+         clean_samples.append(sample)
+      else:
+         sample_stats['outliers_' + outlier_class] += 1
+   sample_stats['outliers'] = len(samples) - len(clean_samples)
+   sample_stats['clean_loops'] = len(clean_samples)
+   sample_stats['clean_avg_loop_sec'] = sum(clean_samples) / len(clean_samples)
+   sample_stats['clean_best_loop_sec'] = min(clean_samples)
+   sample_stats['clean_worst_loop_sec'] = max(clean_samples)
+   return sample_stats
+
+
+def get_throughput_stats(samples, work_units_per_loop, z_score=CONFIDENCE_Z_SCORE):
+   """ Returns the throughput of the loop samples and its confidence interval
+
+   :param samples: (list or array) loop samples in seconds
+   :param work_units_per_loop: (float) work units of one loop: e.g. items or bytes
+   :param z_score: (float) z-score of the confidence interval: default: 95 %
+   :return: (tuple) format: (per_sec, ci_low_per_sec, ci_high_per_sec): work units per second: -1.0 if not measured:
+      with less than 2 samples the interval is the throughput itself
+   """
+   measured_samples = [sample for sample in samples if sample > 0.0]
+   if not measured_samples:
+      return -1.0, -1.0, -1.0
+
+   num_samples = len(measured_samples)
+   mean = sum(measured_samples) / num_samples
+   if num_samples < 2:
+      half_width = 0.0
+   else:
+      variance = sum((sample - mean) ** 2 for sample in measured_samples) / (num_samples - 1)
+      half_width = z_score * (variance / num_samples) ** 0.5
+   per_sec = work_units_per_loop / mean
+   ci_low_per_sec = work_units_per_loop / (mean + half_width)
+   ci_high_per_sec = work_units_per_loop / max(mean - half_width, min(measured_samples))
+   return per_sec, ci_low_per_sec, ci_high_per_sec
+
+
+def get_percentile_stats(samples, percentile, z_score=CONFIDENCE_Z_SCORE):
+   """ Returns a percentile of the loop samples and its confidence interval
+
+   :param samples: (list or array) loop samples in seconds
+   :param percentile: (float) 0.0 to 100.0: e.g. 99.0
+   :param z_score: (float) z-score of the confidence interval: default: 95 %
+   :return: (tuple) format: (percentile_sec, ci_low_sec, ci_high_sec): -1.0 if not measured: the bounds are limited to
+      the best and the worst loop
+   """
+   if not samples:
+      return -1.0, -1.0, -1.0
+
+   sorted_samples = sorted(samples)
+   num_samples = len(sorted_samples)
+   quantile = percentile / 100.0
+   half_width = z_score * (num_samples * quantile * (1.0 - quantile)) ** 0.5
+   # ranks are 1 based
+   ci_low_idx = max(int(math_floor(num_samples * quantile - half_width)) - 1, 0)
+   ci_high_idx = min(int(math_ceil(num_samples * quantile + half_width)) - 1, num_samples - 1)
+   return get_quantile(sorted_samples, quantile), sorted_samples[ci_low_idx], sorted_samples[ci_high_idx]
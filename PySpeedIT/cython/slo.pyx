@@ -0,0 +1,199 @@
+"""
+=============
+PySpeedIT.slo
+=============
+
+Overview
+========
+
+Latency service level objectives (SLO) of *Benchmark-IT* functions: a percentile of the loop samples and a threshold:
+e.g. `p99 <= 2 ms`.
+
+An SLO is evaluated of the loop samples of one repeat:
+
+   - the tail percentile is only statistically valid with enough samples: at least `SLO_MIN_TAIL_SAMPLES` samples
+     beyond the percentile: e.g. 1000 samples for p99: a function with fewer samples is measured again with a longer
+     `run_sec`: up to the `max_run_sec` of its SLOs
+   - the percentile and its distribution-free 95 % confidence interval: see
+     :py:func:`PySpeedIT.sample_stats.get_percentile_stats`
+   - status: `PASS` if the upper confidence bound is within the threshold: `FAIL` otherwise: `INSUFFICIENT-SAMPLES` if
+     the samples are still too few
+   - margin: threshold minus the percentile: negative if the percentile exceeds the threshold
+
+With the `call` engine a function with SLOs is sampled per single call: its calls per sample are not calibrated: an
+average over many calls would hide the slow calls of the tail.
+
+:py:func:`speed_it <PySpeedIT.speed_it.speed_it>` returns the exit code of the SLO gate: see
+:py:func:`get_slo_exit_code`: the command line: ``pyspeedit slo-gate`` checks the structured output
+(``benchmarkit__output_json``) in a CI job: see :mod:`PySpeedIT.cli`
+
+For usage see :mod:`PySpeedIT.speed_it`: module option ``benchmarkit__slos``
+
+.. index:: Benchmark-IT; SLO
+
+Functions
+=========
+
+.. autofunction:: get_required_samples
+
+.. autofunction:: check_slos
+
+.. autofunction:: get_extended_run_sec
+
+.. autofunction:: evaluate_slos
+
+.. autofunction:: get_slo_exit_code
+"""
+from math import ceil as math_ceil
+
+from PySpeedIT.sample_stats import get_percentile_stats
+from PySpeedIT.utils import Err
+
+
+# keys of one SLO definition: `max_run_sec` is optional
+SLO_KEYS = {'percentile', 'threshold_sec', 'max_run_sec'}
+# minimum number of samples beyond the percentile: e.g. p99: 1000 samples
+SLO_MIN_TAIL_SAMPLES = 10
+# default upper limit of the extended `run_sec` of a function
+SLO_DEFAULT_MAX_RUN_SEC = 60.0
+# the extended `run_sec` aims this factor above the required samples
+SLO_RUN_SEC_SAFETY_FACTOR = 1.2
+# maximum number of extended runs of one function per repeat
+SLO_MAX_EXTENSIONS = 3
+# exit codes of the SLO gate
+SLO_GATE_PASSED_EXIT_CODE = 0
+SLO_GATE_FAILED_EXIT_CODE = 1
+
+
+def get_required_samples(percentile):
+   """ Returns the number of samples needed for a statistically valid percentile
+
+   :param percentile: (float) greater 0.0 and less 100.0: e.g. 99.0
+   :return: (int) at least `SLO_MIN_TAIL_SAMPLES` samples beyond the percentile
+   """
+   # round first: e.g. 1 - 0.99 is not exactly 0.01
+   return int(math_ceil(round(SLO_MIN_TAIL_SAMPLES / (1.0 - percentile / 100.0), 6)))
+
+
+def check_slos(benchmarkit__slos, module_tuple_of_func_tuples):
+   """ Returns the checked SLO definitions with their defaults
+
+   :param benchmarkit__slos: (dict or None) see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: module option:
+      name_str: list of SLO definitions: dicts with the keys: percentile, threshold_sec, max_run_sec (optional)
+   :param module_tuple_of_func_tuples: (tuple) the job tuples: (name_str, function_name_str, args, kwargs)
+   :return: (dict) name_str: tuple of SLO definition dicts: percentile, threshold_sec, max_run_sec: floats
+   :raise Err:
+   """
+   checked_slos = {}
+   if not benchmarkit__slos:
+      return checked_slos
+
+   names = {func_tuple[0] for func_tuple in module_tuple_of_func_tuples}
+   for name_str, slos in benchmarkit__slos.items():
+      if name_str not in names or not isinstance(slos, (list, tuple)) or not slos:
+         raise Err('benchmarkit__slos', [
+            'name_str: <{}> slos: <{}>'.format(name_str, slos),
+            '  expected the name_str of a function tuple: and a list of SLO definitions',
+         ])
+      checked_slos[name_str] = []
+      for slo in slos:
+         if not isinstance(slo, dict) or not {'percentile', 'threshold_sec'} <= set(slo) <= SLO_KEYS:
+            raise Err('benchmarkit__slos', [
+               'name_str: <{}> slo: <{}>'.format(name_str, slo),
+               '  expected a dict: keys: <percentile, threshold_sec> and optional: <max_run_sec>',
+            ])
+         max_run_sec = slo.get('max_run_sec', SLO_DEFAULT_MAX_RUN_SEC)
+         for key, value in (('percentile', slo['percentile']), ('threshold_sec', slo['threshold_sec']),
+                            ('max_run_sec', max_run_sec)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+               raise Err('benchmarkit__slos', [
+                  'name_str: <{}> {}: <{}>'.format(name_str, key, value),
+                  '  expected a positive number',
+               ])
+         if slo['percentile'] >= 100:
+            raise Err('benchmarkit__slos', [
+               'name_str: <{}> percentile: <{}>'.format(name_str, slo['percentile']),
+               '  expected: greater 0 and less 100',
+            ])
+         checked_slos[name_str].append({
+            'percentile': float(slo['percentile']),
+            'threshold_sec': float(slo['threshold_sec']),
+            'max_run_sec': float(max_run_sec),
+         })
+      checked_slos[name_str] = tuple(checked_slos[name_str])
+   return checked_slos
+
+
+def get_extended_run_sec(job_slos, num_samples, run_sec, all_loops_time_sec):
+   """ Returns the `run_sec` of a new measurement of a function whose samples are too few for its SLOs
+
+   :param job_slos: (tuple) the SLO definitions of the function: see: :py:func:`check_slos`
+   :param num_samples: (int) the number of samples of the last measurement
+   :param run_sec: (float) the `run_sec` of the last measurement: -1: run once
+   :param all_loops_time_sec: (float) the time of all loops of the last measurement
+   :return: (float or None) the extended run_sec: at least 0.1: None if the samples are enough or the last measurement
+      already reached the `max_run_sec` of the SLOs
+   """
+   required_samples = max(get_required_samples(slo['percentile']) for slo in job_slos)
+   if num_samples >= required_samples:
+      return None
+   max_run_sec = max(slo['max_run_sec'] for slo in job_slos)
+   if run_sec >= max_run_sec:
+      return None
+   # run once: the time of the loops is the best estimate of the needed time
+   base_run_sec = run_sec if run_sec > 0 else max(all_loops_time_sec, 0.001)
+   extended_run_sec = base_run_sec * SLO_RUN_SEC_SAFETY_FACTOR * required_samples / max(num_samples, 1)
+   return min(max(extended_run_sec, 0.1), max_run_sec)
+
+
+def evaluate_slos(samples, job_slos, run_sec):
+   """ Returns the evaluation of the SLOs of a function
+
+   :param samples: (list or array) loop samples in seconds
+   :param job_slos: (tuple) the SLO definitions of the function: see: :py:func:`check_slos`
+   :param run_sec: (float) the `run_sec` of the measurement of the samples: reported
+   :return: (list) one dict per SLO: percentile, threshold_sec, percentile_sec, ci_low_sec, ci_high_sec, margin_sec,
+      margin_percent, samples, required_samples, run_sec, status: `PASS`, `FAIL` or `INSUFFICIENT-SAMPLES`:
+      the times are -1.0 if not measured
+   """
+   slo_results = []
+   for slo in job_slos:
+      percentile_sec, ci_low_sec, ci_high_sec = get_percentile_stats(samples, slo['percentile'])
+      required_samples = get_required_samples(slo['percentile'])
+      if len(samples) < required_samples:
+         status = 'INSUFFICIENT-SAMPLES'
+      elif ci_high_sec <= slo['threshold_sec']:
+         status = 'PASS'
+      else:
+         status = 'FAIL'
+      if percentile_sec == -1.0:
+         margin_sec = margin_percent = -1.0
+      else:
+         margin_sec = slo['threshold_sec'] - percentile_sec
+         margin_percent = margin_sec / slo['threshold_sec'] * 100.0
+      slo_results.append({
+         'percentile': slo['percentile'],
+         'threshold_sec': slo['threshold_sec'],
+         'percentile_sec': percentile_sec,
+         'ci_low_sec': ci_low_sec,
+         'ci_high_sec': ci_high_sec,
+         'margin_sec': margin_sec,
+         'margin_percent': margin_percent,
+         'samples': len(samples),
+         'required_samples': required_samples,
+         'run_sec': run_sec,
+         'status': status,
+      })
+   return slo_results
+
+
+def get_slo_exit_code(slo_results):
+   """ Returns the exit code of the SLO gate
+
+   :param slo_results: (iterable) SLO result dicts: see: :py:func:`evaluate_slos`
+   :return: (int) `SLO_GATE_PASSED_EXIT_CODE` if all SLOs passed or there are none: `SLO_GATE_FAILED_EXIT_CODE`
+      otherwise
+   """
+   if all(slo_result['status'] == 'PASS' for slo_result in slo_results):
+      return SLO_GATE_PASSED_EXIT_CODE
+   return SLO_GATE_FAILED_EXIT_CODE
@@ -106,74 +106,46 @@ Speed-It-Usage
 
       Do not import the module with the functions to speed-it: the module is internally loaded  from file
 
+#. Or: register the functions with the decorators ``@benchmark(...)`` / ``@profile(...)`` and discover the
+   `modules__func_tuples` of a whole directory: see :mod:`PySpeedIT.discover`
+
 
 For more *examples* see any files in the `PySpeedIT source` :samp:`{SOURCE}/Examples`
 
 - especially the file: **run_speed_it.py**
 
-.. index:: PySpeedIT; usage (common errors), Usage; usage (common errors)
+.. index:: PySpeedIT; usage (function code), Usage; usage (function code)
 
-Common Errors
--------------
+Functions to speed_it
+---------------------
 
-Return statement in speed_it functions
-~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Functions which are used for speed_it are normal python functions: they do not need to be rewritten.
 
-Function which are used for speed_it may not have a return statement because they may run in a loop
+   - `return` statements are supported: for the Benchmark-IT `code` engine they end the timed code body
+   - arguments are bound like in a normal call: default arguments do not need to be passed on
+   - the Benchmark-IT `code` engine gives each loop a fresh copy of the mutable arguments: a function which sorts or
+     otherwise mutates its input is not timed on the already mutated input of the previous loop
 
 .. python-example::
 
-   **WRONG** return statement
-
    .. code-block:: python3
 
-      # helper function is ok to have return statement
       def recip_square(i_):
          return 1.0 / (i_ ** 2)
 
 
-      # function to be used by speed_it can not have a return statement
-      def approx_pi(n_=100000):
-         val = 0.
-         for k_ in range(1, n_ + 1):
-            val += recip_square(k_)
-         return (6 * val) ** 0.5
-
-
-Missing speed_it modules__func_tuples arguments
-~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-
-If a function defines a default argument it still needs an argument passed on in the modules__func_tuples.
-
-.. python-example::
-
-   .. code-block:: python3
-
-      # function to be used by speed_it
       def approx_pi(n_=100000):
          val = 0.
          for k_ in range(1, n_ + 1):
             val += recip_square(k_)
          return (6 * val) ** 0.5
 
-   **WRONG:** `modules__func_tuples` missing argument for : ``n_``
-
    .. code-block:: python3
 
       modules__func_tuples = (
             [path_abspath('calculate_pi.py'), (
                ('calculate pi', 'approx_pi', [], {}),
-            )],
-         )
-
-
-   **OK:** `modules__func_tuples` with argument for : ``n_``
-
-   .. code-block:: python3
-
-      modules__func_tuples = (
-            [path_abspath('calculate_pi.py'), (
-               ('calculate pi', 'approx_pi', [], {'n_': 100000}),
+               ('calculate pi: n_ 1000', 'approx_pi', [], {'n_': 1000}),
             )],
          )
 
@@ -212,7 +184,10 @@ Functions
 =========
 .. autofunction:: speed_it
 """
-from importlib.machinery import SourceFileLoader
+from importlib.machinery import (
+   ExtensionFileLoader,
+   SourceFileLoader,
+)
 from os import (
    makedirs as os_makedirs,
 )
@@ -221,12 +196,111 @@ from os.path import (
    splitext as path_splitext,
    join as path_join,
 )
+from re import sub as re_sub
+from shutil import which as shutil_which
+
+from PySpeedIT.constants import (
+   CONTEXT_PROFILER_DEFAULT_MAX_DEPTH,
+   SAMPLING_DEFAULT_INTERVAL_SEC,
+   SHARED_BUFFER_BACKENDS,
+)
+from PySpeedIT.fixtures import clear_fixtures
+from PySpeedIT.sample_stats import OUTLIER_METHODS
+from PySpeedIT.slo import get_slo_exit_code
+from PySpeedIT.system_state import SYSTEM_NOISE_LIMITS
+from PySpeedIT.utils import (
+   Err,
+   build_cython_extensions_parallel,
+)
+
+
+# supported keys of the optional `module_options` dictionary of a modules__func_tuples entry
+MODULE_OPTIONS_KEYS = {
+   'benchmarkit__compile_variants', 'benchmarkit__slos', 'benchmarkit__work_units', 'profile_func_tuples'}
+# supported keys of a `benchmarkit__compile_variants` variant_options_dict
+COMPILE_VARIANT_OPTIONS_KEYS = {'pxd_file_path', 'extra_compile_args', 'extra_link_args', 'cython_directives'}
 
-from PySpeedIT.benchmark_it import benchmark_functions_in_module
-from PySpeedIT.disassemble_it import disassemble_functions_in_module
-from PySpeedIT.line_memory_profile_it import line_memory_profile_functions_in_module
-from PySpeedIT.profile_it import profile_functions_in_module
-from PySpeedIT.utils import Err
+
+def _helper_get_module_options(module_entry):
+   """ Returns the checked optional `module_options` dictionary of a modules__func_tuples entry
+
+   :param module_entry: (list or tuple) see: speed_it() `modules__func_tuples`
+   :return: (dict) module_options
+   """
+   if len(module_entry) > 2:
+      module_options = module_entry[2]
+   else:
+      module_options = {}
+   if set(module_options) - MODULE_OPTIONS_KEYS:
+      raise Err('speed_it', [
+         'module_file_path: <{}>'.format(module_entry[0]),
+         '  unknown module_options: <{}> supported: <{}>'.format(
+            sorted(set(module_options) - MODULE_OPTIONS_KEYS),
+            sorted(MODULE_OPTIONS_KEYS)
+         )
+      ])
+   return module_options
+
+
+def _helper_build_compile_variants(modules__func_tuples, benchmarkit__build_workers):
+   """ Builds the Cython compiled variants of all modules at the same time
+
+   :param modules__func_tuples: (tuple) see: speed_it()
+   :param benchmarkit__build_workers: (int or None) see: speed_it()
+   :return: (dict) module_idx: list of tuples: (variant_name, variant_module_name, cython_extension_module_path)
+   """
+   variant_infos = []
+   build_specs = []
+   for module_idx, module_entry in enumerate(modules__func_tuples):
+      module_file_path = module_entry[0]
+      module_filename_no_extension = path_splitext(path_basename(module_file_path))[0]
+      compile_variants = _helper_get_module_options(module_entry).get('benchmarkit__compile_variants') or {}
+      for variant_name, variant_options in compile_variants.items():
+         if set(variant_options) - COMPILE_VARIANT_OPTIONS_KEYS:
+            raise Err('speed_it', [
+               'module_file_path: <{}>'.format(module_file_path),
+               '  <benchmarkit__compile_variants> variant: <{}> unknown options: <{}> supported: <{}>'.format(
+                  variant_name,
+                  sorted(set(variant_options) - COMPILE_VARIANT_OPTIONS_KEYS),
+                  sorted(COMPILE_VARIANT_OPTIONS_KEYS)
+               )
+            ])
+         variant_module_name = '{}__{}'.format(module_filename_no_extension, re_sub(r'\W', '_', variant_name))
+         build_spec = {'py_or_pyx_file_path': module_file_path, 'module_name': variant_module_name}
+         build_spec.update(variant_options)
+         variant_infos.append((module_idx, variant_name, variant_module_name))
+         build_specs.append(build_spec)
+
+   compiled_variants = {}
+   if build_specs:
+      build_results = build_cython_extensions_parallel(build_specs, max_workers=benchmarkit__build_workers)
+      for (module_idx, variant_name, variant_module_name), (cython_extension_module_path, cache_hit) in zip(
+            variant_infos, build_results):
+         compiled_variants.setdefault(module_idx, []).append(
+            (variant_name, variant_module_name, cython_extension_module_path)
+         )
+   return compiled_variants
+
+
+def _helper_load_compile_variants(module_file_path, module_compiled_variants):
+   """ Returns the loaded Cython compiled variants of one module
+
+   :param module_file_path: (str) path to the `.py` module file
+   :param module_compiled_variants: (list) of tuples: (variant_name, variant_module_name, cython_extension_module_path)
+   :return: (list) of tuples: (variant_name, loaded_variant_module)
+   """
+   variant_modules = []
+   for variant_name, variant_module_name, cython_extension_module_path in module_compiled_variants:
+      try:
+         so_loader = ExtensionFileLoader(variant_module_name, cython_extension_module_path)
+         variant_modules.append((variant_name, so_loader.load_module(variant_module_name)))
+      except Exception as err:
+         raise Err('speed_it', [
+            'COULD NOT LOAD COMPILED VARIANT ERROR: module_file_path: <{}>'.format(module_file_path),
+            '  variant_name: <{}> cython_extension_module_path: <{}>'.format(variant_name, cython_extension_module_path),
+            '    Exception: <{}>'.format(err)
+         ])
+   return variant_modules
 
 
 def _helper_run_it(
@@ -236,6 +310,7 @@ def _helper_run_it(
       linememoryprofiles_dir_path,
       disassembles_dir_path,
       module_tuple_of_func_tuples,
+      profile_module_tuple_of_func_tuples,
       #
       enable_benchmarkit,
       enable_profileit,
@@ -251,7 +326,31 @@ def _helper_run_it(
       benchmarkit__check_too_fast,
       benchmarkit__rank_by,
       benchmarkit__run_sec,
-      benchmarkit__repeat):
+      benchmarkit__repeat,
+      benchmarkit__engine,
+      variant_modules,
+      benchmarkit__stable_mode,
+      benchmarkit__noise_limits,
+      benchmarkit__output_json,
+      benchmarkit__outlier_method,
+      benchmarkit__reject_outliers,
+      benchmarkit__plots,
+      job_timeout_sec,
+      benchmarkit__memory_budgets_mb,
+      benchmarkit__interpreters,
+      benchmarkit__incremental,
+      benchmarkit__work_units,
+      benchmarkit__slos,
+      benchmarkit__isolate_jobs,
+      benchmarkit__shared_buffers,
+      profileit__engine,
+      profileit__sample_interval_sec,
+      profileit__context_max_depth):
+   """ Runs the enabled tools for one loaded_module
+
+   :return: (list) the Benchmark-IT SLO results: see: :py:func:`PySpeedIT.benchmark_it.benchmark_functions_in_module`
+   """
+   slo_results = []
    # ==========
    module_path = getattr(loaded_module, "__file__", loaded_module)
    module_name = getattr(loaded_module, "__name__", loaded_module)
@@ -261,8 +360,10 @@ def _helper_run_it(
    if temp_slashes > output_max_slashes_fileinfo:
       module_path = module_path.split('/', temp_slashes - output_max_slashes_fileinfo)[-1]
 
-   if enable_benchmarkit:
-      benchmark_functions_in_module(
+   if enable_benchmarkit and module_tuple_of_func_tuples:
+      # lazy imports: only the enabled tools are loaded
+      from PySpeedIT.benchmark_it import benchmark_functions_in_module
+      slo_results = benchmark_functions_in_module(
          loaded_module,
          module_path,
          module_name,
@@ -276,40 +377,65 @@ def _helper_run_it(
          benchmarkit__check_too_fast,
          benchmarkit__rank_by,
          benchmarkit__run_sec,
-         benchmarkit__repeat
+         benchmarkit__repeat,
+         benchmarkit__engine,
+         variant_modules,
+         benchmarkit__stable_mode,
+         benchmarkit__noise_limits,
+         benchmarkit__output_json,
+         benchmarkit__outlier_method,
+         benchmarkit__reject_outliers,
+         benchmarkit__plots,
+         job_timeout_sec,
+         benchmarkit__memory_budgets_mb,
+         benchmarkit__interpreters,
+         benchmarkit__incremental,
+         benchmarkit__work_units,
+         benchmarkit__slos,
+         benchmarkit__isolate_jobs,
+         benchmarkit__shared_buffers
       )
-   if enable_profileit:
+   if enable_profileit and profile_module_tuple_of_func_tuples:
+      from PySpeedIT.profile_it import profile_functions_in_module
       profile_functions_in_module(
          loaded_module,
          module_path,
          module_name,
          profiles_dir_path,
-         module_tuple_of_func_tuples,
+         profile_module_tuple_of_func_tuples,
          output_max_slashes_fileinfo,
          use_func_name,
          output_in_sec,
-         profileit__repeat
+         profileit__repeat,
+         job_timeout_sec,
+         profileit__engine,
+         profileit__sample_interval_sec,
+         profileit__context_max_depth
       )
-   if enable_linememoryprofileit:
+   if enable_linememoryprofileit and profile_module_tuple_of_func_tuples:
+      from PySpeedIT.line_memory_profile_it import line_memory_profile_functions_in_module
       line_memory_profile_functions_in_module(
          loaded_module,
          module_path,
          module_name,
          linememoryprofiles_dir_path,
-         module_tuple_of_func_tuples,
+         profile_module_tuple_of_func_tuples,
          output_max_slashes_fileinfo,
          use_func_name,
+         job_timeout_sec
       )
-   if enable_disassembleit:
+   if enable_disassembleit and profile_module_tuple_of_func_tuples:
+      from PySpeedIT.disassemble_it import disassemble_functions_in_module
       disassemble_functions_in_module(
          loaded_module,
          module_path,
          module_name,
          disassembles_dir_path,
-         module_tuple_of_func_tuples,
+         profile_module_tuple_of_func_tuples,
          output_max_slashes_fileinfo,
          use_func_name,
       )
+   return slo_results
 
 
 def speed_it(
@@ -328,7 +454,24 @@ def speed_it(
       benchmarkit__check_too_fast=True,
       benchmarkit__rank_by='best',
       benchmarkit__run_sec=1,
-      benchmarkit__repeat=3):
+      benchmarkit__repeat=3,
+      benchmarkit__engine='auto',
+      benchmarkit__build_workers=None,
+      benchmarkit__stable_mode=False,
+      benchmarkit__noise_limits=None,
+      benchmarkit__output_json=False,
+      benchmarkit__outlier_method='tukey',
+      benchmarkit__reject_outliers=False,
+      benchmarkit__plots=True,
+      job_timeout_sec=None,
+      benchmarkit__memory_budgets_mb=None,
+      benchmarkit__interpreters=None,
+      benchmarkit__incremental=False,
+      benchmarkit__isolate_jobs=False,
+      benchmarkit__shared_buffers=None,
+      profileit__engine='cprofile',
+      profileit__sample_interval_sec=SAMPLING_DEFAULT_INTERVAL_SEC,
+      profileit__context_max_depth=CONTEXT_PROFILER_DEFAULT_MAX_DEPTH):
    """ Writes the results per defined module to html files overwriting them if they existed.
 
    :param html_output_dir_path: Base directory to output the results
@@ -345,7 +488,86 @@ def speed_it(
             [module_path_str, (
                (name1_str, function1_name_str, list_of_positional_arguments, dictionary_of_keyword_arguments),
                (name2_str, function2_name_str, list_of_positional_arguments, dictionary_of_keyword_arguments),
-            ]
+            ), optional_module_options_dict]
+
+         Arguments can be a :py:class:`PySpeedIT.fixtures.Fixture`: a deterministic input built once per run by a
+         seeded factory and shared by all modules: each job gets an isolated view: see: :mod:`PySpeedIT.fixtures`
+
+         `optional_module_options_dict` supported keys:
+
+            - ``benchmarkit__compile_variants``: (dict) variant_name: variant_options_dict
+
+               Benchmark-IT builds each variant of the module with Cython and benchmarks all functions in the pure
+               python module and in all compiled variants: the results are ranked in one table.
+               All variants use the `call` engine. Build variants are reused from the Cython build cache:
+               see: :py:func:`PySpeedIT.utils.build_cython_extension_cached`
+
+               variant_options_dict supported keys:
+
+                  - ``pxd_file_path``: (str) path to an augmenting `.pxd` file for a typed variant
+                  - ``extra_compile_args``: (list) extra arguments for the C compiler: e.g. ``['-O3', '-march=native']``
+                  - ``extra_link_args``: (list) extra arguments for the linker
+                  - ``cython_directives``: (dict) Cython compiler directives: e.g. ``{'boundscheck': False}``
+
+               The variants of all modules are build at the same time: see: `benchmarkit__build_workers`
+
+            - ``benchmarkit__work_units``: (dict) name_str: work_units_dict: the work units of one loop of a function
+
+               Benchmark-IT adds the throughput with its 95 % confidence interval: the columns `ops/sec` and
+               `bytes/sec`: see: `benchmarkit__rank_by`
+
+               work_units_dict supported keys: the value is a positive number or a callable which is called once with
+               the positional and keyword arguments of the function and returns the number
+
+                  - ``ops``: (int, float or callable) operations per loop: e.g. items, records or requests
+                  - ``bytes``: (int, float or callable) bytes processed per loop
+
+               .. code-block:: python3
+
+                  {'benchmarkit__work_units': {
+                     'sort: batch 100': {'ops': 100},
+                     'sort: batch 1000': {'ops': len, 'bytes': lambda data: len(data) * 8},
+                  }}
+
+            - ``benchmarkit__slos``: (dict) name_str: list of slo_dicts: latency service level objectives of a function
+
+               Benchmark-IT evaluates each SLO of the loop samples of each repeat: the column `SLOs` shows the status:
+               `PASS`, `FAIL` or `INSUFFICIENT-SAMPLES`, the percentile with its 95 % confidence interval and the
+               margin: a function with too few samples for a valid tail percentile is measured again with a longer
+               `run_sec`: see: :mod:`PySpeedIT.slo`: the return value of `speed_it` is the exit code of the SLO gate
+
+               slo_dict supported keys:
+
+                  - ``percentile``: (float) greater 0 and less 100: e.g. 99.0
+                  - ``threshold_sec``: (float) upper limit of the percentile in seconds: passed if the upper confidence
+                    bound of the percentile is within it
+                  - ``max_run_sec``: (float) optional upper limit of the extended `run_sec`: default: 60
+
+               .. code-block:: python3
+
+                  {'benchmarkit__slos': {
+                     'lookup': [{'percentile': 99, 'threshold_sec': 0.002}, {'percentile': 50, 'threshold_sec': 0.0005}],
+                  }}
+
+            - ``profile_func_tuples``: (tuple) the func tuples for Profile-IT, Line-Memory-Profile-IT and
+              Disassemble-IT: default: the same func tuples as Benchmark-IT: an empty tuple skips these for the module
+
+         The `modules__func_tuples` can also be discovered from decorated functions: ``@benchmark`` / ``@profile``:
+         see: :py:func:`PySpeedIT.discover.discover_modules__func_tuples`: an empty func tuples skips the tool for the
+         module
+
+         .. code-block:: python3
+
+            [path_abspath('dict_sorting.py'), (
+               ('sorting: pep265', 'example_pep265', [data], {}),
+            ), {
+               'benchmarkit__compile_variants': {
+                  'cython': {},
+                  'cython typed': {'pxd_file_path': path_abspath('dict_sorting_typed.pxd')},
+                  'cython -O3 native': {'extra_compile_args': ['-O3', '-march=native']},
+                  'cython no boundscheck': {'cython_directives': {'boundscheck': False, 'wraparound': False}},
+               }
+            }]
 
          .. code-block:: python3
 
@@ -416,10 +638,13 @@ def speed_it(
 
          .. seealso:: :py:func:`Reference-Time <PySpeedIT.benchmark_it._helper_get_perf_counter_reference_time>`
 
-   :param benchmarkit__rank_by: (str) ``best``, ``average`` or ``worst``
+   :param benchmarkit__rank_by: (str) ``best``, ``average``, ``worst``, ``ops_per_sec`` or ``bytes_per_sec``
 
       ..important:: ``worst`` uses also the `best loop time` but ranks the worst one as: base 100%
 
+      - ``ops_per_sec``, ``bytes_per_sec``: rank by throughput: the highest first: all functions of a module must
+        declare the work units: see: module option ``benchmarkit__work_units``
+
    :param benchmarkit__run_sec: (float or -1)
 
       - the number of loops per run is scaled to approximately fit the benchmarkit__run_sec
@@ -429,6 +654,102 @@ def speed_it(
    :param benchmarkit__repeat: (int) how often everything is repeated
 
       - This is a convenient variable that calls the whole Benchmark-IT setup repeatedly
+
+   :param benchmarkit__engine: (str) ``code``, ``call`` or ``auto``
+
+      - ``code``: times only the code body of the function: needs the source code of the function
+      - ``call``: times calling the callable in a generated tight loop: does not need any source code
+        e.g. builtins, C extension functions, Cython compiled functions, bound methods, `functools.partial` objects,
+        lambdas: the calibrated call overhead is reported separately
+      - ``auto``: ``code`` if the source code of a normal python function is available else ``call``
+
+   :param benchmarkit__build_workers: (int or None) maximum number of processes building the
+      `benchmarkit__compile_variants` at the same time: if None the number of CPUs is used
+   :param benchmarkit__stable_mode: (bool) if True: pins the process to one CPU, raises its priority where allowed and
+      waits before each benchmark for a quiet system: see: :mod:`PySpeedIT.system_state`
+   :param benchmarkit__noise_limits: (dict or None) overrides for the ``SYSTEM_NOISE_LIMITS`` of
+      :mod:`PySpeedIT.system_state`: results with more system noise are marked in the column: `suspect`
+
+      .. code-block:: python3
+
+         benchmarkit__noise_limits={'loadavg_per_cpu': 0.5, 'turbo_allowed': False}
+
+   :param benchmarkit__output_json: (bool) if True a structured `.json` file is written next to the html file with the
+      unformatted results of all repeats: times in seconds, resource counters per loop
+   :param benchmarkit__outlier_method: (str) ``tukey`` or ``mad``: classification of the loop outliers:
+      see: :mod:`PySpeedIT.sample_stats`
+   :param benchmarkit__reject_outliers: (bool) if True the ranking uses the statistics without the outliers
+   :param benchmarkit__plots: (bool) if True self-contained inline SVG plots of the loop samples are added to the html:
+      a box plot comparing all functions and a histogram per function: see: :mod:`PySpeedIT.svg_plots`
+   :param job_timeout_sec: (float or None) hard wall-clock time limit in seconds of each Benchmark-IT benchmark (per
+      repeat), Profile-IT profile and Line-Memory-Profile-IT profile: enforced by a signal based watchdog:
+      see: :py:func:`PySpeedIT.utils.watchdog`
+
+      - a timed-out job is reported with the status `TIMEOUT` and its partial samples: the other jobs continue
+      - if None: no time limit
+
+   :param benchmarkit__memory_budgets_mb: (list or None) memory budgets in MiB: if set each function is additionally
+      benchmarked in a forked child process per budget with `RLIMIT_AS` and `RLIMIT_DATA` set to the budget: an extra
+      table reports the time per budget and the smallest budget where the function still completes:
+      see: :mod:`PySpeedIT.memory_budget`
+
+      - the budget limits the whole address space of the child process: inclusive the interpreter
+      - each budget run takes about `benchmarkit__run_sec`
+
+      .. code-block:: python3
+
+         benchmarkit__memory_budgets_mb=[64, 128, 256, 512]
+
+   :param benchmarkit__interpreters: (list or None) Python interpreter executables: paths or names on the `PATH`: if set
+      the Benchmark-IT suite of each module is run in each interpreter as a subprocess from a serialized suite
+      description and the results are merged: each function is ranked across the interpreters in one table:
+      see: :mod:`PySpeedIT.multi_interpreter`
+
+      - interpreter startup and import cost are not part of the timings
+      - each interpreter needs the PySpeedIT requirements: the function arguments must be picklable
+      - not supported together with: `benchmarkit__compile_variants`
+
+      .. code-block:: python3
+
+         benchmarkit__interpreters=['/usr/bin/python3.11', 'python3.12']
+
+   :param benchmarkit__incremental: (bool) if True only functions whose fingerprint changed since the last run on the
+      same host are benchmarked: the results of unchanged functions are reused: the column `fresh` marks the measured
+      rows: see: :mod:`PySpeedIT.result_cache`
+
+      - fingerprint: the source of the function, transitive the module-level helpers it references, the arguments and
+        the Benchmark-IT settings, the interpreter, the PySpeedIT version and the host
+      - the results are stored in: `$PYSPEEDIT_RESULTS_CACHE_DIR` or `$XDG_CACHE_HOME/PySpeedIT/results` or
+        `~/.cache/PySpeedIT/results`
+
+   :param benchmarkit__isolate_jobs: (bool) if True each Benchmark-IT job runs in a clean child process: forked from a
+      server process which has PySpeedIT, the module, its variants and the fixtures already loaded: the results come
+      back over a pipe: an isolated job costs a fork: see: :mod:`PySpeedIT.fork_server`
+
+      - a job can not change the state seen by the following jobs: e.g. module globals or caches
+      - needs the `fork` start method: Linux and other POSIX systems
+
+   :param benchmarkit__shared_buffers: (str or None) ``shm`` or ``mmap``: with `benchmarkit__interpreters`: large
+      buffer arguments: `bytes`, `bytearray`, `array.array` and NumPy arrays are handed off zero-copy in
+      `multiprocessing.shared_memory` segments or memory-mapped temporary files instead of being pickled: the functions
+      get zero-copy views: see: :mod:`PySpeedIT.shared_buffers`: the handoff size and time are reported per
+      interpreter
+
+   :param profileit__engine: (str) ``cprofile``, ``sampling`` or ``context``: see: :mod:`PySpeedIT.profile_it`
+
+      - ``cprofile``: every call is recorded: exact call counts and the callers and callees of each function
+      - ``sampling``: the stacks are sampled: low overhead: an interactive flamegraph per function and the collapsed
+        stacks: see: :mod:`PySpeedIT.sampling_profiler`
+      - ``context``: every call is recorded per call path: a collapsible calling-context tree per function with the
+        self and total time of each node: see: :mod:`PySpeedIT.context_profiler`
+
+   :param profileit__sample_interval_sec: (float) engine ``sampling``: time between two samples: CPU time where
+      `signal.setitimer` is supported else wall-clock time
+   :param profileit__context_max_depth: (int) engine ``context``: the depth cap of the calling-context tree: the time
+      of deeper calls is counted as self time of the node at the cap
+
+   :return: (int) exit code of the SLO gate: 0 if all Benchmark-IT SLOs passed or none are declared: 1 otherwise:
+      see: :py:func:`PySpeedIT.slo.get_slo_exit_code`: e.g. ``sys.exit(speed_it(...))`` in a CI job
    """
    if not html_output_dir_path:
       raise Err('speed_it', ['html_output_dir_path: <{}> needs to be set'.format(html_output_dir_path)])
@@ -445,6 +766,9 @@ def speed_it(
             enable_disassembleit)
       ])
 
+   if job_timeout_sec is not None and job_timeout_sec <= 0:
+      raise Err('speed_it', ['job_timeout_sec: <{}> must be greater than <0> or None'.format(job_timeout_sec)])
+
    # Prepare folders
    benchmarks_dir_path = path_join(html_output_dir_path, 'BenchmarkIT_Results')
    profiles_dir_path = path_join(html_output_dir_path, 'ProfileIT_Results')
@@ -454,13 +778,81 @@ def speed_it(
    if enable_benchmarkit:
       os_makedirs(benchmarks_dir_path, exist_ok=True)
       # do once some other checks
-      if benchmarkit__rank_by not in {'best', 'average', 'worst'}:
+      if benchmarkit__rank_by not in {'best', 'average', 'worst', 'ops_per_sec', 'bytes_per_sec'}:
          raise Err('speed_it', [
-            'enable_benchmarkit: <{}> >> <benchmarkit__rank_by> must be one of: <best, average, worst> We got: <{}>'.format(
+            'enable_benchmarkit: <{}> >> <benchmarkit__rank_by> must be one of: '
+            '<best, average, worst, ops_per_sec, bytes_per_sec> We got: <{}>'.format(
                enable_benchmarkit,
                benchmarkit__rank_by
             )
          ])
+      if benchmarkit__engine not in {'code', 'call', 'auto'}:
+         raise Err('speed_it', [
+            'enable_benchmarkit: <{}> >> <benchmarkit__engine> must be one of: <code, call, auto> We got: <{}>'.format(
+               enable_benchmarkit,
+               benchmarkit__engine
+            )
+         ])
+      if benchmarkit__outlier_method not in OUTLIER_METHODS:
+         raise Err('speed_it', [
+            'enable_benchmarkit: <{}> >> <benchmarkit__outlier_method> must be one of: <{}> We got: <{}>'.format(
+               enable_benchmarkit,
+               ', '.join(OUTLIER_METHODS),
+               benchmarkit__outlier_method
+            )
+         ])
+      if benchmarkit__noise_limits and set(benchmarkit__noise_limits) - set(SYSTEM_NOISE_LIMITS):
+         raise Err('speed_it', [
+            'enable_benchmarkit: <{}> >> <benchmarkit__noise_limits> unknown keys: <{}> supported: <{}>'.format(
+               enable_benchmarkit,
+               sorted(set(benchmarkit__noise_limits) - set(SYSTEM_NOISE_LIMITS)),
+               sorted(SYSTEM_NOISE_LIMITS)
+            )
+         ])
+      if benchmarkit__memory_budgets_mb is not None:
+         # lazy import: the support check loads multiprocessing: only when memory budgets are declared
+         from PySpeedIT.memory_budget import is_memory_budget_supported
+         if not is_memory_budget_supported():
+            raise Err('speed_it', [
+               'enable_benchmarkit: <{}> >> <benchmarkit__memory_budgets_mb> needs the `resource` module and the '
+               '`fork` start method: not supported on this system'.format(enable_benchmarkit)
+            ])
+         if not benchmarkit__memory_budgets_mb or any(
+               not isinstance(budget_mb, (int, float)) or budget_mb <= 0 for budget_mb in benchmarkit__memory_budgets_mb):
+            raise Err('speed_it', [
+               'enable_benchmarkit: <{}> >> <benchmarkit__memory_budgets_mb> must be a not empty list of numbers '
+               'greater than <0> We got: <{}>'.format(enable_benchmarkit, benchmarkit__memory_budgets_mb)
+            ])
+      if benchmarkit__interpreters is not None:
+         if not benchmarkit__interpreters or any(
+               not isinstance(interpreter, str) or not shutil_which(interpreter)
+               for interpreter in benchmarkit__interpreters):
+            raise Err('speed_it', [
+               'enable_benchmarkit: <{}> >> <benchmarkit__interpreters> must be a not empty list of existing '
+               'interpreter executables We got: <{}>'.format(enable_benchmarkit, benchmarkit__interpreters)
+            ])
+         if any(_helper_get_module_options(module_entry).get('benchmarkit__compile_variants')
+                for module_entry in modules__func_tuples):
+            raise Err('speed_it', [
+               'enable_benchmarkit: <{}> >> <benchmarkit__interpreters> is not supported together with '
+               '<benchmarkit__compile_variants>'.format(enable_benchmarkit)
+            ])
+      if benchmarkit__shared_buffers not in (None,) + SHARED_BUFFER_BACKENDS:
+         raise Err('speed_it', [
+            'enable_benchmarkit: <{}> >> <benchmarkit__shared_buffers> must be one of: <None, {}> We got: <{}>'.format(
+               enable_benchmarkit,
+               ', '.join(SHARED_BUFFER_BACKENDS),
+               benchmarkit__shared_buffers
+            )
+         ])
+      if benchmarkit__isolate_jobs:
+         # lazy import: the support check loads multiprocessing: only when the jobs are isolated
+         from PySpeedIT.fork_server import is_fork_server_supported
+         if not is_fork_server_supported():
+            raise Err('speed_it', [
+               'enable_benchmarkit: <{}> >> <benchmarkit__isolate_jobs> needs the `fork` start method: not supported '
+               'on this system'.format(enable_benchmarkit)
+            ])
       if benchmarkit__repeat < 1:
          raise Err('speed_it', [
             'enable_benchmarkit: <{}> >> <benchmarkit__repeat> must be greater than <0> We got: <{}>'.format(
@@ -470,12 +862,44 @@ def speed_it(
          ])
    if enable_profileit:
       os_makedirs(profiles_dir_path, exist_ok=True)
+      if profileit__engine not in {'cprofile', 'sampling', 'context'}:
+         raise Err('speed_it', [
+            'enable_profileit: <{}> >> <profileit__engine> must be one of: <cprofile, sampling, context> '
+            'We got: <{}>'.format(
+               enable_profileit,
+               profileit__engine
+            )
+         ])
+      if not isinstance(profileit__context_max_depth, int) or profileit__context_max_depth < 1:
+         raise Err('speed_it', [
+            'enable_profileit: <{}> >> <profileit__context_max_depth> must be an int greater than <0> '
+            'We got: <{}>'.format(
+               enable_profileit,
+               profileit__context_max_depth
+            )
+         ])
+      if not profileit__sample_interval_sec > 0:
+         raise Err('speed_it', [
+            'enable_profileit: <{}> >> <profileit__sample_interval_sec> must be greater than <0> We got: <{}>'.format(
+               enable_profileit,
+               profileit__sample_interval_sec
+            )
+         ])
    if enable_linememoryprofileit:
       os_makedirs(linememoryprofiles_dir_path, exist_ok=True)
    if enable_disassembleit:
       os_makedirs(disassembles_dir_path, exist_ok=True)
 
-   for module_file_path, module_tuple_of_func_tuples, in modules__func_tuples:
+   # ========== cython compiled variants of all modules: build at the same time
+   if enable_benchmarkit:
+      compiled_variants = _helper_build_compile_variants(modules__func_tuples, benchmarkit__build_workers)
+   else:
+      compiled_variants = {}
+
+   all_slo_results = []
+   for module_idx, module_entry in enumerate(modules__func_tuples):
+      module_file_path, module_tuple_of_func_tuples = module_entry[:2]
+      module_options = _helper_get_module_options(module_entry)
       module_filename = path_basename(module_file_path)
       module_filename_no_extension = path_splitext(module_filename)[0]
 
@@ -496,14 +920,17 @@ def speed_it(
             'COULD NOT LOAD MODULE ERROR: module_file_path: <{}>'.format(module_file_path),
             '  Exception: <{}>'.format(err)
          ])
+      # ========== cython compiled variants
+      variant_modules = _helper_load_compile_variants(module_file_path, compiled_variants.get(module_idx, []))
       # ==========
-      _helper_run_it(
+      all_slo_results += _helper_run_it(
          py_mod,
          benchmarks_dir_path,
          profiles_dir_path,
          linememoryprofiles_dir_path,
          disassembles_dir_path,
          module_tuple_of_func_tuples,
+         module_options.get('profile_func_tuples', module_tuple_of_func_tuples),
          #
          enable_benchmarkit,
          enable_profileit,
@@ -519,5 +946,27 @@ def speed_it(
          benchmarkit__check_too_fast,
          benchmarkit__rank_by,
          benchmarkit__run_sec,
-         benchmarkit__repeat
+         benchmarkit__repeat,
+         benchmarkit__engine,
+         variant_modules,
+         benchmarkit__stable_mode,
+         benchmarkit__noise_limits,
+         benchmarkit__output_json,
+         benchmarkit__outlier_method,
+         benchmarkit__reject_outliers,
+         benchmarkit__plots,
+         job_timeout_sec,
+         benchmarkit__memory_budgets_mb,
+         benchmarkit__interpreters,
+         benchmarkit__incremental,
+         module_options.get('benchmarkit__work_units'),
+         module_options.get('benchmarkit__slos'),
+         benchmarkit__isolate_jobs,
+         benchmarkit__shared_buffers,
+         profileit__engine,
+         profileit__sample_interval_sec,
+         profileit__context_max_depth
       )
+   # fixtures are built once per run
+   clear_fixtures()
+   return get_slo_exit_code(all_slo_results)
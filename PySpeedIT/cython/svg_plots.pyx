@@ -0,0 +1,309 @@
+"""
+===================
+PySpeedIT.svg_plots
+===================
+
+Overview
+========
+Self-contained inline SVG plots of the *Benchmark-IT* loop samples: no external JavaScript or CSS is needed.
+
+   - histogram: one per function: the samples are binned: one `rect` per bin not per sample
+   - box plot: compares all functions of a module: drawn from the sample quartiles and whiskers
+
+And the flamegraph of the *Profile-IT* engine ``sampling``: one `rect` per merged stack frame: the width is the share of
+the samples: a click on a frame zooms into it: a click on the root frame zooms out: the script is embedded in the SVG.
+
+.. index:: Benchmark-IT; plots, Profile-IT; flamegraph
+
+
+Functions
+=========
+
+.. autofunction:: get_svg_histogram
+
+.. autofunction:: get_svg_box_plot
+
+.. autofunction:: get_svg_flamegraph
+"""
+from html import escape as html_escape
+from zlib import crc32 as zlib_crc32
+
+from PySpeedIT.utils import format_time
+
+
+# histogram: number of bins
+SVG_HISTOGRAM_BINS = 40
+# histogram: samples above: third quartile + factor * IQR are counted in one overflow bin
+SVG_HISTOGRAM_TAIL_FACTOR = 3.0
+
+SVG_HISTOGRAM_WIDTH = 320
+SVG_HISTOGRAM_HEIGHT = 140
+SVG_BOX_PLOT_WIDTH = 900
+SVG_BOX_PLOT_LABEL_WIDTH = 220
+SVG_BOX_PLOT_ROW_HEIGHT = 24
+SVG_FLAMEGRAPH_WIDTH = 1200
+SVG_FLAMEGRAPH_ROW_HEIGHT = 16
+# narrower frames and their callees are not drawn: keeps the SVG small for many distinct stacks
+SVG_FLAMEGRAPH_MIN_WIDTH_PX = 0.1
+# approximate width of one character: font-size 11 monospace: longer function texts are cut
+SVG_FLAMEGRAPH_CHAR_WIDTH_PX = 7
+
+# zooms into the clicked frame: the ancestors span the full width: other frames are hidden
+_SVG_FLAMEGRAPH_SCRIPT = '''<script type="text/ecmascript"><![CDATA[
+function pyspeeditFlameZoom(node) {
+   var svg = node.ownerSVGElement;
+   var plotLeft = +svg.getAttribute('data-plot-left'), plotWidth = +svg.getAttribute('data-plot-width');
+   var x = +node.getAttribute('data-x'), w = +node.getAttribute('data-w'), d = +node.getAttribute('data-d');
+   var frames = svg.querySelectorAll('g.flame'), eps = 1e-12;
+   for (var i = 0; i < frames.length; i++) {
+      var frame = frames[i], fx = +frame.getAttribute('data-x'), fw = +frame.getAttribute('data-w');
+      var nx, nw, visible;
+      if (+frame.getAttribute('data-d') < d) {
+         visible = fx <= x + eps && fx + fw >= x + w - eps;
+         nx = 0;
+         nw = 1;
+      } else {
+         visible = fx >= x - eps && fx + fw <= x + w + eps;
+         nx = (fx - x) / w;
+         nw = fw / w;
+      }
+      frame.style.display = visible ? '' : 'none';
+      if (!visible) continue;
+      var rect = frame.querySelector('rect'), text = frame.querySelector('text');
+      var name = frame.getAttribute('data-n'), chars = Math.floor((nw * plotWidth - 6) / {char_width});
+      rect.setAttribute('x', (plotLeft + nx * plotWidth).toFixed(1));
+      rect.setAttribute('width', (nw * plotWidth).toFixed(1));
+      text.setAttribute('x', (plotLeft + nx * plotWidth + 3).toFixed(1));
+      text.textContent = chars < 3 ? '' : (name.length <= chars ? name : name.slice(0, chars - 2) + '..');
+   }
+}
+]]></script>'''
+
+
+def get_svg_histogram(samples, title, sample_stats, num_bins=SVG_HISTOGRAM_BINS):
+   """ Returns an inline SVG histogram of the samples
+
+   - the range is: the fastest sample to: third quartile + `SVG_HISTOGRAM_TAIL_FACTOR` * IQR:
+     slower samples are counted in an extra overflow bin drawn in red
+
+   :param samples: (list or array) loop samples in seconds
+   :param title: (str) title: e.g. the function name
+   :param sample_stats: (dict) see: :py:func:`PySpeedIT.sample_stats.get_sample_stats`
+   :param num_bins: (int) number of bins
+   :return: (str) svg element
+   """
+   width = SVG_HISTOGRAM_WIDTH
+   height = SVG_HISTOGRAM_HEIGHT
+   plot_top = 20
+   plot_bottom = height - 20
+   plot_height = plot_bottom - plot_top
+   svg_parts = [
+      '<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{1}" viewBox="0 0 {0} {1}" '
+      'style="background-color:#FCFCFC; margin:4px;">'.format(width, height),
+      '<text x="4" y="13" font-size="11" font-weight="bold">{}</text>'.format(html_escape(title)),
+   ]
+   if not samples:
+      svg_parts.append('<text x="4" y="40" font-size="11">NOT-MEASURED</text></svg>')
+      return ''.join(svg_parts)
+
+   range_low = min(samples)
+   range_high = min(
+      max(samples),
+      sample_stats['quartile_3_loop_sec'] + SVG_HISTOGRAM_TAIL_FACTOR * (
+         sample_stats['quartile_3_loop_sec'] - sample_stats['quartile_1_loop_sec'])
+   )
+   bin_width = (range_high - range_low) / num_bins
+   bins = [0] * num_bins
+   overflow = 0
+   if bin_width > 0.0:
+      last_bin = num_bins - 1
+      for sample in samples:
+         if sample > range_high:
+            overflow += 1
+         else:
+            bin_idx = int((sample - range_low) / bin_width)
+            bins[bin_idx if bin_idx < last_bin else last_bin] += 1
+   else:
+      bins[0] = len(samples)
+
+   max_count = max(max(bins), overflow)
+   bar_width = (width - 8) / (num_bins + 2)
+   for bin_idx, count in enumerate(bins):
+      if count:
+         bar_height = count / max_count * plot_height
+         svg_parts.append('<rect x="{:.1f}" y="{:.1f}" width="{:.1f}" height="{:.1f}" fill="#4A7FC1"/>'.format(
+            4 + bin_idx * bar_width, plot_bottom - bar_height, bar_width * 0.9, bar_height))
+   if overflow:
+      bar_height = overflow / max_count * plot_height
+      svg_parts.append(
+         '<rect x="{:.1f}" y="{:.1f}" width="{:.1f}" height="{:.1f}" fill="#C14A4A">'
+         '<title>{:,} slower samples</title></rect>'.format(
+            4 + (num_bins + 1) * bar_width, plot_bottom - bar_height, bar_width * 0.9, bar_height, overflow))
+
+   svg_parts.extend([
+      '<line x1="4" y1="{0}" x2="{1}" y2="{0}" stroke="black" stroke-width="0.5"/>'.format(plot_bottom, width - 4),
+      '<text x="4" y="{}" font-size="10">{}</text>'.format(height - 5, format_time(range_low)),
+      '<text x="{}" y="{}" font-size="10" text-anchor="end">{}</text>'.format(
+         4 + num_bins * bar_width, height - 5, format_time(range_high)),
+      '<text x="{}" y="13" font-size="10" text-anchor="end">max bin: {:,} of {:,}</text>'.format(
+         width - 4, max_count, len(samples)),
+      '</svg>',
+   ])
+   return ''.join(svg_parts)
+
+
+def get_svg_box_plot(rows):
+   """ Returns an inline SVG box plot comparing all rows on one time axis
+
+   - box: first to third quartile: line: median: whiskers: lowest/highest sample within the Tukey mild fences
+
+   :param rows: (list) of tuples: (name, sample_stats): sample_stats see:
+      :py:func:`PySpeedIT.sample_stats.get_sample_stats`
+   :return: (str) svg element
+   """
+   width = SVG_BOX_PLOT_WIDTH
+   label_width = SVG_BOX_PLOT_LABEL_WIDTH
+   row_height = SVG_BOX_PLOT_ROW_HEIGHT
+   height = row_height * len(rows) + 30
+   plot_left = label_width + 10
+   plot_width = width - plot_left - 10
+
+   measured_rows = [sample_stats for name, sample_stats in rows if sample_stats['whisker_low_loop_sec'] != -1.0]
+   if measured_rows:
+      axis_low = min(sample_stats['whisker_low_loop_sec'] for sample_stats in measured_rows)
+      axis_high = max(sample_stats['whisker_high_loop_sec'] for sample_stats in measured_rows)
+   else:
+      axis_low = axis_high = 0.0
+   if axis_high <= axis_low:
+      axis_high = axis_low + 1e-9
+
+   def x_pos(value_):
+      return plot_left + (value_ - axis_low) / (axis_high - axis_low) * plot_width
+
+   svg_parts = [
+      '<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{1}" viewBox="0 0 {0} {1}" '
+      'style="background-color:#FCFCFC; margin:4px;">'.format(width, height),
+   ]
+   for row_idx, (name, sample_stats) in enumerate(rows):
+      y_center = row_idx * row_height + row_height / 2 + 4
+      svg_parts.append('<text x="{}" y="{:.1f}" font-size="11" text-anchor="end">{}</text>'.format(
+         label_width, y_center + 4, html_escape(name)))
+      if sample_stats['whisker_low_loop_sec'] == -1.0:
+         continue
+      box_left = x_pos(sample_stats['quartile_1_loop_sec'])
+      box_right = x_pos(sample_stats['quartile_3_loop_sec'])
+      svg_parts.extend([
+         '<line x1="{:.1f}" y1="{:.1f}" x2="{:.1f}" y2="{:.1f}" stroke="black" stroke-width="1"/>'.format(
+            x_pos(sample_stats['whisker_low_loop_sec']), y_center, x_pos(sample_stats['whisker_high_loop_sec']),
+            y_center),
+         '<rect x="{:.1f}" y="{:.1f}" width="{:.1f}" height="{:.1f}" fill="#FFC6C6" stroke="black" '
+         'stroke-width="1"><title>Q1: {} median: {} Q3: {}</title></rect>'.format(
+            box_left, y_center - row_height * 0.35, max(box_right - box_left, 1.0), row_height * 0.7,
+            format_time(sample_stats['quartile_1_loop_sec']), format_time(sample_stats['median_loop_sec']),
+            format_time(sample_stats['quartile_3_loop_sec'])),
+         '<line x1="{0:.1f}" y1="{1:.1f}" x2="{0:.1f}" y2="{2:.1f}" stroke="blue" stroke-width="2"/>'.format(
+            x_pos(sample_stats['median_loop_sec']), y_center - row_height * 0.35, y_center + row_height * 0.35),
+      ])
+   axis_y = row_height * len(rows) + 8
+   svg_parts.extend([
+      '<line x1="{0}" y1="{1}" x2="{2}" y2="{1}" stroke="black" stroke-width="0.5"/>'.format(
+         plot_left, axis_y, plot_left + plot_width),
+      '<text x="{}" y="{}" font-size="10">{}</text>'.format(plot_left, axis_y + 14, format_time(axis_low)),
+      '<text x="{}" y="{}" font-size="10" text-anchor="end">{}</text>'.format(
+         plot_left + plot_width, axis_y + 14, format_time(axis_high)),
+      '</svg>',
+   ])
+   return ''.join(svg_parts)
+
+
+def _helper_get_flamegraph_color(func_txt):
+   """ Returns a warm fill color: stable for the same function text
+   """
+   hash_value = zlib_crc32(func_txt.encode('utf-8'))
+   return 'rgb({},{},{})'.format(
+      205 + (hash_value & 0xFF) * 50 // 255,
+      ((hash_value >> 8) & 0xFF) * 230 // 255,
+      ((hash_value >> 16) & 0xFF) * 55 // 255,
+   )
+
+
+def _helper_cut_flamegraph_text(func_txt, width_px):
+   """ Returns the function text cut to the frame width
+   """
+   chars = int((width_px - 6) // SVG_FLAMEGRAPH_CHAR_WIDTH_PX)
+   if chars < 3:
+      return ''
+   if len(func_txt) <= chars:
+      return func_txt
+   return func_txt[:chars - 2] + '..'
+
+
+def get_svg_flamegraph(collapsed_stacks, title):
+   """ Returns an inline interactive SVG flamegraph: the root frame at the bottom: the callees above their callers
+
+   - frames with the same stack prefix are merged: siblings are sorted by their function text
+   - frames narrower than `SVG_FLAMEGRAPH_MIN_WIDTH_PX` are not drawn
+   - a click on a frame zooms into it: a click on the root frame zooms out: the tooltip shows the samples
+
+   :param collapsed_stacks: (list) of tuples: (func_txts, count): see:
+      :py:meth:`PySpeedIT.results.SampledProfileResult.get_collapsed_stacks`
+   :param title: (str) title and text of the root frame: e.g. the function name
+   :return: (str) svg element
+   """
+   # merge the stacks: node: [count, children: func_txt: node]
+   root_node = [0, {}]
+   for func_txts, count in collapsed_stacks:
+      root_node[0] += count
+      node = root_node
+      for func_txt in func_txts:
+         node = node[1].setdefault(func_txt, [0, {}])
+         node[0] += count
+   total_count = root_node[0]
+
+   width = SVG_FLAMEGRAPH_WIDTH
+   row_height = SVG_FLAMEGRAPH_ROW_HEIGHT
+   plot_left = 10
+   plot_width = width - 2 * plot_left
+   # frames: (func_txt, depth, x_fraction, width_fraction, count)
+   frames = []
+   pending = [(title, root_node, 0, 0.0)]
+   while pending:
+      func_txt, node, depth, x_fraction = pending.pop()
+      width_fraction = node[0] / total_count if total_count else 1.0
+      if width_fraction * plot_width < SVG_FLAMEGRAPH_MIN_WIDTH_PX:
+         continue
+      frames.append((func_txt, depth, x_fraction, width_fraction, node[0]))
+      child_x_fraction = x_fraction
+      for child_func_txt in sorted(node[1]):
+         child_node = node[1][child_func_txt]
+         pending.append((child_func_txt, child_node, depth + 1, child_x_fraction))
+         child_x_fraction += child_node[0] / total_count
+
+   max_depth = max(depth for func_txt, depth, x_fraction, width_fraction, count in frames)
+   plot_top = 24
+   height = plot_top + (max_depth + 1) * row_height + 10
+   svg_parts = [
+      '<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{1}" viewBox="0 0 {0} {1}" '
+      'data-plot-left="{2}" data-plot-width="{3}" style="background-color:#FCFCFC; margin:4px;">'.format(
+         width, height, plot_left, plot_width),
+      _SVG_FLAMEGRAPH_SCRIPT.replace('{char_width}', str(SVG_FLAMEGRAPH_CHAR_WIDTH_PX)),
+      '<text x="{}" y="16" font-size="12" font-weight="bold">{}</text>'.format(plot_left, html_escape(title)),
+      '<text x="{}" y="16" font-size="10" text-anchor="end">samples: {:,}: click a frame to zoom: the root frame '
+      'zooms out</text>'.format(width - plot_left, total_count),
+   ]
+   for func_txt, depth, x_fraction, width_fraction, count in frames:
+      frame_x = plot_left + x_fraction * plot_width
+      frame_width = width_fraction * plot_width
+      frame_y = plot_top + (max_depth - depth) * row_height
+      svg_parts.append(
+         '<g class="flame" data-n="{0}" data-x="{1!r}" data-w="{2!r}" data-d="{3}" onclick="pyspeeditFlameZoom(this)" '
+         'style="cursor:pointer"><title>{0}: {4:,} samples: {5:.2f} %</title>'
+         '<rect x="{6:.1f}" y="{7}" width="{8:.1f}" height="{9}" fill="{10}" rx="2"/>'
+         '<text x="{11:.1f}" y="{12}" font-size="11" font-family="monospace">{13}</text></g>'.format(
+            html_escape(func_txt), x_fraction, width_fraction, depth, count,
+            count * 100.0 / total_count if total_count else 100.0,
+            frame_x, frame_y, frame_width, row_height - 1, _helper_get_flamegraph_color(func_txt),
+            frame_x + 3, frame_y + row_height - 4, html_escape(_helper_cut_flamegraph_text(func_txt, frame_width)))
+      )
+   svg_parts.append('</svg>')
+   return ''.join(svg_parts)
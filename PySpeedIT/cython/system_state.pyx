@@ -0,0 +1,412 @@
+"""
+======================
+PySpeedIT.system_state
+======================
+
+Overview
+========
+Samples the system state to detect *system noise* during benchmarks and provides a *stable mode*.
+
+The system state is read from the Linux `/proc` and `/sys` files: on other systems or within containers which do not
+provide a file the related values are `None` and are not checked.
+
+   - load average: `/proc/loadavg`
+   - runnable tasks and steal time: `/proc/stat`
+   - CPU governor and frequency: `/sys/devices/system/cpu/cpuN/cpufreq/`
+   - turbo boost: `/sys/devices/system/cpu/intel_pstate/no_turbo` or `/sys/devices/system/cpu/cpufreq/boost`
+
+A benchmark result is *suspect* if the system noise measured before/after it is above the `SYSTEM_NOISE_LIMITS`.
+
+The resource counters of the benchmark process (`resource.getrusage` and `/proc/self/io`) are sampled once before/after
+each sample window and normalized per loop.
+
+.. index:: Benchmark-IT; stable mode
+
+Stable mode
+-----------
+
+   - pins the process to one CPU
+   - raises the process priority where allowed (normally only for privileged users)
+   - rechecks the system conditions before each sample window and waits for a quiet system
+
+
+Functions
+=========
+
+.. autofunction:: get_system_state
+
+.. autofunction:: get_system_noise
+
+.. autofunction:: enter_stable_mode
+
+.. autofunction:: exit_stable_mode
+
+.. autofunction:: wait_for_quiet_system
+
+.. autofunction:: get_resource_usage
+
+.. autofunction:: get_resource_usage_delta
+"""
+from os import (
+   cpu_count as os_cpu_count,
+)
+from sys import platform as sys_platform
+from time import sleep as time_sleep
+
+try:
+   from resource import (
+      RUSAGE_SELF as resource_RUSAGE_SELF,
+      getrusage as resource_getrusage,
+   )
+except ImportError:
+   resource_RUSAGE_SELF = None
+   resource_getrusage = None
+
+try:
+   from os import (
+      sched_getaffinity as os_sched_getaffinity,
+      sched_setaffinity as os_sched_setaffinity,
+   )
+except ImportError:
+   os_sched_getaffinity = None
+   os_sched_setaffinity = None
+
+try:
+   from os import (
+      PRIO_PROCESS as os_PRIO_PROCESS,
+      getpriority as os_getpriority,
+      setpriority as os_setpriority,
+   )
+except ImportError:
+   os_PRIO_PROCESS = None
+   os_getpriority = None
+   os_setpriority = None
+
+from PySpeedIT.utils import Err
+
+
+# default limits above which a benchmark result is marked as suspect
+SYSTEM_NOISE_LIMITS = {
+   # 1 minute load average divided by the number of usable CPUs
+   'loadavg_per_cpu': 0.8,
+   # runnable tasks (without the benchmark itself) divided by the number of usable CPUs
+   'runnable_tasks_per_cpu': 0.5,
+   # percent of the CPU time stolen by the hypervisor
+   'steal_percent': 1.0,
+   # percent change of the CPU frequency between before/after
+   'cpu_freq_change_percent': 10.0,
+   # CPU governors which do not keep a fixed clock
+   'suspect_cpu_governors': ('powersave', 'conservative'),
+   # if False: an enabled turbo boost is marked as suspect
+   'turbo_allowed': True,
+}
+
+# stable mode: niceness which is tried to be set (only allowed for privileged users)
+STABLE_MODE_NICENESS = -10
+# stable mode: how often the system conditions are rechecked before a sample window is run anyway
+STABLE_MODE_RETRIES = 5
+# stable mode: seconds of one recheck window
+STABLE_MODE_WINDOW_SEC = 0.2
+
+
+# ===========================================================================================================================
+# helpers
+# ===========================================================================================================================
+def _helper_read_first_line(file_path):
+   """ Returns the first line of a file or None if it can not be read
+
+   :param file_path: (str)
+   :return: (str or None) stripped first line
+   """
+   try:
+      with open(file_path) as file_:
+         return file_.readline().strip()
+   except (OSError, ValueError):
+      return None
+
+
+def _helper_get_usable_cpus():
+   """ Returns the CPUs the process may run on
+
+   :return: (list) of CPU numbers
+   """
+   if os_sched_getaffinity is not None:
+      return sorted(os_sched_getaffinity(0))
+   return list(range(os_cpu_count() or 1))
+
+
+# ===========================================================================================================================
+# public helpers
+# ===========================================================================================================================
+def get_system_state():
+   """ Returns a sample of the system state
+
+   :return: (dict) system state: values are None if they could not be read
+
+      - cpu_count: (int) number of CPUs of the system: not only the usable CPUs: the load average and the runnable
+        tasks are system wide: also in the stable mode which pins the process to one CPU
+      - loadavg_1min: (float)
+      - runnable_tasks: (int) inclusive the benchmark itself
+      - cpu_total_jiffies: (int)
+      - cpu_steal_jiffies: (int)
+      - cpu_governors: (list) sorted governors of the usable CPUs
+      - cpu_freq_khz: (float) average current frequency of the usable CPUs
+      - turbo: (bool)
+   """
+   usable_cpus = _helper_get_usable_cpus()
+   system_state = {
+      'cpu_count': os_cpu_count() or 1,
+      'loadavg_1min': None,
+      'runnable_tasks': None,
+      'cpu_total_jiffies': None,
+      'cpu_steal_jiffies': None,
+      'cpu_governors': None,
+      'cpu_freq_khz': None,
+      'turbo': None,
+   }
+
+   loadavg_line = _helper_read_first_line('/proc/loadavg')
+   if loadavg_line:
+      system_state['loadavg_1min'] = float(loadavg_line.split()[0])
+
+   try:
+      with open('/proc/stat') as file_:
+         for line in file_:
+            if line.startswith('cpu '):
+               # user nice system idle iowait irq softirq steal guest guest_nice
+               cpu_jiffies = [int(value) for value in line.split()[1:]]
+               system_state['cpu_total_jiffies'] = sum(cpu_jiffies[:8])
+               if len(cpu_jiffies) > 7:
+                  system_state['cpu_steal_jiffies'] = cpu_jiffies[7]
+            elif line.startswith('procs_running '):
+               system_state['runnable_tasks'] = int(line.split()[1])
+   except (OSError, ValueError):
+      pass
+
+   governors = set()
+   frequencies = []
+   for cpu in usable_cpus:
+      cpufreq_dir_path = '/sys/devices/system/cpu/cpu{}/cpufreq/'.format(cpu)
+      governor = _helper_read_first_line(cpufreq_dir_path + 'scaling_governor')
+      if governor:
+         governors.add(governor)
+      frequency = _helper_read_first_line(cpufreq_dir_path + 'scaling_cur_freq')
+      if frequency and frequency.isdigit():
+         frequencies.append(int(frequency))
+   if governors:
+      system_state['cpu_governors'] = sorted(governors)
+   if frequencies:
+      system_state['cpu_freq_khz'] = sum(frequencies) / len(frequencies)
+
+   no_turbo = _helper_read_first_line('/sys/devices/system/cpu/intel_pstate/no_turbo')
+   if no_turbo in ('0', '1'):
+      system_state['turbo'] = no_turbo == '0'
+   else:
+      boost = _helper_read_first_line('/sys/devices/system/cpu/cpufreq/boost')
+      if boost in ('0', '1'):
+         system_state['turbo'] = boost == '1'
+   return system_state
+
+
+def get_system_noise(state_before, state_after, noise_limits=None):
+   """ Returns the reasons why a benchmark run between: state_before and state_after is suspect
+
+   :param state_before: (dict) see: get_system_state()
+   :param state_after: (dict) see: get_system_state()
+   :param noise_limits: (dict or None) overrides for the: `SYSTEM_NOISE_LIMITS`
+   :return: (list) of strings: empty if the system was quiet
+   """
+   limits = dict(SYSTEM_NOISE_LIMITS)
+   if noise_limits:
+      if set(noise_limits) - set(SYSTEM_NOISE_LIMITS):
+         raise Err('system_state.get_system_noise', [
+            'noise_limits: unknown keys: <{}> supported: <{}>'.format(
+               sorted(set(noise_limits) - set(SYSTEM_NOISE_LIMITS)),
+               sorted(SYSTEM_NOISE_LIMITS)
+            )
+         ])
+      limits.update(noise_limits)
+
+   noise_reasons = []
+   cpu_count = state_after['cpu_count'] or 1
+
+   loadavg_values = [state['loadavg_1min'] for state in (state_before, state_after) if state['loadavg_1min'] is not None]
+   if loadavg_values and max(loadavg_values) / cpu_count > limits['loadavg_per_cpu']:
+      noise_reasons.append('loadavg: {:.2f} per cpu > {:.2f}'.format(max(loadavg_values) / cpu_count,
+         limits['loadavg_per_cpu']))
+
+   runnable_values = [state['runnable_tasks'] for state in (state_before, state_after) if
+      state['runnable_tasks'] is not None]
+   if runnable_values and (max(runnable_values) - 1) / cpu_count > limits['runnable_tasks_per_cpu']:
+      noise_reasons.append('runnable tasks: {} on {} cpu'.format(max(runnable_values) - 1, cpu_count))
+
+   if None not in (state_before['cpu_steal_jiffies'], state_after['cpu_steal_jiffies']):
+      total_jiffies = state_after['cpu_total_jiffies'] - state_before['cpu_total_jiffies']
+      if total_jiffies > 0:
+         steal_percent = (state_after['cpu_steal_jiffies'] - state_before['cpu_steal_jiffies']) / total_jiffies * 100.0
+         if steal_percent > limits['steal_percent']:
+            noise_reasons.append('steal time: {:.1f} % > {:.1f} %'.format(steal_percent, limits['steal_percent']))
+
+   for state in (state_before, state_after):
+      if state['cpu_governors']:
+         suspect_governors = set(state['cpu_governors']) & set(limits['suspect_cpu_governors'])
+         if suspect_governors:
+            noise_reasons.append('cpu governor: {}'.format(', '.join(sorted(suspect_governors))))
+            break
+
+   if state_before['cpu_freq_khz'] and state_after['cpu_freq_khz']:
+      freq_change_percent = abs(state_after['cpu_freq_khz'] - state_before['cpu_freq_khz']) / \
+         state_before['cpu_freq_khz'] * 100.0
+      if freq_change_percent > limits['cpu_freq_change_percent']:
+         noise_reasons.append('cpu frequency changed: {:.1f} % > {:.1f} %'.format(freq_change_percent,
+            limits['cpu_freq_change_percent']))
+
+   if not limits['turbo_allowed'] and (state_before['turbo'] or state_after['turbo']):
+      noise_reasons.append('turbo boost enabled')
+
+   return noise_reasons
+
+
+def enter_stable_mode(cpu=None):
+   """ Pins the process to one CPU and raises its priority where allowed
+
+   :param cpu: (int or None) CPU number to pin the process to: if None the last usable CPU is used
+      (the first CPU mostly handles more interrupts)
+   :return: (dict) saved process settings to be passed to: exit_stable_mode()
+
+      - affinity: (set or None) the previous CPU affinity
+      - niceness: (int or None) the previous niceness
+      - cpu: (int or None) the pinned CPU
+      - niceness_raised: (bool) True if the priority could be raised
+   """
+   saved_settings = {'affinity': None, 'niceness': None, 'cpu': None, 'niceness_raised': False}
+   if os_sched_setaffinity is not None:
+      saved_settings['affinity'] = os_sched_getaffinity(0)
+      if cpu is None:
+         cpu = max(saved_settings['affinity'])
+      try:
+         os_sched_setaffinity(0, {cpu})
+         saved_settings['cpu'] = cpu
+      except OSError as err:
+         raise Err('system_state.enter_stable_mode', [
+            'could not pin the process to cpu: <{}>'.format(cpu),
+            '  OSError: <{}>'.format(err)
+         ])
+
+   if os_setpriority is not None:
+      saved_settings['niceness'] = os_getpriority(os_PRIO_PROCESS, 0)
+      if saved_settings['niceness'] > STABLE_MODE_NICENESS:
+         try:
+            os_setpriority(os_PRIO_PROCESS, 0, STABLE_MODE_NICENESS)
+            saved_settings['niceness_raised'] = True
+         except OSError:
+            # not allowed: keep the current priority
+            pass
+   return saved_settings
+
+
+def exit_stable_mode(saved_settings):
+   """ Restores the process settings changed by: enter_stable_mode()
+
+   :param saved_settings: (dict) see: enter_stable_mode()
+   """
+   if saved_settings['affinity'] is not None:
+      os_sched_setaffinity(0, saved_settings['affinity'])
+   if saved_settings['niceness_raised']:
+      try:
+         os_setpriority(os_PRIO_PROCESS, 0, saved_settings['niceness'])
+      except OSError:
+         pass
+
+
+def wait_for_quiet_system(noise_limits=None, retries=STABLE_MODE_RETRIES, window_sec=STABLE_MODE_WINDOW_SEC):
+   """ Rechecks the system conditions until the system is quiet or the retries are used up
+
+   :param noise_limits: (dict or None) see: get_system_noise()
+   :param retries: (int) maximum number of recheck windows
+   :param window_sec: (float) seconds of one recheck window
+   :return: (list) of strings: the noise reasons of the last recheck window: empty if the system was quiet
+   """
+   noise_reasons = []
+   for retry in range(retries):
+      state_before = get_system_state()
+      time_sleep(window_sec)
+      noise_reasons = get_system_noise(state_before, get_system_state(), noise_limits)
+      if not noise_reasons:
+         break
+   return noise_reasons
+
+
+def get_resource_usage():
+   """ Returns a sample of the resource counters of the current process
+
+   :return: (dict) resource counters: values are None if they could not be read
+
+      - minor_faults: (int) page faults serviced without any I/O
+      - major_faults: (int) page faults serviced with I/O
+      - voluntary_ctx_switches: (int) e.g. waiting for a resource
+      - involuntary_ctx_switches: (int) e.g. preempted by the scheduler
+      - max_rss_kb: (int) peak resident set size in KiB
+      - io_read_bytes: (int) bytes read by system calls: `/proc/self/io` `rchar`
+      - io_write_bytes: (int) bytes written by system calls: `/proc/self/io` `wchar`
+   """
+   resource_usage = {
+      'minor_faults': None,
+      'major_faults': None,
+      'voluntary_ctx_switches': None,
+      'involuntary_ctx_switches': None,
+      'max_rss_kb': None,
+      'io_read_bytes': None,
+      'io_write_bytes': None,
+   }
+   if resource_getrusage is not None:
+      rusage = resource_getrusage(resource_RUSAGE_SELF)
+      resource_usage['minor_faults'] = rusage.ru_minflt
+      resource_usage['major_faults'] = rusage.ru_majflt
+      resource_usage['voluntary_ctx_switches'] = rusage.ru_nvcsw
+      resource_usage['involuntary_ctx_switches'] = rusage.ru_nivcsw
+      if sys_platform == 'darwin':
+         # macOS reports bytes
+         resource_usage['max_rss_kb'] = rusage.ru_maxrss // 1024
+      else:
+         resource_usage['max_rss_kb'] = rusage.ru_maxrss
+
+   try:
+      with open('/proc/self/io', 'rb') as file_:
+         proc_self_io = file_.read()
+      for line in proc_self_io.decode('ascii').splitlines():
+         key, value = line.split(':', 1)
+         if key == 'rchar':
+            resource_usage['io_read_bytes'] = int(value)
+         elif key == 'wchar':
+            resource_usage['io_write_bytes'] = int(value)
+      # reading `/proc/self/io` is counted itself by the next sample
+      resource_usage['_io_sample_bytes'] = len(proc_self_io)
+   except (OSError, ValueError):
+      pass
+   return resource_usage
+
+
+def get_resource_usage_delta(usage_before, usage_after, loops):
+   """ Returns the resource counter differences normalized per loop
+
+   :param usage_before: (dict) see: get_resource_usage()
+   :param usage_after: (dict) see: get_resource_usage()
+   :param loops: (int) number of loops of the sample window
+   :return: (dict) keys see: get_resource_usage(): values are per loop (float) or None if they could not be read
+
+      - max_rss_kb: is not normalized: the peak resident set size after the sample window
+   """
+   resource_usage_delta = {}
+   for key, value_after in usage_after.items():
+      if key.startswith('_'):
+         continue
+      if key == 'max_rss_kb':
+         resource_usage_delta[key] = value_after
+      elif value_after is None or usage_before[key] is None or loops < 1:
+         resource_usage_delta[key] = None
+      else:
+         if key == 'io_read_bytes':
+            value_after -= usage_before['_io_sample_bytes']
+         resource_usage_delta[key] = (value_after - usage_before[key]) / loops
+   return resource_usage_delta
@@ -19,6 +19,8 @@ For usage see :mod:`PySpeedIT.speed_it`
 Functions
 =========
 
+.. autofunction:: disassemble_functions
+
 .. autofunction:: disassemble_functions_in_module
 """
 from dis import Bytecode
@@ -28,6 +30,10 @@ from os.path import (
    join as path_join,
 )
 
+from PySpeedIT.results import (
+   DisassembleResult,
+   Instruction,
+)
 from PySpeedIT.utils import (
    Err,
    get_html_template_css,
@@ -117,14 +123,13 @@ def get_html_table_row_template():
    '''
 
 
-def _dis_it(func):
-   """ Returns a dictionary with the disassembled result
+def _dis_it(func, name):
+   """ Returns the disassembled result
 
    :param func: (function)
-   :return: (list) table = list_of_dictionaries
+   :param name: (str) the name of the result
+   :return: (obj) :py:class:`PySpeedIT.results.DisassembleResult`: unformatted values
    """
-   table = []
-
    bytecode = Bytecode(func)
    code = bytecode.codeobj
    filename = code.co_filename
@@ -134,37 +139,42 @@ def _dis_it(func):
       raise Err('_dis_it', ['ERROR: Could not find file: {}'.format(filename)])
    all_lines = linecache_getlines(filename)
 
-   for instr in bytecode:
-      temp_dict = {}
-      if instr.starts_line:
-         temp_dict['starts_line'] = '{}'.format(instr.starts_line)
-      else:
-         temp_dict['starts_line'] = ''
-
-      temp_dict['offset'] = '{}'.format(instr.offset)
-      temp_dict['opname'] = '{}'.format(instr.opname)
+   return DisassembleResult(name, tuple(
+      Instruction(
+         instr.offset, instr.opname, instr.arg, instr.argval, instr.argrepr, instr.is_jump_target, instr.starts_line,
+         all_lines[instr.starts_line - 1].strip() if instr.starts_line else ''
+      )
+      for instr in bytecode
+   ))
 
-      if instr.arg:
-         temp_dict['arg'] = '{}'.format(instr.arg)
-      else:
-         temp_dict['arg'] = ''
 
-      if instr.argval:
-         temp_dict['argval'] = '{}'.format(instr.argval)
-      else:
-         temp_dict['argval'] = ''
+def disassemble_functions(loaded_module, module_tuple_of_func_tuples, use_func_name=True):
+   """ Returns the Disassemble-IT results of all defined functions: the library API: nothing is written
 
-      temp_dict['argrepr'] = '{}'.format(instr.argrepr)
-      temp_dict['is_jump_target'] = '{}'.format(instr.is_jump_target)
+   .. seealso::
 
-      if instr.starts_line:
-         temp_dict['line'] = all_lines[instr.starts_line - 1].strip()
-      else:
-         temp_dict['line'] = ''
+      for the meaning of the parameters :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
 
-      table.append(temp_dict)
+   :return: (list) of :py:class:`PySpeedIT.results.DisassembleResult`: one per function
+   :raise Err:
+   """
+   disassemble_results = []
+   for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
+      try:
+         func = getattr(loaded_module, function_name_str)
+      except Exception as err:
+         raise Err('disassemble_functions', [
+            'COULD NOT ACCESS FUNCTION ERROR: function_name_str: <{}>'.format(function_name_str),
+            '  loaded_module: <{}>'.format(loaded_module),
+            '    Exception: <{}>'.format(err)
+         ])
 
-   return table
+      if use_func_name:
+         name = getattr(func, "__name__", func)
+      else:
+         name = name_str
+      disassemble_results.append(_dis_it(func, name))
+   return disassemble_results
 
 
 def disassemble_functions_in_module(
@@ -196,24 +206,9 @@ def disassemble_functions_in_module(
 
    '''.format(head_embedded_style_sheet=get_html_template_css(), head_module_name=module_name)
 
-   for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
-      try:
-         func = getattr(loaded_module, function_name_str)
-      except Exception as err:
-         raise Err('_profile_functions_in_module', [
-            'COULD NOT ACCESS FUNCTION ERROR: function_name_str: <{}>'.format(function_name_str),
-            '  loaded_module: <{}>'.format(loaded_module),
-            '    Exception: <{}>'.format(err)
-         ])
-
-      if use_func_name:
-         name = getattr(func, "__name__", func)
-      else:
-         name = name_str
-      table = _dis_it(func)
-
+   for disassemble_result in disassemble_functions(loaded_module, module_tuple_of_func_tuples, use_func_name):
       final_result_rows = ''
-      for idx, row in enumerate(table):
+      for idx, instruction in enumerate(disassemble_result.instructions):
          if (idx % 2) == 0:
             final_td_class = 'row-even'
          else:
@@ -221,18 +216,18 @@ def disassemble_functions_in_module(
 
          final_result_rows += get_html_table_row_template().format(
             td_class=final_td_class,
-            td_starts_line=row['starts_line'],
-            td_offset=row['offset'],
-            td_opname=row['opname'],
-            td_arg=row['arg'],
-            td_argval=row['argval'],
-            td_argrepr=row['argrepr'],
-            td_is_jump_target=row['is_jump_target'],
-            td_line=row['line'],
+            td_starts_line='{}'.format(instruction.starts_line) if instruction.starts_line else '',
+            td_offset='{}'.format(instruction.offset),
+            td_opname='{}'.format(instruction.opname),
+            td_arg='{}'.format(instruction.arg) if instruction.arg else '',
+            td_argval='{}'.format(instruction.argval) if instruction.argval else '',
+            td_argrepr='{}'.format(instruction.argrepr),
+            td_is_jump_target='{}'.format(instruction.is_jump_target),
+            td_line=instruction.line,
          )
 
       final_html_table_profile += get_html_table_template().format(
-         head_title_func=name,
+         head_title_func=disassemble_result.name,
          head_module_path=module_path,
 
          head_parameter_output_max_slashes_fileinfo='{}'.format(output_max_slashes_fileinfo),
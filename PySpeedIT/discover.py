@@ -0,0 +1,330 @@
+"""
+==================
+PySpeedIT.discover
+==================
+
+Overview
+========
+Decorator based registration of the functions to speed-it and auto-discovery of the `modules__func_tuples` of
+:py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: no hand-written job list to keep in sync with the code.
+
+   - ``@benchmark(...)``: registers a Benchmark-IT job
+   - ``@profile(...)``: registers a Profile-IT, Line-Memory-Profile-IT and Disassemble-IT job
+
+The decorators only store the job metadata on the function: attribute: ``__speedit_jobs__``: the function is returned
+unchanged: not wrapped. They can be stacked: one job per decorator: e.g. for different arguments.
+
+.. python-example::
+
+   .. code-block:: python3
+
+      # file: benchmarks/calculate_pi.py
+      from PySpeedIT.discover import benchmark, profile
+
+
+      def recip_square(i_):
+         return 1.0 / (i_ ** 2)
+
+
+      @benchmark()
+      @benchmark(name='calculate pi: n_ 1000', kwargs={'n_': 1000})
+      @profile()
+      def approx_pi(n_=100000):
+         val = 0.
+         for k_ in range(1, n_ + 1):
+            val += recip_square(k_)
+         return (6 * val) ** 0.5
+
+   .. code-block:: python3
+
+      # file: run_speed_it.py
+      from os.path import abspath as path_abspath
+
+      from PySpeedIT.discover import discover_modules__func_tuples
+      from PySpeedIT.speed_it import speed_it
+
+      speed_it(
+         html_output_dir_path=path_abspath('result_output'),
+         modules__func_tuples=discover_modules__func_tuples(path_abspath('benchmarks')),
+      )
+
+Discovery is lazy and cached:
+
+   - only files which mention the decorators are parsed: only files which define decorated functions are imported
+   - the parse result of each file is cached by its modification time and size: see: get_discover_cache_file_path():
+     re-scanning an unchanged tree needs only one `stat` per file
+   - directories starting with ``.`` and ``__pycache__`` are skipped: modules with ``__init__`` in the name too:
+     see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+
+.. note:: the discovered modules are imported once for the job metadata and loaded again by
+   :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: module-level code runs twice
+
+.. index:: PySpeedIT; discovery, Usage; decorators
+
+
+Functions
+=========
+
+.. autofunction:: benchmark
+
+.. autofunction:: profile
+
+.. autofunction:: get_registered_jobs
+
+.. autofunction:: get_discover_cache_file_path
+
+.. autofunction:: iter_discovered_modules
+
+.. autofunction:: discover_modules__func_tuples
+"""
+from ast import (
+   AsyncFunctionDef,
+   Attribute,
+   Call,
+   FunctionDef,
+   Name,
+   parse as ast_parse,
+)
+from importlib.util import (
+   module_from_spec as importlib_module_from_spec,
+   spec_from_file_location as importlib_spec_from_file_location,
+)
+from json import (
+   dump as json_dump,
+   load as json_load,
+)
+from os import (
+   makedirs as os_makedirs,
+   replace as os_replace,
+   stat as os_stat,
+   walk as os_walk,
+)
+from os.path import (
+   abspath as path_abspath,
+   basename as path_basename,
+   dirname as path_dirname,
+   join as path_join,
+   splitext as path_splitext,
+)
+from sys import modules as sys_modules
+
+from PySpeedIT.utils import (
+   Err,
+   get_cache_path,
+)
+
+
+# function attribute with the registered jobs: dict: kind: list of job tuples
+SPEEDIT_JOBS_ATTRIBUTE = '__speedit_jobs__'
+# registration kinds: the decorator names
+SPEEDIT_JOB_KINDS = ('benchmark', 'profile')
+# format version of the discover cache file
+DISCOVER_CACHE_FORMAT_VERSION = 1
+
+
+def _helper_get_register_decorator(kind, name, args, kwargs):
+   """ Returns a decorator which appends one job tuple to the registered jobs of the function
+
+   .. seealso:: benchmark()
+   """
+   def decorator(func):
+      jobs = func.__dict__.setdefault(SPEEDIT_JOBS_ATTRIBUTE, {})
+      # decorators are applied bottom-up: keep the source order
+      jobs.setdefault(kind, []).insert(0, (
+         name or func.__name__,
+         func.__name__,
+         list(args or []),
+         dict(kwargs or {}),
+      ))
+      return func
+
+   return decorator
+
+
+def benchmark(name=None, args=None, kwargs=None):
+   """ Registers a Benchmark-IT job of the decorated function: the function is returned unchanged
+
+   - usable with or without arguments: ``@benchmark`` or ``@benchmark(...)``: can be stacked: one job per decorator
+
+   :param name: (str or None) the `name_str` of the job: if None: the function name:
+      see: `modules__func_tuples` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param args: (list or None) positional arguments
+   :param kwargs: (dict or None) keyword arguments: default arguments do not need to be passed on
+   :return: (function) decorator: or the decorated function if used without arguments
+   """
+   if callable(name):
+      return _helper_get_register_decorator('benchmark', None, None, None)(name)
+   return _helper_get_register_decorator('benchmark', name, args, kwargs)
+
+
+def profile(name=None, args=None, kwargs=None):
+   """ Registers a Profile-IT, Line-Memory-Profile-IT and Disassemble-IT job of the decorated function: the function is
+   returned unchanged
+
+   .. seealso:: for the parameters: benchmark()
+   """
+   if callable(name):
+      return _helper_get_register_decorator('profile', None, None, None)(name)
+   return _helper_get_register_decorator('profile', name, args, kwargs)
+
+
+def get_registered_jobs(loaded_module, kind):
+   """ Returns the job tuples of all functions of the module registered with the decorator: kind: in source order
+
+   - only functions defined in the module: not imported ones
+
+   :param loaded_module: (module obj)
+   :param kind: (str) one of: SPEEDIT_JOB_KINDS
+   :return: (list) of job tuples: (name_str, function_name_str, list_of_positional_arguments,
+      dictionary_of_keyword_arguments)
+   """
+   registered_funcs = [
+      value for value in vars(loaded_module).values()
+      if callable(value) and getattr(value, '__module__', None) == loaded_module.__name__ and
+      kind in (getattr(value, SPEEDIT_JOBS_ATTRIBUTE, None) or {})
+   ]
+   registered_funcs.sort(key=lambda func_: getattr(getattr(func_, '__code__', None), 'co_firstlineno', 0))
+   return [job for func in registered_funcs for job in getattr(func, SPEEDIT_JOBS_ATTRIBUTE)[kind]]
+
+
+def get_discover_cache_file_path():
+   """ Returns the path of the discover cache file
+
+   - environment variable `PYSPEEDIT_DISCOVER_CACHE_FILE` if set
+   - else: `$XDG_CACHE_HOME/PySpeedIT/discover_cache.json` or `~/.cache/PySpeedIT/discover_cache.json`
+
+   :return: (str) path of the discover cache file
+   """
+   return get_cache_path('discover_cache.json', 'PYSPEEDIT_DISCOVER_CACHE_FILE')
+
+
+def _helper_is_register_decorator(decorator_node):
+   """ Returns True if the ast decorator node is: benchmark, profile: plain, called or as attribute
+   """
+   if isinstance(decorator_node, Call):
+      decorator_node = decorator_node.func
+   if isinstance(decorator_node, Name):
+      return decorator_node.id in SPEEDIT_JOB_KINDS
+   if isinstance(decorator_node, Attribute):
+      return decorator_node.attr in SPEEDIT_JOB_KINDS
+   return False
+
+
+def _helper_scan_file(py_file_path):
+   """ Returns the names of the module-level functions with a register decorator: without importing the module
+
+   :param py_file_path: (str) path of a python file
+   :return: (list) function names: empty if the file does not mention the decorators or can not be parsed
+   """
+   with open(py_file_path, 'rb') as file_:
+      source_bytes = file_.read()
+   # cheap pre-filter: most files of a large tree never mention the decorators
+   if not any(kind.encode('ascii') in source_bytes for kind in SPEEDIT_JOB_KINDS):
+      return []
+   try:
+      module_node = ast_parse(source_bytes, py_file_path)
+   except (SyntaxError, ValueError):
+      return []
+   return [
+      node.name for node in module_node.body
+      if isinstance(node, (FunctionDef, AsyncFunctionDef)) and any(
+         _helper_is_register_decorator(decorator_node) for decorator_node in node.decorator_list)
+   ]
+
+
+def _helper_load_discover_cache(cache_file_path):
+   """ Returns the discover cache: dict: py_file_path: [mtime_ns, size, function_names]: empty if missing or outdated
+   """
+   try:
+      with open(cache_file_path) as file_:
+         discover_cache = json_load(file_)
+   except (OSError, ValueError):
+      return {}
+   if discover_cache.get('format_version') != DISCOVER_CACHE_FORMAT_VERSION:
+      return {}
+   return discover_cache.get('files', {})
+
+
+def _helper_store_discover_cache(cache_file_path, files):
+   """ Stores the discover cache: atomic: see: _helper_load_discover_cache()
+   """
+   os_makedirs(path_dirname(cache_file_path), exist_ok=True)
+   tmp_file_path = '{}.tmp'.format(cache_file_path)
+   with open(tmp_file_path, 'w') as file_:
+      json_dump({'format_version': DISCOVER_CACHE_FORMAT_VERSION, 'files': files}, file_)
+   os_replace(tmp_file_path, cache_file_path)
+
+
+def _helper_iter_candidate_files(dir_path, cache_file_path):
+   """ Yields the python files of the tree which define decorated functions: the scan results are cached
+
+   :param dir_path: (str) root directory
+   :param cache_file_path: (str or None) see: get_discover_cache_file_path(): if None: no persistent cache
+   :return: (generator) yields py_file_path
+   """
+   if cache_file_path:
+      cached_files = _helper_load_discover_cache(cache_file_path)
+   else:
+      cached_files = {}
+   scanned_files = {}
+   try:
+      for root, dirnames, filenames in os_walk(dir_path):
+         dirnames[:] = sorted(dirname for dirname in dirnames if not dirname.startswith('.') and dirname != '__pycache__')
+         for filename in sorted(filenames):
+            if not filename.endswith('.py') or '__init__' in filename:
+               continue
+            py_file_path = path_join(root, filename)
+            file_stat = os_stat(py_file_path)
+            cached_file = cached_files.get(py_file_path)
+            if cached_file and cached_file[:2] == [file_stat.st_mtime_ns, file_stat.st_size]:
+               function_names = cached_file[2]
+            else:
+               function_names = _helper_scan_file(py_file_path)
+            scanned_files[py_file_path] = [file_stat.st_mtime_ns, file_stat.st_size, function_names]
+            if function_names:
+               yield py_file_path
+   finally:
+      if cache_file_path and scanned_files != {key: cached_files.get(key) for key in scanned_files}:
+         # keep the entries of other trees
+         cached_files.update(scanned_files)
+         _helper_store_discover_cache(cache_file_path, cached_files)
+
+
+def iter_discovered_modules(dir_path, cache_file_path=None):
+   """ Yields the `modules__func_tuples` entries of all modules in the tree with registered jobs: lazy: each module is
+   imported when its entry is requested
+
+   :param dir_path: (str) root directory: e.g. a package directory
+   :param cache_file_path: (str or None) see: get_discover_cache_file_path(): if None: the default path
+   :return: (generator) yields entries: [module_path_str, benchmark_func_tuples, {'profile_func_tuples': ...}]:
+      see: `modules__func_tuples` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :raise Err: if a module can not be imported
+   """
+   if cache_file_path is None:
+      cache_file_path = get_discover_cache_file_path()
+   for py_file_path in _helper_iter_candidate_files(path_abspath(dir_path), cache_file_path):
+      module_name = path_splitext(path_basename(py_file_path))[0]
+      try:
+         module_spec = importlib_spec_from_file_location(module_name, py_file_path)
+         loaded_module = importlib_module_from_spec(module_spec)
+         sys_modules[module_name] = loaded_module
+         module_spec.loader.exec_module(loaded_module)
+      except Exception as err:
+         raise Err('iter_discovered_modules', [
+            'COULD NOT LOAD MODULE ERROR: module_file_path: <{}>'.format(py_file_path),
+            '  Exception: <{}>'.format(err)
+         ])
+      benchmark_func_tuples = tuple(get_registered_jobs(loaded_module, 'benchmark'))
+      profile_func_tuples = tuple(get_registered_jobs(loaded_module, 'profile'))
+      if benchmark_func_tuples or profile_func_tuples:
+         yield [py_file_path, benchmark_func_tuples, {'profile_func_tuples': profile_func_tuples}]
+
+
+def discover_modules__func_tuples(dir_path, cache_file_path=None):
+   """ Returns the `modules__func_tuples` of all modules in the tree with registered jobs
+
+   .. seealso:: iter_discovered_modules()
+
+   :return: (tuple) see: `modules__func_tuples` of :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   """
+   return tuple(iter_discovered_modules(dir_path, cache_file_path))
@@ -0,0 +1,251 @@
+"""
+===========================
+PySpeedIT.multi_interpreter
+===========================
+
+Overview
+========
+Runs the same *Benchmark-IT* suite of one module in multiple Python interpreters: e.g. to plan an interpreter upgrade.
+
+   - the suite description (module path, function tuples and the Benchmark-IT options) is serialized with `pickle`
+     protocol 4 into a temporary suite file
+   - each interpreter runs: ``python -m PySpeedIT.cli run-suite SUITE_FILE RESULT_FILE`` as a subprocess: the PySpeedIT
+     package of the current interpreter is put on its `PYTHONPATH`: the interpreter needs the PySpeedIT requirements
+   - the results are merged: each function name gets the interpreter as suffix: e.g. `sort [CPython 3.12.1]`: so all
+     functions are ranked across the interpreters in one table
+
+Interpreter startup and import cost are not part of the timings: the subprocess measures only the benchmark loops after
+the module and the suite are loaded.
+
+The function arguments must be picklable and loadable by all interpreters: fixtures are built by the running process:
+see :py:func:`PySpeedIT.fixtures.build_func_tuples_fixtures`. Large buffer arguments can be handed off
+zero-copy in shared segments: see :mod:`PySpeedIT.shared_buffers`: the handoff size and time of each interpreter are
+reported.
+
+.. index:: Benchmark-IT; interpreters
+
+
+Functions
+=========
+
+.. autofunction:: get_interpreter_info
+
+.. autofunction:: write_suite_file
+
+.. autofunction:: read_suite_file
+
+.. autofunction:: measure_functions_in_interpreters
+"""
+from os import environ as os_environ
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   getsize as path_getsize,
+   join as path_join,
+   pathsep as path_pathsep,
+)
+from pickle import (
+   dump as pickle_dump,
+   load as pickle_load,
+)
+from platform import (
+   python_implementation as platform_python_implementation,
+   python_version as platform_python_version,
+)
+from shutil import rmtree as shutil_rmtree
+from subprocess import run as subprocess_run
+from sys import executable as sys_executable
+from tempfile import mkdtemp as tempfile_mkdtemp
+from time import perf_counter
+
+from PySpeedIT.fixtures import build_func_tuples_fixtures
+from PySpeedIT.shared_buffers import (
+   release_segments,
+   share_arguments,
+)
+from PySpeedIT.utils import Err
+
+
+# pickle protocol of the suite and result files: supported by all python 3 interpreters since 3.4
+SUITE_PICKLE_PROTOCOL = 4
+# format version of the suite and result files
+SUITE_FORMAT_VERSION = 1
+
+# the directory which contains the PySpeedIT package: put on the `PYTHONPATH` of the subprocesses
+_PYSPEEDIT_PARENT_DIR_PATH = path_dirname(path_dirname(path_abspath(__file__)))
+
+
+def get_interpreter_info():
+   """ Returns information about the running interpreter
+
+   :return: (dict) implementation, version, executable
+   """
+   return {
+      'implementation': platform_python_implementation(),
+      'version': platform_python_version(),
+      'executable': sys_executable,
+   }
+
+
+def write_suite_file(suite_file_path, module_file_path, module_tuple_of_func_tuples, options):
+   """ Writes a serialized suite description
+
+   :param suite_file_path: (str) path of the suite file to write
+   :param module_file_path: (str) path of the python module
+   :param module_tuple_of_func_tuples: (tuple) see: `modules__func_tuples` of
+      :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`: fixtures are built by the running process: also handed off
+      zero-copy as shared buffers
+   :param options: (dict) keyword arguments for :py:func:`PySpeedIT.benchmark_it.measure_functions_in_module`
+   """
+   with open(suite_file_path, 'wb') as file_:
+      pickle_dump({
+         'format_version': SUITE_FORMAT_VERSION,
+         'module_file_path': module_file_path,
+         'module_tuple_of_func_tuples': module_tuple_of_func_tuples,
+         'options': options,
+      }, file_, protocol=SUITE_PICKLE_PROTOCOL)
+
+
+def read_suite_file(suite_file_path):
+   """ Returns a serialized suite description or result
+
+   :param suite_file_path: (str) path of a suite file or result file
+   :return: (dict) see: write_suite_file()
+   :raise Err: if the format version is not supported
+   """
+   with open(suite_file_path, 'rb') as file_:
+      suite = pickle_load(file_)
+   if suite.get('format_version') != SUITE_FORMAT_VERSION:
+      raise Err('read_suite_file', [
+         'format_version: <{}> is not supported: expected: <{}>'.format(suite.get('format_version'), SUITE_FORMAT_VERSION),
+         '  suite_file_path: <{}>'.format(suite_file_path)
+      ])
+   return suite
+
+
+def write_result_file(result_file_path, all_tables, memory_budget_rows, handoff_sec=0.0):
+   """ Writes the serialized results of a suite run in the running interpreter
+
+   :param result_file_path: (str) path of the result file to write
+   :param all_tables: (list) see: :py:func:`PySpeedIT.benchmark_it.measure_functions_in_module`
+   :param memory_budget_rows: (list) see: :py:func:`PySpeedIT.benchmark_it.measure_functions_in_module`
+   :param handoff_sec: (float) time to read the suite file and to attach the shared buffers
+   """
+   with open(result_file_path, 'wb') as file_:
+      pickle_dump({
+         'format_version': SUITE_FORMAT_VERSION,
+         'interpreter': get_interpreter_info(),
+         'handoff_sec': handoff_sec,
+         'all_tables': all_tables,
+         'memory_budget_rows': memory_budget_rows,
+      }, file_, protocol=SUITE_PICKLE_PROTOCOL)
+
+
+def _helper_get_interpreter_labels(interpreter_results):
+   """ Returns a unique label per interpreter result: e.g. `CPython 3.12.1`: duplicates get the position as suffix:
+   e.g. `CPython 3.12.1 #2`
+
+   :param interpreter_results: (list) of result dicts: see: write_result_file()
+   :return: (list) of str
+   """
+   labels = [
+      '{} {}'.format(result['interpreter']['implementation'], result['interpreter']['version'])
+      for result in interpreter_results
+   ]
+   return [
+      '{} #{}'.format(label, idx + 1) if labels.count(label) > 1 else label for idx, label in enumerate(labels)
+   ]
+
+
+def measure_functions_in_interpreters(interpreters, module_file_path, module_tuple_of_func_tuples, options,
+                                      shared_buffers=None):
+   """ Returns the merged unformatted benchmark results of running the suite in each interpreter
+
+   :param interpreters: (list) interpreter executables: paths or names on the `PATH`
+   :param module_file_path: (str) path of the python module
+   :param module_tuple_of_func_tuples: (tuple) see: `modules__func_tuples` of
+      :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param options: (dict) keyword arguments for :py:func:`PySpeedIT.benchmark_it.measure_functions_in_module`
+   :param shared_buffers: (str or None) ``shm`` or ``mmap``: large buffer arguments are handed off in shared segments:
+      see: :mod:`PySpeedIT.shared_buffers`: the segments are removed at the end: also if an interpreter crashed
+   :return: (tuple) format: (all_tables, memory_budget_rows, interpreters_info)
+
+      - all_tables, memory_budget_rows: see: :py:func:`PySpeedIT.benchmark_it.measure_functions_in_module`: the names
+        have the interpreter label as suffix: each row has the key: interpreter
+      - interpreters_info: (list) of dicts: label, implementation, version, executable, handoff_pickled_bytes: the size
+        of the suite file, handoff_shared_bytes, handoff_sec: the time to write and to read the suite file and to
+        share and attach the buffers
+
+   :raise Err: if a subprocess fails
+   """
+   env = dict(os_environ)
+   env['PYTHONPATH'] = path_pathsep.join(
+      path_ for path_ in (_PYSPEEDIT_PARENT_DIR_PATH, os_environ.get('PYTHONPATH')) if path_
+   )
+   # the factories of the fixtures need not be importable by the interpreters
+   module_tuple_of_func_tuples = build_func_tuples_fixtures(module_tuple_of_func_tuples)
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_interpreters_')
+   segments = []
+   try:
+      suite_file_path = path_join(work_dir_path, 'suite.pickle')
+      handoff_start_time = perf_counter()
+      if shared_buffers:
+         module_tuple_of_func_tuples, segments, shared_bytes = share_arguments(
+            module_tuple_of_func_tuples, shared_buffers, work_dir_path)
+      else:
+         shared_bytes = 0
+      write_suite_file(suite_file_path, module_file_path, module_tuple_of_func_tuples, options)
+      handoff_sec = perf_counter() - handoff_start_time
+      pickled_bytes = path_getsize(suite_file_path)
+      interpreter_results = []
+      for idx, interpreter in enumerate(interpreters):
+         result_file_path = path_join(work_dir_path, 'result_{}.pickle'.format(idx))
+         try:
+            completed_process = subprocess_run(
+               [interpreter, '-m', 'PySpeedIT.cli', 'run-suite', suite_file_path, result_file_path],
+               env=env, capture_output=True, text=True
+            )
+         except OSError as err:
+            raise Err('measure_functions_in_interpreters', [
+               'COULD NOT RUN INTERPRETER ERROR: interpreter: <{}>'.format(interpreter),
+               '  Exception: <{}>'.format(err)
+            ])
+         if completed_process.returncode != 0:
+            raise Err('measure_functions_in_interpreters', [
+               'SUITE RUN ERROR: interpreter: <{}> exit code: <{}>'.format(interpreter, completed_process.returncode),
+               '  module_file_path: <{}>'.format(module_file_path),
+            ] + ['    {}'.format(line) for line in completed_process.stderr.splitlines()[-20:]])
+         interpreter_results.append(read_suite_file(result_file_path))
+   finally:
+      release_segments(segments)
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+   labels = _helper_get_interpreter_labels(interpreter_results)
+   all_tables = []
+   for repeat_idx in range(len(interpreter_results[0]['all_tables'])):
+      table = []
+      for label, result in zip(labels, interpreter_results):
+         for benchmark_result in result['all_tables'][repeat_idx]:
+            benchmark_result['name'] = '{} [{}]'.format(benchmark_result['name'], label)
+            benchmark_result['interpreter'] = label
+            table.append(benchmark_result)
+      all_tables.append(table)
+
+   memory_budget_rows = []
+   for label, result in zip(labels, interpreter_results):
+      for row in result['memory_budget_rows']:
+         row['name'] = '{} [{}]'.format(row['name'], label)
+         row['interpreter'] = label
+         memory_budget_rows.append(row)
+
+   interpreters_info = []
+   for label, result in zip(labels, interpreter_results):
+      interpreter_info = {
+         'label': label,
+         'handoff_pickled_bytes': pickled_bytes,
+         'handoff_shared_bytes': shared_bytes,
+         'handoff_sec': handoff_sec + result['handoff_sec'],
+      }
+      interpreter_info.update(result['interpreter'])
+      interpreters_info.append(interpreter_info)
+   return all_tables, memory_budget_rows, interpreters_info
@@ -0,0 +1,305 @@
+"""
+=======================
+PySpeedIT.pytest_plugin
+=======================
+
+Overview
+========
+pytest plugin: test functions marked with ``@pytest.mark.speedit`` are benchmarked with the *Benchmark-IT* `call`
+engine instead of being called once: see :py:func:`PySpeedIT.benchmark_it.benchmark_callable`.
+
+   - the fixtures are set up once per test before the timing: the setup is never part of the results
+   - expensive inputs can be shared by all benchmarks of a session: fixture: ``speedit_session_cache``
+   - assertions in the test function are checked in each loop: a failing assertion fails the test
+   - the results are attached to the test report: `user_properties`: key: ``speedit``: e.g. in the junitxml output:
+     a ranking per group is shown in the terminal summary
+
+The plugin is registered by the entry point `pytest11` if PySpeedIT is installed: else: ``pytest -p PySpeedIT.pytest_plugin``
+
+.. code-block:: python3
+
+   import pytest
+
+   @pytest.fixture(scope='session')
+   def big_list(speedit_session_cache):
+      return speedit_session_cache.get('big_list', list, range(100000, 0, -1))
+
+   @pytest.mark.speedit(run_sec=0.5, group='sort')
+   def test_sorted(big_list):
+      sorted(big_list)
+
+   @pytest.mark.speedit(run_sec=0.5, group='sort')
+   def test_sort_copy(big_list):
+      big_list[:].sort()
+
+Marker keyword arguments: override the command line options per test
+
+   - run_sec, repeat, with_gc, check_too_fast, job_timeout_sec: see: :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`:
+     with `repeat` the repeat with the smallest average loop time is reported
+   - group: (str) tests are ranked within their group: default: the test file
+
+Command line options:
+
+   - ``--speedit-run-sec``, ``--speedit-repeat``, ``--speedit-with-gc``, ``--speedit-job-timeout-sec``: defaults for all
+     marked tests: a timed-out benchmark fails the test
+   - ``--speedit-shard INDEX/COUNT``: runs only the marked tests of one shard: e.g. ``1/4``: the marked tests are
+     distributed round-robin in the order of their node ids: unmarked tests run in all shards
+   - ``--speedit-json PATH``: writes the unformatted results: times in seconds
+   - ``--speedit-disable``: runs the marked tests once as normal tests
+
+Sharding: run each shard in its own job, e.g. on separate CI machines. With pytest-xdist ``-n`` each worker benchmarks
+its tests and the results are gathered by the controller: but parallel workers on the same host disturb each others
+timings: prefer the shards.
+
+.. note:: this module is not Cython compiled: pytest introspects the signatures of the hook functions
+
+.. index:: Benchmark-IT; pytest
+
+
+Functions
+=========
+
+.. autofunction:: speedit_session_cache
+
+.. autoclass:: SessionCache
+   :members:
+
+.. autoclass:: SpeedITSession
+"""
+from inspect import iscoroutinefunction as inspect_iscoroutinefunction
+from json import dump as json_dump
+from operator import itemgetter
+
+# no `pytest_` aliases: module-level names with that prefix are taken as hooks
+from pytest import (
+   StashKey,
+   UsageError,
+   fail,
+   fixture,
+   hookimpl,
+)
+
+from PySpeedIT.benchmark_it import (
+   _helper_get_perf_counter_reference_time,
+   benchmark_callable,
+)
+from PySpeedIT.utils import format_time
+
+
+SPEEDIT_MARKER = 'speedit'
+# marker keyword arguments: overrides of the command line options
+SPEEDIT_MARKER_OPTIONS = ('run_sec', 'repeat', 'with_gc', 'check_too_fast', 'job_timeout_sec', 'group')
+
+_SPEEDIT_SESSION_KEY = StashKey()
+
+
+class SessionCache(object):
+   """ Session wide cache of expensive benchmark inputs: see: fixture: ``speedit_session_cache``
+
+   - the cached values are shared by all benchmarks: they must not be modified by the benchmarks
+   """
+
+   def __init__(self):
+      """ Constructor.
+      """
+      self.values = {}
+      self.hits = 0
+      self.misses = 0
+
+   def get(self, key, factory, *args, **kwargs):
+      """ Returns the cached value of key: on the first request it is created by: factory(*args, **kwargs)
+
+      :param key: (hashable) cache key
+      :param factory: (callable) creates the value
+      :return: (any) the cached value
+      """
+      if key in self.values:
+         self.hits += 1
+      else:
+         self.misses += 1
+         self.values[key] = factory(*args, **kwargs)
+      return self.values[key]
+
+
+def _helper_parse_shard(shard_text):
+   """ Returns the parsed ``--speedit-shard`` option
+
+   :param shard_text: (str) format: INDEX/COUNT: e.g. ``1/4``: INDEX: 1 to COUNT
+   :return: (tuple) format: (index, count): index: 0 based
+   :raise UsageError: if the format is wrong
+   """
+   try:
+      index, count = (int(part) for part in shard_text.split('/'))
+   except ValueError:
+      index = count = 0
+   if count < 1 or not 1 <= index <= count:
+      raise UsageError(
+         '--speedit-shard: <{}> must be: INDEX/COUNT with 1 <= INDEX <= COUNT: e.g. 1/4'.format(shard_text))
+   return index - 1, count
+
+
+class SpeedITSession(object):
+   """ The plugin state of one pytest session: registered as a plugin by pytest_configure()
+   """
+
+   def __init__(self, config):
+      """ Constructor.
+      """
+      self.config = config
+      self.session_cache = SessionCache()
+      self.results = []
+      self.perf_counter_reference_time = None
+      if config.getoption('speedit_shard'):
+         self.shard = _helper_parse_shard(config.getoption('speedit_shard'))
+      else:
+         self.shard = None
+
+   def _get_item_options(self, item, marker):
+      """ Returns the benchmark options of a marked test: the marker keyword arguments override the command line options
+      """
+      unknown_options = set(marker.kwargs) - set(SPEEDIT_MARKER_OPTIONS)
+      if marker.args or unknown_options:
+         fail('speedit marker: only the keyword arguments: <{}> are supported: We got: <{}> <{}>'.format(
+            ', '.join(SPEEDIT_MARKER_OPTIONS), marker.args, sorted(unknown_options)), pytrace=False)
+      options = {
+         'run_sec': self.config.getoption('speedit_run_sec'),
+         'repeat': self.config.getoption('speedit_repeat'),
+         'with_gc': self.config.getoption('speedit_with_gc'),
+         'check_too_fast': True,
+         'job_timeout_sec': self.config.getoption('speedit_job_timeout_sec'),
+         'group': item.nodeid.split('::')[0],
+      }
+      options.update(marker.kwargs)
+      return options
+
+   def pytest_collection_modifyitems(self, config, items):
+      if self.shard is None:
+         return
+      shard_index, shard_count = self.shard
+      benchmark_nodeids = sorted(item.nodeid for item in items if item.get_closest_marker(SPEEDIT_MARKER))
+      deselected_nodeids = {
+         nodeid for idx, nodeid in enumerate(benchmark_nodeids) if idx % shard_count != shard_index
+      }
+      if deselected_nodeids:
+         config.hook.pytest_deselected(items=[item for item in items if item.nodeid in deselected_nodeids])
+         items[:] = [item for item in items if item.nodeid not in deselected_nodeids]
+
+   @hookimpl(tryfirst=True)
+   def pytest_pyfunc_call(self, pyfuncitem):
+      marker = pyfuncitem.get_closest_marker(SPEEDIT_MARKER)
+      if marker is None or self.config.getoption('speedit_disable') or inspect_iscoroutinefunction(pyfuncitem.obj):
+         return None
+      options = self._get_item_options(pyfuncitem, marker)
+      if self.perf_counter_reference_time is None:
+         self.perf_counter_reference_time = _helper_get_perf_counter_reference_time()
+
+      test_kwargs = {arg: pyfuncitem.funcargs[arg] for arg in pyfuncitem._fixtureinfo.argnames}
+      benchmark_results = [
+         benchmark_callable(
+            pyfuncitem.obj,
+            [],
+            test_kwargs,
+            pyfuncitem.nodeid,
+            options['with_gc'],
+            options['check_too_fast'],
+            options['run_sec'],
+            job_timeout_sec=options['job_timeout_sec'],
+            perf_counter_reference_time=self.perf_counter_reference_time
+         ) for repeat_idx in range(options['repeat'])
+      ]
+      benchmark_result = min(benchmark_results, key=itemgetter('avg_loop_sec'))
+      result_row = {key: value for key, value in benchmark_result.items() if key != 'samples'}
+      result_row['group'] = options['group']
+      result_row['repeat'] = options['repeat']
+      result_row['run_sec'] = options['run_sec']
+      pyfuncitem.user_properties.append(('speedit', result_row))
+      pyfuncitem.add_report_section('call', 'speedit', 'loops: {:,} avg_loop: {} best_loop: {} median_loop: {}'.format(
+         result_row['loops'], format_time(result_row['avg_loop_sec']), format_time(result_row['best_loop_sec']),
+         format_time(result_row['median_loop_sec'])))
+      if any(result['status'] == 'TIMEOUT' for result in benchmark_results):
+         fail('speedit: the benchmark exceeded: job_timeout_sec: <{}>'.format(
+            options['job_timeout_sec']), pytrace=False)
+      return True
+
+   def pytest_runtest_logreport(self, report):
+      # also on the xdist controller: the user_properties are sent with the reports
+      if report.when == 'call':
+         self.results.extend(value for name, value in report.user_properties if name == 'speedit')
+
+   def pytest_terminal_summary(self, terminalreporter):
+      if not self.results:
+         return
+      terminalreporter.write_sep('-', 'PySpeedIT Benchmark-IT')
+      for group in sorted({result['group'] for result in self.results}):
+         group_results = sorted(
+            (result for result in self.results if result['group'] == group), key=itemgetter('avg_loop_sec'))
+         compare_reference = group_results[0]['avg_loop_sec']
+         terminalreporter.write_line('group: {}'.format(group))
+         terminalreporter.write_line('   {:>4} {:>10} {:>12} {:>12} {:>12} {:>12} {:<8} {}'.format(
+            'rank', 'compare %', 'avg_loop', 'best_loop', 'median_loop', 'loops', 'status', 'name'))
+         for idx, result in enumerate(group_results):
+            terminalreporter.write_line('   {:>4} {:>10.3f} {:>12} {:>12} {:>12} {:>12,} {:<8} {}'.format(
+               idx + 1,
+               result['avg_loop_sec'] / compare_reference * 100.0 if compare_reference > 0 else 100.0,
+               format_time(result['avg_loop_sec']),
+               format_time(result['best_loop_sec']),
+               format_time(result['median_loop_sec']),
+               result['loops'],
+               result['status'],
+               result['name'],
+            ))
+      if self.session_cache.hits or self.session_cache.misses:
+         terminalreporter.write_line('speedit_session_cache: created: {} reused: {}'.format(
+            self.session_cache.misses, self.session_cache.hits))
+
+   def pytest_sessionfinish(self, session):
+      json_file_path = self.config.getoption('speedit_json')
+      # xdist workers: the controller writes the results
+      if not json_file_path or hasattr(self.config, 'workerinput'):
+         return
+      with open(json_file_path, 'w') as file_:
+         json_dump({
+            'parameters': {
+               'speedit_run_sec': self.config.getoption('speedit_run_sec'),
+               'speedit_repeat': self.config.getoption('speedit_repeat'),
+               'speedit_with_gc': self.config.getoption('speedit_with_gc'),
+               'speedit_job_timeout_sec': self.config.getoption('speedit_job_timeout_sec'),
+               'speedit_shard': self.config.getoption('speedit_shard'),
+            },
+            'results': self.results,
+         }, file_, indent=3)
+
+
+def pytest_addoption(parser):
+   group = parser.getgroup('speedit', 'PySpeedIT Benchmark-IT of tests marked with: @pytest.mark.speedit')
+   group.addoption('--speedit-run-sec', type=float, default=1,
+                   help='seconds per benchmark: -1 to run it once: default: 1')
+   group.addoption('--speedit-repeat', type=int, default=1,
+                   help='repeats per benchmark: the fastest repeat is reported: default: 1')
+   group.addoption('--speedit-with-gc', action='store_true', help='keep the garbage collector enabled')
+   group.addoption('--speedit-job-timeout-sec', type=float, default=None,
+                   help='wall-clock time limit per benchmark repeat: a timed-out benchmark fails')
+   group.addoption('--speedit-shard', default=None, metavar='INDEX/COUNT',
+                   help='run only the benchmarks of one shard: e.g. 1/4')
+   group.addoption('--speedit-json', default=None, metavar='PATH', help='write the unformatted results as json')
+   group.addoption('--speedit-disable', action='store_true', help='run the marked tests once as normal tests')
+
+
+def pytest_configure(config):
+   config.addinivalue_line(
+      'markers',
+      '{}(**options): benchmark the test with PySpeedIT Benchmark-IT: options: {}'.format(
+         SPEEDIT_MARKER, ', '.join(SPEEDIT_MARKER_OPTIONS))
+   )
+   speedit_session = SpeedITSession(config)
+   config.stash[_SPEEDIT_SESSION_KEY] = speedit_session
+   config.pluginmanager.register(speedit_session, 'pyspeedit-session')
+
+
+@fixture(scope='session')
+def speedit_session_cache(request):
+   """ Returns the session wide cache of expensive benchmark inputs: see: :py:class:`SessionCache`
+
+   - values created once are reused by all benchmarks of the session: e.g. in function scoped fixtures
+   """
+   return request.config.stash[_SPEEDIT_SESSION_KEY].session_cache
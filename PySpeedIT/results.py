@@ -0,0 +1,496 @@
+"""
+=================
+PySpeedIT.results
+=================
+
+Overview
+========
+Compact in-process result objects of all tools: the library API returns them: the html writers are one consumer.
+
+   - Benchmark-IT: :py:func:`PySpeedIT.benchmark_it.benchmark_functions`: :py:class:`BenchmarkRow`
+   - Profile-IT: :py:func:`PySpeedIT.profile_it.profile_functions`: :py:class:`ProfileResult`: engine ``sampling``:
+     :py:class:`SampledProfileResult`: engine ``context``: :py:class:`ContextProfileResult`
+   - Line-Memory-Profile-IT: :py:func:`PySpeedIT.line_memory_profile_it.line_memory_profile_functions`:
+     :py:class:`LineMemoryResult`
+   - Disassemble-IT: :py:func:`PySpeedIT.disassemble_it.disassemble_functions`: :py:class:`DisassembleResult`
+
+All classes use `__slots__`: no per instance `__dict__`: the loop samples and the per-line memory values are stored in
+`array` objects: 8 bytes per value: so suites with millions of rows stay small in memory. All values are unformatted:
+times in seconds, memory in MiB. The objects are picklable.
+
+.. python-example::
+
+   .. code-block:: python3
+
+      from PySpeedIT.benchmark_it import benchmark_functions
+
+      tables = benchmark_functions(loaded_module, (('sorting', 'example_sort', [data], {}),), benchmarkit__repeat=1)
+      for row in tables[0]:
+         print(row.name, row.avg_loop_sec, len(row.samples))
+
+.. index:: PySpeedIT; library API, Results; objects
+
+
+Classes
+=======
+
+.. autoclass:: BenchmarkRow
+   :members:
+
+.. autoclass:: ProfileCaller
+
+.. autoclass:: ProfileCallee
+
+.. autoclass:: ProfileEntry
+   :members:
+
+.. autoclass:: ProfileResult
+
+.. autoclass:: SampledProfileResult
+   :members:
+
+.. autoclass:: ContextProfileResult
+   :members:
+
+.. autoclass:: LineMemoryResult
+   :members:
+
+.. autoclass:: Instruction
+
+.. autoclass:: DisassembleResult
+"""
+from array import array
+
+from PySpeedIT.utils import Err
+
+
+# all keys of a Benchmark-IT benchmark result dict: see: PySpeedIT.benchmark_it._TimeIT.benchmark_it()
+BENCHMARK_ROW_FIELDS = (
+   'name', 'status', 'engine', 'loops', 'samples',
+   'all_loops_time_sec', 'avg_loop_sec', 'best_loop_sec', 'second_best_loop_sec', 'worst_loop_sec',
+   'second_worst_loop_sec', 'median_loop_sec', 'quartile_1_loop_sec', 'quartile_3_loop_sec', 'whisker_low_loop_sec',
+   'whisker_high_loop_sec', 'call_overhead_sec',
+   'outliers', 'outliers_low_severe', 'outliers_low_mild', 'outliers_high_mild', 'outliers_high_severe',
+   'clean_loops', 'clean_avg_loop_sec', 'clean_best_loop_sec', 'clean_worst_loop_sec',
+   'minor_faults', 'major_faults', 'voluntary_ctx_switches', 'involuntary_ctx_switches', 'max_rss_kb',
+   'io_read_bytes', 'io_write_bytes',
+   'suspect', 'fresh', 'measured_at', 'interpreter',
+   'ops_per_loop', 'ops_per_sec', 'ops_per_sec_ci_low', 'ops_per_sec_ci_high',
+   'bytes_per_loop', 'bytes_per_sec', 'bytes_per_sec_ci_low', 'bytes_per_sec_ci_high',
+   'run_sec', 'slos',
+)
+
+
+class _SlotsResult(object):
+   """ Base of the result classes: compact pickle state: a tuple of the slot values: equal if all values are equal:
+   short repr
+   """
+   __slots__ = ()
+   # the fields shown by repr()
+   _repr_fields = ()
+
+   def __getstate__(self):
+      return tuple(getattr(self, field) for field in self.__slots__)
+
+   def __setstate__(self, state):
+      for field, value in zip(self.__slots__, state):
+         setattr(self, field, value)
+
+   def __eq__(self, other):
+      if type(other) is not type(self):
+         return NotImplemented
+      return self.__getstate__() == other.__getstate__()
+
+   def __repr__(self):
+      return '{}({})'.format(
+         type(self).__name__, ', '.join('{}={!r}'.format(field, getattr(self, field)) for field in self._repr_fields))
+
+
+class BenchmarkRow(_SlotsResult):
+   """ One Benchmark-IT result row: one function in one repeat
+
+   - attributes: BENCHMARK_ROW_FIELDS: see: the benchmark result dict of `_TimeIT.benchmark_it()`, the sample
+     statistics of :py:func:`PySpeedIT.sample_stats.get_sample_stats` and
+     :py:func:`PySpeedIT.benchmark_it.measure_functions_in_module`: fields which were not measured or declared are None
+   - samples: (array of doubles) time in seconds of each loop
+   - slos: (list or None) SLO result dicts: see: :py:func:`PySpeedIT.slo.evaluate_slos`
+   """
+   __slots__ = BENCHMARK_ROW_FIELDS
+   _repr_fields = ('name', 'status', 'loops', 'avg_loop_sec')
+
+   def __init__(self, **fields):
+      """ Constructor.
+
+      :raise Err: for unknown fields
+      """
+      unknown_fields = set(fields) - set(BENCHMARK_ROW_FIELDS)
+      if unknown_fields:
+         raise Err('BenchmarkRow', ['unknown fields: <{}>'.format(sorted(unknown_fields))])
+      for field in BENCHMARK_ROW_FIELDS:
+         setattr(self, field, fields.get(field))
+      if self.samples is None:
+         self.samples = array('d')
+      elif not isinstance(self.samples, array):
+         self.samples = array('d', self.samples)
+
+   @classmethod
+   def from_dict(cls, benchmark_result):
+      """ Returns a BenchmarkRow of a benchmark result dict
+
+      :param benchmark_result: (dict) see: :py:func:`PySpeedIT.benchmark_it.measure_functions_in_module`
+      :return: (obj) BenchmarkRow
+      """
+      return cls(**benchmark_result)
+
+   def as_dict(self):
+      """ Returns a new benchmark result dict: e.g. for formatting: the samples array is shared
+
+      :return: (dict) field: value
+      """
+      return {field: getattr(self, field) for field in BENCHMARK_ROW_FIELDS}
+
+
+class ProfileCaller(_SlotsResult):
+   """ One caller of a Profile-IT entry: the calls from the caller to the entry
+
+   - func_txt: (str) the caller: `file_path:line_num(func_name)` or the name of a built-in
+   - calls, primitive_calls: (int)
+   - func_time, func_cumulative_time: (float) seconds spent in the entry for these calls
+   """
+   __slots__ = ('func_txt', 'calls', 'primitive_calls', 'func_time', 'func_cumulative_time')
+   _repr_fields = ('func_txt', 'calls', 'func_time')
+
+   def __init__(self, func_txt, calls, primitive_calls, func_time, func_cumulative_time):
+      """ Constructor.
+      """
+      self.func_txt = func_txt
+      self.calls = calls
+      self.primitive_calls = primitive_calls
+      self.func_time = func_time
+      self.func_cumulative_time = func_cumulative_time
+
+
+class ProfileCallee(_SlotsResult):
+   """ One callee of a Profile-IT entry: the calls from the entry to the callee: the inverse of a
+   :py:class:`ProfileCaller`
+
+   - func_txt: (str) the callee: `file_path:line_num(func_name)` or the name of a built-in
+   - calls, primitive_calls: (int)
+   - func_time, func_cumulative_time: (float) seconds spent in the callee for these calls
+   """
+   __slots__ = ('func_txt', 'calls', 'primitive_calls', 'func_time', 'func_cumulative_time')
+   _repr_fields = ('func_txt', 'calls', 'func_time')
+
+   def __init__(self, func_txt, calls, primitive_calls, func_time, func_cumulative_time):
+      """ Constructor.
+      """
+      self.func_txt = func_txt
+      self.calls = calls
+      self.primitive_calls = primitive_calls
+      self.func_time = func_time
+      self.func_cumulative_time = func_cumulative_time
+
+
+class ProfileEntry(_SlotsResult):
+   """ One Profile-IT entry: one profiled function
+
+   - file_path: (str) `~` for built-ins
+   - line_num: (int) first line: 0 for built-ins
+   - func_name: (str)
+   - calls, primitive_calls: (int) primitive calls are not induced via recursion
+   - func_time: (float) seconds spent in the function itself
+   - func_cumulative_time: (float) seconds spent in the function inclusive the sub calls
+   - callers: (tuple) of :py:class:`ProfileCaller`
+   - callees: (tuple) of :py:class:`ProfileCallee`
+   """
+   __slots__ = ('file_path', 'line_num', 'func_name', 'calls', 'primitive_calls', 'func_time', 'func_cumulative_time',
+                'callers', 'callees')
+   _repr_fields = ('func_name', 'calls', 'func_time')
+
+   def __init__(self, file_path, line_num, func_name, calls, primitive_calls, func_time, func_cumulative_time, callers,
+                callees=()):
+      """ Constructor.
+      """
+      self.file_path = file_path
+      self.line_num = line_num
+      self.func_name = func_name
+      self.calls = calls
+      self.primitive_calls = primitive_calls
+      self.func_time = func_time
+      self.func_cumulative_time = func_cumulative_time
+      self.callers = callers
+      self.callees = callees
+
+   def get_func_txt(self, output_max_slashes_fileinfo=None):
+      """ Returns the text of the function: `file_path:line_num(func_name)` or the name of a built-in
+
+      :param output_max_slashes_fileinfo: (int or None) max path levels: see: speed_it(): if None: the full path
+      :return: (str)
+      """
+      return get_profile_func_txt(self.file_path, self.line_num, self.func_name, output_max_slashes_fileinfo)
+
+
+class ProfileResult(_SlotsResult):
+   """ The Profile-IT result of one function
+
+   - name: (str)
+   - status: (str) ``OK`` or ``TIMEOUT``: partial profile
+   - total_calls, primitive_calls: (int)
+   - total_time: (float) seconds
+   - entries: (tuple) of :py:class:`ProfileEntry`: unsorted
+   """
+   __slots__ = ('name', 'status', 'total_calls', 'primitive_calls', 'total_time', 'entries')
+   _repr_fields = ('name', 'status', 'total_calls', 'total_time')
+
+   def __init__(self, name, status, total_calls, primitive_calls, total_time, entries):
+      """ Constructor.
+      """
+      self.name = name
+      self.status = status
+      self.total_calls = total_calls
+      self.primitive_calls = primitive_calls
+      self.total_time = total_time
+      self.entries = entries
+
+
+class SampledProfileResult(_SlotsResult):
+   """ The Profile-IT result of one function: engine ``sampling``: interned stacks: see:
+   :mod:`PySpeedIT.sampling_profiler`
+
+   - name: (str)
+   - status: (str) ``OK`` or ``TIMEOUT``: the samples until then
+   - mode: (str) ``signal`` or ``thread``
+   - interval_sec: (float) time between two samples
+   - frames: (tuple) of tuples: (file_path, line_num, func_name)
+   - stacks: (tuple) of tuples of frame indexes: outermost frame first
+   - counts: (array of unsigned longs) number of samples per stack
+   """
+   __slots__ = ('name', 'status', 'mode', 'interval_sec', 'frames', 'stacks', 'counts')
+   _repr_fields = ('name', 'status', 'mode', 'interval_sec')
+
+   def __init__(self, name, status, mode, interval_sec, frames, stacks, counts):
+      """ Constructor.
+      """
+      self.name = name
+      self.status = status
+      self.mode = mode
+      self.interval_sec = interval_sec
+      self.frames = frames
+      self.stacks = stacks
+      self.counts = counts
+
+   def get_num_samples(self):
+      """ Returns the number of all samples
+
+      :return: (int)
+      """
+      return sum(self.counts)
+
+   def get_collapsed_stacks(self, output_max_slashes_fileinfo=None):
+      """ Returns the stacks as function texts: see: :py:func:`get_profile_func_txt`
+
+      :param output_max_slashes_fileinfo: (int or None) max path levels: see: speed_it(): if None: the full path
+      :return: (list) of tuples: (func_txts, count): func_txts: tuple: outermost frame first
+      """
+      func_txts = [
+         get_profile_func_txt(file_path, line_num, func_name, output_max_slashes_fileinfo)
+         for file_path, line_num, func_name in self.frames
+      ]
+      return [
+         (tuple(func_txts[frame_idx] for frame_idx in stack), count) for stack, count in zip(self.stacks, self.counts)
+      ]
+
+   def get_collapsed_text(self, root=None, output_max_slashes_fileinfo=None):
+      """ Returns the collapsed-stack text: one line per stack: `frame;frame;frame count`: e.g. for `flamegraph.pl`
+
+      - `;` within a function text is replaced by `,`
+
+      :param root: (str or None) if set: added as the outermost frame of each stack: e.g. the result name
+      :param output_max_slashes_fileinfo: (int or None) see: :py:meth:`get_collapsed_stacks`
+      :return: (str)
+      """
+      lines = []
+      for func_txts, count in self.get_collapsed_stacks(output_max_slashes_fileinfo):
+         if root is not None:
+            func_txts = (root,) + func_txts
+         lines.append('{} {}\n'.format(';'.join(func_txt.replace(';', ',') for func_txt in func_txts), count))
+      return ''.join(lines)
+
+
+class ContextProfileResult(_SlotsResult):
+   """ The Profile-IT result of one function: engine ``context``: the calling-context tree: array backed: one value per
+   node: node 0 is the root: see: :mod:`PySpeedIT.context_profiler`
+
+   - name: (str)
+   - status: (str) ``OK`` or ``TIMEOUT``: the calls until then
+   - max_depth: (int) the depth cap
+   - frames: (tuple) of tuples: (file_path, line_num, func_name)
+   - parents: (array of longs) the parent node index: -1 for the root
+   - node_frames: (array of longs) the frame index: -1 for the root
+   - calls: (array of unsigned longs): the root: the number of repeats
+   - total_times: (array of doubles) seconds inclusive the callees
+   - self_times: (array of doubles) seconds exclusive the callees
+   - truncated: (array of unsigned chars) 1 if the callees were cut at the depth cap
+   """
+   __slots__ = ('name', 'status', 'max_depth', 'frames', 'parents', 'node_frames', 'calls', 'total_times', 'self_times',
+                'truncated')
+   _repr_fields = ('name', 'status', 'max_depth')
+
+   def __init__(self, name, status, max_depth, frames, parents, node_frames, calls, total_times, self_times, truncated):
+      """ Constructor.
+      """
+      self.name = name
+      self.status = status
+      self.max_depth = max_depth
+      self.frames = frames
+      self.parents = parents
+      self.node_frames = node_frames
+      self.calls = calls
+      self.total_times = total_times
+      self.self_times = self_times
+      self.truncated = truncated
+
+   def __len__(self):
+      return len(self.parents)
+
+   def get_children(self):
+      """ Returns the child node indexes of all nodes: sorted by the total time: the highest first
+
+      :return: (list) of lists: one per node
+      """
+      children = [[] for node_idx in range(len(self.parents))]
+      for node_idx in range(1, len(self.parents)):
+         children[self.parents[node_idx]].append(node_idx)
+      for node_children in children:
+         node_children.sort(key=lambda node_idx_: self.total_times[node_idx_], reverse=True)
+      return children
+
+   def get_func_txt(self, node_idx, output_max_slashes_fileinfo=None):
+      """ Returns the text of the function of a node: see: :py:func:`get_profile_func_txt`: the root: the name
+
+      :param node_idx: (int)
+      :param output_max_slashes_fileinfo: (int or None) max path levels: see: speed_it(): if None: the full path
+      :return: (str)
+      """
+      if node_idx == 0:
+         return '{}'.format(self.name)
+      return get_profile_func_txt(*self.frames[self.node_frames[node_idx]], output_max_slashes_fileinfo)
+
+   def get_path(self, node_idx, output_max_slashes_fileinfo=None):
+      """ Returns the call path of a node: the function texts from the outermost call to the node: without the root
+
+      :param node_idx: (int)
+      :param output_max_slashes_fileinfo: (int or None) see: :py:meth:`get_func_txt`
+      :return: (tuple) of str
+      """
+      path = []
+      while node_idx > 0:
+         path.append(self.get_func_txt(node_idx, output_max_slashes_fileinfo))
+         node_idx = self.parents[node_idx]
+      return tuple(reversed(path))
+
+
+class LineMemoryResult(_SlotsResult):
+   """ The Line-Memory-Profile-IT result of one function: array backed: one value per source line
+
+   - name: (str)
+   - status: (str) ``OK`` or ``TIMEOUT``: the lines measured until then
+   - max_mem_mib: (float)
+   - line_nums: (array of longs)
+   - memory_usage_mib: (array of doubles) 0.0 for lines which were not executed
+   - increment_memory_usage_mib: (array of doubles)
+   - lines: (tuple) of str: the stripped source lines
+   """
+   __slots__ = ('name', 'status', 'max_mem_mib', 'line_nums', 'memory_usage_mib', 'increment_memory_usage_mib', 'lines')
+   _repr_fields = ('name', 'status', 'max_mem_mib')
+
+   def __init__(self, name, status, max_mem_mib, line_nums, memory_usage_mib, increment_memory_usage_mib, lines):
+      """ Constructor.
+      """
+      self.name = name
+      self.status = status
+      self.max_mem_mib = max_mem_mib
+      self.line_nums = line_nums
+      self.memory_usage_mib = memory_usage_mib
+      self.increment_memory_usage_mib = increment_memory_usage_mib
+      self.lines = lines
+
+   def __len__(self):
+      return len(self.line_nums)
+
+   def iter_rows(self):
+      """ Yields one tuple per source line: (line_num, memory_usage_mib, increment_memory_usage_mib, line)
+      """
+      return zip(self.line_nums, self.memory_usage_mib, self.increment_memory_usage_mib, self.lines)
+
+
+class Instruction(_SlotsResult):
+   """ One Disassemble-IT bytecode instruction: see: `dis.Instruction`
+
+   - offset: (int)
+   - opname: (str)
+   - arg: (int or None)
+   - argval: (any) the resolved argument value
+   - argrepr: (str)
+   - is_jump_target: (bool)
+   - starts_line: (int or None) the source line number if the instruction starts a line
+   - line: (str) the stripped source line if the instruction starts a line: else empty
+   """
+   __slots__ = ('offset', 'opname', 'arg', 'argval', 'argrepr', 'is_jump_target', 'starts_line', 'line')
+   _repr_fields = ('offset', 'opname', 'argrepr')
+
+   def __init__(self, offset, opname, arg, argval, argrepr, is_jump_target, starts_line, line):
+      """ Constructor.
+      """
+      self.offset = offset
+      self.opname = opname
+      self.arg = arg
+      self.argval = argval
+      self.argrepr = argrepr
+      self.is_jump_target = is_jump_target
+      self.starts_line = starts_line
+      self.line = line
+
+
+class DisassembleResult(_SlotsResult):
+   """ The Disassemble-IT result of one function
+
+   - name: (str)
+   - instructions: (tuple) of :py:class:`Instruction`
+   """
+   __slots__ = ('name', 'instructions')
+   _repr_fields = ('name',)
+
+   def __init__(self, name, instructions):
+      """ Constructor.
+      """
+      self.name = name
+      self.instructions = instructions
+
+
+def get_profile_func_txt(file_path, line_num, func_name, output_max_slashes_fileinfo=None):
+   """ Returns the text of a profiled function: `file_path:line_num(func_name)` or the name of a built-in
+
+   - enclosing angle brackets are removed: e.g. of `<module>` or `<built-in method ...>`
+
+   :param file_path: (str) `~` for built-ins
+   :param line_num: (int)
+   :param func_name: (str)
+   :param output_max_slashes_fileinfo: (int or None) max path levels: see: speed_it(): if None: the full path
+   :return: (str)
+   """
+   if file_path == '~':
+      func_txt = func_name
+   else:
+      slashes = file_path.count('/')
+      if output_max_slashes_fileinfo is not None and slashes > output_max_slashes_fileinfo:
+         file_path = file_path.split('/', slashes - output_max_slashes_fileinfo)[-1]
+      func_txt = '{}:{}({})'.format(file_path, line_num, func_name)
+
+   if func_txt[0] == '<' and func_txt[-1] == '>':
+      return func_txt[1:-1]
+   if func_txt[0] == '<':
+      return func_txt[1:]
+   if func_txt[-1] == '>':
+      return func_txt[:-1]
+   return func_txt
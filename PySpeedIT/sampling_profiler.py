@@ -0,0 +1,214 @@
+"""
+===========================
+PySpeedIT.sampling_profiler
+===========================
+
+Overview
+========
+A statistical profiler for the *Profile-IT* engine ``sampling``: instead of a callback per call like the `cProfiler` it
+records the full stack of the profiled function at a fixed interval: heavy call paths are not slowed down and the hot
+spots do not shift: the overhead is a small fixed cost per sample.
+
+Modes:
+
+   - ``signal``: `signal.setitimer` with `ITIMER_PROF`: samples the CPU time of the process: the stack of the
+     interrupted frame is recorded in the `SIGPROF` handler: only in the main thread of systems with `setitimer`
+   - ``thread``: a background thread reads the stack of the profiled thread with `sys._current_frames()`: samples the
+     wall-clock time: also waiting functions are seen: the effective rate is limited by the GIL switch interval
+   - ``auto``: ``signal`` where supported else ``thread``
+
+Interned storage: each code object is stored once as a frame index: each distinct stack once as a tuple of frame
+indexes with a sample count: a long run adds counts not stacks.
+
+.. code-block:: python3
+
+   sampling_profiler = SamplingProfiler(interval_sec=0.001)
+   sampling_profiler.start()
+   try:
+      func()
+   finally:
+      sampling_profiler.stop()
+   frames, stacks, counts = sampling_profiler.get_samples()
+
+.. index:: Profile-IT; sampling profiler
+
+
+Classes
+=======
+
+.. autoclass:: SamplingProfiler
+   :members:
+
+
+Functions
+=========
+
+.. autofunction:: get_sampling_mode
+"""
+from array import array
+from sys import (
+   _current_frames as sys_current_frames,
+   _getframe as sys_getframe,
+)
+from signal import (
+   SIG_DFL as signal_SIG_DFL,
+   signal as signal_signal,
+)
+from threading import (
+   Event as threading_Event,
+   Thread as threading_Thread,
+   current_thread as threading_current_thread,
+   get_ident as threading_get_ident,
+   main_thread as threading_main_thread,
+)
+
+try:
+   from signal import (
+      SIGPROF as signal_SIGPROF,
+      ITIMER_PROF as signal_ITIMER_PROF,
+      setitimer as signal_setitimer,
+   )
+except ImportError:
+   signal_SIGPROF = None
+   signal_ITIMER_PROF = None
+   signal_setitimer = None
+
+from PySpeedIT.constants import SAMPLING_DEFAULT_INTERVAL_SEC
+from PySpeedIT.utils import Err
+
+
+SAMPLING_MODES = ('auto', 'signal', 'thread')
+# deeper stacks are cut: the outermost frames are kept
+SAMPLING_MAX_STACK_DEPTH = 256
+
+
+def get_sampling_mode(mode='auto'):
+   """ Returns the sampling mode which is used for: mode
+
+   :param mode: (str) ``auto``, ``signal`` or ``thread``
+   :return: (str) ``signal`` or ``thread``
+   :raise Err: for an unknown mode or ``signal`` if it is not supported: not the main thread or no `setitimer`
+   """
+   if mode not in SAMPLING_MODES:
+      raise Err('get_sampling_mode', ['mode: <{}> must be one of: <{}>'.format(mode, ', '.join(SAMPLING_MODES))])
+   signal_supported = signal_setitimer is not None and threading_current_thread() is threading_main_thread()
+   if mode == 'auto':
+      return 'signal' if signal_supported else 'thread'
+   if mode == 'signal' and not signal_supported:
+      raise Err('get_sampling_mode', [
+         'mode: <signal> needs `signal.setitimer` and the main thread: use mode: <thread>'
+      ])
+   return mode
+
+
+class SamplingProfiler(object):
+   """ Records the stacks of the calling thread at a fixed interval: see: the module documentation
+
+   - only frames below the frame which called :py:meth:`start` are recorded: the profiled code not the caller
+   """
+
+   def __init__(self, interval_sec=SAMPLING_DEFAULT_INTERVAL_SEC, mode='auto'):
+      """ Constructor.
+
+      :param interval_sec: (float) time between two samples: CPU time for ``signal``: wall-clock time for ``thread``
+      :param mode: (str) see: :py:func:`get_sampling_mode`
+      :raise Err: for an interval which is not greater than 0 or an unsupported mode
+      """
+      if not interval_sec > 0:
+         raise Err('SamplingProfiler', ['interval_sec: <{}> must be greater than <0>'.format(interval_sec)])
+      self.interval_sec = interval_sec
+      self.mode = get_sampling_mode(mode)
+      # id(code): frame index: the code objects are kept alive in: self._codes: so the ids stay unique
+      self._frame_idxs = {}
+      self._codes = []
+      # tuple of frame indexes: outermost first: stack index
+      self._stack_idxs = {}
+      self._counts = array('L')
+      self._stop_frame = None
+      self._thread_ident = None
+      self._old_handler = None
+      self._stop_event = None
+      self._sampler_thread = None
+
+   def _record(self, frame):
+      """ Records the stack of frame up to the frame which called start()
+      """
+      stop_frame = self._stop_frame
+      codes = []
+      while frame is not None and frame is not stop_frame:
+         codes.append(frame.f_code)
+         frame = frame.f_back
+      if not codes or frame is None or codes[-1] in _PROFILER_CODES:
+         # the sample was not taken within the profiled code: e.g. in start() or stop()
+         return
+      if len(codes) > SAMPLING_MAX_STACK_DEPTH:
+         codes = codes[-SAMPLING_MAX_STACK_DEPTH:]
+      frame_idxs = self._frame_idxs
+      stack = []
+      for code in reversed(codes):
+         frame_idx = frame_idxs.get(id(code))
+         if frame_idx is None:
+            frame_idx = frame_idxs[id(code)] = len(self._codes)
+            self._codes.append(code)
+         stack.append(frame_idx)
+      stack = tuple(stack)
+      stack_idx = self._stack_idxs.get(stack)
+      if stack_idx is None:
+         self._stack_idxs[stack] = len(self._counts)
+         self._counts.append(1)
+      else:
+         self._counts[stack_idx] += 1
+
+   def _signal_handler(self, signum, frame):
+      self._record(frame)
+
+   def _sampler_main(self):
+      """ Runs in the sampler thread of mode ``thread``
+      """
+      while not self._stop_event.wait(self.interval_sec):
+         self._record(sys_current_frames().get(self._thread_ident))
+
+   def start(self):
+      """ Starts sampling the calling thread: the samples are added to the previous ones
+      """
+      self._stop_frame = sys_getframe(1)
+      if self.mode == 'signal':
+         self._old_handler = signal_signal(signal_SIGPROF, self._signal_handler)
+         signal_setitimer(signal_ITIMER_PROF, self.interval_sec, self.interval_sec)
+      else:
+         self._thread_ident = threading_get_ident()
+         self._stop_event = threading_Event()
+         self._sampler_thread = threading_Thread(target=self._sampler_main, name='PySpeedIT-sampler', daemon=True)
+         self._sampler_thread.start()
+
+   def stop(self):
+      """ Stops sampling
+      """
+      if self.mode == 'signal':
+         signal_setitimer(signal_ITIMER_PROF, 0)
+         # None: the previous handler was not installed from python
+         signal_signal(signal_SIGPROF, signal_SIG_DFL if self._old_handler is None else self._old_handler)
+      elif self._sampler_thread is not None:
+         self._stop_event.set()
+         self._sampler_thread.join()
+         self._sampler_thread = None
+      self._stop_frame = None
+
+   def get_samples(self):
+      """ Returns the recorded samples: interned
+
+      :return: (tuple) format: (frames, stacks, counts)
+
+         - frames: (tuple) of tuples: (file_path, line_num, func_name): line_num: the first line of the function
+         - stacks: (tuple) of tuples of frame indexes: outermost frame first
+         - counts: (array of unsigned longs) number of samples per stack
+      """
+      frames = tuple((code.co_filename, code.co_firstlineno, code.co_name) for code in self._codes)
+      stacks = [None] * len(self._counts)
+      for stack, stack_idx in self._stack_idxs.items():
+         stacks[stack_idx] = stack
+      return frames, tuple(stacks), array('L', self._counts)
+
+
+# samples taken within these methods are not recorded
+_PROFILER_CODES = (SamplingProfiler.start.__code__, SamplingProfiler.stop.__code__)
@@ -0,0 +1,296 @@
+"""
+========================
+PySpeedIT.shared_buffers
+========================
+
+Overview
+========
+Zero-copy handoff of large function arguments to the *Benchmark-IT* worker processes: see
+:mod:`PySpeedIT.multi_interpreter`.
+
+Arguments of a function tuple which are large buffers: `bytes`, `bytearray`, `array.array` and contiguous NumPy arrays of
+at least `SHARED_BUFFER_MIN_BYTES` are copied once into a shared segment: the pickled suite description only contains
+a small :py:class:`SharedBuffer` placeholder: the worker reattaches to the segment and gets a zero-copy view:
+
+   - ``shm``: `multiprocessing.shared_memory`
+   - ``mmap``: memory-mapped temporary files
+
+The views of `bytearray`, `array.array` and NumPy arrays are writable but private: copy-on-write mappings: changes are
+not seen by the following workers: ``shm`` maps the file of the segment in `/dev/shm`: systems without it get a private
+copy.
+
+Views in the worker:
+
+   - `bytes`: a read-only `memoryview`
+   - `bytearray`: a writable `memoryview`
+   - `array.array`: a `memoryview` cast to the typecode of the array: `u` arrays are not shared
+   - NumPy arrays: an array of the same dtype and shape on the segment
+
+The segments belong to the process which created them: :py:func:`release_segments` closes and removes them: also if a
+worker crashed.
+
+.. index:: Benchmark-IT; shared buffers
+
+
+Classes
+=======
+
+.. autoclass:: SharedBuffer
+   :members:
+
+
+Functions
+=========
+
+.. autofunction:: share_arguments
+
+.. autofunction:: attach_arguments
+
+.. autofunction:: release_segments
+"""
+from array import array
+from mmap import (
+   ACCESS_COPY as mmap_ACCESS_COPY,
+   ACCESS_READ as mmap_ACCESS_READ,
+   mmap,
+)
+from os.path import (
+   isfile as path_isfile,
+   join as path_join,
+)
+
+from PySpeedIT.constants import SHARED_BUFFER_BACKENDS
+from PySpeedIT.utils import Err
+
+
+# smaller buffers are pickled
+SHARED_BUFFER_MIN_BYTES = 2 ** 20
+# POSIX shared memory segments are files in this directory: where supported
+SHM_DIR_PATH = '/dev/shm'
+# array typecodes which a memoryview can be cast to
+_MEMORYVIEW_TYPECODES = set('bBhHiIlLqQfd')
+
+
+class SharedBuffer(object):
+   """ Placeholder of a large buffer argument in a shared segment: picklable: see: the module documentation
+
+   - backend: (str) ``shm`` or ``mmap``
+   - segment: (str) the shared memory name or the path of the memory-mapped file
+   - kind: (str) ``bytes``, ``bytearray``, ``array`` or ``ndarray``
+   - nbytes: (int) size of the buffer in bytes
+   - typecode: (str or None) ``array``: the typecode: ``ndarray``: the dtype string
+   - shape: (tuple or None) ``ndarray``: the shape
+   """
+   __slots__ = ('backend', 'segment', 'kind', 'nbytes', 'typecode', 'shape')
+
+   def __init__(self, backend, segment, kind, nbytes, typecode=None, shape=None):
+      """ Constructor.
+      """
+      self.backend = backend
+      self.segment = segment
+      self.kind = kind
+      self.nbytes = nbytes
+      self.typecode = typecode
+      self.shape = shape
+
+   def __getstate__(self):
+      return tuple(getattr(self, field) for field in self.__slots__)
+
+   def __setstate__(self, state):
+      for field, value in zip(self.__slots__, state):
+         setattr(self, field, value)
+
+   def __repr__(self):
+      return 'SharedBuffer({}: {}: {} bytes)'.format(self.backend, self.kind, self.nbytes)
+
+
+def _helper_get_buffer_info(value):
+   """ Returns the tuple: (kind, typecode, shape) of a buffer which can be shared: None otherwise
+   """
+   if isinstance(value, bytes):
+      return 'bytes', None, None
+   if isinstance(value, bytearray):
+      return 'bytearray', None, None
+   if isinstance(value, array):
+      if value.typecode in _MEMORYVIEW_TYPECODES:
+         return 'array', value.typecode, None
+      return None
+   # NumPy arrays: duck typed: NumPy is not imported
+   value_type = type(value)
+   if value_type.__module__ == 'numpy' and value_type.__name__ == 'ndarray' and value.flags['C_CONTIGUOUS'] and \
+         not value.dtype.hasobject:
+      return 'ndarray', value.dtype.str, tuple(value.shape)
+   return None
+
+
+def _helper_create_segment(backend, nbytes, segment_dir_path, segment_idx):
+   """ Returns the tuple: (segment_name_or_path, writable_memoryview, handle): handle: see: release_segments()
+   """
+   if backend == 'shm':
+      from multiprocessing.shared_memory import SharedMemory
+      shared_memory = SharedMemory(create=True, size=nbytes)
+      return shared_memory.name, shared_memory.buf[:nbytes], shared_memory
+
+   file_path = path_join(segment_dir_path, 'shared_buffer_{}.bin'.format(segment_idx))
+   with open(file_path, 'wb') as file_:
+      file_.truncate(nbytes)
+   with open(file_path, 'r+b') as file_:
+      mapped = mmap(file_.fileno(), nbytes)
+   return file_path, memoryview(mapped), mapped
+
+
+def share_arguments(module_tuple_of_func_tuples, backend, segment_dir_path, min_bytes=SHARED_BUFFER_MIN_BYTES):
+   """ Returns the function tuples with the large buffer arguments replaced by :py:class:`SharedBuffer` placeholders
+
+   - a buffer used by several function tuples is shared once
+
+   :param module_tuple_of_func_tuples: (tuple) see: `modules__func_tuples` of
+      :py:func:`speed_it <PySpeedIT.speed_it.speed_it>`
+   :param backend: (str) ``shm`` or ``mmap``
+   :param segment_dir_path: (str) directory of the memory-mapped files: backend ``mmap``
+   :param min_bytes: (int) smaller buffers are not shared
+   :return: (tuple) format: (shared_func_tuples, segments, shared_bytes)
+
+      - shared_func_tuples: (tuple) of function tuples
+      - segments: (list) the segment handles: see: :py:func:`release_segments`
+      - shared_bytes: (int) the size of all shared buffers
+
+   :raise Err: for an unknown backend
+   """
+   if backend not in SHARED_BUFFER_BACKENDS:
+      raise Err('share_arguments', [
+         'backend: <{}> must be one of: <{}>'.format(backend, ', '.join(SHARED_BUFFER_BACKENDS))
+      ])
+   placeholders = {}
+   segments = []
+   shared_bytes = 0
+
+   def share(value):
+      buffer_info = _helper_get_buffer_info(value)
+      if buffer_info is None:
+         return value
+      source_view = memoryview(value).cast('B')
+      if source_view.nbytes < min_bytes:
+         return value
+      if id(value) not in placeholders:
+         segment, target_view, handle = _helper_create_segment(
+            backend, source_view.nbytes, segment_dir_path, len(segments))
+         segments.append(handle)
+         target_view[:] = source_view
+         target_view.release()
+         placeholders[id(value)] = SharedBuffer(backend, segment, buffer_info[0], source_view.nbytes, *buffer_info[1:])
+      return placeholders[id(value)]
+
+   shared_func_tuples = []
+   try:
+      for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples:
+         shared_func_tuples.append((
+            name_str,
+            function_name_str,
+            [share(argument) for argument in func_positional_arguments],
+            {key: share(argument) for key, argument in func_keyword_arguments.items()},
+         ))
+   except BaseException:
+      release_segments(segments)
+      raise
+   for placeholder in placeholders.values():
+      shared_bytes += placeholder.nbytes
+   return tuple(shared_func_tuples), segments, shared_bytes
+
+
+def _helper_attach_segment(shared_buffer):
+   """ Returns the tuple: (memoryview, handle) of an existing segment: handle: see: release_segments()
+
+   - the views of the writable kinds are private: changes are not seen by the following workers
+   """
+   writable = shared_buffer.kind != 'bytes'
+   if shared_buffer.backend == 'shm':
+      shm_file_path = path_join(SHM_DIR_PATH, shared_buffer.segment)
+      if writable and path_isfile(shm_file_path):
+         # a private copy-on-write mapping of the shared memory file: like the backend: mmap
+         segment = shm_file_path
+      else:
+         from multiprocessing.shared_memory import SharedMemory
+         try:
+            shared_memory = SharedMemory(name=shared_buffer.segment, track=False)
+         except TypeError:
+            # before python 3.13: the attaching process must not unlink the segment at its exit
+            from multiprocessing.resource_tracker import unregister
+            shared_memory = SharedMemory(name=shared_buffer.segment)
+            unregister(getattr(shared_memory, '_name', '/' + shared_memory.name), 'shared_memory')
+         view = shared_memory.buf[:shared_buffer.nbytes]
+         if writable:
+            # no shared memory file to map privately: a private copy
+            private_copy = bytearray(view)
+            view.release()
+            view = memoryview(private_copy)
+         return view.toreadonly() if not writable else view, shared_memory
+   else:
+      segment = shared_buffer.segment
+   with open(segment, 'rb' if not writable else 'r+b') as file_:
+      handle = mmap(file_.fileno(), shared_buffer.nbytes, access=mmap_ACCESS_COPY if writable else mmap_ACCESS_READ)
+   view = memoryview(handle)
+   if not writable:
+      view = view.toreadonly()
+   return view, handle
+
+
+def attach_arguments(module_tuple_of_func_tuples):
+   """ Returns the function tuples with the :py:class:`SharedBuffer` placeholders replaced by zero-copy views
+
+   :param module_tuple_of_func_tuples: (tuple) see: :py:func:`share_arguments`
+   :return: (tuple) format: (attached_func_tuples, segments): segments: see: :py:func:`release_segments`: after the
+      views are no longer used
+   """
+   views = {}
+   segments = []
+
+   def attach(value):
+      if not isinstance(value, SharedBuffer):
+         return value
+      if value.segment not in views:
+         view, handle = _helper_attach_segment(value)
+         segments.append(handle)
+         if value.kind == 'array':
+            view = view.cast(value.typecode)
+         elif value.kind == 'ndarray':
+            # lazy import: NumPy is only needed for shared NumPy arrays
+            from numpy import (
+               dtype as numpy_dtype,
+               ndarray as numpy_ndarray,
+            )
+            view = numpy_ndarray(value.shape, dtype=numpy_dtype(value.typecode), buffer=view)
+         views[value.segment] = view
+      return views[value.segment]
+
+   attached_func_tuples = tuple(
+      (
+         name_str,
+         function_name_str,
+         [attach(argument) for argument in func_positional_arguments],
+         {key: attach(argument) for key, argument in func_keyword_arguments.items()},
+      ) for name_str, function_name_str, func_positional_arguments, func_keyword_arguments in module_tuple_of_func_tuples
+   )
+   return attached_func_tuples, segments
+
+
+def release_segments(segments, unlink=True):
+   """ Closes the segments: shared memory segments are removed if unlink
+
+   - views which are still referenced keep a memory-mapped file open until they are released
+
+   :param segments: (list) segment handles: see: :py:func:`share_arguments`, :py:func:`attach_arguments`
+   :param unlink: (bool) True in the process which created the segments
+   """
+   for handle in segments:
+      try:
+         handle.close()
+      except BufferError:
+         # a view is still exported: the mapping is released with the last view
+         pass
+      if unlink and hasattr(handle, 'unlink'):
+         try:
+            handle.unlink()
+         except FileNotFoundError:
+            pass
+   del segments[:]
@@ -12,24 +12,71 @@ Classes
 =========
 .. autoclass:: Err
 
+.. autoclass:: JobTimeout
+
 
 Functions
 =========
 .. autofunction:: build_cython_extension
 
+.. autofunction:: build_cython_extension_cached
+
+.. autofunction:: build_cython_extensions_parallel
+
+.. autofunction:: get_cache_path
+
+.. autofunction:: get_cython_cache_dir_path
+
 .. autofunction:: format_time
+
+.. autofunction:: format_throughput
+
+.. autofunction:: watchdog
 """
-from distutils.dist import Distribution
-from distutils.errors import DistutilsArgError
-from distutils.extension import Extension
+from contextlib import contextmanager
+from hashlib import sha256 as hashlib_sha256
+from os import (
+   environ as os_environ,
+   listdir as os_listdir,
+   makedirs as os_makedirs,
+   rename as os_rename,
+   replace as os_replace,
+   stat as os_stat,
+   utime as os_utime,
+   walk as os_walk,
+)
 from os.path import (
    basename as path_basename,
    dirname as path_dirname,
+   expanduser as path_expanduser,
+   isdir as path_isdir,
    splitext as path_splitext,
    join as path_join,
 )
-
-from Cython.Distutils import build_ext as cython_build_ext
+from shutil import (
+   copyfile as shutil_copyfile,
+   rmtree as shutil_rmtree,
+)
+from signal import signal as signal_signal
+from sys import version as sys_version
+from sysconfig import get_config_var as sysconfig_get_config_var
+from tempfile import mkdtemp as tempfile_mkdtemp
+from threading import (
+   current_thread as threading_current_thread,
+   main_thread as threading_main_thread,
+)
+from time import perf_counter
+
+try:
+   from signal import (
+      SIGALRM as signal_SIGALRM,
+      ITIMER_REAL as signal_ITIMER_REAL,
+      setitimer as signal_setitimer,
+   )
+except ImportError:
+   signal_SIGALRM = None
+   signal_ITIMER_REAL = None
+   signal_setitimer = None
 
 from PySpeedIT import TESTED_HOST_OS
 
@@ -63,28 +110,152 @@ This `PySpeedIT` was tested with:
       print(self.__txt)
 
 
+class JobTimeout(BaseException):
+   """ Raised within a job supervised by: :py:func:`watchdog` when its time limit is exceeded
+
+   - derived from `BaseException`: so it is not swallowed by an `except Exception` within the job
+   """
+
+
+# default size budget of the Cython build cache in bytes
+CYTHON_CACHE_SIZE_BUDGET = 256 * 1024 * 1024
+
+
+# ===========================================================================================================================
+# helpers
+# ===========================================================================================================================
+def _helper_import_cython_build():
+   """ Returns the Cython and distutils build objects: imported on first use: they are slow to import and only needed to
+   build Cython extensions
+
+   :return: (tuple) format: (cython_version, cython_build_ext, Distribution, Extension, DistutilsArgError)
+   :raise Err: if Cython is not installed
+   """
+   from distutils.dist import Distribution
+   from distutils.errors import DistutilsArgError
+   from distutils.extension import Extension
+   try:
+      from Cython import __version__ as cython_version
+      from Cython.Distutils import build_ext as cython_build_ext
+   except ImportError as err:
+      raise Err('utils', [
+         'Cython is required to build Cython extensions: e.g. `pip install cython`',
+         '  ImportError: <{}>'.format(err)
+      ])
+   return cython_version, cython_build_ext, Distribution, Extension, DistutilsArgError
+
+
+def _helper_get_cython_cache_key(source_bytes, pxd_bytes, module_name, extra_compile_args, extra_link_args,
+                                 cython_directives):
+   """ Returns the hex digest of all inputs which have an influence on a build Cython extension
+
+   :return: (str) cache key
+   """
+   cython_version = _helper_import_cython_build()[0]
+   key_parts = [
+      'module_name: {!r}'.format(module_name),
+      'cython_version: {!r}'.format(cython_version),
+      'extra_compile_args: {!r}'.format(list(extra_compile_args or [])),
+      'extra_link_args: {!r}'.format(list(extra_link_args or [])),
+      'cython_directives: {!r}'.format(sorted((cython_directives or {}).items())),
+      'python_version: {!r}'.format(sys_version),
+   ]
+   for config_var_name in ('EXT_SUFFIX', 'SOABI', 'CC', 'CFLAGS', 'LDSHARED'):
+      key_parts.append('{}: {!r}'.format(config_var_name, sysconfig_get_config_var(config_var_name)))
+   for env_var_name in ('CC', 'CFLAGS', 'LDFLAGS', 'LDSHARED'):
+      key_parts.append('env {}: {!r}'.format(env_var_name, os_environ.get(env_var_name)))
+
+   cache_key = hashlib_sha256()
+   cache_key.update('\n'.join(key_parts).encode('utf-8'))
+   cache_key.update(b'\n-- source --\n')
+   cache_key.update(source_bytes)
+   cache_key.update(b'\n-- pxd --\n')
+   cache_key.update(pxd_bytes)
+   return cache_key.hexdigest()
+
+
+def _helper_get_dir_size(dir_path):
+   """ Returns the size in bytes of all files in dir_path
+
+   :param dir_path: (str)
+   :return: (int) size in bytes
+   """
+   dir_size = 0
+   for root, dirs, files in os_walk(dir_path):
+      for file_name in files:
+         try:
+            dir_size += os_stat(path_join(root, file_name)).st_size
+         except OSError:
+            pass
+   return dir_size
+
+
+def _helper_evict_cython_cache(cache_dir_path, cache_size_budget, keep_cache_keys):
+   """ Removes the least recently used cache entries until the cache fits into: cache_size_budget
+
+   - the entries of keep_cache_keys are never removed
+
+   :param cache_dir_path: (str)
+   :param cache_size_budget: (int) size budget in bytes
+   :param keep_cache_keys: (set) cache keys of entries which must be kept
+   """
+   cache_entries = []
+   cache_size = 0
+   for entry_name in os_listdir(cache_dir_path):
+      entry_dir_path = path_join(cache_dir_path, entry_name)
+      if entry_name.startswith('_build_') or not path_isdir(entry_dir_path):
+         continue
+      try:
+         entry_mtime = os_stat(entry_dir_path).st_mtime
+      except OSError:
+         continue
+      entry_size = _helper_get_dir_size(entry_dir_path)
+      cache_size += entry_size
+      if entry_name not in keep_cache_keys:
+         cache_entries.append((entry_mtime, entry_size, entry_dir_path))
+
+   for entry_mtime, entry_size, entry_dir_path in sorted(cache_entries):
+      if cache_size <= cache_size_budget:
+         break
+      shutil_rmtree(entry_dir_path, ignore_errors=True)
+      cache_size -= entry_size
+
+
 # ===========================================================================================================================
 # public helpers
 # ===========================================================================================================================
-def build_cython_extension(py_or_pyx_file_path, cython_force_rebuild=True):
+def build_cython_extension(py_or_pyx_file_path, cython_force_rebuild=True, extra_compile_args=None,
+                           extra_link_args=None, cython_directives=None):
    """ Build a cython extension from a `.py` or `.pyx` file
 
    - build will be done in a sub-folder named `_pyxbld` in the py_or_pyx_file_path
 
    :param py_or_pyx_file_path: (str) path to a `.py` or `.pyx` file
    :param cython_force_rebuild: (bool) If True the cython extension is rebuild even if it was already build
+   :param extra_compile_args: (list or None) extra arguments for the C compiler: e.g. ['-O3', '-march=native']
+   :param extra_link_args: (list or None) extra arguments for the linker
+   :param cython_directives: (dict or None) Cython compiler directives: e.g. {'boundscheck': False}
    :return: (tuple) cython_extension_module_path, cython_module_c_file_path, cython_build_dir_path
    """
    module_dir = path_dirname(py_or_pyx_file_path)
    module__cython_name = path_splitext(path_basename(py_or_pyx_file_path))[0]
    cython_module_c_file_path = path_join(module_dir, module__cython_name + '.c')
    cython_build_dir_path = path_join(module_dir, '_pyxbld')
+   cython_build_ext, Distribution, Extension, DistutilsArgError = _helper_import_cython_build()[1:]
 
    args = ['--quiet', 'build_ext', '--build-lib', module_dir]
    if cython_force_rebuild:
       args.append('--force')
    dist = Distribution({'script_name': None, 'script_args': args})
-   dist.ext_modules = [Extension(name=module__cython_name, sources=[py_or_pyx_file_path])]
+   extension = Extension(
+      name=module__cython_name,
+      sources=[py_or_pyx_file_path],
+      extra_compile_args=list(extra_compile_args or []),
+      extra_link_args=list(extra_link_args or [])
+   )
+   if cython_directives:
+      extension.cython_directives = dict(cython_directives)
+   dist.ext_modules = [extension]
    dist.cmdclass = {'build_ext': cython_build_ext}
    build = dist.get_command_obj('build')
    build.build_base = cython_build_dir_path
@@ -117,6 +288,231 @@ def build_cython_extension(py_or_pyx_file_path, cython_force_rebuild=True):
    return cython_extension_module_path, cython_module_c_file_path, cython_build_dir_path
 
 
+def get_cache_path(sub_path, env_var_name):
+   """ Returns the path of a PySpeedIT cache directory or file
+
+   - environment variable: env_var_name if set
+   - else: `$XDG_CACHE_HOME/PySpeedIT/{sub_path}` or `~/.cache/PySpeedIT/{sub_path}`
+
+   :param sub_path: (str) path within the PySpeedIT cache directory: e.g. ``cython``
+   :param env_var_name: (str) name of the environment variable which overrides the path: e.g. ``PYSPEEDIT_CACHE_DIR``
+   :return: (str) path of the cache directory or file
+   """
+   if os_environ.get(env_var_name):
+      return os_environ[env_var_name]
+   xdg_cache_home = os_environ.get('XDG_CACHE_HOME') or path_join(path_expanduser('~'), '.cache')
+   return path_join(xdg_cache_home, 'PySpeedIT', sub_path)
+
+
+def get_cython_cache_dir_path():
+   """ Returns the path of the Cython build cache directory
+
+   - environment variable `PYSPEEDIT_CACHE_DIR` if set
+   - else: `$XDG_CACHE_HOME/PySpeedIT/cython` or `~/.cache/PySpeedIT/cython`
+
+   :return: (str) path of the Cython build cache directory
+   """
+   return get_cache_path('cython', 'PYSPEEDIT_CACHE_DIR')
+
+
+def build_cython_extension_cached(py_or_pyx_file_path, module_name=None, pxd_file_path=None, extra_compile_args=None,
+                                  extra_link_args=None, cython_directives=None, cache_dir_path=None,
+                                  cache_size_budget=CYTHON_CACHE_SIZE_BUDGET):
+   """ Build a cython extension from a `.py` or `.pyx` file using a content-hash build cache
+
+   - the cache key is a hash of: the source, the optional `.pxd`, the module name, the Cython version,
+     the compiler/linker flags, the Cython directives and the Python ABI (version, `EXT_SUFFIX`, `CC`, `CFLAGS` ...)
+   - if the key matches a cache entry the cached extension is returned without any build
+   - else the source is copied to a temporary build directory within the cache and build there:
+     nothing is written next to the source
+   - least recently used cache entries are removed if the cache exceeds: cache_size_budget
+
+   The extension can be loaded with: `ExtensionFileLoader(module_name, cython_extension_module_path)`
+
+   :param py_or_pyx_file_path: (str) path to a `.py` or `.pyx` file
+   :param module_name: (str or None) module name of the extension: if None the file name without extension is used
+   :param pxd_file_path: (str or None) path to an augmenting `.pxd` file
+   :param extra_compile_args: (list or None) see: build_cython_extension()
+   :param extra_link_args: (list or None) see: build_cython_extension()
+   :param cython_directives: (dict or None) see: build_cython_extension()
+   :param cache_dir_path: (str or None) if None: see: get_cython_cache_dir_path()
+   :param cache_size_budget: (int or None) size budget of the whole cache in bytes: if None no entries are evicted
+   :return: (tuple) cython_extension_module_path, cache_hit
+   """
+   source_extension = path_splitext(py_or_pyx_file_path)[1]
+   if module_name is None:
+      module_name = path_splitext(path_basename(py_or_pyx_file_path))[0]
+   if not module_name.isidentifier():
+      raise Err('utils.build_cython_extension_cached', [
+         'module_name: <{}> must be a valid python identifier'.format(module_name),
+         '  py_or_pyx_file_path: <{}>'.format(py_or_pyx_file_path)
+      ])
+   if cache_dir_path is None:
+      cache_dir_path = get_cython_cache_dir_path()
+
+   try:
+      with open(py_or_pyx_file_path, 'rb') as file_:
+         source_bytes = file_.read()
+      if pxd_file_path:
+         with open(pxd_file_path, 'rb') as file_:
+            pxd_bytes = file_.read()
+      else:
+         pxd_bytes = b''
+      os_makedirs(cache_dir_path, exist_ok=True)
+   except OSError as err:
+      raise Err('utils.build_cython_extension_cached', [
+         'py_or_pyx_file_path: <{}>'.format(py_or_pyx_file_path),
+         '  pxd_file_path: <{}> cache_dir_path: <{}>'.format(pxd_file_path, cache_dir_path),
+         '    OSError: <{}>'.format(err)
+      ])
+
+   cache_key = _helper_get_cython_cache_key(source_bytes, pxd_bytes, module_name, extra_compile_args, extra_link_args,
+      cython_directives)
+   cache_entry_dir_path = path_join(cache_dir_path, cache_key)
+   cython_extension_module_path = path_join(cache_entry_dir_path, module_name + sysconfig_get_config_var('EXT_SUFFIX'))
+   try:
+      os_utime(cache_entry_dir_path)
+      os_stat(cython_extension_module_path)
+      return cython_extension_module_path, True
+   except OSError:
+      pass
+
+   build_dir_path = tempfile_mkdtemp(prefix='_build_', dir=cache_dir_path)
+   try:
+      build_source_file_path = path_join(build_dir_path, module_name + source_extension)
+      shutil_copyfile(py_or_pyx_file_path, build_source_file_path)
+      if pxd_file_path:
+         shutil_copyfile(pxd_file_path, path_join(build_dir_path, module_name + '.pxd'))
+      build_extension_module_path = build_cython_extension(
+         build_source_file_path,
+         cython_force_rebuild=True,
+         extra_compile_args=extra_compile_args,
+         extra_link_args=extra_link_args,
+         cython_directives=cython_directives
+      )[0]
+
+      # move the complete entry in place in one step: an other process may have added the same entry meanwhile
+      build_entry_dir_path = path_join(build_dir_path, '_entry')
+      os_makedirs(build_entry_dir_path)
+      os_replace(build_extension_module_path, path_join(build_entry_dir_path, path_basename(cython_extension_module_path)))
+      try:
+         os_rename(build_entry_dir_path, cache_entry_dir_path)
+      except OSError:
+         if not path_isdir(cache_entry_dir_path):
+            raise
+   except OSError as err:
+      raise Err('utils.build_cython_extension_cached', [
+         'py_or_pyx_file_path: <{}>'.format(py_or_pyx_file_path),
+         '  cache_dir_path: <{}>'.format(cache_dir_path),
+         '    OSError: <{}>'.format(err)
+      ])
+   finally:
+      shutil_rmtree(build_dir_path, ignore_errors=True)
+
+   if cache_size_budget is not None:
+      _helper_evict_cython_cache(cache_dir_path, cache_size_budget, {cache_key})
+   return cython_extension_module_path, False
+
+
+def build_cython_extensions_parallel(build_specs, max_workers=None, cache_dir_path=None,
+                                     cache_size_budget=CYTHON_CACHE_SIZE_BUDGET):
+   """ Build many cython extensions at the same time using the Cython build cache
+
+   - each build spec is build in its own process: e.g. many modules or the same module with different compiler flags
+   - cache entries are only evicted once after all builds are finished: none of the just build entries is removed
+
+   .. code-block:: python3
+
+      build_specs = [
+         {'py_or_pyx_file_path': 'example.py', 'module_name': 'example_O2', 'extra_compile_args': ['-O2']},
+         {'py_or_pyx_file_path': 'example.py', 'module_name': 'example_O3', 'extra_compile_args': ['-O3']},
+         {'py_or_pyx_file_path': 'example.py', 'module_name': 'example_native',
+            'extra_compile_args': ['-O3', '-march=native'], 'cython_directives': {'boundscheck': False}},
+      ]
+
+   :param build_specs: (list) of dicts: keyword arguments for: build_cython_extension_cached()
+      supported keys: `py_or_pyx_file_path`, `module_name`, `pxd_file_path`, `extra_compile_args`, `extra_link_args`,
+      `cython_directives`
+   :param max_workers: (int or None) maximum number of build processes: if None the number of CPUs is used
+   :param cache_dir_path: (str or None) if None: see: get_cython_cache_dir_path()
+   :param cache_size_budget: (int or None) size budget of the whole cache in bytes: if None no entries are evicted
+   :return: (list) of tuples: (cython_extension_module_path, cache_hit) in the order of the build_specs
+   """
+   supported_keys = {
+      'py_or_pyx_file_path', 'module_name', 'pxd_file_path', 'extra_compile_args', 'extra_link_args', 'cython_directives'
+   }
+   for build_spec in build_specs:
+      if 'py_or_pyx_file_path' not in build_spec or set(build_spec) - supported_keys:
+         raise Err('utils.build_cython_extensions_parallel', [
+            'build_spec: <{}>'.format(build_spec),
+            '  must have the key <py_or_pyx_file_path> and only the supported keys: <{}>'.format(sorted(supported_keys))
+         ])
+   if cache_dir_path is None:
+      cache_dir_path = get_cython_cache_dir_path()
+
+   if len(build_specs) < 2 or max_workers == 1:
+      build_results = [
+         build_cython_extension_cached(cache_dir_path=cache_dir_path, cache_size_budget=None, **build_spec)
+         for build_spec in build_specs
+      ]
+   else:
+      from concurrent.futures import ProcessPoolExecutor
+      with ProcessPoolExecutor(max_workers=max_workers) as executor:
+         futures = [
+            executor.submit(build_cython_extension_cached, cache_dir_path=cache_dir_path, cache_size_budget=None,
+               **build_spec)
+            for build_spec in build_specs
+         ]
+         build_results = [future.result() for future in futures]
+
+   if cache_size_budget is not None and build_results:
+      _helper_evict_cython_cache(
+         cache_dir_path,
+         cache_size_budget,
+         {path_basename(path_dirname(cython_extension_module_path)) for cython_extension_module_path, cache_hit in
+            build_results}
+      )
+   return build_results
+
+
+@contextmanager
+def watchdog(timeout_sec):
+   """ Context manager: a signal based wall-clock watchdog: raises :py:class:`JobTimeout` within the supervised block
+   if it runs longer than: timeout_sec
+
+   - uses `SIGALRM`: only active in the main thread of systems with `signal.setitimer`
+   - the signal is handled between python bytecodes: a single long running C call is interrupted after it returned
+   - an already running `ITIMER_REAL` timer (e.g. of a test runner) is restored afterwards
+
+   .. code-block:: python3
+
+      try:
+         with watchdog(10.0):
+            func()
+      except JobTimeout:
+         print('TIMEOUT')
+
+   :param timeout_sec: (float or None) if None or 0: no watchdog is used
+   """
+   if not timeout_sec or signal_setitimer is None or threading_current_thread() is not threading_main_thread():
+      yield
+      return
+
+   def timeout_handler(signum_, frame_):
+      raise JobTimeout('job exceeded its time limit of: <{}> seconds'.format(timeout_sec))
+
+   old_handler = signal_signal(signal_SIGALRM, timeout_handler)
+   start_time = perf_counter()
+   old_timer_sec = signal_setitimer(signal_ITIMER_REAL, timeout_sec)[0]
+   try:
+      yield
+   finally:
+      signal_setitimer(signal_ITIMER_REAL, 0)
+      signal_signal(signal_SIGALRM, old_handler)
+      if old_timer_sec > 0:
+         signal_setitimer(signal_ITIMER_REAL, max(old_timer_sec - (perf_counter() - start_time), 0.001))
+
+
 def format_time(time_):
    """ Returns a formatted time string in the Orders of magnitude (time)
 
@@ -150,6 +546,25 @@ def format_time(time_):
    return final_time_str
 
 
+def format_throughput(per_sec, unit):
+   """ Returns a formatted throughput string with a decimal SI prefix: e.g. `12.35 Mops/s`, `1.20 GB/s`
+
+   :param per_sec: (float) work units per second: if -1.0 return 'NOT-MEASURED'
+   :param unit: (str) symbol of the work unit: e.g. `ops` or `B`
+   :return: (str) formatted throughput
+   """
+   if per_sec == -1.0:
+      return 'NOT-MEASURED'
+   base = 1
+   for prefix in ['', 'k', 'M', 'G']:
+      if per_sec < base * 1000:
+         break
+      base *= 1000
+   else:
+      prefix = 'T'
+   return '{:.2f} {}{}/s'.format(per_sec / base, prefix, unit)
+
+
 def get_html_template_css():
    """ Returns the css styles used by all: Benchmark-IT, Profile-IT, Line-Memory-Profile-IT, Disassemble-IT
 
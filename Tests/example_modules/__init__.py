@@ -0,0 +1,36 @@
+""" example modules of the tests: each test loads its own fresh instance: module state changed by one test is not seen
+by the next
+"""
+from importlib.util import (
+   module_from_spec as importlib_module_from_spec,
+   spec_from_file_location as importlib_spec_from_file_location,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+
+
+EXAMPLE_MODULES_DIR_PATH = path_dirname(path_abspath(__file__))
+
+
+def get_example_module_path(module_name):
+   """ Returns the file path of an example module
+
+   :param module_name: (str) e.g. ``example_results``
+   :return: (str) absolute file path
+   """
+   return path_join(EXAMPLE_MODULES_DIR_PATH, '{}.py'.format(module_name))
+
+
+def load_example_module(module_name):
+   """ Returns a new instance of an example module: not added to `sys.modules`
+
+   :param module_name: (str) e.g. ``example_results``
+   :return: (module) the loaded module
+   """
+   module_spec = importlib_spec_from_file_location(module_name, get_example_module_path(module_name))
+   loaded_module = importlib_module_from_spec(module_spec)
+   module_spec.loader.exec_module(loaded_module)
+   return loaded_module
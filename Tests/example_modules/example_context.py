@@ -0,0 +1,27 @@
+""" example module of: test_context_profiler.py: the line numbers are checked
+"""
+
+
+def _helper_work(n_):
+   return sorted(range(n_, 0, -1))
+
+
+def _helper_request_path():
+   return _helper_work(10000)
+
+
+def _helper_background_job():
+   for idx in range(10):
+      _helper_work(10)
+
+
+def _helper_recurse(depth_):
+   if depth_:
+      return _helper_recurse(depth_ - 1)
+   return len([depth_])
+
+
+def example_app():
+   _helper_request_path()
+   _helper_background_job()
+   return _helper_recurse(50)
@@ -0,0 +1,23 @@
+""" example module of: test_discover.py: copied into the scanned trees
+"""
+from PySpeedIT.discover import benchmark, profile
+from PySpeedIT import discover
+
+
+DATA = list(range(100))
+
+
+@benchmark(name='sum data', args=[DATA])
+@benchmark
+@profile()
+def example_sum(data_=DATA):
+   return sum(data_)
+
+
+@discover.profile
+def example_profile_only():
+   return 1
+
+
+def example_not_registered():
+   return 2
@@ -0,0 +1,19 @@
+""" example module of: test_fork_server.py
+"""
+import os
+
+
+CACHE = []
+
+
+def example_grow_cache(n_):
+   CACHE.extend(range(n_))
+   return len(CACHE)
+
+
+def example_ok(n_):
+   return sum(range(n_))
+
+
+def example_boom():
+   os._exit(3)
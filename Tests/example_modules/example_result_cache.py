@@ -0,0 +1,17 @@
+""" example module of: test_result_cache.py: the tests change: SCALE
+"""
+
+
+SCALE = 2
+
+
+def _helper_scale(n_):
+   return n_ * SCALE
+
+
+def example_scaled(n_):
+   return [_helper_scale(idx) for idx in range(n_)]
+
+
+def example_sum(n_):
+   return sum(range(n_))
@@ -0,0 +1,13 @@
+""" example module of: test_results.py: the line numbers are checked
+"""
+
+
+def _helper_square(n_):
+   return n_ * n_
+
+
+def example_squares(n_):
+   result = []
+   for idx in range(n_):
+      result.append(_helper_square(idx))
+   return result
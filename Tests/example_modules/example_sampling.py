@@ -0,0 +1,18 @@
+""" example module of: test_sampling_profiler.py: the line numbers are checked
+"""
+
+
+def _helper_hot(n_):
+   return sum(idx * idx for idx in range(n_))
+
+
+def _helper_cold(n_):
+   return list(range(n_))
+
+
+def example_work(n_):
+   result = 0
+   for idx in range(n_):
+      result += _helper_hot(20000)
+      _helper_cold(100)
+   return result
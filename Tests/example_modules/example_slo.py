@@ -0,0 +1,21 @@
+""" example module of: test_slo.py
+"""
+from time import perf_counter
+
+
+# the calls of: example_spiky
+_calls = [0]
+
+
+def example_sum(n_):
+   return sum(range(n_))
+
+
+def example_spiky():
+   """ every 50th call busy-waits 0.5 ms: 2 % slow calls: the p99 of single calls is about 0.5 ms
+   """
+   _calls[0] += 1
+   if _calls[0] % 50 == 0:
+      end_time = perf_counter() + 0.0005
+      while perf_counter() < end_time:
+         pass
@@ -0,0 +1,206 @@
+""" tests Benchmark-IT: code engine (ast transformation) and call engine
+"""
+from functools import partial
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+)
+from sys import (
+   modules as sys_modules,
+   path as sys_path,
+)
+from time import sleep
+from traceback import extract_tb
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.benchmark_it import (
+   _CallTimeIT,
+   _TimeIT,
+   _helper_get_benchmark_engine,
+   _helper_get_perf_counter_reference_time,
+   _helper_iter_benchmark_jobs,
+)
+from PySpeedIT.utils import (
+   JobTimeout,
+   watchdog,
+)
+
+
+REFERENCE_TIME = _helper_get_perf_counter_reference_time()
+
+
+def _decorator(func_):
+   return func_
+
+
+@_decorator
+def example_return(data_, n_=3):
+   """ multi line
+   docstring
+   """
+   result = sorted(data_)
+   return result[:n_]
+
+
+def example_single_line(x_): return x_ * 2
+
+
+def example_nested_return(items_, target_):
+   for i_ in items_:
+      for j_ in items_:
+         if i_ + j_ == target_:
+            return i_, j_
+   return None
+
+
+def example_tags():
+   # ::SPEEDIT:: data
+   data = list(range(1000))
+   # **SPEEDIT**
+   data.reverse()
+   # ::SPEEDIT:: sorted
+   result = sorted(data)
+   # **SPEEDIT**
+   del result
+
+
+def example_raise(x_):
+   y_ = x_
+   raise ValueError(y_)
+
+
+def example_sleep(sec_):
+   sleep(sec_)
+
+
+def example_mutate(data_):
+   if data_ != [3, 2, 1]:
+      raise ValueError(data_)
+   data_.sort()
+
+
+def _time_it(func, args_list, kwargs_dict):
+   return _TimeIT(func, func.__name__, sys_modules[__name__].__dict__, args_list, kwargs_dict, False, -1, func.__name__,
+      REFERENCE_TIME)
+
+
+def test_code_engine_supported_functions():
+   """ Tests: test_code_engine_supported_functions: return, decorators, docstrings, single-line bodies, tags
+   """
+   print('::: TEST: test_code_engine_supported_functions()')
+   for func, args_list, kwargs_dict in (
+         (example_return, [[3, 2, 1]], {}),
+         (example_single_line, [3], {}),
+         (example_nested_return, [list(range(20)), 30], {}),
+         (example_tags, [], {})):
+      benchmark_result = _time_it(func, args_list, kwargs_dict).benchmark_it(with_gc=False)
+      assert benchmark_result['loops'] == 1
+      assert benchmark_result['engine'] == 'code'
+
+
+def test_code_engine_keeps_line_numbers():
+   """ Tests: test_code_engine_keeps_line_numbers: tracebacks point to the original source line
+   """
+   print('::: TEST: test_code_engine_keeps_line_numbers()')
+   try:
+      _time_it(example_raise, [1], {}).benchmark_it(with_gc=False)
+   except ValueError as err:
+      last_frame = extract_tb(err.__traceback__)[-1]
+      assert last_frame.filename == example_raise.__code__.co_filename
+      assert last_frame.lineno == example_raise.__code__.co_firstlineno + 2
+   else:
+      raise AssertionError('expected a ValueError')
+
+
+def test_code_engine_fresh_arguments():
+   """ Tests: test_code_engine_fresh_arguments: each loop gets a fresh copy of the mutable arguments
+   """
+   print('::: TEST: test_code_engine_fresh_arguments()')
+   data = [3, 2, 1]
+   timeit_obj = _TimeIT(example_mutate, 'example_mutate', sys_modules[__name__].__dict__, [data], {}, False, 0.1,
+      'mutate', REFERENCE_TIME)
+   benchmark_result = timeit_obj.benchmark_it(with_gc=False)
+   assert benchmark_result['loops'] > 1
+   assert data == [3, 2, 1]
+
+
+def test_call_engine():
+   """ Tests: test_call_engine: callables without source code
+   """
+   print('::: TEST: test_call_engine()')
+   for func, args_list, kwargs_dict in (
+         (sorted, [[3, 1, 2]], {'reverse': True}),
+         (partial(sorted, key=abs), [[3, -1, 2]], {}),
+         (lambda x_: x_ + 1, [1], {}),
+         ([1, 2, 3].count, [2], {})):
+      assert _helper_get_benchmark_engine(func, 'auto') == 'call'
+      benchmark_result = _CallTimeIT(func, 'func', args_list, kwargs_dict, False, -1, 'func',
+         REFERENCE_TIME).benchmark_it(with_gc=False)
+      assert benchmark_result['engine'] == 'call'
+      assert benchmark_result['call_overhead_sec'] > 0
+   assert _helper_get_benchmark_engine(example_return, 'auto') == 'code'
+
+
+def test_call_engine_variants():
+   """ Tests: test_call_engine_variants: the same function in several module variants, slow callables with check_too_fast
+   """
+   print('::: TEST: test_call_engine_variants()')
+   this_module = sys_modules[__name__]
+   jobs = list(_helper_iter_benchmark_jobs(this_module, [('copy', this_module)], (
+      ('sort', 'example_return', [list(range(20000, 0, -1))], {}),
+   ), False, 'auto'))
+   assert [job[4] for job in jobs] == ['sort [python]', 'sort [copy]']
+   for name_str, func, orig_func_name, job_module, name, args_list, kwargs_dict, engine in jobs:
+      assert engine == 'call'
+      benchmark_result = _CallTimeIT(func, orig_func_name, args_list, kwargs_dict, True, -1, name,
+         REFERENCE_TIME).benchmark_it(with_gc=False)
+      assert benchmark_result['call_overhead_sec'] > 0
+
+
+def test_job_timeout():
+   """ Tests: test_job_timeout: a timed-out benchmark keeps its partial samples: unfinished first loop: lower bound
+   """
+   print('::: TEST: test_job_timeout()')
+   for timeit_obj in (
+         _TimeIT(example_sleep, 'example_sleep', sys_modules[__name__].__dict__, [0.02], {}, False, 10, 'sleep',
+            REFERENCE_TIME),
+         _CallTimeIT(example_sleep, 'example_sleep', [0.02], {}, False, 10, 'sleep', REFERENCE_TIME)):
+      try:
+         with watchdog(0.3):
+            timeit_obj.benchmark_it(with_gc=False)
+      except JobTimeout:
+         benchmark_result = timeit_obj.get_partial_result(0.3)
+      else:
+         raise AssertionError('expected a JobTimeout')
+      assert benchmark_result['status'] == 'TIMEOUT'
+      assert 1 < benchmark_result['loops'] == len(benchmark_result['samples'])
+      assert benchmark_result['best_loop_sec'] >= 0.02
+      assert benchmark_result['minor_faults'] is None
+
+   timeit_obj = _time_it(example_sleep, [1.0], {})
+   try:
+      with watchdog(0.1):
+         timeit_obj.benchmark_it(with_gc=False)
+   except JobTimeout:
+      benchmark_result = timeit_obj.get_partial_result(0.1)
+   assert benchmark_result['loops'] == 0
+   assert list(benchmark_result['samples']) == [0.1]
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_code_engine_supported_functions()
+   test_code_engine_keeps_line_numbers()
+   test_code_engine_fresh_arguments()
+   test_call_engine()
+   test_call_engine_variants()
+   test_job_timeout()
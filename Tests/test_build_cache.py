@@ -0,0 +1,122 @@
+""" tests the content-hash Cython build cache
+"""
+from importlib.machinery import ExtensionFileLoader
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os import (
+   environ as os_environ,
+   listdir,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+from shutil import rmtree
+from sys import path as sys_path
+from tempfile import mkdtemp
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.discover import get_discover_cache_file_path
+from PySpeedIT.result_cache import get_results_cache_dir_path
+from PySpeedIT.utils import (
+   build_cython_extension_cached,
+   build_cython_extensions_parallel,
+   get_cache_path,
+   get_cython_cache_dir_path,
+)
+
+
+def test_build_cython_extension_cached():
+   """ Tests: test_build_cython_extension_cached: cache hit, cache miss on changed flags, size budget eviction
+   """
+   print('::: TEST: test_build_cython_extension_cached()')
+   tmp_dir_path = mkdtemp()
+   try:
+      source_file_path = path_join(tmp_dir_path, 'cache_example.py')
+      with open(source_file_path, 'w') as file_:
+         file_.write('def double(x_):\n   return x_ * 2\n')
+      cache_dir_path = path_join(tmp_dir_path, 'cache')
+
+      extension_path, cache_hit = build_cython_extension_cached(source_file_path, cache_dir_path=cache_dir_path)
+      assert not cache_hit
+      # nothing is written next to the source
+      assert sorted(listdir(tmp_dir_path)) == ['cache', 'cache_example.py']
+      cached_module = ExtensionFileLoader('cache_example', extension_path).load_module('cache_example')
+      assert cached_module.double(21) == 42
+
+      assert build_cython_extension_cached(source_file_path, cache_dir_path=cache_dir_path) == (extension_path, True)
+
+      # other flags: other key: the first entry is evicted with a zero size budget
+      other_extension_path, cache_hit = build_cython_extension_cached(source_file_path,
+         cython_directives={'boundscheck': False}, cache_dir_path=cache_dir_path, cache_size_budget=0)
+      assert not cache_hit
+      assert other_extension_path != extension_path
+      assert len(listdir(cache_dir_path)) == 1
+   finally:
+      rmtree(tmp_dir_path)
+
+
+def test_build_cython_extensions_parallel():
+   """ Tests: test_build_cython_extensions_parallel: one module build with a compiler-flag matrix
+   """
+   print('::: TEST: test_build_cython_extensions_parallel()')
+   tmp_dir_path = mkdtemp()
+   try:
+      source_file_path = path_join(tmp_dir_path, 'flags_example.py')
+      with open(source_file_path, 'w') as file_:
+         file_.write('def double(x_):\n   return x_ * 2\n')
+      build_specs = [
+         {'py_or_pyx_file_path': source_file_path, 'module_name': 'flags_example_O0', 'extra_compile_args': ['-O0']},
+         {'py_or_pyx_file_path': source_file_path, 'module_name': 'flags_example_O2', 'extra_compile_args': ['-O2']},
+         {'py_or_pyx_file_path': source_file_path, 'module_name': 'flags_example_nobounds',
+            'cython_directives': {'boundscheck': False}},
+      ]
+      cache_dir_path = path_join(tmp_dir_path, 'cache')
+      build_results = build_cython_extensions_parallel(build_specs, max_workers=3, cache_dir_path=cache_dir_path)
+      assert [cache_hit for extension_path, cache_hit in build_results] == [False, False, False]
+      for build_spec, (extension_path, cache_hit) in zip(build_specs, build_results):
+         module_name = build_spec['module_name']
+         assert ExtensionFileLoader(module_name, extension_path).load_module(module_name).double(2) == 4
+      assert len(listdir(cache_dir_path)) == 3
+
+      build_results = build_cython_extensions_parallel(build_specs, max_workers=3, cache_dir_path=cache_dir_path)
+      assert [cache_hit for extension_path, cache_hit in build_results] == [True, True, True]
+   finally:
+      rmtree(tmp_dir_path)
+
+
+def test_get_cache_path():
+   """ Tests: test_get_cache_path: environment variable: XDG_CACHE_HOME: the caches of all tools
+   """
+   print('::: TEST: test_get_cache_path()')
+   env_var_names = ('XDG_CACHE_HOME', 'PYSPEEDIT_CACHE_DIR', 'PYSPEEDIT_RESULTS_CACHE_DIR', 'PYSPEEDIT_DISCOVER_CACHE_FILE')
+   previous_values = {env_var_name: os_environ.pop(env_var_name, None) for env_var_name in env_var_names}
+   try:
+      assert get_cache_path('cython', 'PYSPEEDIT_CACHE_DIR').endswith(path_join('.cache', 'PySpeedIT', 'cython'))
+      os_environ['XDG_CACHE_HOME'] = path_join('xdg', 'cache')
+      assert get_cython_cache_dir_path() == path_join('xdg', 'cache', 'PySpeedIT', 'cython')
+      assert get_results_cache_dir_path() == path_join('xdg', 'cache', 'PySpeedIT', 'results')
+      assert get_discover_cache_file_path() == path_join('xdg', 'cache', 'PySpeedIT', 'discover_cache.json')
+      os_environ['PYSPEEDIT_RESULTS_CACHE_DIR'] = 'results_dir'
+      assert get_results_cache_dir_path() == 'results_dir'
+   finally:
+      for env_var_name, previous_value in previous_values.items():
+         if previous_value is None:
+            os_environ.pop(env_var_name, None)
+         else:
+            os_environ[env_var_name] = previous_value
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_build_cython_extension_cached()
+   test_build_cython_extensions_parallel()
+   test_get_cache_path()
@@ -0,0 +1,102 @@
+""" tests the context Profile-IT engine: the calling-context tree keeps the time per call path
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+from shutil import rmtree as shutil_rmtree
+from sys import path as sys_path
+from tempfile import mkdtemp as tempfile_mkdtemp
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.context_profiler import ContextProfiler
+from PySpeedIT.profile_it import (
+   context_profile_functions,
+   profile_functions_in_module,
+)
+from PySpeedIT.results import ContextProfileResult
+from PySpeedIT.utils import Err
+
+from example_modules import load_example_module
+
+
+def test_context_profiler():
+   """ Tests: test_context_profiler: one node per call path: self and total time: depth cap
+   """
+   print('::: TEST: test_context_profiler()')
+   loaded_module = load_example_module('example_context')
+   func_tuples = (('app', 'example_app', [], {}),)
+   context_result = context_profile_functions(
+      loaded_module, func_tuples, use_func_name=False, profileit__repeat=2, profileit__context_max_depth=6)[0]
+   assert isinstance(context_result, ContextProfileResult) and context_result.status == 'OK'
+   assert context_result.calls[0] == 2
+
+   nodes = {
+      context_result.get_path(node_idx, 0): node_idx for node_idx in range(1, len(context_result))
+   }
+   # the profiler and the caller of start() are not part of the tree
+   assert {path[0] for path in nodes} == {'example_context.py:24(example_app)'}
+   request_work = nodes[(
+      'example_context.py:24(example_app)', 'example_context.py:9(_helper_request_path)',
+      'example_context.py:5(_helper_work)')]
+   background_work = nodes[(
+      'example_context.py:24(example_app)', 'example_context.py:13(_helper_background_job)',
+      'example_context.py:5(_helper_work)')]
+   # the same helper: kept apart per call path
+   assert context_result.calls[request_work] == 2 and context_result.calls[background_work] == 20
+   assert context_result.total_times[request_work] > context_result.total_times[background_work]
+   children = context_result.get_children()
+   assert context_result.get_func_txt(children[request_work][0]) == 'built-in method builtins.sorted'
+
+   for node_idx in range(1, len(context_result)):
+      child_total_time = sum(context_result.total_times[child_idx] for child_idx in children[node_idx])
+      assert context_result.total_times[node_idx] >= context_result.self_times[node_idx] >= 0.0
+      assert abs(context_result.total_times[node_idx] - context_result.self_times[node_idx] - child_total_time) < 1e-6
+   assert abs(context_result.total_times[0] - sum(
+      context_result.total_times[child_idx] for child_idx in children[0])) < 1e-6
+
+   # depth cap: the recursion is cut: the node at the cap is truncated
+   assert max(len(path) for path in nodes) == 6
+   truncated_paths = [path for path, node_idx in nodes.items() if context_result.truncated[node_idx]]
+   assert len(truncated_paths) == 1 and truncated_paths[0][-1] == 'example_context.py:18(_helper_recurse)'
+   try:
+      ContextProfiler(0)
+      assert False, 'expected Err for a max_depth of 0'
+   except Err:
+      pass
+
+
+def test_context_profile_report():
+   """ Tests: test_context_profile_report: the collapsible calling-context tree
+   """
+   print('::: TEST: test_context_profile_report()')
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_context_profiler_')
+   try:
+      loaded_module = load_example_module('example_context')
+      profile_functions_in_module(
+         loaded_module, loaded_module.__file__, 'example_context', work_dir_path, (('app', 'example_app', [], {}),), 0,
+         False, False, 1, profileit__engine='context', profileit__context_max_depth=6)
+      with open(path_join(work_dir_path, 'profile_it__example_context.html')) as file_:
+         html = file_.read()
+      assert html.count('<details') == html.count('</details>') > 0
+      assert html.count('<strong>example_context.py:5(_helper_work)</strong>') == 2
+      assert html.count('truncated: depth cap') == 1
+      assert '<summary><strong>app</strong>' in html
+   finally:
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_context_profiler()
+   test_context_profile_report()
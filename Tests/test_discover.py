@@ -0,0 +1,98 @@
+""" tests the decorator based registration and the cached discovery of the modules__func_tuples
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from json import load as json_load
+from os import makedirs as os_makedirs
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+from shutil import rmtree as shutil_rmtree
+from sys import path as sys_path
+from tempfile import mkdtemp as tempfile_mkdtemp
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.discover import (
+   SPEEDIT_JOBS_ATTRIBUTE,
+   benchmark,
+   discover_modules__func_tuples,
+   iter_discovered_modules,
+)
+
+from example_modules import get_example_module_path
+
+
+def _helper_write(file_path, source):
+   os_makedirs(path_dirname(file_path), exist_ok=True)
+   with open(file_path, 'w') as file_:
+      file_.write(source)
+
+
+def test_benchmark_decorator():
+   """ Tests: test_benchmark_decorator: the function is not wrapped: stacked decorators keep the source order
+   """
+   print('::: TEST: test_benchmark_decorator()')
+
+   def example_func(x_=1):
+      return x_
+
+   decorated = benchmark(name='first', args=[1])(benchmark(kwargs={'x_': 2})(example_func))
+   assert decorated is example_func
+   assert getattr(example_func, SPEEDIT_JOBS_ATTRIBUTE)['benchmark'] == [
+      ('first', 'example_func', [1], {}),
+      ('example_func', 'example_func', [], {'x_': 2}),
+   ]
+
+
+def test_discover_modules__func_tuples():
+   """ Tests: test_discover_modules__func_tuples: only decorated modules: per tool func tuples: cached scan results
+   """
+   print('::: TEST: test_discover_modules__func_tuples()')
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_discover_')
+   try:
+      tree_dir_path = path_join(work_dir_path, 'tree')
+      cache_file_path = path_join(work_dir_path, 'discover_cache.json')
+      with open(get_example_module_path('example_discover')) as file_:
+         example_module_source = file_.read()
+      _helper_write(path_join(tree_dir_path, 'pkg', 'example_discover.py'), example_module_source)
+      _helper_write(path_join(tree_dir_path, 'pkg', 'plain.py'), 'def func():\n   return 1\n')
+      # mentions the decorator name: parsed but never imported
+      _helper_write(path_join(tree_dir_path, 'mentions.py'), 'raise RuntimeError("benchmark")\n')
+      _helper_write(path_join(tree_dir_path, '.hidden', 'example_hidden.py'), example_module_source)
+
+      assert not isinstance(iter_discovered_modules(tree_dir_path, cache_file_path), (list, tuple))
+      modules__func_tuples = discover_modules__func_tuples(tree_dir_path, cache_file_path)
+      assert len(modules__func_tuples) == 1
+      module_file_path, benchmark_func_tuples, module_options = modules__func_tuples[0]
+      assert module_file_path == path_join(tree_dir_path, 'pkg', 'example_discover.py')
+      assert [func_tuple[0] for func_tuple in benchmark_func_tuples] == ['sum data', 'example_sum']
+      assert benchmark_func_tuples[0][2] == [list(range(100))]
+      assert [func_tuple[1] for func_tuple in module_options['profile_func_tuples']] == [
+         'example_sum', 'example_profile_only']
+
+      with open(cache_file_path) as file_:
+         cached_files = json_load(file_)['files']
+      assert sorted(cached_files) == sorted([
+         module_file_path, path_join(tree_dir_path, 'pkg', 'plain.py'), path_join(tree_dir_path, 'mentions.py')])
+      assert cached_files[module_file_path][2] == ['example_sum', 'example_profile_only']
+
+      # a changed file is scanned again
+      _helper_write(module_file_path, 'def func():\n   return 1\n')
+      assert discover_modules__func_tuples(tree_dir_path, cache_file_path) == ()
+   finally:
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_benchmark_decorator()
+   test_discover_modules__func_tuples()
@@ -0,0 +1,116 @@
+""" tests the deterministic benchmark fixtures: built once per run: isolated views per job
+"""
+from array import array
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+)
+import random
+from sys import path as sys_path
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.benchmark_it import benchmark_functions
+from PySpeedIT.fixtures import (
+   Fixture,
+   clear_fixtures,
+   get_fixture_value,
+   get_fixture_view,
+   resolve_fixtures,
+)
+from PySpeedIT.profile_it import profile_functions
+from PySpeedIT.utils import Err
+
+
+FACTORY_CALLS = []
+
+
+def make_list(rng, size):
+   FACTORY_CALLS.append(size)
+   values = list(range(size))
+   rng.shuffle(values)
+   return values
+
+
+def test_fixtures():
+   """ Tests: test_fixtures: seeded factory, built once, shared by equal fixtures, isolation modes
+   """
+   print('::: TEST: test_fixtures()')
+   clear_fixtures()
+   del FACTORY_CALLS[:]
+   fixture = Fixture(make_list, seed=3, args=(100,))
+   value = get_fixture_value(fixture)
+   # equal factory, seed and arguments: the same value: e.g. declared by another module
+   assert get_fixture_value(Fixture(make_list, seed=3, args=(100,), isolation='readonly')) is value
+   assert FACTORY_CALLS == [100]
+   assert get_fixture_value(Fixture(make_list, seed=4, args=(100,))) != value
+   assert sorted(value) == list(range(100))
+   assert 'object at' not in repr(fixture)
+
+   # deterministic: built again after clearing
+   clear_fixtures()
+   assert get_fixture_value(fixture) == value and get_fixture_value(fixture) is not value
+   value = get_fixture_value(fixture)
+
+   view = get_fixture_view(fixture)
+   view.reverse()
+   assert view is not value and get_fixture_view(fixture) == value
+   readonly_view = get_fixture_view(Fixture(make_list, seed=3, args=(100,), isolation='readonly'))
+   assert readonly_view == tuple(value)
+   cow_fixture = Fixture(make_list, seed=3, args=(100,), isolation='cow')
+   assert get_fixture_view(cow_fixture, forked=True) is value
+   assert get_fixture_view(cow_fixture) is not value
+
+   buffer_view = get_fixture_view(Fixture(lambda rng: bytearray(b'abc'), isolation='readonly'))
+   try:
+      buffer_view[0] = 0
+      assert False, 'expected TypeError for a read-only view'
+   except TypeError:
+      pass
+   assert get_fixture_view(Fixture(lambda rng: array('d', [1.0]), isolation='readonly')).readonly
+
+   args, kwargs = resolve_fixtures([1, fixture], {'data': fixture})
+   assert args[0] == 1 and args[1] == value and kwargs['data'] == value and args[1] is not kwargs['data']
+   plain_args = [1]
+   assert resolve_fixtures(plain_args, {})[0] is plain_args
+
+   for factory, isolation in ((None, 'copy'), (make_list, 'unknown')):
+      try:
+         Fixture(factory, isolation=isolation)
+         assert False, 'expected Err for: {} {}'.format(factory, isolation)
+      except Err:
+         pass
+   clear_fixtures()
+
+
+def test_fixtures_isolated_jobs():
+   """ Tests: test_fixtures_isolated_jobs: functions which change their input in place do not change the fixture
+   """
+   print('::: TEST: test_fixtures_isolated_jobs()')
+   clear_fixtures()
+   fixture = Fixture(make_list, seed=5, args=(1000,))
+   value = list(get_fixture_value(fixture))
+   func_tuples = (
+      ('shuffle a', 'shuffle', [fixture], {}),
+      ('shuffle b', 'shuffle', [fixture], {}),
+   )
+   all_tables = benchmark_functions(
+      random, func_tuples, use_func_name=False, benchmarkit__run_sec=0.1, benchmarkit__repeat=2)
+   assert all(row.status == 'OK' for table in all_tables for row in table)
+   profile_functions(random, func_tuples)
+   assert get_fixture_value(fixture) == value
+   clear_fixtures()
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_fixtures()
+   test_fixtures_isolated_jobs()
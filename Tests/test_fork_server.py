@@ -0,0 +1,120 @@
+""" tests the fork server: each job runs in a clean child process: the results come back over a pipe
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from json import load as json_load
+from os import _exit as os_exit
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+from shutil import rmtree as shutil_rmtree
+from sys import path as sys_path
+from tempfile import mkdtemp as tempfile_mkdtemp
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.benchmark_it import benchmark_functions
+from PySpeedIT.fork_server import ForkServer
+from PySpeedIT.speed_it import speed_it
+
+from example_modules import (
+   get_example_module_path,
+   load_example_module,
+)
+
+
+STATE = []
+
+
+def _helper_run_job(request):
+   if request == 'crash':
+      os_exit(3)
+   if request == 'error':
+      raise ValueError('expected error')
+   STATE.append(request)
+   return list(STATE)
+
+
+def test_fork_server():
+   """ Tests: test_fork_server: clean state per job: errors and crashes are reported
+   """
+   print('::: TEST: test_fork_server()')
+   with ForkServer(_helper_run_job) as fork_server:
+      assert fork_server.submit(1) == ('OK', [1], '')
+      # the child of the first job did not change the state of the server
+      assert fork_server.submit(2) == ('OK', [2], '')
+      status, result, error_text = fork_server.submit('error')
+      assert status == 'ERROR' and result is None and 'expected error' in error_text
+      status, result, error_text = fork_server.submit('crash')
+      assert status == 'CRASHED' and result is None and '3' in error_text
+      # the server survives crashed jobs
+      assert fork_server.submit(3) == ('OK', [3], '')
+   assert STATE == []
+
+
+def test_isolated_benchmark_jobs():
+   """ Tests: test_isolated_benchmark_jobs: `benchmarkit__isolate_jobs`: module globals are not changed by the jobs
+   """
+   print('::: TEST: test_isolated_benchmark_jobs()')
+   loaded_module = load_example_module('example_fork_server')
+   func_tuples = (('grow cache', 'example_grow_cache', [10], {}),)
+   all_tables = benchmark_functions(
+      loaded_module, func_tuples, benchmarkit__run_sec=0.1, benchmarkit__repeat=2, benchmarkit__isolate_jobs=True)
+   assert [row.status for table in all_tables for row in table] == ['OK', 'OK']
+   assert all(len(row.samples) == row.loops for table in all_tables for row in table)
+   assert loaded_module.CACHE == []
+
+   benchmark_functions(loaded_module, func_tuples, benchmarkit__run_sec=0.1, benchmarkit__repeat=1)
+   assert loaded_module.CACHE
+
+
+def test_crashed_benchmark_job():
+   """ Tests: test_crashed_benchmark_job: a crashed isolated job is reported without samples: the other jobs continue
+   """
+   print('::: TEST: test_crashed_benchmark_job()')
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_fork_server_')
+   try:
+      loaded_module = load_example_module('example_fork_server')
+      func_tuples = (('boom', 'example_boom', [], {}), ('ok', 'example_ok', [100], {}))
+      all_tables = benchmark_functions(
+         loaded_module, func_tuples, benchmarkit__run_sec=0.1, benchmarkit__repeat=1, benchmarkit__isolate_jobs=True)
+      boom_row, ok_row = all_tables[0]
+      assert boom_row.status == 'CRASHED' and len(boom_row.samples) == 0 and boom_row.avg_loop_sec == -1.0
+      assert boom_row.suspect and boom_row.suspect[0].startswith('CRASHED')
+      assert ok_row.status == 'OK' and len(ok_row.samples) == ok_row.loops > 0
+
+      speed_it(
+         html_output_dir_path=work_dir_path,
+         enable_benchmarkit=True,
+         enable_profileit=False,
+         enable_linememoryprofileit=False,
+         enable_disassembleit=False,
+         modules__func_tuples=([get_example_module_path('example_fork_server'), func_tuples],),
+         benchmarkit__run_sec=0.1,
+         benchmarkit__repeat=1,
+         benchmarkit__output_json=True,
+         benchmarkit__isolate_jobs=True,
+      )
+      with open(path_join(work_dir_path, 'BenchmarkIT_Results', 'benchmark_it__example_fork_server.json')) as file_:
+         json_result = json_load(file_)
+      # the crashed job ranks last
+      assert [(row['name'], row['status']) for row in json_result['repeats'][0]] == [
+         ('example_ok', 'OK'), ('example_boom', 'CRASHED')]
+      assert json_result['repeats'][0][1]['compare_percent'] == -1.0
+   finally:
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_fork_server()
+   test_isolated_benchmark_jobs()
+   test_crashed_benchmark_job()
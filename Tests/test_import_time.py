@@ -0,0 +1,111 @@
+""" tests the import time: tool modules and heavy dependencies are only imported when their feature is used
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os import environ as os_environ
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+)
+from subprocess import run as subprocess_run
+from sys import (
+   executable as sys_executable,
+   path as sys_path,
+)
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+
+# must not be imported by: import PySpeedIT.speed_it
+LAZY_MODULE_NAMES = (
+   'Cython',
+   'distutils',
+   'setuptools',
+   'psutil',
+   'concurrent.futures.process',
+   'multiprocessing',
+   'PySpeedIT.benchmark_it',
+   'PySpeedIT.profile_it',
+   'PySpeedIT.line_memory_profile_it',
+   'PySpeedIT.disassemble_it',
+)
+
+# generous upper limit of the cumulative import time of PySpeedIT.speed_it: eager imports took about 0.35 sec
+MAX_SPEED_IT_IMPORT_TIME_SEC = 0.25
+
+
+def _helper_get_importtime(code):
+   """ Returns the cumulative import time in seconds of each module imported by code: see: `python -X importtime`
+   """
+   env = dict(os_environ)
+   env['PYTHONPATH'] = PROJECT_ROOT
+   completed_process = subprocess_run(
+      [sys_executable, '-X', 'importtime', '-c', code], env=env, capture_output=True, text=True)
+   assert completed_process.returncode == 0, completed_process.stderr
+   import_times = {}
+   for line in completed_process.stderr.splitlines():
+      if not line.startswith('import time:') or 'cumulative' in line:
+         continue
+      self_us, cumulative_us, module_name = line[len('import time:'):].split('|')
+      import_times[module_name.strip()] = int(cumulative_us) / 1000000.0
+   return import_times
+
+
+def test_import_time():
+   """ Tests: test_import_time: `-X importtime`: no tool module or heavy dependency is imported up front
+   """
+   print('::: TEST: test_import_time()')
+   import_times = _helper_get_importtime('import PySpeedIT.speed_it')
+   eager_module_names = [
+      module_name for module_name in import_times
+      if any(module_name == lazy_name or module_name.startswith(lazy_name + '.') for lazy_name in LAZY_MODULE_NAMES)
+   ]
+   assert not eager_module_names, eager_module_names
+   # fastest of a couple of runs: the import time of a busy test machine varies
+   speed_it_import_time_sec = min(
+      import_times['PySpeedIT.speed_it'],
+      *(_helper_get_importtime('import PySpeedIT.speed_it')['PySpeedIT.speed_it'] for run_idx in range(2))
+   )
+   assert speed_it_import_time_sec < MAX_SPEED_IT_IMPORT_TIME_SEC, speed_it_import_time_sec
+
+   # Benchmark-IT does not need: Cython, distutils, psutil: multiprocessing and subprocess only for its options
+   #   the versioneer `PySpeedIT._version` of a git checkout already imports subprocess
+   benchmark_it_module_names = set(_helper_get_importtime('import PySpeedIT.benchmark_it')) - set(
+      _helper_get_importtime('import PySpeedIT'))
+   eager_module_names = {
+      'Cython', 'distutils', 'psutil', 'multiprocessing', 'subprocess', 'PySpeedIT.fork_server',
+      'PySpeedIT.memory_budget', 'PySpeedIT.multi_interpreter', 'PySpeedIT.result_cache'
+   } & benchmark_it_module_names
+   assert not eager_module_names, eager_module_names
+
+
+def test_import_without_cython():
+   """ Tests: test_import_without_cython: PySpeedIT can be imported and used without Cython
+   """
+   print('::: TEST: test_import_without_cython()')
+   env = dict(os_environ)
+   env['PYTHONPATH'] = PROJECT_ROOT
+   completed_process = subprocess_run([sys_executable, '-c', '''
+import sys
+sys.modules['Cython'] = None
+from PySpeedIT.utils import Err, build_cython_extension
+from PySpeedIT.speed_it import speed_it
+try:
+   build_cython_extension('example.py')
+except Err:
+   print('Err: Cython is required')
+'''], env=env, capture_output=True, text=True)
+   assert completed_process.returncode == 0, completed_process.stderr
+   assert 'Err: Cython is required' in completed_process.stdout
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_import_time()
+   test_import_without_cython()
@@ -0,0 +1,61 @@
+""" tests the Benchmark-IT runs in a child process with a memory budget
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+)
+from sys import (
+   modules as sys_modules,
+   path as sys_path,
+)
+
+from psutil import Process
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.benchmark_it import (
+   _TimeIT,
+   _helper_get_perf_counter_reference_time,
+)
+from PySpeedIT.memory_budget import (
+   get_smallest_completing_budget,
+   run_with_memory_budget,
+)
+
+
+def example_alloc(size_mb_):
+   data = bytearray(size_mb_ * 2 ** 20)
+   return len(data)
+
+
+def test_memory_budget():
+   """ Tests: test_memory_budget: too small budget: MEMORY-ERROR: the parent process is not limited
+   """
+   print('::: TEST: test_memory_budget()')
+   timeit_obj = _TimeIT(example_alloc, 'example_alloc', sys_modules[__name__].__dict__, [100], {}, False, -1,
+      'example_alloc', _helper_get_perf_counter_reference_time())
+   baseline_mb = Process().memory_info().vms / float(2 ** 20)
+   budget_results = [
+      run_with_memory_budget(timeit_obj, False, memory_budget_mb)
+      for memory_budget_mb in (int(baseline_mb) + 20, int(baseline_mb) + 400)
+   ]
+   assert [budget_result['status'] for budget_result in budget_results] == ['MEMORY-ERROR', 'OK']
+   assert budget_results[0]['benchmark_result'] is None
+   assert budget_results[1]['benchmark_result']['loops'] == 1
+   assert get_smallest_completing_budget(budget_results) == int(baseline_mb) + 400
+   assert get_smallest_completing_budget(budget_results[:1]) is None
+   # the parent is not limited
+   assert example_alloc(200) == 200 * 2 ** 20
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_memory_budget()
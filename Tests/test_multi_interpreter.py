@@ -0,0 +1,96 @@
+""" tests running a Benchmark-IT suite in other interpreters as subprocesses
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+)
+from sys import (
+   executable as sys_executable,
+   path as sys_path,
+)
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.fixtures import (
+   Fixture,
+   clear_fixtures,
+)
+from PySpeedIT.multi_interpreter import measure_functions_in_interpreters
+
+
+def example_sum(n_):
+   return sum(range(n_))
+
+
+def example_sort(data_):
+   data_.sort()
+   return data_
+
+
+def _helper_make_data(rng_, size_):
+   """ fixture factory: not importable by the interpreter subprocesses: the test module is not on their path
+   """
+   return [rng_.random() for idx_ in range(size_)]
+
+
+def test_measure_functions_in_interpreters():
+   """ Tests: test_measure_functions_in_interpreters: results of each interpreter are merged into one table per repeat
+   """
+   print('::: TEST: test_measure_functions_in_interpreters()')
+   all_tables, memory_budget_rows, interpreters_info = measure_functions_in_interpreters(
+      [sys_executable, sys_executable],
+      path_abspath(__file__),
+      (('sum', 'example_sum', [1000], {}),),
+      {
+         'use_func_name': False,
+         'benchmarkit__with_gc': False,
+         'benchmarkit__check_too_fast': False,
+         'benchmarkit__run_sec': -1,
+         'benchmarkit__repeat': 2,
+      }
+   )
+   assert len(all_tables) == 2
+   assert [interpreter_info['label'][-2:] for interpreter_info in interpreters_info] == ['#1', '#2']
+   for table in all_tables:
+      assert [benchmark_result['name'] for benchmark_result in table] == [
+         'sum [{}]'.format(interpreter_info['label']) for interpreter_info in interpreters_info
+      ]
+      assert all(benchmark_result['status'] == 'OK' for benchmark_result in table)
+   assert memory_budget_rows == []
+
+
+def test_fixtures_in_interpreters():
+   """ Tests: test_fixtures_in_interpreters: the fixture values are built by the running process
+   """
+   print('::: TEST: test_fixtures_in_interpreters()')
+   data = Fixture(_helper_make_data, seed=1, args=(1000,))
+   try:
+      all_tables, memory_budget_rows, interpreters_info = measure_functions_in_interpreters(
+         [sys_executable],
+         path_abspath(__file__),
+         (('sort', 'example_sort', [data], {}), ('sort again', 'example_sort', [], {'data_': data})),
+         {
+            'use_func_name': False,
+            'benchmarkit__with_gc': False,
+            'benchmarkit__check_too_fast': False,
+            'benchmarkit__run_sec': -1,
+            'benchmarkit__repeat': 1,
+         }
+      )
+   finally:
+      clear_fixtures()
+   assert [benchmark_result['status'] for benchmark_result in all_tables[0]] == ['OK', 'OK']
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_measure_functions_in_interpreters()
+   test_fixtures_in_interpreters()
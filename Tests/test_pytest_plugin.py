@@ -0,0 +1,103 @@
+""" tests the pytest plugin: benchmarks of marked tests, sharding and the session cache
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from json import load as json_load
+from os import environ as os_environ
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+from shutil import rmtree as shutil_rmtree
+from subprocess import run as subprocess_run
+from sys import (
+   executable as sys_executable,
+   path as sys_path,
+)
+from tempfile import mkdtemp as tempfile_mkdtemp
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+
+EXAMPLE_TESTS_SOURCE = '''
+import pytest
+
+
+@pytest.fixture
+def numbers(speedit_session_cache):
+   return speedit_session_cache.get('numbers', list, range(1000, 0, -1))
+
+
+@pytest.mark.speedit(group='sort')
+def test_sorted(numbers):
+   assert sorted(numbers)[0] == 1
+
+
+@pytest.mark.speedit(group='sort')
+def test_min(numbers):
+   assert min(numbers) == 1
+
+
+@pytest.mark.speedit(group='sum', repeat=2)
+def test_sum(numbers):
+   assert sum(numbers) == 500500
+
+
+def test_not_benchmarked():
+   assert True
+'''
+
+
+def _helper_run_pytest(work_dir_path, json_file_path, extra_args):
+   env = dict(os_environ)
+   env['PYTHONPATH'] = PROJECT_ROOT
+   completed_process = subprocess_run(
+      [sys_executable, '-m', 'pytest', '-p', 'PySpeedIT.pytest_plugin', '-p', 'no:cacheprovider', '-q',
+       '--speedit-run-sec=0.1', '--speedit-json={}'.format(json_file_path),
+       path_join(work_dir_path, 'test_example_speedit.py')] + extra_args,
+      cwd=work_dir_path, env=env, capture_output=True, text=True
+   )
+   assert completed_process.returncode == 0, completed_process.stdout + completed_process.stderr
+   with open(json_file_path) as file_:
+      return json_load(file_)['results'], completed_process.stdout
+
+
+def test_pytest_plugin():
+   """ Tests: test_pytest_plugin: marked tests are benchmarked: results in the json and the terminal summary
+   """
+   print('::: TEST: test_pytest_plugin()')
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_pytest_plugin_')
+   try:
+      with open(path_join(work_dir_path, 'test_example_speedit.py'), 'w') as file_:
+         file_.write(EXAMPLE_TESTS_SOURCE)
+
+      results, stdout = _helper_run_pytest(work_dir_path, path_join(work_dir_path, 'all.json'), [])
+      assert sorted(result['name'].split('::')[-1] for result in results) == ['test_min', 'test_sorted', 'test_sum']
+      assert all(result['status'] == 'OK' and result['loops'] > 0 for result in results)
+      assert 'PySpeedIT Benchmark-IT' in stdout
+      # the fixture runs per test: the expensive input is created once
+      assert 'speedit_session_cache: created: 1 reused: 2' in stdout
+
+      shard_names = []
+      for shard in ('1/2', '2/2'):
+         results, stdout = _helper_run_pytest(
+            work_dir_path, path_join(work_dir_path, 'shard.json'), ['--speedit-shard={}'.format(shard)])
+         shard_names.append(sorted(result['name'].split('::')[-1] for result in results))
+         # unmarked tests run in all shards
+         assert '{} passed'.format(len(shard_names[-1]) + 1) in stdout
+      assert sorted(shard_names[0] + shard_names[1]) == ['test_min', 'test_sorted', 'test_sum']
+      assert len(shard_names[0]) == 2 and len(shard_names[1]) == 1
+   finally:
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_pytest_plugin()
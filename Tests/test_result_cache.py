@@ -0,0 +1,84 @@
+""" tests the incremental re-benchmarking: unchanged functions reuse the stored results
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os import environ as os_environ
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+from shutil import rmtree as shutil_rmtree
+from sys import path as sys_path
+from tempfile import mkdtemp as tempfile_mkdtemp
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.benchmark_it import measure_functions_in_module
+from PySpeedIT.result_cache import (
+   get_arguments_fingerprint,
+   get_function_fingerprint,
+)
+
+from example_modules import load_example_module
+
+
+def _helper_measure(loaded_module):
+   all_tables, memory_budget_rows = measure_functions_in_module(
+      loaded_module,
+      (('scaled', 'example_scaled', [100], {}), ('sum', 'example_sum', [100], {})),
+      False,
+      False,
+      False,
+      -1,
+      2,
+      benchmarkit__incremental=True
+   )
+   return {benchmark_result['name']: benchmark_result for benchmark_result in all_tables[-1]}
+
+
+def test_result_cache():
+   """ Tests: test_result_cache: a changed helper changes the fingerprint: only changed functions are re-run
+   """
+   print('::: TEST: test_result_cache()')
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_result_cache_')
+   previous_cache_dir_path = os_environ.get('PYSPEEDIT_RESULTS_CACHE_DIR')
+   os_environ['PYSPEEDIT_RESULTS_CACHE_DIR'] = path_join(work_dir_path, 'results')
+   try:
+      module_scale_2 = load_example_module('example_result_cache')
+      module_scale_3 = load_example_module('example_result_cache')
+      module_scale_3.SCALE = 3
+      assert get_function_fingerprint(module_scale_2.example_scaled) != \
+         get_function_fingerprint(module_scale_3.example_scaled)
+      assert get_function_fingerprint(module_scale_2.example_sum) == \
+         get_function_fingerprint(module_scale_3.example_sum)
+      assert get_arguments_fingerprint([1], {'a': 2}) != get_arguments_fingerprint([1], {'a': 3})
+
+      first_results = _helper_measure(module_scale_2)
+      assert first_results['scaled']['fresh'] and first_results['sum']['fresh']
+
+      second_results = _helper_measure(module_scale_2)
+      assert not second_results['scaled']['fresh'] and not second_results['sum']['fresh']
+      assert second_results['sum']['measured_at'] == first_results['sum']['measured_at']
+
+      # only the transitive helper constant changed
+      third_results = _helper_measure(module_scale_3)
+      assert third_results['scaled']['fresh']
+      assert not third_results['sum']['fresh']
+   finally:
+      if previous_cache_dir_path is None:
+         os_environ.pop('PYSPEEDIT_RESULTS_CACHE_DIR', None)
+      else:
+         os_environ['PYSPEEDIT_RESULTS_CACHE_DIR'] = previous_cache_dir_path
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_result_cache()
@@ -0,0 +1,146 @@
+""" tests the library API: the tools return compact result objects: nothing is written
+"""
+from array import array
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+from pickle import (
+   dumps as pickle_dumps,
+   loads as pickle_loads,
+)
+from shutil import rmtree as shutil_rmtree
+from sys import path as sys_path
+from tempfile import mkdtemp as tempfile_mkdtemp
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.benchmark_it import benchmark_functions
+from PySpeedIT.disassemble_it import disassemble_functions
+from PySpeedIT.line_memory_profile_it import line_memory_profile_functions
+from PySpeedIT.profile_it import (
+   profile_functions,
+   profile_functions_in_module,
+)
+from PySpeedIT.results import (
+   BenchmarkRow,
+   DisassembleResult,
+   LineMemoryResult,
+   ProfileResult,
+   get_profile_func_txt,
+)
+from PySpeedIT.utils import Err
+
+from example_modules import load_example_module
+
+
+EXAMPLE_FUNC_TUPLES = (('squares', 'example_squares', [50], {}),)
+
+
+def _helper_assert_compact(result_obj):
+   assert not hasattr(result_obj, '__dict__')
+   copy_obj = pickle_loads(pickle_dumps(result_obj))
+   assert type(copy_obj) is type(result_obj)
+   for field in result_obj.__slots__:
+      assert getattr(copy_obj, field) == getattr(result_obj, field)
+
+
+def test_results():
+   """ Tests: test_results: the library API of all tools: compact picklable result objects with unformatted values
+   """
+   print('::: TEST: test_results()')
+   loaded_module = load_example_module('example_results')
+
+   all_tables = benchmark_functions(
+      loaded_module, EXAMPLE_FUNC_TUPLES, use_func_name=False, benchmarkit__run_sec=0.1, benchmarkit__repeat=2)
+   assert len(all_tables) == 2
+   row = all_tables[0][0]
+   assert isinstance(row, BenchmarkRow)
+   assert row.name == 'squares' and row.status == 'OK' and row.fresh
+   assert isinstance(row.samples, array) and len(row.samples) == row.loops
+   assert row.best_loop_sec <= row.avg_loop_sec <= row.worst_loop_sec
+   assert row.as_dict()['avg_loop_sec'] == row.avg_loop_sec
+   _helper_assert_compact(row)
+   try:
+      BenchmarkRow(name='squares', unknown_field=1)
+      assert False, 'BenchmarkRow: expected Err for an unknown field'
+   except Err:
+      pass
+
+   profile_result = profile_functions(loaded_module, EXAMPLE_FUNC_TUPLES, use_func_name=True)[0]
+   assert isinstance(profile_result, ProfileResult)
+   assert profile_result.name == 'example_squares' and profile_result.status == 'OK'
+   entries = {entry.func_name: entry for entry in profile_result.entries}
+   assert entries['_helper_square'].calls == 50
+   assert [caller.calls for caller in entries['_helper_square'].callers] == [50]
+   assert entries['_helper_square'].callers[0].func_txt.endswith('(example_squares)')
+   assert entries['_helper_square'].get_func_txt(0) == 'example_results.py:5(_helper_square)'
+   # callees: the inverted callers
+   callees = {callee.func_txt: callee for callee in entries['example_squares'].callees}
+   assert callees[entries['_helper_square'].get_func_txt()].calls == 50
+   assert callees["method 'append' of 'list' objects"].calls == 50
+   assert entries['_helper_square'].callees == ()
+   _helper_assert_compact(entries['_helper_square'])
+   _helper_assert_compact(profile_result)
+
+   line_memory_result = line_memory_profile_functions(loaded_module, EXAMPLE_FUNC_TUPLES)[0]
+   assert isinstance(line_memory_result, LineMemoryResult)
+   assert len(line_memory_result) == 5
+   assert isinstance(line_memory_result.memory_usage_mib, array)
+   assert list(line_memory_result.iter_rows())[1][0] == 10
+   assert line_memory_result.lines[0] == 'def example_squares(n_):'
+   assert line_memory_result.max_mem_mib > 0
+   _helper_assert_compact(line_memory_result)
+
+   disassemble_result = disassemble_functions(loaded_module, EXAMPLE_FUNC_TUPLES)[0]
+   assert isinstance(disassemble_result, DisassembleResult)
+   assert 'RETURN_VALUE' in [instruction.opname for instruction in disassemble_result.instructions]
+   assert 'result.append(_helper_square(idx))' in [
+      instruction.line for instruction in disassemble_result.instructions]
+   _helper_assert_compact(disassemble_result.instructions[0])
+
+
+def test_profile_call_graph_report():
+   """ Tests: test_profile_call_graph_report: each function expands to its callers and callees
+   """
+   print('::: TEST: test_profile_call_graph_report()')
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_results_')
+   try:
+      loaded_module = load_example_module('example_results')
+      profile_functions_in_module(
+         loaded_module, loaded_module.__file__, 'example_results', work_dir_path, EXAMPLE_FUNC_TUPLES, 0, True, False, 1)
+      with open(path_join(work_dir_path, 'profile_it__example_results.html')) as file_:
+         html = file_.read()
+      assert html.count('<details>') == html.count('<summary>') == 3
+      assert '<summary>example_results.py:5(_helper_square)</summary>' in html
+      # the caller of _helper_square and the callee of example_squares
+      assert html.count('<td>example_results.py:5(_helper_square)</td>') == 1
+      assert html.count('<td>example_results.py:9(example_squares)</td>') == 2
+   finally:
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+def test_get_profile_func_txt():
+   """ Tests: test_get_profile_func_txt: path levels and angle brackets
+   """
+   print('::: TEST: test_get_profile_func_txt()')
+   assert get_profile_func_txt('/a/b/c.py', 3, 'func') == '/a/b/c.py:3(func)'
+   assert get_profile_func_txt('/a/b/c.py', 3, 'func', 1) == 'b/c.py:3(func)'
+   assert get_profile_func_txt('~', 0, '<built-in method builtins.len>') == 'built-in method builtins.len'
+   assert get_profile_func_txt('<string>', 1, '<module>', 1) == 'string>:1(<module>)'
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_results()
+   test_profile_call_graph_report()
+   test_get_profile_func_txt()
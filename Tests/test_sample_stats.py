@@ -0,0 +1,95 @@
+""" tests the robust statistics and the throughput of the Benchmark-IT loop samples
+"""
+from array import array
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+)
+from sys import path as sys_path
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT import sample_stats
+from PySpeedIT.benchmark_it import benchmark_functions
+from PySpeedIT.sample_stats import (
+   classify_outliers,
+   get_quantile,
+   get_sample_stats,
+   get_throughput_stats,
+)
+from PySpeedIT.utils import (
+   Err,
+   format_throughput,
+)
+
+
+def test_outliers():
+   """ Tests: test_outliers: tukey and mad classification, statistics with and without outliers
+   """
+   print('::: TEST: test_outliers()')
+   assert get_quantile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+   samples = array('d', [1.0, 1.1, 0.9, 1.0, 1.05, 0.95, 1.0, 1.3, 10.0, 0.1])
+   for outlier_method in ('tukey', 'mad'):
+      classification = classify_outliers(samples, outlier_method)
+      assert classification[7] == {'tukey': 'high_mild', 'mad': None}[outlier_method]
+      assert classification[8] == 'high_severe'
+      assert classification[9] in ('low_mild', 'low_severe')
+      assert classification[:7] == [None] * 7
+
+      sample_stats = get_sample_stats(samples, outlier_method)
+      assert sample_stats['outliers_high_severe'] == 1
+      assert sample_stats['outliers'] + sample_stats['clean_loops'] == len(samples)
+      assert sample_stats['clean_worst_loop_sec'] < max(samples)
+      assert sample_stats['median_loop_sec'] == 1.0
+
+   # too few samples or all equal: no outliers
+   assert classify_outliers([1.0, 5.0], 'tukey') == [None, None]
+   assert get_sample_stats([2.0] * 10, 'mad')['outliers'] == 0
+
+
+def test_throughput():
+   """ Tests: test_throughput: work units per second with a confidence interval: declared per function
+   """
+   print('::: TEST: test_throughput()')
+   per_sec, ci_low_per_sec, ci_high_per_sec = get_throughput_stats(array('d', [0.001, 0.0011, 0.0009, 0.001]), 100)
+   assert per_sec == 100000.0
+   assert ci_low_per_sec < per_sec < ci_high_per_sec <= 100 / 0.0009
+   assert get_throughput_stats([0.5], 2) == (4.0, 4.0, 4.0)
+   assert get_throughput_stats([], 2) == (-1.0, -1.0, -1.0)
+   assert format_throughput(12345678, 'ops') == '12.35 Mops/s'
+   assert format_throughput(1.2e9, 'B') == '1.20 GB/s'
+   assert format_throughput(-1.0, 'B') == 'NOT-MEASURED'
+
+   row = benchmark_functions(
+      sample_stats,
+      (('quantile', 'get_quantile', [[1.0, 2.0, 3.0], 0.5], {}),),
+      use_func_name=False,
+      benchmarkit__run_sec=0.1,
+      benchmarkit__repeat=1,
+      benchmarkit__work_units={'quantile': {'ops': lambda sorted_samples, quantile: len(sorted_samples), 'bytes': 24}}
+   )[0][0]
+   assert row.ops_per_loop == 3.0 and row.bytes_per_loop == 24.0
+   assert row.bytes_per_sec == row.ops_per_sec * 8
+   assert row.ops_per_sec_ci_low <= row.ops_per_sec <= row.ops_per_sec_ci_high
+
+   for work_units in ({'unknown': {'ops': 1}}, {'quantile': {'items': 1}}, {'quantile': {'ops': 0}}):
+      try:
+         benchmark_functions(sample_stats, (('quantile', 'get_quantile', [[1.0], 0.5], {}),), benchmarkit__run_sec=-1,
+                             benchmarkit__repeat=1, benchmarkit__work_units=work_units)
+         assert False, 'expected Err for: {}'.format(work_units)
+      except Err:
+         pass
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_outliers()
+   test_throughput()
@@ -0,0 +1,115 @@
+""" tests the sampling Profile-IT engine: interned stacks, collapsed stacks and the flamegraph
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+from shutil import rmtree as shutil_rmtree
+from sys import path as sys_path
+from tempfile import mkdtemp as tempfile_mkdtemp
+from time import perf_counter
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.profile_it import (
+   profile_functions_in_module,
+   sample_functions,
+)
+from PySpeedIT.results import SampledProfileResult
+from PySpeedIT.sampling_profiler import SamplingProfiler
+from PySpeedIT.svg_plots import get_svg_flamegraph
+from PySpeedIT.utils import Err
+
+from example_modules import load_example_module
+
+
+def _helper_spin(duration_sec):
+   end_time = perf_counter() + duration_sec
+   while perf_counter() < end_time:
+      pass
+
+
+def test_sampling_profiler():
+   """ Tests: test_sampling_profiler: both modes: only the profiled frames: interned stacks
+   """
+   print('::: TEST: test_sampling_profiler()')
+   for mode in ('signal', 'thread'):
+      sampling_profiler = SamplingProfiler(0.001, mode)
+      for repeat in range(2):
+         sampling_profiler.start()
+         try:
+            _helper_spin(0.1)
+         finally:
+            sampling_profiler.stop()
+      frames, stacks, counts = sampling_profiler.get_samples()
+      assert sum(counts) > 20, (mode, sum(counts))
+      # the samples of both repeats are added to the same interned stack
+      assert len(stacks) == len(set(stacks)) and max(counts) > sum(counts) // 2
+      # the outermost frame is the profiled function: not the caller of start() or the profiler
+      assert {frames[stack[0]][2] for stack in stacks} == {'_helper_spin'}
+      assert not {'start', 'stop', '_record'} & {func_name for file_path, line_num, func_name in frames}
+   try:
+      SamplingProfiler(0)
+      assert False, 'expected Err for an interval of 0'
+   except Err:
+      pass
+
+
+def test_sampled_profile_report():
+   """ Tests: test_sampled_profile_report: collapsed stacks: flamegraph report
+   """
+   print('::: TEST: test_sampled_profile_report()')
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_sampling_profiler_')
+   try:
+      loaded_module = load_example_module('example_sampling')
+      func_tuples = (('work', 'example_work', [100], {}),)
+      sampled_result = sample_functions(loaded_module, func_tuples, use_func_name=False)[0]
+      assert isinstance(sampled_result, SampledProfileResult) and sampled_result.status == 'OK'
+      hot_samples = sum(
+         count for func_txts, count in sampled_result.get_collapsed_stacks(0) if
+         'example_sampling.py:5(_helper_hot)' in func_txts)
+      assert hot_samples > sampled_result.get_num_samples() // 2
+
+      collapsed_lines = sampled_result.get_collapsed_text('work', 0).splitlines()
+      assert collapsed_lines and all(line.startswith('work;example_sampling.py:13(example_work)') for line in
+                                     collapsed_lines)
+      assert sum(int(line.rsplit(' ', 1)[1]) for line in collapsed_lines) == sampled_result.get_num_samples()
+
+      profile_functions_in_module(
+         loaded_module, loaded_module.__file__, 'example_sampling', work_dir_path, func_tuples, 0, False, False, 1,
+         profileit__engine='sampling')
+      with open(path_join(work_dir_path, 'profile_it__example_sampling.html')) as file_:
+         html = file_.read()
+      assert html.count('<svg') == 1 and 'pyspeeditFlameZoom' in html
+      assert 'data-n="example_sampling.py:5(_helper_hot)"' in html
+      with open(path_join(work_dir_path, 'profile_it__example_sampling.collapsed')) as file_:
+         assert file_.read().startswith('work;example_sampling.py:13(example_work)')
+   finally:
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+def test_svg_flamegraph():
+   """ Tests: test_svg_flamegraph: merged stack prefixes: narrow frames are not drawn
+   """
+   print('::: TEST: test_svg_flamegraph()')
+   svg = get_svg_flamegraph([(('main', 'a', 'b'), 6), (('main', 'a'), 3), (('main', 'c'), 1), (('tiny',), 0)], 'root')
+   # root, main, a, b, c: the frames with 0 samples are not drawn
+   assert svg.count('<g class="flame"') == 5
+   assert 'data-n="a" data-x="0.0" data-w="0.9"' in svg
+   assert '<title>main: 10 samples: 100.00 %</title>' in svg
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_sampling_profiler()
+   test_sampled_profile_report()
+   test_svg_flamegraph()
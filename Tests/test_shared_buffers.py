@@ -0,0 +1,162 @@
+""" tests the zero-copy handoff of large buffer arguments to the interpreter subprocesses
+"""
+from array import array
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os import (
+   _exit as os_exit,
+   listdir as os_listdir,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   isdir as path_isdir,
+)
+from shutil import rmtree as shutil_rmtree
+from sys import (
+   executable as sys_executable,
+   path as sys_path,
+)
+from tempfile import mkdtemp as tempfile_mkdtemp
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.multi_interpreter import measure_functions_in_interpreters
+from PySpeedIT.shared_buffers import (
+   SharedBuffer,
+   attach_arguments,
+   release_segments,
+   share_arguments,
+)
+from PySpeedIT.utils import Err
+
+
+BENCHMARK_OPTIONS = {
+   'use_func_name': False,
+   'benchmarkit__with_gc': False,
+   'benchmarkit__check_too_fast': False,
+   'benchmarkit__run_sec': -1,
+   'benchmarkit__repeat': 1,
+}
+
+
+def example_checksum(data_, values_):
+   if isinstance(data_, bytes) or isinstance(values_, array):
+      raise TypeError('expected zero-copy views')
+   return sum(data_[::4096]) + values_[-1]
+
+
+def example_crash(data_):
+   os_exit(3)
+
+
+def _helper_get_shm_names():
+   return set(os_listdir('/dev/shm')) if path_isdir('/dev/shm') else set()
+
+
+def test_share_arguments():
+   """ Tests: test_share_arguments: placeholders, zero-copy views of both backends, release of the segments
+   """
+   print('::: TEST: test_share_arguments()')
+   data = bytes(range(256)) * 64
+   values = array('d', range(2048))
+   small = bytearray(b'small')
+   func_tuples = (
+      ('a', 'func_a', [data, small], {'values_': values}),
+      ('b', 'func_b', [data], {}),
+   )
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_shared_buffers_')
+   try:
+      for backend in ('shm', 'mmap'):
+         shared_func_tuples, segments, shared_bytes = share_arguments(func_tuples, backend, work_dir_path, 1024)
+         assert len(segments) == 2 and shared_bytes == len(data) + values.itemsize * len(values)
+         assert isinstance(shared_func_tuples[0][2][0], SharedBuffer) and shared_func_tuples[0][2][1] is small
+         # a buffer used by several function tuples is shared once
+         assert shared_func_tuples[1][2][0] is shared_func_tuples[0][2][0]
+
+         attached_func_tuples, attached_segments = attach_arguments(shared_func_tuples)
+         data_view = attached_func_tuples[0][2][0]
+         values_view = attached_func_tuples[0][3]['values_']
+         assert isinstance(data_view, memoryview) and data_view.readonly and data_view == data
+         assert values_view.format == 'd' and values_view.tolist() == values.tolist()
+         assert attached_func_tuples[1][2][0] is data_view
+         try:
+            share_arguments(func_tuples, 'unknown', work_dir_path)
+            assert False, 'expected Err for an unknown backend'
+         except Err:
+            pass
+         data_view.release()
+         values_view.release()
+         del attached_func_tuples, data_view, values_view
+         release_segments(attached_segments, unlink=False)
+         release_segments(segments)
+         assert segments == []
+   finally:
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+def test_private_views():
+   """ Tests: test_private_views: changes of a writable view are not seen by the next attach
+   """
+   print('::: TEST: test_private_views()')
+   data = bytearray(range(256)) * 64
+   func_tuples = (('a', 'func_a', [data], {}),)
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_shared_buffers_')
+   try:
+      for backend in ('shm', 'mmap'):
+         shared_func_tuples, segments, shared_bytes = share_arguments(func_tuples, backend, work_dir_path, 1024)
+         for attach in range(2):
+            attached_func_tuples, attached_segments = attach_arguments(shared_func_tuples)
+            data_view = attached_func_tuples[0][2][0]
+            assert not data_view.readonly and data_view == data, (backend, attach)
+            data_view[:16] = b'\xff' * 16
+            data_view.release()
+            del attached_func_tuples, data_view
+            release_segments(attached_segments, unlink=False)
+         release_segments(segments)
+   finally:
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+def test_shared_buffers_in_interpreters():
+   """ Tests: test_shared_buffers_in_interpreters: zero-copy views in the subprocess: handoff report: cleanup on crash
+   """
+   print('::: TEST: test_shared_buffers_in_interpreters()')
+   data = bytes(range(256)) * 8192
+   values = array('q', range(2 ** 18))
+   shm_names = _helper_get_shm_names()
+   for shared_buffers in ('shm', 'mmap'):
+      all_tables, memory_budget_rows, interpreters_info = measure_functions_in_interpreters(
+         [sys_executable],
+         path_abspath(__file__),
+         (('checksum', 'example_checksum', [data, values], {}),),
+         BENCHMARK_OPTIONS,
+         shared_buffers
+      )
+      assert all_tables[0][0]['status'] == 'OK'
+      interpreter_info = interpreters_info[0]
+      assert interpreter_info['handoff_shared_bytes'] == len(data) + values.itemsize * len(values)
+      assert interpreter_info['handoff_pickled_bytes'] < 65536
+      assert interpreter_info['handoff_sec'] > 0
+   assert _helper_get_shm_names() == shm_names
+
+   try:
+      measure_functions_in_interpreters(
+         [sys_executable], path_abspath(__file__), (('crash', 'example_crash', [data], {}),), BENCHMARK_OPTIONS, 'shm')
+      assert False, 'expected Err for a crashed interpreter'
+   except Err:
+      pass
+   assert _helper_get_shm_names() == shm_names
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_share_arguments()
+   test_private_views()
+   test_shared_buffers_in_interpreters()
@@ -0,0 +1,162 @@
+""" tests the Benchmark-IT latency SLOs: percentile confidence intervals, extended runs and the SLO gate
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from json import load as json_load
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+   join as path_join,
+)
+from shutil import rmtree as shutil_rmtree
+from sys import path as sys_path
+from tempfile import mkdtemp as tempfile_mkdtemp
+import time
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.benchmark_it import benchmark_functions
+from PySpeedIT.cli import main
+from PySpeedIT.sample_stats import get_percentile_stats
+from PySpeedIT.slo import (
+   check_slos,
+   evaluate_slos,
+   get_extended_run_sec,
+   get_required_samples,
+   get_slo_exit_code,
+)
+from PySpeedIT.speed_it import speed_it
+from PySpeedIT.utils import Err
+
+from example_modules import (
+   get_example_module_path,
+   load_example_module,
+)
+
+
+def test_percentiles():
+   """ Tests: test_percentiles: required samples, distribution-free confidence intervals and the SLO status
+   """
+   print('::: TEST: test_percentiles()')
+   assert get_required_samples(99) == 1000
+   assert get_required_samples(99.9) == 10000
+   assert get_required_samples(50) == 20
+
+   samples = [idx / 1000.0 for idx in range(1, 1001)]
+   percentile_sec, ci_low_sec, ci_high_sec = get_percentile_stats(samples, 99)
+   assert ci_low_sec < percentile_sec < ci_high_sec <= samples[-1]
+   assert get_percentile_stats([], 99) == (-1.0, -1.0, -1.0)
+
+   job_slos = check_slos(
+      {'f': [{'percentile': 99, 'threshold_sec': 1.0}, {'percentile': 99, 'threshold_sec': percentile_sec}]},
+      (('f', 'func', [], {}),)
+   )['f']
+   assert job_slos[0]['max_run_sec'] == 60.0
+   passed, failed = evaluate_slos(samples, job_slos, 1.0)
+   assert passed['status'] == 'PASS' and passed['margin_sec'] > 0
+   # the estimate is within the threshold but not the upper confidence bound
+   assert failed['status'] == 'FAIL' and failed['margin_sec'] == 0.0
+   assert evaluate_slos(samples[:100], job_slos, 1.0)[0]['status'] == 'INSUFFICIENT-SAMPLES'
+   assert get_slo_exit_code([passed]) == 0 and get_slo_exit_code([passed, failed]) == 1 and get_slo_exit_code([]) == 0
+
+   assert get_extended_run_sec(job_slos, 1000, 1.0, 1.0) is None
+   assert get_extended_run_sec(job_slos, 100, 1.0, 1.0) == 12.0
+   assert get_extended_run_sec(job_slos, 100, 60.0, 60.0) is None
+   assert get_extended_run_sec(job_slos, 1, -1, 0.001) == 1.2
+
+   for slos in ({'unknown': [{'percentile': 99, 'threshold_sec': 1.0}]}, {'f': []}, {'f': [{'percentile': 99}]},
+                {'f': [{'percentile': 100, 'threshold_sec': 1.0}]}, {'f': [{'percentile': 99, 'threshold_sec': 0}]}):
+      try:
+         check_slos(slos, (('f', 'func', [], {}),))
+         assert False, 'expected Err for: {}'.format(slos)
+      except Err:
+         pass
+
+
+def test_slo_extended_run():
+   """ Tests: test_slo_extended_run: too few samples for the tail percentile: the function is measured longer
+   """
+   print('::: TEST: test_slo_extended_run()')
+   # about 90 samples of a 1 ms sleep in 0.1 sec: p95 needs 200
+   row = benchmark_functions(
+      time,
+      (('sleep', 'sleep', [0.001], {}),),
+      use_func_name=False,
+      benchmarkit__run_sec=0.1,
+      benchmarkit__repeat=1,
+      benchmarkit__slos={'sleep': [{'percentile': 95, 'threshold_sec': 1.0}, {'percentile': 95, 'threshold_sec': 1e-6}]}
+   )[0][0]
+   assert row.run_sec > 0.1
+   assert len(row.samples) >= 200
+   assert [slo_result['status'] for slo_result in row.slos] == ['PASS', 'FAIL']
+   assert row.slos[1]['margin_sec'] < 0
+
+
+def test_slo_call_engine():
+   """ Tests: test_slo_call_engine: the `call` engine samples single calls: the slow calls of the tail are not averaged
+   """
+   print('::: TEST: test_slo_call_engine()')
+   row = benchmark_functions(
+      load_example_module('example_slo'),
+      (('spiky', 'example_spiky', [], {}),),
+      use_func_name=False,
+      benchmarkit__check_too_fast=False,
+      benchmarkit__run_sec=0.1,
+      benchmarkit__repeat=1,
+      benchmarkit__engine='call',
+      benchmarkit__slos={'spiky': [{'percentile': 99, 'threshold_sec': 0.0002}]}
+   )[0][0]
+   assert row.engine == 'call'
+   assert row.loops == len(row.samples)
+   assert row.slos[0]['status'] == 'FAIL'
+   assert row.slos[0]['percentile_sec'] >= 0.0005
+
+
+def test_slo_gate():
+   """ Tests: test_slo_gate: speed_it returns the exit code of the SLO gate: `pyspeedit slo-gate` of the json output
+   """
+   print('::: TEST: test_slo_gate()')
+   work_dir_path = tempfile_mkdtemp(prefix='pyspeedit_test_slo_')
+   try:
+      json_file_path = path_join(work_dir_path, 'BenchmarkIT_Results', 'benchmark_it__example_slo.json')
+
+      for threshold_sec, expected_exit_code in ((1.0, 0), (1e-9, 1)):
+         exit_code = speed_it(
+            html_output_dir_path=work_dir_path,
+            enable_benchmarkit=True,
+            enable_profileit=False,
+            enable_linememoryprofileit=False,
+            enable_disassembleit=False,
+            modules__func_tuples=(
+               [get_example_module_path('example_slo'), (('sum', 'example_sum', [10], {}),), {
+                  'benchmarkit__slos': {'sum': [{'percentile': 99, 'threshold_sec': threshold_sec}]},
+               }],
+            ),
+            benchmarkit__run_sec=0.1,
+            benchmarkit__repeat=1,
+            benchmarkit__output_json=True,
+         )
+         assert exit_code == expected_exit_code
+         assert main(['slo-gate', json_file_path]) == expected_exit_code
+         with open(json_file_path, 'r') as file_:
+            json_result = json_load(file_)
+         assert json_result['slo_status'] == ('PASS' if expected_exit_code == 0 else 'FAIL')
+         assert json_result['repeats'][0][0]['slos'][0]['threshold_sec'] == threshold_sec
+         with open(path_join(work_dir_path, 'BenchmarkIT_Results', 'benchmark_it__example_slo.html'), 'r') as file_:
+            assert 'p99 &lt;= ' in file_.read()
+   finally:
+      shutil_rmtree(work_dir_path, ignore_errors=True)
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_percentiles()
+   test_slo_extended_run()
+   test_slo_call_engine()
+   test_slo_gate()
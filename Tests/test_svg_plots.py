@@ -0,0 +1,50 @@
+""" tests the inline SVG plots of the Benchmark-IT loop samples
+"""
+from array import array
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+)
+from sys import path as sys_path
+from xml.etree.ElementTree import fromstring
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.sample_stats import get_sample_stats
+from PySpeedIT.svg_plots import (
+   SVG_HISTOGRAM_BINS,
+   get_svg_box_plot,
+   get_svg_histogram,
+)
+
+
+def test_svg_plots():
+   """ Tests: test_svg_plots: valid svg: one shape per bin not per sample: slow tail in the overflow bin
+   """
+   print('::: TEST: test_svg_plots()')
+   samples = array('d', [(idx % 100) * 1e-7 + 1e-6 for idx in range(100000)])
+   samples.append(1.0)
+   sample_stats = get_sample_stats(samples)
+
+   histogram = fromstring(get_svg_histogram(samples, 'func <a&b>', sample_stats))
+   rects = histogram.findall('{http://www.w3.org/2000/svg}rect')
+   assert 1 < len(rects) <= SVG_HISTOGRAM_BINS + 1
+   assert rects[-1].get('fill') == '#C14A4A'
+   assert rects[-1].find('{http://www.w3.org/2000/svg}title').text == '1 slower samples'
+
+   box_plot = fromstring(get_svg_box_plot([('a', sample_stats), ('b', get_sample_stats([]))]))
+   assert len(box_plot.findall('{http://www.w3.org/2000/svg}rect')) == 1
+   assert fromstring(get_svg_histogram([], 'empty', get_sample_stats([]))).tag.endswith('svg')
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_svg_plots()
@@ -0,0 +1,110 @@
+""" tests the system noise detection and the stable mode
+"""
+from inspect import (
+   getfile as inspect_getfile,
+   currentframe as inspect_currentframe,
+)
+from os import (
+   cpu_count as os_cpu_count,
+   sched_getaffinity,
+)
+from os.path import (
+   abspath as path_abspath,
+   dirname as path_dirname,
+)
+from sys import path as sys_path
+
+
+SCRIPT_PATH = path_dirname(path_abspath(inspect_getfile(inspect_currentframe())))
+PROJECT_ROOT = path_dirname(SCRIPT_PATH)
+
+sys_path.insert(0, PROJECT_ROOT)
+
+from PySpeedIT.system_state import (
+   enter_stable_mode,
+   exit_stable_mode,
+   get_resource_usage,
+   get_resource_usage_delta,
+   get_system_noise,
+   get_system_state,
+)
+
+
+def _system_state(**kwargs):
+   system_state = {
+      'cpu_count': 4,
+      'loadavg_1min': 0.1,
+      'runnable_tasks': 1,
+      'cpu_total_jiffies': 1000,
+      'cpu_steal_jiffies': 0,
+      'cpu_governors': ['performance'],
+      'cpu_freq_khz': 3000000.0,
+      'turbo': False,
+   }
+   system_state.update(kwargs)
+   return system_state
+
+
+def test_get_system_noise():
+   """ Tests: test_get_system_noise: quiet system, each noise source, unavailable values
+   """
+   print('::: TEST: test_get_system_noise()')
+   assert get_system_state().keys() == _system_state().keys()
+   assert get_system_noise(_system_state(), _system_state(cpu_total_jiffies=2000)) == []
+
+   noise_reasons = get_system_noise(_system_state(), _system_state(
+      loadavg_1min=8.0,
+      runnable_tasks=6,
+      cpu_total_jiffies=2000,
+      cpu_steal_jiffies=100,
+      cpu_governors=['powersave'],
+      cpu_freq_khz=2000000.0,
+      turbo=True,
+   ), {'turbo_allowed': False})
+   assert len(noise_reasons) == 6
+
+   unavailable = {key: None for key in _system_state() if key != 'cpu_count'}
+   assert get_system_noise(_system_state(**unavailable), _system_state(**unavailable)) == []
+
+
+def test_stable_mode():
+   """ Tests: test_stable_mode: pins the process to one cpu and restores the affinity: the noise checks still use all
+   cpus of the system
+   """
+   print('::: TEST: test_stable_mode()')
+   affinity = sched_getaffinity(0)
+   saved_settings = enter_stable_mode()
+   try:
+      assert sched_getaffinity(0) == {max(affinity)}
+      state_before = get_system_state()
+      state_after = get_system_state()
+      assert state_before['cpu_count'] == state_after['cpu_count'] == os_cpu_count()
+      # a quiet system with 4 cpus: suspect if divided by the one pinned cpu
+      state_before.update(cpu_count=4, loadavg_1min=2.0, runnable_tasks=2)
+      state_after.update(cpu_count=4, loadavg_1min=2.0, runnable_tasks=2)
+      noise_reasons = get_system_noise(state_before, state_after)
+      assert not [reason for reason in noise_reasons if reason.startswith(('loadavg', 'runnable'))], noise_reasons
+   finally:
+      exit_stable_mode(saved_settings)
+   assert sched_getaffinity(0) == affinity
+
+
+def test_resource_usage_delta():
+   """ Tests: test_resource_usage_delta: counters are normalized per loop: the sampling itself is not counted
+   """
+   print('::: TEST: test_resource_usage_delta()')
+   usage_before = get_resource_usage()
+   for loop in range(4):
+      with open(__file__, 'rb') as file_:
+         file_size = len(file_.read())
+   resource_usage_delta = get_resource_usage_delta(usage_before, get_resource_usage(), 4)
+   assert resource_usage_delta['io_read_bytes'] == file_size
+   assert resource_usage_delta['max_rss_kb'] > 0
+   assert '_io_sample_bytes' not in resource_usage_delta
+
+
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++ #
+if __name__ == '__main__':
+   test_get_system_noise()
+   test_stable_mode()
+   test_resource_usage_delta()
@@ -61,10 +61,10 @@ MAIN_PACKAGE_PATH = path_join(ROOT_PACKAGE_PATH, PACKAGE_NAME)
 
 from PySpeedIT import TESTED_HOST_OS
 
-if sys_version_info[:2] < (3, 4) or 'linux' not in sys_platform:
+if sys_version_info[:2] < (3, 9) or 'linux' not in sys_platform:
    print('''
 
-      PySpeedIT is only tested with Python 3.4.2rc1 or higher:\n  current python version: {0:d}.{1:d}\n\n
+      PySpeedIT is only tested with Python 3.9 or higher:\n  current python version: {0:d}.{1:d}\n\n
 
       TESTED_HOST_OS: {3:}
       '''.format(sys_version_info[:2][0], sys_version_info[:2][1], TESTED_HOST_OS))
@@ -199,10 +199,25 @@ class CleanCommand(setuptools_Command):
       need_normal_clean = True
       exclude_files = [
          'benchmark_it.c',
+         'constants.c',
+         'context_profiler.c',
          'disassemble_it.c',
+         'discover.c',
+         'fixtures.c',
+         'fork_server.c',
          'line_memory_profile_it.c',
+         'memory_budget.c',
+         'multi_interpreter.c',
          'profile_it.c',
+         'result_cache.c',
+         'results.c',
+         'sample_stats.c',
+         'sampling_profiler.c',
+         'shared_buffers.c',
+         'slo.c',
          'speed_it.c',
+         'svg_plots.c',
+         'system_state.c',
          'utils.c',
          '_version.c',
       ]
@@ -377,10 +392,25 @@ cython_include_path = []  # include for cimport, different from compile include:
 # Cython extension names
 cython_extension_name_sources = {
    'PySpeedIT.benchmark_it': ['PySpeedIT/cython/benchmark_it.pyx'],
+   'PySpeedIT.constants': ['PySpeedIT/cython/constants.pyx'],
+   'PySpeedIT.context_profiler': ['PySpeedIT/cython/context_profiler.pyx'],
    'PySpeedIT.disassemble_it': ['PySpeedIT/cython/disassemble_it.pyx'],
+   'PySpeedIT.discover': ['PySpeedIT/cython/discover.pyx'],
+   'PySpeedIT.fixtures': ['PySpeedIT/cython/fixtures.pyx'],
+   'PySpeedIT.fork_server': ['PySpeedIT/cython/fork_server.pyx'],
    'PySpeedIT.line_memory_profile_it': ['PySpeedIT/cython/line_memory_profile_it.pyx'],
+   'PySpeedIT.memory_budget': ['PySpeedIT/cython/memory_budget.pyx'],
+   'PySpeedIT.multi_interpreter': ['PySpeedIT/cython/multi_interpreter.pyx'],
    'PySpeedIT.profile_it': ['PySpeedIT/cython/profile_it.pyx'],
+   'PySpeedIT.result_cache': ['PySpeedIT/cython/result_cache.pyx'],
+   'PySpeedIT.results': ['PySpeedIT/cython/results.pyx'],
+   'PySpeedIT.sample_stats': ['PySpeedIT/cython/sample_stats.pyx'],
+   'PySpeedIT.sampling_profiler': ['PySpeedIT/cython/sampling_profiler.pyx'],
+   'PySpeedIT.shared_buffers': ['PySpeedIT/cython/shared_buffers.pyx'],
+   'PySpeedIT.slo': ['PySpeedIT/cython/slo.pyx'],
    'PySpeedIT.speed_it': ['PySpeedIT/cython/speed_it.pyx'],
+   'PySpeedIT.svg_plots': ['PySpeedIT/cython/svg_plots.pyx'],
+   'PySpeedIT.system_state': ['PySpeedIT/cython/system_state.pyx'],
    'PySpeedIT.utils': ['PySpeedIT/cython/utils.pyx'],
    'PySpeedIT._version': ['PySpeedIT/cython/_version.pyx'],
 }
@@ -434,4 +464,12 @@ setuptools_setup(
    ],
    keywords='python benchmark profile timeit speed memory disassemble',
    scripts=[],
+   entry_points={
+      'console_scripts': [
+         'pyspeedit = PySpeedIT.cli:main',
+      ],
+      'pytest11': [
+         'pyspeedit = PySpeedIT.pytest_plugin',
+      ],
+   },
 )